@@ -1107,6 +1107,14 @@ AZURE_STORAGE_ENDPOINT = os.environ.get("AZURE_STORAGE_ENDPOINT", None)
 AZURE_STORAGE_CONTAINER_NAME = os.environ.get("AZURE_STORAGE_CONTAINER_NAME", None)
 AZURE_STORAGE_KEY = os.environ.get("AZURE_STORAGE_KEY", None)
 
+# Local copies of S3/GCS/Azure files kept for reuse by get_file; least recently
+# used copies are removed above this size (0 = unbounded)
+STORAGE_CACHE_MAX_SIZE_MB = int(os.environ.get("STORAGE_CACHE_MAX_SIZE_MB", "10240"))
+
+# When > 0, file downloads redirect to a presigned S3/GCS/Azure URL valid for this
+# many seconds instead of streaming through the app (0 = always stream)
+STORAGE_PRESIGNED_URL_EXPIRES = int(os.environ.get("STORAGE_PRESIGNED_URL_EXPIRES", "0"))
+
 ####################################
 # File Upload DIR
 ####################################
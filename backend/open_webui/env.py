@@ -406,6 +406,63 @@ MODELS_CACHE_MAX_USERS = _safe_int_env("MODELS_CACHE_MAX_USERS", 1000, min_value
 # Recommended: 50-100 for 4 CPU pods, can go higher with PgBouncer for connection pooling
 RAG_THREAD_POOL_SIZE = _safe_int_env("RAG_THREAD_POOL_SIZE", 50, min_value=5, max_value=200)
 
+####################################
+# FACILITIES
+####################################
+
+# Max number of facilities sections generated concurrently for a single user
+# (retrieval + web search + LLM call per section). Sections beyond the cap wait
+# for a free slot, so one user cannot monopolize the LLM backends.
+FACILITIES_SECTION_CONCURRENCY = _safe_int_env(
+    "FACILITIES_SECTION_CONCURRENCY", 4, min_value=1, max_value=32
+)
+
+####################################
+# KATEX RENDERING (PDF export)
+####################################
+
+# Number of long-lived Node processes rendering KaTeX fragments per Python process
+KATEX_WORKER_POOL_SIZE = _safe_int_env("KATEX_WORKER_POOL_SIZE", 2, min_value=1, max_value=16)
+# Max rendered fragments kept in the process-wide LRU cache (shared across exports)
+KATEX_RENDER_CACHE_SIZE = _safe_int_env("KATEX_RENDER_CACHE_SIZE", 4096, min_value=0, max_value=1000000)
+# Seconds to wait for a render batch before the worker is restarted
+KATEX_RENDER_TIMEOUT = _safe_int_env("KATEX_RENDER_TIMEOUT", 30, min_value=1, max_value=600)
+
+####################################
+# CHAT EXPORT
+####################################
+
+# Processes rendering PDFs concurrently for group ZIP exports (shared across requests)
+CHAT_EXPORT_PDF_WORKERS = _safe_int_env(
+    "CHAT_EXPORT_PDF_WORKERS", min(4, os.cpu_count() or 1), min_value=1, max_value=32
+)
+
+####################################
+# CODE INTERPRETER (Jupyter kernel pool)
+####################################
+
+# Kernels kept started and idle per Jupyter server, ready to be leased
+JUPYTER_KERNEL_POOL_SIZE = _safe_int_env("JUPYTER_KERNEL_POOL_SIZE", 2, min_value=0, max_value=64)
+# Max kernels (idle + leased + session-bound) per Jupyter server; also caps concurrent executions
+JUPYTER_KERNEL_POOL_MAX_KERNELS = _safe_int_env(
+    "JUPYTER_KERNEL_POOL_MAX_KERNELS", 16, min_value=1, max_value=256
+)
+# Seconds a session kernel (or an unused pool) may stay idle before it is culled
+JUPYTER_KERNEL_IDLE_TIMEOUT = _safe_int_env(
+    "JUPYTER_KERNEL_IDLE_TIMEOUT", 600, min_value=10, max_value=86400
+)
+# How a kernel is cleaned before it is leased again:
+#   "restart" - restart the kernel process in the background (full isolation, default)
+#   "reset"   - clear the user namespace with %reset (faster, imported modules stay loaded)
+#   "session" - keep one kernel per chat so state carries over between code blocks;
+#               executions without a chat fall back to "reset"
+JUPYTER_KERNEL_POOL_POLICY = os.environ.get("JUPYTER_KERNEL_POOL_POLICY", "restart").lower()
+if JUPYTER_KERNEL_POOL_POLICY not in ("restart", "reset", "session"):
+    log.warning(
+        f"Invalid JUPYTER_KERNEL_POOL_POLICY '{JUPYTER_KERNEL_POOL_POLICY}', using default 'restart'"
+    )
+    JUPYTER_KERNEL_POOL_POLICY = "restart"
+
 ####################################
 # JOB QUEUE (RQ - Redis Queue)
 ####################################
@@ -479,6 +536,34 @@ except (ValueError, TypeError) as e:
     log.warning(f"Invalid JOB_FAILURE_TTL value '{os.environ.get('JOB_FAILURE_TTL')}': {e}. Using default 86400")
     JOB_FAILURE_TTL = 86400
 
+# Worker execution mode:
+#   "fork" - stock RQ worker, forks a fresh work horse per job (default)
+#   "warm" - long-lived worker that initializes config, embedding models, tokenizer
+#            and vector DB client once and executes jobs in-process
+WORKER_MODE = os.environ.get("WORKER_MODE", "fork").lower()
+if WORKER_MODE not in ("fork", "warm"):
+    log.warning(f"Invalid WORKER_MODE '{WORKER_MODE}', using default 'fork'")
+    WORKER_MODE = "fork"
+
+# Number of jobs a warm worker process executes concurrently (one thread each)
+WORKER_CONCURRENCY = _safe_int_env("WORKER_CONCURRENCY", 1, min_value=1, max_value=32)
+
+# Recycle a warm worker process after this many jobs per thread (0 = never).
+# Guards against slow memory/handle leaks in loaders and embedding clients.
+WORKER_MAX_JOBS = _safe_int_env("WORKER_MAX_JOBS", 500, min_value=0, max_value=100000)
+
+# Fair-share scheduling: how many jobs of one user may sit in a queue class
+# (interactive chat uploads / bulk knowledge ingestion) at once. The rest wait in
+# a per-user backlog and are admitted as the user's earlier jobs finish.
+JOB_QUEUE_USER_SLOTS = _safe_int_env("JOB_QUEUE_USER_SLOTS", 4, min_value=1, max_value=1000)
+
+# Admission limit: backlogged jobs per user and class before new ones are refused (0 = no limit)
+JOB_QUEUE_MAX_BACKLOG = _safe_int_env("JOB_QUEUE_MAX_BACKLOG", 2000, min_value=0, max_value=1000000)
+
+# Files that split into more chunks than this are embedded by parallel sub-jobs
+# of this many chunks each, so one large document can use every idle worker (0 = off)
+FILE_PROCESSING_PART_CHUNKS = _safe_int_env("FILE_PROCESSING_PART_CHUNKS", 400, min_value=0, max_value=100000)
+
 ####################################
 # WEBUI_AUTH (Required for security)
 ####################################
@@ -533,6 +618,12 @@ WEBSOCKET_MANAGER = os.environ.get("WEBSOCKET_MANAGER", "")
 
 WEBSOCKET_REDIS_URL = os.environ.get("WEBSOCKET_REDIS_URL", REDIS_URL)
 
+# Presence ("user-list") and model usage changes are coalesced and broadcast
+# as diffs to subscribed sockets at most once per interval (milliseconds)
+WEBSOCKET_PRESENCE_BROADCAST_INTERVAL_MS = _safe_int_env(
+    "WEBSOCKET_PRESENCE_BROADCAST_INTERVAL_MS", 1000, min_value=100, max_value=60000
+)
+
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
 if AIOHTTP_CLIENT_TIMEOUT == "":
@@ -557,6 +648,47 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST = 5
 
+####################################
+# AI TUTOR PROXY
+####################################
+
+# Keep-alive connection pool shared by all AI Tutor proxy requests
+AI_TUTOR_PROXY_POOL_SIZE = _safe_int_env("AI_TUTOR_PROXY_POOL_SIZE", 100, min_value=1, max_value=1000)
+AI_TUTOR_PROXY_CONNECT_TIMEOUT = _safe_int_env("AI_TUTOR_PROXY_CONNECT_TIMEOUT", 10, min_value=1, max_value=300)
+# Max seconds without upstream data before the request is aborted
+AI_TUTOR_PROXY_READ_TIMEOUT = _safe_int_env("AI_TUTOR_PROXY_READ_TIMEOUT", 300, min_value=1, max_value=3600)
+
+# Per-route read timeouts as JSON, keyed by path prefix, e.g. '{"/student-analysis": 600}'
+try:
+    AI_TUTOR_PROXY_ROUTE_TIMEOUTS = {
+        str(prefix): int(seconds)
+        for prefix, seconds in json.loads(
+            os.environ.get("AI_TUTOR_PROXY_ROUTE_TIMEOUTS", "{}")
+        ).items()
+    }
+except Exception:
+    AI_TUTOR_PROXY_ROUTE_TIMEOUTS = {}
+
+####################################
+# PIPELINES CLIENT
+####################################
+
+# Keep-alive connection pool shared by pipeline filters and the pipelines admin API
+PIPELINES_CLIENT_POOL_SIZE = _safe_int_env("PIPELINES_CLIENT_POOL_SIZE", 100, min_value=1, max_value=1000)
+# Seconds pipeline server listings, pipeline lists and valve specs are cached (0 = off)
+PIPELINES_CACHE_TTL = _safe_int_env("PIPELINES_CACHE_TTL", 10, min_value=0, max_value=3600)
+
+####################################
+# EMBEDDING CACHE
+####################################
+
+# Reuse chunk vectors keyed by (engine, model, chunk text) across re-processing and re-uploads
+ENABLE_EMBEDDING_CACHE = os.environ.get("ENABLE_EMBEDDING_CACHE", "true").lower() == "true"
+# Cached vectors older than this many days are dropped and re-embedded on next use (0 = keep)
+EMBEDDING_CACHE_MAX_AGE_DAYS = _safe_int_env("EMBEDDING_CACHE_MAX_AGE_DAYS", 90, min_value=0)
+# Upper bound on cached vectors; the oldest are dropped first (0 = unbounded)
+EMBEDDING_CACHE_MAX_ROWS = _safe_int_env("EMBEDDING_CACHE_MAX_ROWS", 1000000, min_value=0)
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -588,6 +720,17 @@ AUDIT_EXCLUDED_PATHS = os.getenv("AUDIT_EXCLUDED_PATHS", "/chats,/chat,/folders"
 AUDIT_EXCLUDED_PATHS = [path.strip() for path in AUDIT_EXCLUDED_PATHS]
 AUDIT_EXCLUDED_PATHS = [path.lstrip("/") for path in AUDIT_EXCLUDED_PATHS]
 
+####################################
+# LOG PIPELINE
+####################################
+
+# Write stdout logs from loguru's background thread so callers never block on flushing
+LOG_ENQUEUE = os.environ.get("LOG_ENQUEUE", "True").lower() == "true"
+
+# Max DEBUG/INFO records per second from a single log statement; the rest are
+# dropped unformatted and counted. WARNING and above always pass (0 = unlimited)
+LOG_RATE_LIMIT = _safe_int_env("LOG_RATE_LIMIT", 20, min_value=0, max_value=100000)
+
 ####################################
 # OPENTELEMETRY CONFIGURATION
 ####################################
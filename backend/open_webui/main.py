@@ -8,6 +8,7 @@ import shutil
 import sys
 import time
 import random
+import re
 
 from contextlib import asynccontextmanager
 from urllib.parse import urlencode, parse_qs, urlparse
@@ -47,7 +48,7 @@ from starlette.responses import Response, StreamingResponse
 
 from open_webui.utils import logger
 from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
-from open_webui.utils.logger import start_logger, NYC_TIMEZONE
+from open_webui.utils.logger import start_logger, correlation_scope, NYC_TIMEZONE
 
 # Set timezone early - before any logging happens
 import os
@@ -55,6 +56,7 @@ os.environ["TZ"] = "America/New_York"
 from open_webui.socket.main import (
     app as socket_app,
     periodic_usage_pool_cleanup,
+    periodic_presence_broadcast,
 )
 from open_webui.routers import (
     ai_tutor,
@@ -92,6 +94,7 @@ from open_webui.routers.retrieval import (
 
 from open_webui.internal.db import Session
 
+from open_webui.models.chats import Chats
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 from open_webui.models.users import UserModel, Users
@@ -327,6 +330,7 @@ from open_webui.config import (
     AppConfig,
     reset_config,
 )
+from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import (
     MODELS_CACHE_MAX_USERS,
     AUDIT_EXCLUDED_PATHS,
@@ -349,6 +353,10 @@ from open_webui.env import (
     OFFLINE_MODE,
 )
 from open_webui.utils.katex_compiler import KaTeXCompiler
+from open_webui.utils.code_interpreter import (
+    get_jupyter_kernel_pool,
+    shutdown_jupyter_kernel_pools,
+)
 
 
 from open_webui.utils.models import (
@@ -377,7 +385,14 @@ from open_webui.utils.auth import (
 from open_webui.utils.oauth import OAuthManager
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 
-from open_webui.tasks import stop_task, list_tasks, periodic_task_cleanup, startup_cleanup  # Import from tasks.py
+from open_webui.tasks import (
+    stop_task,
+    list_tasks,
+    list_task_ids_by_chat_id,
+    periodic_task_cleanup,
+    startup_cleanup,
+    start_task_cancellation_listener,
+)  # Import from tasks.py
 
 
 if SAFE_MODE:
@@ -558,7 +573,10 @@ async def lifespan(app: FastAPI):
         get_license_data(app, app.state.config.LICENSE_KEY)
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(periodic_presence_broadcast())
     asyncio.create_task(periodic_task_cleanup())
+    # Listen for cancellation requests for tasks running on this pod
+    start_task_cancellation_listener()
     # Clean up orphaned tasks on startup (fixes memory leak on pod restart)
     startup_task = asyncio.create_task(startup_cleanup())
     # Add error callback to log failures (BUG #6 fix)
@@ -608,9 +626,34 @@ async def lifespan(app: FastAPI):
                 log.warning(f"Failed to copy KaTeX fonts from node_modules: {e}")
     except Exception as e:
         log.debug(f"KaTeX font cache init failed: {e}")
+
+    # Start Jupyter kernels ahead of the first code interpreter call
+    if (
+        app.state.config.ENABLE_CODE_INTERPRETER
+        and app.state.config.CODE_INTERPRETER_ENGINE == "jupyter"
+        and app.state.config.CODE_INTERPRETER_JUPYTER_URL
+    ):
+        get_jupyter_kernel_pool(
+            app.state.config.CODE_INTERPRETER_JUPYTER_URL,
+            (
+                app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN
+                if app.state.config.CODE_INTERPRETER_JUPYTER_AUTH == "token"
+                else None
+            ),
+            (
+                app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD
+                if app.state.config.CODE_INTERPRETER_JUPYTER_AUTH == "password"
+                else None
+            ),
+        ).prewarm()
     
     yield
     
+    await ai_tutor.close_session()
+    await pipelines.close_session()
+    chats.shutdown_pdf_export_executor()
+    await shutdown_jupyter_kernel_pools()
+
     # Shutdown OpenTelemetry (flush remaining spans/metrics)
     if otel_initialized:
         try:
@@ -1112,6 +1155,21 @@ async def inspect_websocket(request: Request, call_next):
     return await call_next(request)
 
 
+REQUEST_ID_PATTERN = re.compile(r"^[\w.-]{1,64}$")
+
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    # Tag every log line of the request (and the jobs it enqueues) with one id
+    request_id = request.headers.get("X-Request-ID")
+    if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+        request_id = None
+    with correlation_scope(request_id) as cid:
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = cid
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ALLOW_ORIGIN,
@@ -1451,6 +1509,20 @@ async def list_tasks_endpoint(user=Depends(get_verified_user)):
     return {"tasks": list_tasks()}  # Use the function from tasks.py
 
 
+@app.get("/api/tasks/chat/{chat_id}")
+async def list_tasks_by_chat_id_endpoint(chat_id: str, user=Depends(get_verified_user)):
+    # Task IDs are what /api/tasks/stop takes, so only hand out a chat's own
+    chat = Chats.get_chat_by_id(chat_id)
+    if chat is None or (
+        chat.user_id != user.id
+        and not (user.role == "admin" and ENABLE_ADMIN_CHAT_ACCESS)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail=ERROR_MESSAGES.NOT_FOUND
+        )
+    return {"task_ids": list_task_ids_by_chat_id(chat_id)}
+
+
 ##################################
 #
 # Config Endpoints
@@ -0,0 +1,42 @@
+"""Add embedding_cache table for reusing chunk vectors
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "a7b8c9d0e1f2"
+down_revision = "f6a7b8c9d0e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    if "embedding_cache" not in sa.inspect(conn).get_table_names():
+        op.create_table(
+            "embedding_cache",
+            sa.Column("id", sa.Text(), primary_key=True),
+            sa.Column("engine", sa.Text(), nullable=True),
+            sa.Column("model", sa.Text(), nullable=True),
+            sa.Column("dimensions", sa.Integer(), nullable=True),
+            sa.Column("vector", sa.LargeBinary(), nullable=True),
+            sa.Column("created_at", sa.BigInteger(), nullable=True),
+        )
+
+    # Pruning deletes by age
+    indexes = {
+        index["name"] for index in sa.inspect(conn).get_indexes("embedding_cache")
+    }
+    if "ix_embedding_cache_created_at" not in indexes:
+        op.create_index(
+            "ix_embedding_cache_created_at", "embedding_cache", ["created_at"]
+        )
+
+
+def downgrade():
+    op.drop_table("embedding_cache")
@@ -0,0 +1,33 @@
+"""Add file.content_hash for upload deduplication
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b8c9d0e1f2a3"
+down_revision = "a7b8c9d0e1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = {col["name"] for col in inspector.get_columns("file")}
+    indexes = {index["name"] for index in inspector.get_indexes("file")}
+
+    if "content_hash" not in columns:
+        op.add_column("file", sa.Column("content_hash", sa.Text(), nullable=True))
+    if "ix_file_content_hash" not in indexes:
+        op.create_index("ix_file_content_hash", "file", ["content_hash"])
+
+
+def downgrade():
+    op.drop_index("ix_file_content_hash", table_name="file")
+    with op.batch_alter_table("file") as batch_op:
+        batch_op.drop_column("content_hash")
@@ -0,0 +1,35 @@
+"""Add covering index for channel message pagination
+
+Revision ID: d4e5f6a7b8c9
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d4e5f6a7b8c9"
+down_revision = "b2c3d4e5f6a7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination of channel timelines and threads
+    op.create_index(
+        "message_channel_parent_created_idx",
+        "message",
+        ["channel_id", "parent_id", "created_at"],
+    )
+    # Reply aggregates and grouped reactions are looked up per page
+    op.create_index("message_parent_id_idx", "message", ["parent_id"])
+    op.create_index(
+        "message_reaction_message_id_idx", "message_reaction", ["message_id"]
+    )
+
+
+def downgrade():
+    op.drop_index("message_reaction_message_id_idx", table_name="message_reaction")
+    op.drop_index("message_parent_id_idx", table_name="message")
+    op.drop_index("message_channel_parent_created_idx", table_name="message")
@@ -0,0 +1,75 @@
+"""Promote chat filter fields from meta to indexed columns
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e5f6a7b8c9d0"
+down_revision = "d4e5f6a7b8c9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    columns = {col["name"] for col in sa.inspect(conn).get_columns("chat")}
+
+    # group_id used to be added at startup only; the composite indexes need it
+    if "group_id" not in columns:
+        op.add_column("chat", sa.Column("group_id", sa.Text(), nullable=True))
+    if "model_name" not in columns:
+        op.add_column("chat", sa.Column("model_name", sa.Text(), nullable=True))
+    if "base_model_name" not in columns:
+        op.add_column("chat", sa.Column("base_model_name", sa.Text(), nullable=True))
+    if "num_of_messages" not in columns:
+        op.add_column("chat", sa.Column("num_of_messages", sa.Integer(), nullable=True))
+
+    # Backfill from meta in a single statement per dialect
+    if conn.dialect.name == "postgresql":
+        op.execute(
+            """
+            UPDATE chat SET
+                model_name = meta->>'model_name',
+                base_model_name = meta->>'base_model_name',
+                num_of_messages = CASE
+                    WHEN meta->>'num_of_messages' ~ '^[0-9]+$'
+                    THEN CAST(meta->>'num_of_messages' AS INTEGER)
+                END
+            WHERE meta IS NOT NULL
+            """
+        )
+    elif conn.dialect.name == "sqlite":
+        op.execute(
+            """
+            UPDATE chat SET
+                model_name = json_extract(meta, '$.model_name'),
+                base_model_name = json_extract(meta, '$.base_model_name'),
+                num_of_messages = CAST(json_extract(meta, '$.num_of_messages') AS INTEGER)
+            WHERE meta IS NOT NULL AND json_valid(meta)
+            """
+        )
+
+    op.create_index(
+        "chat_group_model_updated_idx",
+        "chat",
+        ["group_id", "model_name", "updated_at"],
+    )
+    op.create_index(
+        "chat_group_base_model_updated_idx",
+        "chat",
+        ["group_id", "base_model_name", "updated_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("chat_group_base_model_updated_idx", table_name="chat")
+    op.drop_index("chat_group_model_updated_idx", table_name="chat")
+    with op.batch_alter_table("chat") as batch_op:
+        batch_op.drop_column("num_of_messages")
+        batch_op.drop_column("base_model_name")
+        batch_op.drop_column("model_name")
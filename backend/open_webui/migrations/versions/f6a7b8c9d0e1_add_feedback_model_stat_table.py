@@ -0,0 +1,118 @@
+"""Add feedback_model_stat table for server-side leaderboards
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+import time
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, select, column
+
+revision = "f6a7b8c9d0e1"
+down_revision = "e5f6a7b8c9d0"
+branch_labels = None
+depends_on = None
+
+# Same Elo parameters as open_webui.models.feedbacks at the time of writing
+ELO_K = 32
+ELO_INITIAL_RATING = 1000.0
+
+
+def get_feedback_outcome(data):
+    if not data or not data.get("model_id"):
+        return None
+    rating = str(data.get("rating"))
+    if rating == "1":
+        return 1
+    if rating == "-1":
+        return 0
+    return None
+
+
+def replay_feedback(conn) -> dict:
+    """model_id -> [rating, won, lost] for all existing feedback, oldest first."""
+
+    def expected_score(rating_a, rating_b):
+        return 1 / (1 + 10 ** ((rating_b - rating_a) / 400))
+
+    feedback = table(
+        "feedback",
+        column("id", sa.Text()),
+        column("data", sa.JSON()),
+        column("created_at", sa.BigInteger()),
+    )
+    rows = conn.execute(
+        select(feedback.c.data).order_by(
+            feedback.c.created_at.asc(), feedback.c.id.asc()
+        )
+    )
+
+    stats = {}
+    for (data,) in rows:
+        outcome = get_feedback_outcome(data)
+        if outcome is None:
+            continue
+        model_a = data["model_id"]
+        for model_b in data.get("sibling_model_ids") or []:
+            stats_a = stats.setdefault(model_a, [ELO_INITIAL_RATING, 0, 0])
+            stats_b = stats.setdefault(model_b, [ELO_INITIAL_RATING, 0, 0])
+            change_a = ELO_K * (outcome - expected_score(stats_a[0], stats_b[0]))
+            change_b = ELO_K * ((1 - outcome) - expected_score(stats_b[0], stats_a[0]))
+
+            stats_a[0] += change_a
+            stats_b[0] += change_b
+            if outcome == 1:
+                stats_a[1] += 1
+                stats_b[2] += 1
+            else:
+                stats_a[2] += 1
+                stats_b[1] += 1
+    return stats
+
+
+def upgrade():
+    conn = op.get_bind()
+    if "feedback_model_stat" not in sa.inspect(conn).get_table_names():
+        op.create_table(
+            "feedback_model_stat",
+            sa.Column("model_id", sa.Text(), primary_key=True),
+            sa.Column("rating", sa.Float(), nullable=True),
+            sa.Column("won", sa.BigInteger(), nullable=True),
+            sa.Column("lost", sa.BigInteger(), nullable=True),
+            sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        )
+
+    feedback_model_stat = table(
+        "feedback_model_stat",
+        column("model_id", sa.Text()),
+        column("rating", sa.Float()),
+        column("won", sa.BigInteger()),
+        column("lost", sa.BigInteger()),
+        column("updated_at", sa.BigInteger()),
+    )
+    if conn.execute(select(feedback_model_stat.c.model_id).limit(1)).first():
+        return
+
+    # Feedback given before this table existed; afterwards rows are kept up
+    # to date as feedback is created, changed or deleted
+    now = int(time.time())
+    rows = [
+        {
+            "model_id": model_id,
+            "rating": rating,
+            "won": won,
+            "lost": lost,
+            "updated_at": now,
+        }
+        for model_id, (rating, won, lost) in replay_feedback(conn).items()
+    ]
+    if rows:
+        op.bulk_insert(feedback_model_stat, rows)
+
+
+def downgrade():
+    op.drop_table("feedback_model_stat")
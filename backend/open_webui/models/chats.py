@@ -9,7 +9,8 @@ from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, Index, Integer, String, Text, JSON
+from sqlalchemy.orm import validates
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -40,6 +41,38 @@ class Chat(Base):
     meta = Column(JSON, server_default="{}")
     folder_id = Column(Text, nullable=True)
 
+    # Copies of frequently filtered meta fields, so instructor dashboards can
+    # use indexes instead of evaluating JSON expressions on every row.
+    # Kept in sync whenever `meta` is assigned (see _sync_meta_columns).
+    model_name = Column(Text, nullable=True)
+    base_model_name = Column(Text, nullable=True)
+    num_of_messages = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("chat_group_model_updated_idx", "group_id", "model_name", "updated_at"),
+        Index(
+            "chat_group_base_model_updated_idx",
+            "group_id",
+            "base_model_name",
+            "updated_at",
+        ),
+    )
+
+    @validates("meta")
+    def _sync_meta_columns(self, key, meta):
+        meta = meta or {}
+        self.model_name = meta.get("model_name")
+        self.base_model_name = meta.get("base_model_name")
+        try:
+            self.num_of_messages = (
+                int(meta["num_of_messages"])
+                if meta.get("num_of_messages") is not None
+                else None
+            )
+        except (TypeError, ValueError):
+            self.num_of_messages = None
+        return meta
+
 
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -851,112 +884,84 @@ class ChatTable:
             log.debug(f"all_chats: {all_chats}")
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def _build_meta_filter_query(self, db, filters: dict):
+        """
+        Query for chats matching the instructor meta filters, or None when the
+        group is missing or does not exist.
+        """
+        query = db.query(Chat)
+        
+        # Filter by group_id FIRST (direct column filter)
+        if filters.get("group_id"):
+            # Validate that the group exists before proceeding
+            from open_webui.models.groups import Groups  # lazy import to avoid cycles
+            group = Groups.get_group_by_id(filters["group_id"])
+            if not group:
+                # Group doesn't exist, return empty result without processing other filters
+                log.debug(f"Group {filters['group_id']} not found, returning empty result")
+                return None
+            
+            query = query.filter_by(group_id=filters["group_id"])
+        else:
+            # No group id provided, return empty result without processing other filters
+            log.debug(f"group_id not provided")
+            return None
+            
+        
+        # Filter by user_ids
+        if filters.get("user_ids") and len(filters["user_ids"]) > 0:
+            query = query.filter(Chat.user_id.in_(filters["user_ids"]))
+        
+        # Filter by model_name / base_model_name / message count using the
+        # indexed columns mirrored from meta
+        if filters.get("model_name"):
+            query = query.filter(Chat.model_name == filters["model_name"])
+        
+        if filters.get("base_model_name"):
+            query = query.filter(Chat.base_model_name == filters["base_model_name"])
+        
+        if filters.get("min_messages") is not None:
+            query = query.filter(Chat.num_of_messages >= filters["min_messages"])
+        
+        if filters.get("max_messages") is not None and filters.get("max_messages") > 0:
+            query = query.filter(Chat.num_of_messages <= filters["max_messages"])
+        
+        # Filter by total time taken (stored as total_seconds)
+        if filters.get("min_time_taken") is not None:
+            if db.bind.dialect.name == "sqlite":
+                query = query.filter(
+                    text("CAST(json_extract(Chat.meta, '$.total_time_taken') AS REAL) >= :min_time_taken")
+                ).params(min_time_taken=filters["min_time_taken"])
+            elif db.bind.dialect.name == "postgresql":
+                query = query.filter(
+                    text("CAST(Chat.meta->>'total_time_taken' AS FLOAT) >= :min_time_taken")
+                ).params(min_time_taken=filters["min_time_taken"])
+            else:
+                raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
+        
+        if filters.get("max_time_taken") is not None and filters.get("max_time_taken") > 0:
+            if db.bind.dialect.name == "sqlite":
+                query = query.filter(
+                    text("CAST(json_extract(Chat.meta, '$.total_time_taken') AS REAL) <= :max_time_taken")
+                ).params(max_time_taken=filters["max_time_taken"])
+            elif db.bind.dialect.name == "postgresql":
+                query = query.filter(
+                    text("CAST(Chat.meta->>'total_time_taken' AS FLOAT) <= :max_time_taken")
+                ).params(max_time_taken=filters["max_time_taken"])
+            else:
+                raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
+        return query.order_by(Chat.updated_at.desc())
+
     def get_chats_by_user_id_and_meta_filter(
         self, filters: dict, skip: int = 0, limit: int = 50
     ) -> list[ChatModel]:
         try:
-            with get_db() as db:                
-                query = db.query(Chat)
-                
-                # Filter by group_id FIRST (direct column filter)
-                if filters.get("group_id"):
-                    # Validate that the group exists before proceeding
-                    from open_webui.models.groups import Groups  # lazy import to avoid cycles
-                    group = Groups.get_group_by_id(filters["group_id"])
-                    if not group:
-                        # Group doesn't exist, return empty result without processing other filters
-                        log.debug(f"Group {filters['group_id']} not found, returning empty result")
-                        return []
-                    
-                    query = query.filter_by(group_id=filters["group_id"])
-                else:
-                    # No group id provided, return empty result without processing other filters
-                    log.debug(f"group_id not provided")
+            with get_db() as db:
+                query = self._build_meta_filter_query(db, filters)
+                if query is None:
                     return []
-                    
-                
-                # Filter by user_ids
-                if filters.get("user_ids") and len(filters["user_ids"]) > 0:
-                    query = query.filter(Chat.user_id.in_(filters["user_ids"]))
-                
-                # Filter by model_name
-                if filters.get("model_name"):
-                    if db.bind.dialect.name == "sqlite":
-                        query = query.filter(
-                            text("json_extract(Chat.meta, '$.model_name') = :model_name")
-                        ).params(model_name=filters["model_name"])
-                    elif db.bind.dialect.name == "postgresql":
-                        query = query.filter(
-                            text("Chat.meta->>'model_name' = :model_name")
-                        ).params(model_name=filters["model_name"])
-                    else:
-                        raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
-                
-                # Filter by base_model_name
-                if filters.get("base_model_name"):
-                    if db.bind.dialect.name == "sqlite":
-                        query = query.filter(
-                            text("json_extract(Chat.meta, '$.base_model_name') = :base_model_name")
-                        ).params(base_model_name=filters["base_model_name"])
-                    elif db.bind.dialect.name == "postgresql":
-                        query = query.filter(
-                            text("Chat.meta->>'base_model_name' = :base_model_name")
-                        ).params(base_model_name=filters["base_model_name"])
-                    else:
-                        raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
-                
-                # Filter by number of messages
-                if filters.get("min_messages") is not None:
-                    if db.bind.dialect.name == "sqlite":
-                        query = query.filter(
-                            text("CAST(json_extract(Chat.meta, '$.num_of_messages') AS INTEGER) >= :min_messages")
-                        ).params(min_messages=filters["min_messages"])
-                    elif db.bind.dialect.name == "postgresql":
-                        query = query.filter(
-                            text("CAST(Chat.meta->>'num_of_messages' AS INTEGER) >= :min_messages")
-                        ).params(min_messages=filters["min_messages"])
-                    else:
-                        raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
-                
-                if filters.get("max_messages") is not None and filters.get("max_messages") > 0:
-                    if db.bind.dialect.name == "sqlite":
-                        query = query.filter(
-                            text("CAST(json_extract(Chat.meta, '$.num_of_messages') AS INTEGER) <= :max_messages")
-                        ).params(max_messages=filters["max_messages"])
-                    elif db.bind.dialect.name == "postgresql":
-                        query = query.filter(
-                            text("CAST(Chat.meta->>'num_of_messages' AS INTEGER) <= :max_messages")
-                        ).params(max_messages=filters["max_messages"])
-                    else:
-                        raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
-                
-                # Filter by total time taken (stored as total_seconds)
-                if filters.get("min_time_taken") is not None:
-                    if db.bind.dialect.name == "sqlite":
-                        query = query.filter(
-                            text("CAST(json_extract(Chat.meta, '$.total_time_taken') AS REAL) >= :min_time_taken")
-                        ).params(min_time_taken=filters["min_time_taken"])
-                    elif db.bind.dialect.name == "postgresql":
-                        query = query.filter(
-                            text("CAST(Chat.meta->>'total_time_taken' AS FLOAT) >= :min_time_taken")
-                        ).params(min_time_taken=filters["min_time_taken"])
-                    else:
-                        raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
-                
-                if filters.get("max_time_taken") is not None and filters.get("max_time_taken") > 0:
-                    if db.bind.dialect.name == "sqlite":
-                        query = query.filter(
-                            text("CAST(json_extract(Chat.meta, '$.total_time_taken') AS REAL) <= :max_time_taken")
-                        ).params(max_time_taken=filters["max_time_taken"])
-                    elif db.bind.dialect.name == "postgresql":
-                        query = query.filter(
-                            text("CAST(Chat.meta->>'total_time_taken' AS FLOAT) <= :max_time_taken")
-                        ).params(max_time_taken=filters["max_time_taken"])
-                    else:
-                        raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
-                
-                # Apply pagination and ordering
-                query = query.order_by(Chat.updated_at.desc())
+
+                # Apply pagination
                 if skip is not None and skip > 0:
                     query = query.offset(skip)
                 if limit is not None and limit > 0:
@@ -969,6 +974,40 @@ class ChatTable:
             log.exception(f"Error filtering chats by meta: {e}")
             return []
 
+    def iter_chats_by_meta_filter(
+        self, filters: dict, skip: int = 0, limit: int = 0, batch_size: int = 100
+    ):
+        """
+        Same selection as get_chats_by_user_id_and_meta_filter, but yields chats
+        one at a time from a server-side cursor so exports keep memory flat.
+        """
+        with get_db() as db:
+            query = self._build_meta_filter_query(db, filters)
+            if query is None:
+                return
+            if skip is not None and skip > 0:
+                query = query.offset(skip)
+            if limit is not None and limit > 0:
+                query = query.limit(limit)
+            for chat in query.execution_options(stream_results=True).yield_per(batch_size):
+                yield ChatModel.model_validate(chat)
+
+    def iter_chats_by_ids_and_group_id(
+        self, chat_ids: list[str], group_id: str, batch_size: int = 100
+    ):
+        """Streaming counterpart of get_chats_by_ids_and_group_id."""
+        if not chat_ids:
+            return
+        with get_db() as db:
+            query = (
+                db.query(Chat)
+                .filter(Chat.id.in_(chat_ids))
+                .filter_by(group_id=group_id)
+                .order_by(Chat.updated_at.desc())
+            )
+            for chat in query.execution_options(stream_results=True).yield_per(batch_size):
+                yield ChatModel.model_validate(chat)
+
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
     ) -> Optional[ChatModel]:
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import time
+from array import array
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import (
+    EMBEDDING_CACHE_MAX_AGE_DAYS,
+    EMBEDDING_CACHE_MAX_ROWS,
+    SRC_LOG_LEVELS,
+)
+from sqlalchemy import BigInteger, Column, Integer, LargeBinary, Text
+from sqlalchemy.exc import IntegrityError
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+####################
+# Embedding Cache DB Schema
+####################
+
+
+class EmbeddingCache(Base):
+    __tablename__ = "embedding_cache"
+
+    # sha256 of engine, model and chunk text
+    id = Column(Text, primary_key=True)
+    engine = Column(Text)
+    model = Column(Text)
+    dimensions = Column(Integer)
+    # float32 values, the precision vector stores keep anyway
+    vector = Column(LargeBinary)
+    created_at = Column(BigInteger, index=True)
+
+
+def get_embedding_cache_key(engine: str, model: str, text: str) -> str:
+    return hashlib.sha256(f"{engine}\n{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCacheTable:
+    # Keep IN lists well below database parameter limits
+    BATCH_SIZE = 500
+    # Seconds between prunes in this process
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self):
+        self._last_pruned = 0.0
+
+    def get_embeddings(
+        self, engine: str, model: str, texts: list[str]
+    ) -> dict[str, list[float]]:
+        """Cached vectors for `texts`, keyed by text. Misses are left out."""
+        keys = {get_embedding_cache_key(engine, model, text): text for text in texts}
+        found = {}
+        try:
+            with get_db() as db:
+                ids = list(keys)
+                for i in range(0, len(ids), self.BATCH_SIZE):
+                    rows = (
+                        db.query(EmbeddingCache.id, EmbeddingCache.vector)
+                        .filter(EmbeddingCache.id.in_(ids[i : i + self.BATCH_SIZE]))
+                        .all()
+                    )
+                    for id, vector in rows:
+                        found[keys[id]] = array("f", vector).tolist()
+        except Exception as e:
+            # The cache is an optimization; a failed lookup just means re-embedding
+            log.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+        return found
+
+    def insert_embeddings(
+        self, engine: str, model: str, embeddings: dict[str, list[float]]
+    ) -> int:
+        """Store new vectors, keyed by text. Returns how many rows were added."""
+        rows = {
+            get_embedding_cache_key(engine, model, text): vector
+            for text, vector in embeddings.items()
+        }
+        if not rows:
+            return 0
+
+        now = int(time.time())
+        try:
+            with get_db() as db:
+                ids = list(rows)
+                existing = set()
+                for i in range(0, len(ids), self.BATCH_SIZE):
+                    existing.update(
+                        id
+                        for (id,) in db.query(EmbeddingCache.id).filter(
+                            EmbeddingCache.id.in_(ids[i : i + self.BATCH_SIZE])
+                        )
+                    )
+
+                new_rows = [
+                    EmbeddingCache(
+                        id=id,
+                        engine=engine,
+                        model=model,
+                        dimensions=len(vector),
+                        vector=array("f", vector).tobytes(),
+                        created_at=now,
+                    )
+                    for id, vector in rows.items()
+                    if id not in existing
+                ]
+                db.add_all(new_rows)
+                db.commit()
+        except IntegrityError:
+            # Another worker cached the same chunks first
+            return 0
+        except Exception as e:
+            log.warning(f"Embedding cache insert failed: {e}")
+            return 0
+
+        if time.monotonic() - self._last_pruned > self.PRUNE_INTERVAL:
+            self._last_pruned = time.monotonic()
+            try:
+                self.prune_embeddings()
+            except Exception as e:
+                log.warning(f"Embedding cache prune failed: {e}")
+        return len(new_rows)
+
+    def prune_embeddings(
+        self,
+        max_age_days: int = EMBEDDING_CACHE_MAX_AGE_DAYS,
+        max_rows: int = EMBEDDING_CACHE_MAX_ROWS,
+    ) -> int:
+        """
+        Drop vectors older than `max_age_days`, then the oldest beyond
+        `max_rows`. Vectors of models no longer in use age out this way too.
+        """
+        deleted = 0
+        with get_db() as db:
+            if max_age_days:
+                cutoff = int(time.time()) - max_age_days * 86400
+                deleted += (
+                    db.query(EmbeddingCache)
+                    .filter(EmbeddingCache.created_at < cutoff)
+                    .delete(synchronize_session=False)
+                )
+            if max_rows:
+                # created_at of the newest row over the limit
+                row = (
+                    db.query(EmbeddingCache.created_at)
+                    .order_by(EmbeddingCache.created_at.desc())
+                    .offset(max_rows)
+                    .first()
+                )
+                if row is not None:
+                    deleted += (
+                        db.query(EmbeddingCache)
+                        .filter(EmbeddingCache.created_at <= row.created_at)
+                        .delete(synchronize_session=False)
+                    )
+            db.commit()
+
+        if deleted:
+            log.info(f"Pruned {deleted} cached embeddings")
+        return deleted
+
+
+EmbeddingCaches = EmbeddingCacheTable()
@@ -8,7 +8,7 @@ from open_webui.models.chats import Chats
 
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Float, Text, JSON, Boolean, cast, text
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -32,6 +32,17 @@ class Feedback(Base):
     updated_at = Column(BigInteger)
 
 
+class FeedbackModelStat(Base):
+    """Leaderboard row per model, maintained as feedback is created, changed or deleted."""
+
+    __tablename__ = "feedback_model_stat"
+    model_id = Column(Text, primary_key=True)
+    rating = Column(Float)
+    won = Column(BigInteger, default=0)
+    lost = Column(BigInteger, default=0)
+    updated_at = Column(BigInteger)
+
+
 class FeedbackModel(BaseModel):
     id: str
     user_id: str
@@ -46,6 +57,16 @@ class FeedbackModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class FeedbackModelStatModel(BaseModel):
+    model_id: str
+    rating: float
+    won: int
+    lost: int
+    updated_at: int
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+
 ####################
 # Forms
 ####################
@@ -92,6 +113,217 @@ class FeedbackForm(BaseModel):
     model_config = ConfigDict(extra="allow")
 
 
+####################
+# Elo rating
+####################
+
+ELO_K = 32
+ELO_INITIAL_RATING = 1000.0
+
+
+def get_feedback_outcome(data: Optional[dict]) -> Optional[int]:
+    """1 if the rated model won, 0 if it lost, None if the feedback doesn't count."""
+    if not data or not data.get("model_id"):
+        return None
+    rating = str(data.get("rating"))
+    if rating == "1":
+        return 1
+    if rating == "-1":
+        return 0
+    return None
+
+
+def get_feedback_rating_key(data: Optional[dict]) -> tuple:
+    """The fields of a feedback that affect the leaderboard."""
+    data = data or {}
+    return (
+        get_feedback_outcome(data),
+        data.get("model_id"),
+        tuple(data.get("sibling_model_ids") or []),
+    )
+
+
+def apply_feedback_to_stats(
+    stats: dict, data: Optional[dict], weight: float = 1.0
+) -> set[str]:
+    """
+    Apply one feedback to `stats` (model_id -> [rating, won, lost]) in place,
+    with the same Elo update the leaderboard used to compute in the browser.
+    `weight` scales the rating change (the result still counts as a win or
+    loss). Returns the ids of the models that changed.
+    """
+    outcome = get_feedback_outcome(data)
+    if outcome is None:
+        return set()
+
+    def expected_score(rating_a: float, rating_b: float) -> float:
+        return 1 / (1 + 10 ** ((rating_b - rating_a) / 400))
+
+    model_a = data["model_id"]
+    changed = set()
+    for model_b in data.get("sibling_model_ids") or []:
+        stats_a = stats.setdefault(model_a, [ELO_INITIAL_RATING, 0, 0])
+        stats_b = stats.setdefault(model_b, [ELO_INITIAL_RATING, 0, 0])
+        change_a = ELO_K * (outcome - expected_score(stats_a[0], stats_b[0])) * weight
+        change_b = (
+            ELO_K * ((1 - outcome) - expected_score(stats_b[0], stats_a[0])) * weight
+        )
+
+        stats_a[0] += change_a
+        stats_b[0] += change_b
+        if outcome == 1:
+            stats_a[1] += 1
+            stats_b[2] += 1
+        else:
+            stats_a[2] += 1
+            stats_b[1] += 1
+        changed.update((model_a, model_b))
+    return changed
+
+
+class FeedbackStatsTable:
+    def _lock(self, db):
+        """
+        Serialize writers of the leaderboard until the caller's transaction
+        ends; readers are not blocked. A rebuild then sees every feedback
+        committed before it, and two feedbacks for a new model can't both
+        insert its row. SQLite already allows only one writer at a time.
+        """
+        if db.bind.dialect.name == "postgresql":
+            db.execute(
+                text("LOCK TABLE feedback_model_stat IN SHARE ROW EXCLUSIVE MODE")
+            )
+
+    def apply_feedback(self, db, data: Optional[dict]):
+        """Incrementally apply a new feedback inside the caller's transaction."""
+        outcome = get_feedback_outcome(data)
+        if outcome is None or not data.get("sibling_model_ids"):
+            return
+
+        self._lock(db)
+        model_ids = sorted({data["model_id"], *data["sibling_model_ids"]})
+        rows = {
+            row.model_id: row
+            for row in db.query(FeedbackModelStat).filter(
+                FeedbackModelStat.model_id.in_(model_ids)
+            )
+        }
+        stats = {
+            model_id: [row.rating, row.won, row.lost] for model_id, row in rows.items()
+        }
+        changed = apply_feedback_to_stats(stats, data)
+
+        now = int(time.time())
+        for model_id in changed:
+            rating, won, lost = stats[model_id]
+            row = rows.get(model_id)
+            if row is None:
+                db.add(
+                    FeedbackModelStat(
+                        model_id=model_id,
+                        rating=rating,
+                        won=won,
+                        lost=lost,
+                        updated_at=now,
+                    )
+                )
+            else:
+                row.rating, row.won, row.lost, row.updated_at = rating, won, lost, now
+
+    def rebuild(self, db, batch_size: int = 500) -> int:
+        """
+        Replay all feedback in creation order inside the caller's transaction,
+        so the stats commit (or roll back) together with the feedback change.
+        Needed when a past feedback changes, since Elo depends on the order
+        ratings were given. Only the rating data is read, never snapshots.
+        """
+        self._lock(db)
+        stats: dict = {}
+        query = (
+            db.query(Feedback.data)
+            .order_by(Feedback.created_at.asc(), Feedback.id.asc())
+            .yield_per(batch_size)
+        )
+        for (data,) in query:
+            apply_feedback_to_stats(stats, data)
+
+        now = int(time.time())
+        db.query(FeedbackModelStat).delete()
+        db.add_all(
+            FeedbackModelStat(
+                model_id=model_id,
+                rating=rating,
+                won=won,
+                lost=lost,
+                updated_at=now,
+            )
+            for model_id, (rating, won, lost) in stats.items()
+        )
+        log.info(f"Rebuilt feedback leaderboard for {len(stats)} models")
+        return len(stats)
+
+    def get_model_stats(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        model_ids: Optional[list[str]] = None,
+    ) -> tuple[list[FeedbackModelStatModel], int]:
+        with get_db() as db:
+            query = db.query(FeedbackModelStat)
+            if model_ids:
+                query = query.filter(FeedbackModelStat.model_id.in_(model_ids))
+            total = query.count()
+            query = query.order_by(
+                FeedbackModelStat.rating.desc(), FeedbackModelStat.model_id.asc()
+            ).offset(skip)
+            if limit:
+                query = query.limit(limit)
+            return [FeedbackModelStatModel.model_validate(row) for row in query], total
+
+    def get_topic_model_stats(
+        self, tag_weights: dict[str, float], batch_size: int = 500
+    ) -> list[FeedbackModelStatModel]:
+        """
+        Replay all feedback like rebuild, weighting each one by the highest
+        weight among its tags (0 for untagged feedback), without storing the
+        result. Used to re-rank the leaderboard by topic similarity.
+        """
+        stats: dict = {}
+        with get_db() as db:
+            query = (
+                db.query(Feedback.data)
+                .order_by(Feedback.created_at.asc(), Feedback.id.asc())
+                .yield_per(batch_size)
+            )
+            for (data,) in query:
+                weight = max(
+                    (
+                        tag_weights.get(tag, 0.0)
+                        for tag in (data or {}).get("tags") or []
+                    ),
+                    default=0.0,
+                )
+                apply_feedback_to_stats(stats, data, weight)
+
+        now = int(time.time())
+        return sorted(
+            (
+                FeedbackModelStatModel(
+                    model_id=model_id,
+                    rating=rating,
+                    won=won,
+                    lost=lost,
+                    updated_at=now,
+                )
+                for model_id, (rating, won, lost) in stats.items()
+            ),
+            key=lambda item: (-item.rating, item.model_id),
+        )
+
+
+FeedbackStats = FeedbackStatsTable()
+
+
 class FeedbackTable:
     def insert_new_feedback(
         self, user_id: str, form_data: FeedbackForm
@@ -111,6 +343,7 @@ class FeedbackTable:
             try:
                 result = Feedback(**feedback.model_dump())
                 db.add(result)
+                FeedbackStats.apply_feedback(db, feedback.data)
                 db.commit()
                 db.refresh(result)
                 if result:
@@ -152,6 +385,51 @@ class FeedbackTable:
                 .all()
             ]
 
+    def get_feedbacks(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        model_id: Optional[str] = None,
+        rating: Optional[str] = None,
+    ) -> tuple[list[FeedbackModel], int]:
+        """One page of feedback, newest first, without the chat snapshots."""
+        with get_db() as db:
+            query = db.query(Feedback)
+            if model_id:
+                query = query.filter(Feedback.data["model_id"].as_string() == model_id)
+            if rating:
+                # Ratings are stored as either ints or strings
+                query = query.filter(
+                    cast(Feedback.data["rating"].as_string(), Text) == str(rating)
+                )
+            total = query.count()
+
+            query = (
+                query.with_entities(
+                    Feedback.id,
+                    Feedback.user_id,
+                    Feedback.version,
+                    Feedback.type,
+                    Feedback.data,
+                    Feedback.meta,
+                    Feedback.created_at,
+                    Feedback.updated_at,
+                )
+                .order_by(Feedback.updated_at.desc())
+                .offset(skip)
+            )
+            if limit:
+                query = query.limit(limit)
+            return [FeedbackModel.model_validate(row) for row in query], total
+
+    def get_feedback_tags(self, batch_size: int = 500) -> list[str]:
+        """Distinct tags across all feedback, for topic re-ranking."""
+        tags = set()
+        with get_db() as db:
+            for (data,) in db.query(Feedback.data).yield_per(batch_size):
+                tags.update((data or {}).get("tags") or [])
+        return sorted(tags)
+
     def get_feedbacks_by_type(self, type: str) -> list[FeedbackModel]:
         with get_db() as db:
             return [
@@ -180,6 +458,7 @@ class FeedbackTable:
             if not feedback:
                 return None
 
+            rating_key = get_feedback_rating_key(feedback.data)
             if form_data.data:
                 feedback.data = form_data.data.model_dump()
             if form_data.meta:
@@ -189,6 +468,9 @@ class FeedbackTable:
 
             feedback.updated_at = int(time.time())
 
+            if get_feedback_rating_key(feedback.data) != rating_key:
+                db.flush()
+                FeedbackStats.rebuild(db)
             db.commit()
             return FeedbackModel.model_validate(feedback)
 
@@ -200,6 +482,7 @@ class FeedbackTable:
             if not feedback:
                 return None
 
+            rating_key = get_feedback_rating_key(feedback.data)
             if form_data.data:
                 feedback.data = form_data.data.model_dump()
             if form_data.meta:
@@ -209,6 +492,9 @@ class FeedbackTable:
 
             feedback.updated_at = int(time.time())
 
+            if get_feedback_rating_key(feedback.data) != rating_key:
+                db.flush()
+                FeedbackStats.rebuild(db)
             db.commit()
             return FeedbackModel.model_validate(feedback)
 
@@ -217,28 +503,43 @@ class FeedbackTable:
             feedback = db.query(Feedback).filter_by(id=id).first()
             if not feedback:
                 return False
+            counted = get_feedback_outcome(feedback.data) is not None
             db.delete(feedback)
+            if counted:
+                db.flush()
+                FeedbackStats.rebuild(db)
             db.commit()
-            return True
+        return True
 
     def delete_feedback_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         with get_db() as db:
             feedback = db.query(Feedback).filter_by(id=id, user_id=user_id).first()
             if not feedback:
                 return False
+            counted = get_feedback_outcome(feedback.data) is not None
             db.delete(feedback)
+            if counted:
+                db.flush()
+                FeedbackStats.rebuild(db)
             db.commit()
-            return True
+        return True
 
     def delete_feedbacks_by_user_id(self, user_id: str) -> bool:
         with get_db() as db:
             feedbacks = db.query(Feedback).filter_by(user_id=user_id).all()
             if not feedbacks:
                 return False
+            counted = any(
+                get_feedback_outcome(feedback.data) is not None
+                for feedback in feedbacks
+            )
             for feedback in feedbacks:
                 db.delete(feedback)
+            if counted:
+                db.flush()
+                FeedbackStats.rebuild(db)
             db.commit()
-            return True
+        return True
 
     def delete_all_feedbacks(self) -> bool:
         with get_db() as db:
@@ -247,6 +548,8 @@ class FeedbackTable:
                 return False
             for feedback in feedbacks:
                 db.delete(feedback)
+            FeedbackStats._lock(db)
+            db.query(FeedbackModelStat).delete()
             db.commit()
             return True
 
@@ -20,6 +20,8 @@ class File(Base):
     id = Column(String, primary_key=True)
     user_id = Column(String)
     hash = Column(Text, nullable=True)
+    # sha256 of the uploaded bytes, `hash` is of the extracted text
+    content_hash = Column(Text, nullable=True, index=True)
 
     filename = Column(Text)
     path = Column(Text, nullable=True)
@@ -39,6 +41,7 @@ class FileModel(BaseModel):
     id: str
     user_id: str
     hash: Optional[str] = None
+    content_hash: Optional[str] = None
 
     filename: str
     path: Optional[str] = None
@@ -90,6 +93,7 @@ class FileMetadataResponse(BaseModel):
 class FileForm(BaseModel):
     id: str
     hash: Optional[str] = None
+    content_hash: Optional[str] = None
     filename: str
     path: str
     data: dict = {}
@@ -130,6 +134,30 @@ class FilesTable:
             except Exception:
                 return None
 
+    def get_processed_file_by_content_hash(
+        self, content_hash: str, processing_signature: str, exclude_id: str
+    ) -> Optional[FileModel]:
+        """
+        Most recent completed upload with the same bytes, processed with the
+        same extraction, chunking and embedding settings.
+        """
+        with get_db() as db:
+            files = (
+                db.query(File)
+                .filter(File.content_hash == content_hash, File.id != exclude_id)
+                .order_by(File.created_at.desc())
+                .limit(20)
+                .all()
+            )
+            for file in files:
+                meta = file.meta or {}
+                if (
+                    meta.get("processing_status") == "completed"
+                    and meta.get("processing_signature") == processing_signature
+                ):
+                    return FileModel.model_validate(file)
+            return None
+
     def get_file_metadata_by_id(self, id: str) -> Optional[FileMetadataResponse]:
         with get_db() as db:
             try:
@@ -247,10 +247,10 @@ class GroupTable:
                 cache.invalidate_group_admin_config(id)
                 cache.invalidate_group_members(id)
                 
-                # If permissions changed, invalidate permissions for all members
+                # If permissions changed, invalidate effective permissions in one step
+                # (also covers members whose group list was cached before they joined)
                 if old_group and old_group.permissions != new_group.permissions:
-                    for user_id in old_user_ids:
-                        cache.invalidate_user_permissions(user_id)
+                    cache.bump_permissions_version()
                 
                 # If members changed, invalidate cache only for users whose membership changed
                 # not all group members
@@ -8,7 +8,7 @@ from open_webui.models.tags import TagModel, Tag, Tags
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -19,6 +19,8 @@ from sqlalchemy.sql import exists
 
 class MessageReaction(Base):
     __tablename__ = "message_reaction"
+    __table_args__ = (Index("message_reaction_message_id_idx", "message_id"),)
+
     id = Column(Text, primary_key=True)
     user_id = Column(Text)
     message_id = Column(Text)
@@ -38,6 +40,17 @@ class MessageReactionModel(BaseModel):
 
 class Message(Base):
     __tablename__ = "message"
+    __table_args__ = (
+        # Covers keyset pagination of channel timelines and threads
+        Index(
+            "message_channel_parent_created_idx",
+            "channel_id",
+            "parent_id",
+            "created_at",
+        ),
+        Index("message_parent_id_idx", "parent_id"),
+    )
+
     id = Column(Text, primary_key=True)
 
     user_id = Column(Text)
@@ -129,13 +142,13 @@ class MessageTable:
                 return None
 
             reactions = self.get_reactions_by_message_id(id)
-            replies = self.get_replies_by_message_id(id)
+            stats = self.get_reply_stats_by_message_ids([id]).get(id, {})
 
             return MessageResponse(
                 **{
                     **MessageModel.model_validate(message).model_dump(),
-                    "latest_reply_at": replies[0].created_at if replies else None,
-                    "reply_count": len(replies),
+                    "latest_reply_at": stats.get("latest_reply_at"),
+                    "reply_count": stats.get("reply_count", 0),
                     "reactions": reactions,
                 }
             )
@@ -150,6 +163,27 @@ class MessageTable:
             )
             return [MessageModel.model_validate(message) for message in all_messages]
 
+    def get_reply_stats_by_message_ids(self, ids: list[str]) -> dict[str, dict]:
+        """Return reply_count and latest_reply_at for each message id in one query."""
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            rows = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
+                )
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+                .all()
+            )
+            return {
+                parent_id: {"reply_count": count, "latest_reply_at": latest}
+                for parent_id, count, latest in rows
+            }
+
     def get_reply_user_ids_by_message_id(self, id: str) -> list[str]:
         with get_db() as db:
             return [
@@ -157,22 +191,58 @@ class MessageTable:
                 for message in db.query(Message).filter_by(parent_id=id).all()
             ]
 
+    def _paginate(
+        self,
+        query,
+        skip: int = 0,
+        limit: int = 50,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> list[Message]:
+        # Keyset pagination on created_at; always returns newest first.
+        if before is not None:
+            query = query.filter(Message.created_at < before)
+
+        if after is not None:
+            messages = (
+                query.filter(Message.created_at > after)
+                .order_by(Message.created_at.asc())
+                .limit(limit)
+                .all()
+            )
+            return list(reversed(messages))
+
+        query = query.order_by(Message.created_at.desc())
+        if before is None and skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+
     def get_messages_by_channel_id(
-        self, channel_id: str, skip: int = 0, limit: int = 50
+        self,
+        channel_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
     ) -> list[MessageModel]:
         with get_db() as db:
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+            all_messages = self._paginate(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=None),
+                skip,
+                limit,
+                before,
+                after,
             )
             return [MessageModel.model_validate(message) for message in all_messages]
 
     def get_messages_by_parent_id(
-        self, channel_id: str, parent_id: str, skip: int = 0, limit: int = 50
+        self,
+        channel_id: str,
+        parent_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
     ) -> list[MessageModel]:
         with get_db() as db:
             message = db.get(Message, parent_id)
@@ -180,17 +250,17 @@ class MessageTable:
             if not message:
                 return []
 
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=parent_id)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+            all_messages = self._paginate(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=parent_id),
+                skip,
+                limit,
+                before,
+                after,
             )
 
             # If length of all_messages is less than limit, then add the parent message
-            if len(all_messages) < limit:
+            # (only when paging backwards, since the parent is the oldest entry)
+            if len(all_messages) < limit and after is None:
                 all_messages.append(message)
 
             return [MessageModel.model_validate(message) for message in all_messages]
@@ -243,6 +313,38 @@ class MessageTable:
 
             return [Reactions(**reaction) for reaction in reactions.values()]
 
+    def get_reactions_by_message_ids(
+        self, ids: list[str]
+    ) -> dict[str, list[Reactions]]:
+        """Group reactions for many messages with a single query."""
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            all_reactions = (
+                db.query(MessageReaction)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at.asc())
+                .all()
+            )
+
+            grouped = {}
+            for reaction in all_reactions:
+                reactions = grouped.setdefault(reaction.message_id, {})
+                if reaction.name not in reactions:
+                    reactions[reaction.name] = {
+                        "name": reaction.name,
+                        "user_ids": [],
+                        "count": 0,
+                    }
+                reactions[reaction.name]["user_ids"].append(reaction.user_id)
+                reactions[reaction.name]["count"] += 1
+
+            return {
+                message_id: [Reactions(**reaction) for reaction in reactions.values()]
+                for message_id, reactions in grouped.items()
+            }
+
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str
     ) -> bool:
@@ -113,6 +113,12 @@ class ToolValves(BaseModel):
     valves: Optional[dict] = None
 
 
+class ToolVersionModel(BaseModel):
+    id: str
+    valves: dict = {}
+    updated_at: int  # timestamp in epoch
+
+
 class ToolsTable:
     def insert_new_tool(
         self, user_id: str, user_email: str, form_data: ToolForm, specs: list[dict]
@@ -218,6 +224,29 @@ class ToolsTable:
             log.exception(f"Error getting tool valves by id {id}: {e}")
             return None
 
+    def get_tool_versions_by_ids(self, ids: list[str]) -> dict[str, ToolVersionModel]:
+        """Valves and version of several tools in one query, without loading their source."""
+        if not ids:
+            return {}
+        try:
+            with get_db() as db:
+                rows = (
+                    db.query(Tool.id, Tool.valves, Tool.updated_at)
+                    .filter(Tool.id.in_(ids))
+                    .all()
+                )
+                return {
+                    row.id: ToolVersionModel(
+                        id=row.id,
+                        valves=row.valves or {},
+                        updated_at=row.updated_at or 0,
+                    )
+                    for row in rows
+                }
+        except Exception as e:
+            log.exception(f"Error getting tool versions by ids {ids}: {e}")
+            return {}
+
     def update_tool_valves_by_id(self, id: str, valves: dict) -> Optional[ToolValves]:
         try:
             with get_db() as db:
@@ -5,8 +5,11 @@ from sqlalchemy import (
     column,
     create_engine,
     Column,
+    ForeignKey,
     Integer,
+    literal,
     MetaData,
+    or_,
     select,
     text,
     Text,
@@ -17,7 +20,7 @@ from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import JSONB, array, insert
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
@@ -44,6 +47,23 @@ class DocumentChunk(Base):
     vmetadata = Column(MutableDict.as_mutable(JSONB), nullable=True)
 
 
+class DocumentChunkMembership(Base):
+    """
+    Puts a chunk owned by one collection (usually `file-{id}`) into another,
+    e.g. a knowledge base, without copying its text or vector.
+    """
+
+    __tablename__ = "document_chunk_membership"
+
+    collection_name = Column(Text, primary_key=True)
+    chunk_id = Column(
+        Text,
+        ForeignKey("document_chunk.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
 class PgvectorClient:
     def __init__(self) -> None:
         log.info("[PGVECTOR] init START | use_existing_db=%s", not PGVECTOR_DB_URL)
@@ -129,6 +149,17 @@ class PgvectorClient:
                 "The 'vector' column does not exist in the 'document_chunk' table."
             )
 
+    def _in_collection(self, collection_name: str):
+        """Chunks owned by the collection or shared into it."""
+        return or_(
+            DocumentChunk.collection_name == collection_name,
+            DocumentChunk.id.in_(
+                select(DocumentChunkMembership.chunk_id).where(
+                    DocumentChunkMembership.collection_name == collection_name
+                )
+            ),
+        )
+
     def adjust_vector_length(self, vector: List[float]) -> List[float]:
         # Adjust vector to have length VECTOR_LENGTH
         current_length = len(vector)
@@ -236,7 +267,7 @@ class PgvectorClient:
                         DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)
                     ).label("distance"),
                 )
-                .where(DocumentChunk.collection_name == collection_name)
+                .where(self._in_collection(collection_name))
                 .order_by(
                     (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
                 )
@@ -302,7 +333,7 @@ class PgvectorClient:
         log.info("[PGVECTOR] query START | collection=%s | filter=%s | limit=%s", collection_name, filter, limit)
         try:
             query = self.session.query(DocumentChunk).filter(
-                DocumentChunk.collection_name == collection_name
+                self._in_collection(collection_name)
             )
 
             for key, value in filter.items():
@@ -341,7 +372,7 @@ class PgvectorClient:
         log.info("[PGVECTOR] get START | collection=%s | limit=%s", collection_name, limit)
         try:
             query = self.session.query(DocumentChunk).filter(
-                DocumentChunk.collection_name == collection_name
+                self._in_collection(collection_name)
             )
             if limit is not None:
                 query = query.limit(limit)
@@ -374,27 +405,76 @@ class PgvectorClient:
     ) -> None:
         log.info("[PGVECTOR] delete START | collection=%s | ids_count=%s | filter=%s", collection_name, len(ids) if ids else 0, filter)
         try:
-            query = self.session.query(DocumentChunk).filter(
-                DocumentChunk.collection_name == collection_name
-            )
+            conditions = []
             if ids:
-                query = query.filter(DocumentChunk.id.in_(ids))
+                conditions.append(DocumentChunk.id.in_(ids))
             if filter:
                 for key, value in filter.items():
-                    query = query.filter(
-                        DocumentChunk.vmetadata[key].astext == str(value)
+                    conditions.append(DocumentChunk.vmetadata[key].astext == str(value))
+
+            # Shared chunks only leave this collection; their owner keeps them
+            memberships = self.session.query(DocumentChunkMembership).filter(
+                DocumentChunkMembership.collection_name == collection_name
+            )
+            if conditions:
+                memberships = memberships.filter(
+                    DocumentChunkMembership.chunk_id.in_(
+                        select(DocumentChunk.id).where(*conditions)
                     )
-            deleted = query.delete(synchronize_session=False)
+                )
+            unlinked = memberships.delete(synchronize_session=False)
+
+            # Deleting owned chunks cascades to their memberships elsewhere
+            deleted = (
+                self.session.query(DocumentChunk)
+                .filter(DocumentChunk.collection_name == collection_name, *conditions)
+                .delete(synchronize_session=False)
+            )
             self.session.commit()
-            log.info("[PGVECTOR] delete SUCCESS | collection=%s | deleted=%s", collection_name, deleted)
+            log.info("[PGVECTOR] delete SUCCESS | collection=%s | deleted=%s | unlinked=%s", collection_name, deleted, unlinked)
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during delete: {e}")
             raise
 
+    def add_to_collection(
+        self,
+        collection_name: str,
+        source_collection_name: str,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Share the chunks owned by `source_collection_name` with `collection_name`.
+        Only membership rows are written; text and vectors stay stored once.
+        """
+        log.info("[PGVECTOR] add_to_collection START | collection=%s | source=%s | filter=%s", collection_name, source_collection_name, filter)
+        try:
+            chunks = select(literal(collection_name), DocumentChunk.id).where(
+                DocumentChunk.collection_name == source_collection_name
+            )
+            if filter:
+                for key, value in filter.items():
+                    chunks = chunks.where(
+                        DocumentChunk.vmetadata[key].astext == str(value)
+                    )
+
+            result = self.session.execute(
+                insert(DocumentChunkMembership)
+                .from_select(["collection_name", "chunk_id"], chunks)
+                .on_conflict_do_nothing()
+            )
+            self.session.commit()
+            log.info("[PGVECTOR] add_to_collection SUCCESS | collection=%s | linked=%s", collection_name, result.rowcount)
+            return result.rowcount
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during add_to_collection: {e}")
+            raise
+
     def reset(self) -> None:
         log.info("[PGVECTOR] reset START")
         try:
+            self.session.query(DocumentChunkMembership).delete()
             deleted = self.session.query(DocumentChunk).delete()
             self.session.commit()
             log.info("[PGVECTOR] reset SUCCESS | deleted=%s", deleted)
@@ -410,8 +490,8 @@ class PgvectorClient:
         log.info("[PGVECTOR] has_collection START | collection=%s", collection_name)
         try:
             exists = (
-                self.session.query(DocumentChunk)
-                .filter(DocumentChunk.collection_name == collection_name)
+                self.session.query(DocumentChunk.id)
+                .filter(self._in_collection(collection_name))
                 .first()
                 is not None
             )
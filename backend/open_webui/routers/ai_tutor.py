@@ -1,10 +1,19 @@
+import asyncio
 import logging
+from typing import Optional
 
-import requests
+import aiohttp
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import Response
-
-from open_webui.env import AI_TUTOR_API_BASE_URL, SRC_LOG_LEVELS
+from fastapi.responses import StreamingResponse
+
+from open_webui.env import (
+    AI_TUTOR_API_BASE_URL,
+    AI_TUTOR_PROXY_CONNECT_TIMEOUT,
+    AI_TUTOR_PROXY_POOL_SIZE,
+    AI_TUTOR_PROXY_READ_TIMEOUT,
+    AI_TUTOR_PROXY_ROUTE_TIMEOUTS,
+    SRC_LOG_LEVELS,
+)
 from open_webui.utils.auth import get_verified_user
 from open_webui.utils.super_admin import is_super_admin
 from open_webui.constants import ERROR_MESSAGES
@@ -78,13 +87,56 @@ FORWARDED_HEADER_ALLOWLIST = {
 }
 
 RESPONSE_HEADER_BLOCKLIST = {
-    "content-encoding",
     "content-length",
     "connection",
     "transfer-encoding",
 }
 
 
+# Shared keep-alive session for upstream requests (created lazily on the running loop)
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=AI_TUTOR_PROXY_POOL_SIZE, keepalive_timeout=30
+            ),
+            # Responses are passed through as-is, so keep upstream encoding untouched
+            auto_decompress=False,
+            trust_env=True,
+        )
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def get_route_timeout(path: str) -> aiohttp.ClientTimeout:
+    """Timeout for a path; the longest matching prefix in AI_TUTOR_PROXY_ROUTE_TIMEOUTS wins."""
+    normalized_path = "/" + path.lstrip("/")
+    read_timeout = AI_TUTOR_PROXY_READ_TIMEOUT
+    matched_length = -1
+    for prefix, seconds in AI_TUTOR_PROXY_ROUTE_TIMEOUTS.items():
+        normalized_prefix = "/" + prefix.lstrip("/")
+        if normalized_path.startswith(normalized_prefix) and len(normalized_prefix) > matched_length:
+            read_timeout = seconds
+            matched_length = len(normalized_prefix)
+
+    # No total limit, so long SSE streams are fine as long as data keeps flowing
+    return aiohttp.ClientTimeout(
+        total=None,
+        sock_connect=AI_TUTOR_PROXY_CONNECT_TIMEOUT,
+        sock_read=read_timeout,
+    )
+
+
 def build_upstream_url(path: str) -> str:
     base_url = AI_TUTOR_API_BASE_URL.rstrip("/")
     if not base_url:
@@ -100,14 +152,25 @@ def build_upstream_url(path: str) -> str:
 
 
 def get_forward_headers(request: Request) -> dict[str, str]:
-    return {
+    headers = {
         key: value
         for key, value in request.headers.items()
         if key.lower() in FORWARDED_HEADER_ALLOWLIST
     }
+    # Keep the upload length so a streamed body is not re-sent as chunked
+    if request_has_body(request) and "content-length" in request.headers:
+        headers["Content-Length"] = request.headers["content-length"]
+    return headers
+
 
+def request_has_body(request: Request) -> bool:
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        return content_length.strip() not in ("", "0")
+    return "chunked" in request.headers.get("transfer-encoding", "").lower()
 
-def build_response_headers(upstream_response: requests.Response) -> dict[str, str]:
+
+def build_response_headers(upstream_response: aiohttp.ClientResponse) -> dict[str, str]:
     return {
         key: value
         for key, value in upstream_response.headers.items()
@@ -135,27 +198,52 @@ async def proxy_ai_tutor_request(request: Request, path: str, _user=Depends(get_
             )
 
     upstream_url = build_upstream_url(path)
-    request_body = await request.body()
 
     try:
-        upstream_response = requests.request(
+        upstream_response = await get_session().request(
             method=request.method,
             url=upstream_url,
             headers=get_forward_headers(request),
             params=list(request.query_params.multi_items()),
-            data=request_body if request_body else None,
-            timeout=300,
+            # Stream the upload instead of buffering it in memory
+            data=request.stream() if request_has_body(request) else None,
+            timeout=get_route_timeout(path),
         )
-    except requests.RequestException as exc:
+    except asyncio.TimeoutError as exc:
+        log.warning(f"AI Tutor proxy timed out connecting to {upstream_url}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="AI Tutor service timed out.",
+        ) from exc
+    except aiohttp.ClientError as exc:
         log.exception("AI Tutor proxy connection error: %s", exc)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="AI Tutor service is unavailable.",
         ) from exc
 
-    return Response(
-        content=upstream_response.content,
-        status_code=upstream_response.status_code,
+    async def stream_upstream_body():
+        completed = False
+        try:
+            # Pass chunks (including SSE events) through as soon as they arrive
+            async for chunk in upstream_response.content.iter_any():
+                yield chunk
+            completed = True
+        except asyncio.TimeoutError:
+            log.warning(f"AI Tutor proxy read timed out for {upstream_url}")
+        except aiohttp.ClientError as exc:
+            log.warning(f"AI Tutor proxy stream error for {upstream_url}: {exc}")
+        finally:
+            if completed:
+                # Fully read: return the connection to the keep-alive pool
+                upstream_response.release()
+            else:
+                # Client disconnected or upstream failed: abort the upstream request
+                upstream_response.close()
+
+    return StreamingResponse(
+        stream_upstream_body(),
+        status_code=upstream_response.status,
         headers=build_response_headers(upstream_response),
         media_type=upstream_response.headers.get("content-type"),
     )
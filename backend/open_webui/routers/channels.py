@@ -140,12 +140,59 @@ async def delete_channel_by_id(id: str, user=Depends(get_admin_user)):
 
 
 class MessageUserResponse(MessageResponse):
-    user: UserNameResponse
+    # None when the author's account has been deleted
+    user: Optional[UserNameResponse] = None
+
+
+def hydrate_messages(
+    message_list: list[MessageModel], include_replies: bool = True
+) -> list[MessageUserResponse]:
+    """
+    Attach users, reply aggregates and reactions to a page of messages using a
+    fixed number of queries, independent of the page size.
+    """
+    if not message_list:
+        return []
+
+    message_ids = [message.id for message in message_list]
+    users = {
+        user.id: user
+        for user in Users.get_users_by_user_ids(
+            list({message.user_id for message in message_list})
+        )
+    }
+    reply_stats = (
+        Messages.get_reply_stats_by_message_ids(message_ids) if include_replies else {}
+    )
+    reactions = Messages.get_reactions_by_message_ids(message_ids)
+
+    messages = []
+    for message in message_list:
+        user = users.get(message.user_id)
+        stats = reply_stats.get(message.id, {})
+        messages.append(
+            MessageUserResponse(
+                **{
+                    **message.model_dump(),
+                    "reply_count": stats.get("reply_count", 0),
+                    "latest_reply_at": stats.get("latest_reply_at"),
+                    "reactions": reactions.get(message.id, []),
+                    "user": UserNameResponse(**user.model_dump()) if user else None,
+                }
+            )
+        )
+
+    return messages
 
 
 @router.get("/{id}/messages", response_model=list[MessageUserResponse])
 async def get_channel_messages(
-    id: str, skip: int = 0, limit: int = 50, user=Depends(get_verified_user)
+    id: str,
+    skip: int = 0,
+    limit: int = 50,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    user=Depends(get_verified_user),
 ):
     channel = Channels.get_channel_by_id(id)
     if not channel:
@@ -160,31 +207,10 @@ async def get_channel_messages(
             status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
         )
 
-    message_list = Messages.get_messages_by_channel_id(id, skip, limit)
-    users = {}
-
-    messages = []
-    for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        replies = Messages.get_replies_by_message_id(message.id)
-        latest_reply_at = replies[0].created_at if replies else None
-
-        messages.append(
-            MessageUserResponse(
-                **{
-                    **message.model_dump(),
-                    "reply_count": len(replies),
-                    "latest_reply_at": latest_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
-                }
-            )
-        )
-
-    return messages
+    message_list = Messages.get_messages_by_channel_id(
+        id, skip, limit, before=before, after=after
+    )
+    return hydrate_messages(message_list)
 
 
 ############################
@@ -374,6 +400,8 @@ async def get_channel_thread_messages(
     message_id: str,
     skip: int = 0,
     limit: int = 50,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
     user=Depends(get_verified_user),
 ):
     channel = Channels.get_channel_by_id(id)
@@ -389,28 +417,10 @@ async def get_channel_thread_messages(
             status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
         )
 
-    message_list = Messages.get_messages_by_parent_id(id, message_id, skip, limit)
-    users = {}
-
-    messages = []
-    for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        messages.append(
-            MessageUserResponse(
-                **{
-                    **message.model_dump(),
-                    "reply_count": 0,
-                    "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
-                }
-            )
-        )
-
-    return messages
+    message_list = Messages.get_messages_by_parent_id(
+        id, message_id, skip, limit, before=before, after=after
+    )
+    return hydrate_messages(message_list, include_replies=False)
 
 
 ############################
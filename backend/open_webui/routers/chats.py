@@ -1,10 +1,15 @@
+import asyncio
 import csv
 import json
 import logging
+import multiprocessing
 import re
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from io import BytesIO, StringIO
+from io import StringIO
+from itertools import chain, groupby, islice
 from typing import Optional
 from urllib.parse import quote
 import pytz
@@ -25,15 +30,15 @@ from open_webui.models.folders import Folders
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, CHAT_EXPORT_PDF_WORKERS
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
-from open_webui.utils.pdf_generator import PDFGenerator
+from open_webui.utils.pdf_generator import render_chat_pdf
 from open_webui.models.users import Users
 from open_webui.utils.super_admin import is_super_admin
 
@@ -872,6 +877,128 @@ async def delete_all_tags_by_id(id: str, user=Depends(get_verified_user)):
 ############################
 
 
+_pdf_export_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_export_executor() -> ProcessPoolExecutor:
+    """
+    Process pool shared by all ZIP exports. Workers are forked from a
+    forkserver that has already imported the PDF renderer, never from the
+    threaded server process, so they cannot inherit a lock held by another
+    thread.
+    """
+    global _pdf_export_executor
+    if _pdf_export_executor is None:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["open_webui.utils.pdf_generator"])
+        _pdf_export_executor = ProcessPoolExecutor(
+            max_workers=CHAT_EXPORT_PDF_WORKERS,
+            mp_context=context,
+        )
+    return _pdf_export_executor
+
+
+def _reset_pdf_export_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a pool broken by a crashed worker; the next export starts a new one."""
+    global _pdf_export_executor
+    if _pdf_export_executor is executor:
+        _pdf_export_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_export_executor() -> None:
+    global _pdf_export_executor
+    if _pdf_export_executor is not None:
+        _pdf_export_executor.shutdown(wait=False, cancel_futures=True)
+        _pdf_export_executor = None
+
+
+def _clean_filename_part(value: str) -> str:
+    cleaned = "".join(c for c in value if c.isalnum() or c in (' ', '-', '_')).strip()
+    return cleaned.replace(' ', '_')
+
+
+def _build_zip_export_jobs(chats) -> list[tuple[str, str, list]]:
+    """
+    Group chats by user + model into (filename, pdf_title, messages) jobs.
+    Each PDF contains all conversations for that student with the same homework/model.
+    """
+    # Group chats by user_id + model_name for merged PDFs
+    grouped_chats = {}
+    for chat in chats:
+        model_name = chat.meta.get('model_name') or chat.meta.get('base_model_name') or 'Unknown_Model'
+        key = (chat.user_id, model_name)
+        grouped_chats.setdefault(key, []).append(chat)
+
+    user_ids = list({chat.user_id for chat in chats})
+    users_map = {u.id: u for u in Users.get_users_by_user_ids(user_ids)}
+
+    jobs = []
+    filenames = set()
+    for (user_id, raw_model_name), group_chats in grouped_chats.items():
+        user_info = users_map.get(user_id)
+        user_name = _clean_filename_part(user_info.name) if user_info else f"User_{user_id}"
+        model_name = _clean_filename_part(raw_model_name)
+
+        # Collect and merge all messages from all chats for this user-model combination
+        all_messages = []
+        for chat in group_chats:
+            messages = chat.chat.get('messages', [])
+            if len(group_chats) > 1:
+                # Add a separator message to distinguish between different chat sessions
+                all_messages.append(
+                    {
+                        "role": "system",
+                        "content": f"--- Chat Session: {chat.title} ---",
+                        "timestamp": messages[0].get('timestamp', 0) if messages else 0,
+                    }
+                )
+            all_messages.extend(messages)
+
+        # Sort all messages by timestamp to maintain chronological order
+        all_messages.sort(key=lambda x: x.get('timestamp', 0))
+
+        if len(group_chats) == 1:
+            pdf_title = f"{user_name} - {model_name} - {group_chats[0].title}"
+        else:
+            pdf_title = f"{user_name} - {model_name} - {len(group_chats)} Conversations"
+
+        # Handle duplicate filenames by adding a counter
+        filename = f"{user_name}_{model_name}.pdf"
+        counter = 1
+        while filename in filenames:
+            filename = f"{user_name}_{model_name}_{counter}.pdf"
+            counter += 1
+        filenames.add(filename)
+
+        jobs.append((filename, pdf_title, all_messages))
+    return jobs
+
+
+class _ZipStreamBuffer:
+    """Write-only file object for zipfile that hands out written bytes in chunks."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 @router.post("/export/zip")
 async def export_chats_as_zip(
     form_data: ChatExportZipForm, user=Depends(get_verified_user)
@@ -879,6 +1006,10 @@ async def export_chats_as_zip(
     """
     Export selected chats as a ZIP file containing individual PDFs for each student.
     Each PDF contains all conversations for that student with the same homework/model.
+
+    PDFs are rendered concurrently in a process pool and each one is added to
+    the ZIP as soon as it is ready; the ZIP is streamed to the client while the
+    remaining PDFs render. Entries that fail to render are skipped.
     """
     try:
         # Only admins can export group chat data
@@ -888,23 +1019,22 @@ async def export_chats_as_zip(
                 detail="Only administrators can export group chat data"
             )
 
-        # Validate that all chat IDs exist and belong to the specified group
-        chats = []
-        for chat_id in form_data.chat_ids:
-            chat = Chats.get_chat_by_id(chat_id)
-            if not chat:
+        # Load all requested chats in one query, restricted to the group
+        chat_ids = list(dict.fromkeys(form_data.chat_ids))
+        chats = Chats.get_chats_by_ids_and_group_id(chat_ids, form_data.group_id)
+        found_ids = {chat.id for chat in chats}
+        for chat_id in chat_ids:
+            if chat_id in found_ids:
+                continue
+            if not Chats.get_chat_by_id(chat_id):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Chat {chat_id} not found"
                 )
-            
-            if chat.group_id != form_data.group_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Chat {chat_id} does not belong to group {form_data.group_id}"
-                )
-            
-            chats.append(chat)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Chat {chat_id} does not belong to group {form_data.group_id}"
+            )
 
         if not chats:
             raise HTTPException(
@@ -912,123 +1042,84 @@ async def export_chats_as_zip(
                 detail="No valid chats found for export"
             )
 
-        # Group chats by user_id + model_name for merged PDFs
-        grouped_chats = {}
-        for chat in chats:
-            user_id = chat.user_id
-            model_name = chat.meta.get('model_name') or chat.meta.get('base_model_name') or 'Unknown_Model'
-            
-            # Create a unique key for each user-model combination
-            key = f"{user_id}_{model_name}"
-            
-            if key not in grouped_chats:
-                grouped_chats[key] = {
-                    'user_id': user_id,
-                    'model_name': model_name,
-                    'chats': []
-                }
-            
-            grouped_chats[key]['chats'].append(chat)
-
-        # Generate PDFs for each group
-        pdf_files = {}
-        for group_key, group_data in grouped_chats.items():
-            try:
-                # Get user information
-                user_info = Users.get_user_by_id(group_data['user_id'])
-                if not user_info:
-                    user_name = f"User_{group_data['user_id']}"
-                else:
-                    # Clean user name for filename (remove invalid characters)
-                    user_name = "".join(c for c in user_info.name if c.isalnum() or c in (' ', '-', '_')).strip()
-                    user_name = user_name.replace(' ', '_')
-
-                # Clean model name for filename
-                model_name = "".join(c for c in group_data['model_name'] if c.isalnum() or c in (' ', '-', '_')).strip()
-                model_name = model_name.replace(' ', '_')
-
-                # Collect and merge all messages from all chats for this user-model combination
-                all_messages = []
-                chat_titles = []
-                
-                for chat in group_data['chats']:
-                    chat_titles.append(chat.title)
-                    messages = chat.chat.get('messages', [])
-                    
-                    # Add chat context to messages if multiple chats
-                    if len(group_data['chats']) > 1:
-                        # Add a separator message to distinguish between different chat sessions
-                        separator_message = {
-                            "role": "system",
-                            "content": f"--- Chat Session: {chat.title} ---",
-                            "timestamp": messages[0].get('timestamp', 0) if messages else 0
-                        }
-                        all_messages.append(separator_message)
-                    
-                    all_messages.extend(messages)
-
-                # Sort all messages by timestamp to maintain chronological order
-                all_messages.sort(key=lambda x: x.get('timestamp', 0))
-
-                # Create title for the merged PDF
-                if len(chat_titles) == 1:
-                    pdf_title = f"{user_name} - {model_name} - {chat_titles[0]}"
-                else:
-                    pdf_title = f"{user_name} - {model_name} - {len(chat_titles)} Conversations"
+        jobs = _build_zip_export_jobs(chats)
 
-                # Generate PDF using existing PDFGenerator
-                pdf_form = ChatTitleMessagesForm(
-                    title=pdf_title,
-                    messages=all_messages
-                )
-                
-                pdf_generator = PDFGenerator(pdf_form)
-                pdf_bytes = pdf_generator.generate_chat_pdf()
-                
-                # Create filename for the PDF
-                filename = f"{user_name}_{model_name}.pdf"
-                
-                # Handle duplicate filenames by adding a counter
-                original_filename = filename
-                counter = 1
-                while filename in pdf_files:
-                    name_part = original_filename.replace('.pdf', '')
-                    filename = f"{name_part}_{counter}.pdf"
-                    counter += 1
-                
-                pdf_files[filename] = pdf_bytes
-
-            except Exception as e:
-                log.error(f"Error generating PDF for group {group_key}: {e}")
-                # Continue with other PDFs even if one fails
-                continue
+        loop = asyncio.get_running_loop()
+        executor = _get_pdf_export_executor()
+        try:
+            pending = {
+                loop.run_in_executor(executor, render_chat_pdf, title, messages): filename
+                for filename, title, messages in jobs
+            }
+        except BrokenProcessPool:
+            # A worker of an earlier export crashed; start over with a new pool
+            _reset_pdf_export_executor(executor)
+            executor = _get_pdf_export_executor()
+            pending = {
+                loop.run_in_executor(executor, render_chat_pdf, title, messages): filename
+                for filename, title, messages in jobs
+            }
 
-        if not pdf_files:
+        ready: list[tuple[str, bytes]] = []
+
+        def collect(done):
+            for future in done:
+                filename = pending.pop(future)
+                try:
+                    ready.append((filename, future.result()))
+                except BrokenProcessPool as e:
+                    # Every PDF still queued in this pool fails the same way
+                    log.error(f"PDF worker crashed while generating {filename}: {e}")
+                    _reset_pdf_export_executor(executor)
+                except Exception as e:
+                    log.error(f"Error generating PDF {filename}: {e}")
+
+        # Wait for the first successful PDF before responding, so a fully
+        # failed export still returns an error status instead of an empty ZIP
+        while pending and not ready:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            collect(done)
+
+        if not ready:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to generate any PDFs"
             )
 
-        # Create ZIP file containing all PDFs
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for filename, pdf_bytes in pdf_files.items():
-                zip_file.writestr(filename, pdf_bytes)
-
-        zip_buffer.seek(0)
-        zip_content = zip_buffer.getvalue()
+        async def stream_zip():
+            buffer = _ZipStreamBuffer()
+            written = 0
+            try:
+                with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                    while True:
+                        for filename, pdf_bytes in ready:
+                            await asyncio.to_thread(zip_file.writestr, filename, pdf_bytes)
+                            written += 1
+                            yield buffer.drain()
+                        ready.clear()
+                        if not pending:
+                            break
+
+                        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        collect(done)
+                # Central directory is written when the archive is closed
+                yield buffer.drain()
+                log.info(f"Successfully streamed ZIP export with {written}/{len(jobs)} PDFs")
+            finally:
+                # Client went away: drop PDFs that have not started rendering yet
+                for future in pending:
+                    future.cancel()
 
-        # Create filename for the ZIP
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y-%m-%d")
         zip_filename = f"group-{form_data.group_id}-conversations-{timestamp}.zip"
 
-        log.info(f"Successfully created ZIP export: {zip_filename} with {len(pdf_files)} PDFs")
-
-        return Response(
-            content=zip_content,
+        return StreamingResponse(
+            stream_zip(),
             media_type="application/zip",
-            headers={"Content-Disposition": f"attachment; filename={zip_filename}"}
+            headers={
+                "Content-Disposition": f"attachment; filename={zip_filename}",
+                "X-Export-Total": str(len(jobs)),
+            }
         )
 
     except HTTPException:
@@ -1046,97 +1137,140 @@ async def export_chats_as_zip(
 ############################
 
 
-def _build_conversation_export_rows(chats) -> list:
+CONVERSATION_EXPORT_FIELDS = [
+    'member', 'email_id', 'model_name', 'chat_id', 'question', 'model_response', 'timestamp'
+]
+
+
+def _chat_export_rows(chat, user, est_tz):
+    """Rows for a single chat, read from the already loaded chat row."""
+    member = user.name if user else f"User_{chat.user_id}"
+    email = user.email if user else ""
+    model_name = chat.meta.get("model_name") or chat.meta.get("base_model_name") or "Unknown"
+    messages = chat.chat.get("history", {}).get("messages", {}) or {}
+    if not messages:
+        return
+    assistant_by_parent = {}
+    for _mid, msg in messages.items():
+        if msg.get("role") == "assistant":
+            parent_id = msg.get("parentId") or msg.get("parent_id")
+            if parent_id and parent_id not in assistant_by_parent:
+                assistant_by_parent[parent_id] = msg.get("content", "") or ""
+    for message_id, message in messages.items():
+        if message.get("role") != "user":
+            continue
+        ts = message.get("timestamp", 0)
+        if ts:
+            dt_est = datetime.fromtimestamp(ts, tz=pytz.UTC).astimezone(est_tz)
+            human_ts = dt_est.strftime("%Y-%m-%d %I:%M:%S %p %Z")
+        else:
+            human_ts = "Unknown"
+        yield {
+            "member": member,
+            "email_id": email,
+            "model_name": model_name,
+            "chat_id": chat.id,
+            "question": message.get("content", ""),
+            "model_response": assistant_by_parent.get(message_id, ""),
+            "timestamp": human_ts,
+        }
+
+
+def _iter_conversation_export_rows(chats, batch_size: int = 100):
     """
     Per-turn rows: member, email_id, model_name, chat_id, question, model_response, timestamp.
     Timestamps are formatted in US/Eastern with the real zone abbreviation (EST/EDT).
     Order matches the CSV / JSON export: iterate chats (caller order), then message dict order.
+
+    `chats` may be any iterable (e.g. a streaming cursor); users are looked up
+    once per batch of chats, so rows can be produced without loading every chat.
     """
-    if not chats:
-        return []
-    user_ids = list(set(c.user_id for c in chats))
-    users_map = {u.id: u for u in Users.get_users_by_user_ids(user_ids)}
-    rows: list[dict] = []
-    for chat in chats:
-        u = users_map.get(chat.user_id)
-        member = u.name if u else f"User_{chat.user_id}"
-        email = u.email if u else ""
-        model_name = chat.meta.get("model_name") or chat.meta.get("base_model_name") or "Unknown"
-        messages = Chats.get_messages_by_chat_id(chat.id)
-        if not messages:
-            continue
-        assistant_by_parent = {}
-        for _mid, msg in messages.items():
-            if msg.get("role") == "assistant":
-                parent_id = msg.get("parentId") or msg.get("parent_id")
-                if parent_id and parent_id not in assistant_by_parent:
-                    assistant_by_parent[parent_id] = msg.get("content", "") or ""
-        for message_id, message in messages.items():
-            if message.get("role") != "user":
-                continue
-            ts = message.get("timestamp", 0)
-            if ts:
-                est_tz = pytz.timezone("US/Eastern")
-                dt_est = datetime.fromtimestamp(ts, tz=pytz.UTC).astimezone(est_tz)
-                human_ts = dt_est.strftime("%Y-%m-%d %I:%M:%S %p %Z")
-            else:
-                human_ts = "Unknown"
-            rows.append(
+    est_tz = pytz.timezone("US/Eastern")
+    users_map: dict = {}
+    chats = iter(chats)
+    while True:
+        batch = list(islice(chats, batch_size))
+        if not batch:
+            break
+        missing_ids = list({c.user_id for c in batch} - users_map.keys())
+        if missing_ids:
+            users_map.update({u.id: u for u in Users.get_users_by_user_ids(missing_ids)})
+            for user_id in missing_ids:
+                users_map.setdefault(user_id, None)
+        for chat in batch:
+            yield from _chat_export_rows(chat, users_map[chat.user_id], est_tz)
+
+
+def _iter_chat_threads(rows):
+    """Group consecutive rows by chat_id into threads with turns: question, model_response, timestamp."""
+    for chat_id, chat_rows in groupby(rows, key=lambda r: r["chat_id"]):
+        first = next(chat_rows)
+        yield {
+            "chat_id": chat_id,
+            "member": first["member"],
+            "email_id": first["email_id"],
+            "model_name": first["model_name"],
+            "turns": [
                 {
-                    "member": member,
-                    "email_id": email,
-                    "model_name": model_name,
-                    "chat_id": chat.id,
-                    "question": message.get("content", ""),
-                    "model_response": assistant_by_parent.get(message_id, ""),
-                    "timestamp": human_ts,
+                    "question": r["question"],
+                    "model_response": r["model_response"],
+                    "timestamp": r["timestamp"],
                 }
-            )
-    return rows
-
-
-def _chats_to_json_payload(group_id: str, group_name: str, flat_rows: list) -> dict:
-    """Group flat rows by chat_id with turns: question, model_response, timestamp."""
-    chat_order: list = []
-    by_cid: dict = {}
-    for r in flat_rows:
-        cid = r["chat_id"]
-        if cid not in by_cid:
-            chat_order.append(cid)
-            by_cid[cid] = {
-                "chat_id": cid,
-                "member": r["member"],
-                "email_id": r["email_id"],
-                "model_name": r["model_name"],
-                "turns": [],
-            }
-        by_cid[cid]["turns"].append(
-            {
-                "question": r["question"],
-                "model_response": r["model_response"],
-                "timestamp": r["timestamp"],
-            }
-        )
-    return {
-        "group_id": group_id,
-        "group_name": group_name,
-        # `chat_order` matches the order of threads in the export (same as DB fetch order, newest updated first when using chat_ids)
-        "chats": [by_cid[cid] for cid in chat_order],
-    }
+                for r in chain([first], chat_rows)
+            ],
+        }
 
 
-def _load_chats_for_group_export(form_data: ChatExportCSVForm) -> list:
-    """Match CSV/JSON: chat_ids (non-empty) or filter payload."""
+def _iter_chats_for_group_export(form_data: ChatExportCSVForm):
+    """Match CSV/JSON: chat_ids (non-empty) or filter payload, streamed from the database."""
     filter_payload = form_data.model_dump()
     raw_chat_ids = filter_payload.pop("chat_ids", None) or []
     chat_ids = list(dict.fromkeys(str(x) for x in raw_chat_ids if x))
     if chat_ids:
-        return Chats.get_chats_by_ids_and_group_id(chat_ids, form_data.group_id)
-    return Chats.get_chats_by_user_id_and_meta_filter(
+        return Chats.iter_chats_by_ids_and_group_id(chat_ids, form_data.group_id)
+    return Chats.iter_chats_by_meta_filter(
         filter_payload, form_data.skip, form_data.limit
     )
 
 
+def _peek(iterator):
+    """Return (first item, iterator including it), or (None, None) if empty."""
+    iterator = iter(iterator)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return None, None
+    return first, chain([first], iterator)
+
+
+def _load_export_rows(form_data: ChatExportCSVForm):
+    """
+    Streaming rows for a group export. Raises 404 up front if there are no
+    chats or no questions, so errors are reported before the response starts.
+    """
+    first_chat, chats = _peek(_iter_chats_for_group_export(form_data))
+    if first_chat is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No chats found matching the criteria",
+        )
+    first_row, rows = _peek(_iter_conversation_export_rows(chats))
+    if first_row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No questions found in the selected chats",
+        )
+    return rows
+
+
+def _export_content_disposition(group_name: Optional[str], ext: str) -> str:
+    # Create safe filename + RFC5987-compatible header value.
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = _safe_export_filename(group_name, timestamp, ext)
+    filename_star = quote(filename)
+    return f'attachment; filename="{filename}"; filename*=UTF-8\'\'{filename_star}'
+
+
 def _safe_export_filename(group_name: Optional[str], timestamp: str, ext: str) -> str:
     """
     Build a filesystem/header-safe filename.
@@ -1181,43 +1315,28 @@ async def export_chats_as_csv(
                 detail="Group not found"
             )
 
-        chats = _load_chats_for_group_export(form_data)
-        if not chats:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No chats found matching the criteria"
-            )
-
-        csv_rows = _build_conversation_export_rows(chats)
-        if not csv_rows:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No questions found in the selected chats"
-            )
+        rows = _load_export_rows(form_data)
 
-        # Generate CSV
-        output = StringIO()
-        fieldnames = ['member', 'email_id', 'model_name', 'chat_id', 'question', 'model_response', 'timestamp']
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(csv_rows)
-
-        csv_content = output.getvalue()
-        output.close()
-
-        # Create safe filename + RFC5987-compatible header value.
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = _safe_export_filename(group.name, timestamp, "csv")
-        filename_star = quote(filename)
+        def stream_csv(batch_size: int = 200):
+            output = StringIO()
+            writer = csv.DictWriter(output, fieldnames=CONVERSATION_EXPORT_FIELDS)
+            writer.writeheader()
+            try:
+                for count, row in enumerate(rows, 1):
+                    writer.writerow(row)
+                    if count % batch_size == 0:
+                        yield output.getvalue()
+                        output.seek(0)
+                        output.truncate(0)
+                yield output.getvalue()
+            except Exception as e:
+                log.exception(f"Error streaming CSV export: {e}")
+                raise
 
-        return Response(
-            content=csv_content,
+        return StreamingResponse(
+            stream_csv(),
             media_type="text/csv",
-            headers={
-                "Content-Disposition": (
-                    f'attachment; filename="{filename}"; filename*=UTF-8\'\'{filename_star}'
-                )
-            }
+            headers={"Content-Disposition": _export_content_disposition(group.name, "csv")},
         )
 
     except HTTPException:
@@ -1259,42 +1378,79 @@ async def export_chats_as_json(
                 detail="Group not found",
             )
 
-        chats = _load_chats_for_group_export(form_data)
-        if not chats:
+        rows = _load_export_rows(form_data)
+
+        def stream_json():
+            yield (
+                "{\n"
+                f'  "group_id": {json.dumps(form_data.group_id, ensure_ascii=False)},\n'
+                f'  "group_name": {json.dumps(group.name or "", ensure_ascii=False)},\n'
+                '  "chats": ['
+            )
+            separator = "\n    "
+            for thread in _iter_chat_threads(rows):
+                yield separator + json.dumps(thread, ensure_ascii=False)
+                separator = ",\n    "
+            yield "\n  ]\n}\n"
+
+        return StreamingResponse(
+            stream_json(),
+            media_type="application/json; charset=utf-8",
+            headers={"Content-Disposition": _export_content_disposition(group.name, "json")},
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.exception(f"Error exporting chats as JSON: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to export chats as JSON",
+        )
+
+
+############################
+# Export Chats as NDJSON (one thread per line, same objects as JSON `chats`)
+############################
+
+
+@router.post("/export/ndjson")
+async def export_chats_as_ndjson(
+    form_data: ChatExportCSVForm, user=Depends(get_verified_user)
+):
+    try:
+        if user.role != "admin":
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No chats found matching the criteria",
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only administrators can export group chat data",
             )
 
-        flat_rows = _build_conversation_export_rows(chats)
-        if not flat_rows:
+        from open_webui.models.groups import Groups
+
+        group = Groups.get_group_by_id(form_data.group_id)
+        if not group:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="No questions found in the selected chats",
+                detail="Group not found",
             )
 
-        payload = _chats_to_json_payload(
-            form_data.group_id, group.name or "", flat_rows
-        )
-        body = json.dumps(payload, ensure_ascii=False, indent=2)
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = _safe_export_filename(group.name, ts, "json")
-        filename_star = quote(filename)
-        return Response(
-            content=body,
-            media_type="application/json; charset=utf-8",
-            headers={
-                "Content-Disposition": (
-                    f'attachment; filename="{filename}"; filename*=UTF-8\'\'{filename_star}'
-                ),
-            },
+        rows = _load_export_rows(form_data)
+
+        def stream_ndjson():
+            for thread in _iter_chat_threads(rows):
+                yield json.dumps(thread, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(
+            stream_ndjson(),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": _export_content_disposition(group.name, "ndjson")},
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        log.exception(f"Error exporting chats as JSON: {e}")
+        log.exception(f"Error exporting chats as NDJSON: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to export chats as JSON",
+            detail="Failed to export chats as NDJSON",
         )
@@ -1,10 +1,12 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from pydantic import BaseModel
 
 from open_webui.models.users import Users, UserModel
 from open_webui.models.feedbacks import (
     FeedbackModel,
+    FeedbackModelStatModel,
+    FeedbackStats,
     FeedbackResponse,
     FeedbackForm,
     Feedbacks,
@@ -60,6 +62,75 @@ class FeedbackUserResponse(FeedbackResponse):
     user: Optional[UserModel] = None
 
 
+class LeaderboardResponse(BaseModel):
+    items: list[FeedbackModelStatModel]
+    total: int
+
+
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    skip: int = 0,
+    limit: int = Query(50, ge=0, le=500),
+    model_ids: Optional[list[str]] = Query(None),
+    user=Depends(get_admin_user),
+):
+    items, total = FeedbackStats.get_model_stats(
+        skip=skip, limit=limit, model_ids=model_ids
+    )
+    return LeaderboardResponse(items=items, total=total)
+
+
+class TopicLeaderboardForm(BaseModel):
+    # tag -> similarity to the topic; feedback is weighted by its best tag
+    tags: dict[str, float]
+
+
+@router.post("/leaderboard/topic", response_model=LeaderboardResponse)
+async def get_topic_leaderboard(
+    form_data: TopicLeaderboardForm, user=Depends(get_admin_user)
+):
+    items = FeedbackStats.get_topic_model_stats(form_data.tags)
+    return LeaderboardResponse(items=items, total=len(items))
+
+
+class FeedbackListResponse(BaseModel):
+    items: list[FeedbackUserResponse]
+    total: int
+
+
+@router.get("/feedbacks", response_model=FeedbackListResponse)
+async def get_feedbacks_page(
+    skip: int = 0,
+    limit: int = Query(50, ge=0, le=500),
+    model_id: Optional[str] = None,
+    rating: Optional[str] = None,
+    user=Depends(get_admin_user),
+):
+    feedbacks, total = Feedbacks.get_feedbacks(
+        skip=skip, limit=limit, model_id=model_id, rating=rating
+    )
+    users = {
+        u.id: u
+        for u in Users.get_users_by_user_ids(
+            list({feedback.user_id for feedback in feedbacks})
+        )
+    }
+    return FeedbackListResponse(
+        items=[
+            FeedbackUserResponse(
+                **feedback.model_dump(), user=users.get(feedback.user_id)
+            )
+            for feedback in feedbacks
+        ],
+        total=total,
+    )
+
+
+@router.get("/feedbacks/tags", response_model=list[str])
+async def get_feedback_tags(user=Depends(get_admin_user)):
+    return Feedbacks.get_feedback_tags()
+
+
 @router.get("/feedbacks/all", response_model=list[FeedbackUserResponse])
 async def get_all_feedbacks(user=Depends(get_admin_user)):
     feedbacks = Feedbacks.get_all_feedbacks()
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional
+import asyncio
 import logging
 import os
 import json
+import re
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from io import BytesIO
 from datetime import datetime
@@ -13,6 +17,7 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
 
+from open_webui.env import FACILITIES_SECTION_CONCURRENCY
 from open_webui.models.knowledge import Knowledges
 from open_webui.retrieval.vector.connector import VECTOR_DB_CLIENT
 from open_webui.utils.auth import get_verified_user
@@ -413,10 +418,9 @@ def search_knowledge_base(query: str, user_id: str, request: Request, model, k:
             return []
         
         
-        results = []
-        for collection_name in collection_names:
+        def search_collection(collection_name: str) -> List[tuple]:
+            collection_results = []
             try:
-               
                 search_results = VECTOR_DB_CLIENT.search(
                     collection_name=collection_name,
                     vectors=[query_embedding],
@@ -429,30 +433,28 @@ def search_knowledge_base(query: str, user_id: str, request: Request, model, k:
                     distances = search_results.distances[0] if hasattr(search_results, 'distances') and search_results.distances else []
                     
                     for i, doc in enumerate(documents):
+                        source = 'unknown'
                         if i < len(metadatas) and metadatas[i]:
-                            
-                            metadata = metadatas[i]
-                            source = 'unknown'
-                            
-                            logging.info(f"Metadata for document {i}: {metadata}")
-                            
-                            
                             for key in ['source', 'name', 'filename', 'file_name']:
-                                if key in metadata:
-                                    source = metadata[key]
-                                    logging.info(f"Found source '{source}' using key '{key}'")
+                                if key in metadatas[i]:
+                                    source = metadatas[i][key]
                                     break
                         else:
-                            source = 'unknown'
                             logging.warning(f"No metadata found for document {i}")
                         
                         # Get real distance/score if available
                         real_score = distances[i] if i < len(distances) else 0.15
-                        results.append((doc, source, real_score))
+                        collection_results.append((doc, source, real_score))
                         
             except Exception as e:
                 logging.warning(f"Failed to search collection {collection_name}: {e}")
-                continue
+            return collection_results
+        
+        # Query all collections concurrently; results keep collection order
+        results = []
+        with ThreadPoolExecutor(max_workers=min(len(collection_names), 8)) as executor:
+            for collection_results in executor.map(search_collection, collection_names):
+                results.extend(collection_results)
         
         return results[:k]
         
@@ -488,495 +490,585 @@ async def call_llm_direct(prompt: str, model: str, user, request: Request) -> st
         logging.error(f"Direct LLM call failed: {e}")
         raise Exception(f"LLM call failed: {str(e)}")
 
-@router.post("/generate", response_model=FacilitiesResponse)
-async def generate_facilities_response(request: Request, form_data: FacilitiesRequest, user=Depends(get_verified_user)):
+NIH_SECTION_GENERATION_INSTRUCTIONS = {
+    "1. Project Title": "",
+    "2. Laboratory": """Describe where the work will be performed. Include the lab's location (campus, building, and room number). If the PI has a dedicated laboratory, list its size in square feet. If sharing space with another PI or working in a mentor's laboratory, explain that arrangement and what space is available for the project.
+Describe how the lab is outfitted — be specific about capabilities pertinent to the project. List availability of biological safety cabinets, chemical fume hoods, tissue culture incubators, bench- and micro-centrifuges, refrigerators, and freezers. If sharing space, explain what resources are specifically available for the study.
+If more than one laboratory will be used, describe each separately with a bolded title for each Research Space.""",
+    "3. Animal": """Describe where animals are housed and the proximity to the PI's laboratory. List any specific procedure rooms, surgical suites, or other equipment available for animal studies. Explain what institutional resources are available such as veterinary care, basic husbandry, and IACUC support. Include AAALAC accreditation if mentioned.""",
+    "4. Computer": """Describe computer resources available including PCs, their operating systems, and basic software needed for the research (list any specialized statistical or graphical software, Office suite, etc.). Describe Internet access and the computers available to lab staff. If specialized computing (mainframe access, HPC clusters, GPU resources) is needed for the project, document its availability.""",
+    "5. Office": """Indicate any dedicated office space and list its size in square feet. Provide the office location and proximity to the lab (campus, building, and room number). List any office space available to employees, students, postdocs, etc., its size, and whether it is dedicated or located in/near the lab.""",
+    "6. Clinical": """Detail any clinical resources available to support the work. List any support from ACTSI, CTSI, or any clinical cores (biostatistics cores, biorepositories, imaging cores, clinical pharmacology units). Include information about patient populations or clinical cohorts if available.""",
+    "7. Other": """List any other institutional, departmental, or divisional resources necessary for the project that do not fit into the Laboratory, Animal, Computer, Office, Clinical, or Equipment sections. Include libraries, shared core facilities, mentorship programs, training resources, collaborative arrangements, and unique scientific environment features.""",
+    "8. Equipment": """List major items of equipment already available for this project. For each piece of equipment, identify its location and pertinent capabilities where appropriate. Be comprehensive — enumerate ALL equipment with exact names, models, specifications, and quantities as mentioned in the sources. Include sequencers, centrifuges, microscopes, PCR machines, flow cytometers, imaging systems, and any other research instruments."""
+}
+
+# For NSF: mapping from individual sections to NSF response headers
+NSF_HEADER_MAPPING = {
+    "Project Title": "1. Project Title",
+    "Research Space and Facilities": "2. Facilities",
+    "Core Instrumentation": "3. Major Equipment",
+    "Computing and Data Resources": "3. Major Equipment",
+    "Internal Facilities (NYU)": "4. Other Resources",
+    "External Facilities (Other Institutions)": "4. Other Resources",
+    "Special Infrastructure": "4. Other Resources"
+}
+
+
+####################################
+# Section scheduler
+####################################
+
+# Per-user semaphores capping how many sections run at once for one user,
+# shared across that user's concurrent /generate requests on this worker.
+# Running requests hold the semaphore, so an entry lives exactly as long as
+# one of its user's requests does.
+_user_section_semaphores: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def get_user_section_semaphore(user_id: str) -> asyncio.Semaphore:
+    semaphore = _user_section_semaphores.get(user_id)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(FACILITIES_SECTION_CONCURRENCY)
+        _user_section_semaphores[user_id] = semaphore
+    return semaphore
+
+
+class SectionRetrievalCache:
     """
-    Generate facilities response
-    Only works when facilities is enabled for the user
+    Request-scoped memo of retrieval calls. Sections that hit the same sources
+    with the same query await a single in-flight lookup instead of repeating it.
     """
-    if not request.app.state.config.ENABLE_FACILITIES.get(user.email):
-        raise HTTPException(status_code=403, detail="Facilities feature is not enabled for this user")
-    try:
-        logging.info(f"DEBUG: Received facilities request with files: {form_data.files}")
-        logging.info(f"DEBUG: Files count: {len(form_data.files) if form_data.files else 0}")
-        if form_data.files:
-            for i, file in enumerate(form_data.files):
-                logging.info(f"DEBUG: File {i}: {file}")
-        if form_data.sponsor not in ["NSF", "NIH"]:
-            raise HTTPException(status_code=400, detail="Invalid sponsor. Must be 'NSF' or 'NIH'")
-        
-        # Get model information for knowledge base access
-        models = await get_models_for_user(request, user)
-        model = models.get(form_data.model)
-        if not model:
-            raise HTTPException(status_code=400, detail="Model not found")
-        
-        section_labels = get_section_labels(form_data.sponsor)
-        
-        # Mapping from form fields to section labels (1-to-1 for both NSF and NIH)
-        if form_data.sponsor == "NSF":
-            # NSF: 1-to-1 mapping to individual sections (will be grouped in response)
-            field_mappings = {
-                "projectTitle": "Project Title",
-                "researchSpaceFacilities": "Research Space and Facilities", 
-                "coreInstrumentation": "Core Instrumentation",
-                "computingDataResources": "Computing and Data Resources",
-                "internalFacilitiesNYU": "Internal Facilities (NYU)",
-                "externalFacilitiesOther": "External Facilities (Other Institutions)",
-                "specialInfrastructure": "Special Infrastructure"
-            }
-        else:
-            # NIH: Individual sections
-            field_mappings = {
-                "projectTitle": "1. Project Title",
-                "laboratory": "2. Laboratory",
-                "animal": "3. Animal",
-                "computer": "4. Computer",
-                "office": "5. Office",
-                "clinical": "6. Clinical",
-                "other": "7. Other",
-                "equipment": "8. Equipment"
-            }
-        
-        user_inputs = {}
-        for form_key, section_label in field_mappings.items():
-            if form_key in form_data.form_data:
-                text = form_data.form_data[form_key].strip()
-                if text:
-                    user_inputs[section_label] = text
-        
-        # For NSF: Create mapping from individual sections to NSF response headers
-        nsf_header_mapping = {}
-        if form_data.sponsor == "NSF":
-            nsf_header_mapping = {
-                "Project Title": "1. Project Title",
-                "Research Space and Facilities": "2. Facilities",
-                "Core Instrumentation": "3. Major Equipment",
-                "Computing and Data Resources": "3. Major Equipment",
-                "Internal Facilities (NYU)": "4. Other Resources",
-                "External Facilities (Other Institutions)": "4. Other Resources",
-                "Special Infrastructure": "4. Other Resources"
-            }
-        
-        if not any(user_inputs.values()):
-            return FacilitiesResponse(
-                success=False,
-                message="No input provided in form fields",
-                sections={},
-                sources=[],
-                error="Please fill in at least one form field"
-            )
-        
 
-        section_generation_instructions = {}
-        if form_data.sponsor == "NSF":
-            section_generation_instructions = {
-               }
-        else:  # NIH
-            section_generation_instructions = {
-                "1. Project Title": "",
-                "2. Laboratory": """Describe where the work will be performed. Include the lab's location (campus, building, and room number). If the PI has a dedicated laboratory, list its size in square feet. If sharing space with another PI or working in a mentor's laboratory, explain that arrangement and what space is available for the project.
-Describe how the lab is outfitted — be specific about capabilities pertinent to the project. List availability of biological safety cabinets, chemical fume hoods, tissue culture incubators, bench- and micro-centrifuges, refrigerators, and freezers. If sharing space, explain what resources are specifically available for the study.
-If more than one laboratory will be used, describe each separately with a bolded title for each Research Space.""",
-                "3. Animal": """Describe where animals are housed and the proximity to the PI's laboratory. List any specific procedure rooms, surgical suites, or other equipment available for animal studies. Explain what institutional resources are available such as veterinary care, basic husbandry, and IACUC support. Include AAALAC accreditation if mentioned.""",
-                "4. Computer": """Describe computer resources available including PCs, their operating systems, and basic software needed for the research (list any specialized statistical or graphical software, Office suite, etc.). Describe Internet access and the computers available to lab staff. If specialized computing (mainframe access, HPC clusters, GPU resources) is needed for the project, document its availability.""",
-                "5. Office": """Indicate any dedicated office space and list its size in square feet. Provide the office location and proximity to the lab (campus, building, and room number). List any office space available to employees, students, postdocs, etc., its size, and whether it is dedicated or located in/near the lab.""",
-                "6. Clinical": """Detail any clinical resources available to support the work. List any support from ACTSI, CTSI, or any clinical cores (biostatistics cores, biorepositories, imaging cores, clinical pharmacology units). Include information about patient populations or clinical cohorts if available.""",
-                "7. Other": """List any other institutional, departmental, or divisional resources necessary for the project that do not fit into the Laboratory, Animal, Computer, Office, Clinical, or Equipment sections. Include libraries, shared core facilities, mentorship programs, training resources, collaborative arrangements, and unique scientific environment features.""",
-                "8. Equipment": """List major items of equipment already available for this project. For each piece of equipment, identify its location and pertinent capabilities where appropriate. Be comprehensive — enumerate ALL equipment with exact names, models, specifications, and quantities as mentioned in the sources. Include sequencers, centrifuges, microscopes, PCR machines, flow cytometers, imaging systems, and any other research instruments."""
-            }
-        
-        # Import the file processing function from middleware (moved outside loop for efficiency)
-        from open_webui.utils.middleware import chat_completion_files_handler
-        
-        section_outputs = {}
-        all_sources = []
-        cited_sources = set()  # Track which sources are actually cited in the text
-        # Using source names directly - frontend will handle the mapping  
-        
-        for section, user_text in user_inputs.items():
-            if not user_text:
-                continue
-            
-            logging.info(f"Processing section: {section}")
-            logging.info(f"Web search enabled flag: {form_data.web_search_enabled}")
-            
-            query = f"{section}: {user_text}"
-            
-            # (query expansion, hybrid search, reranking, TOP_K config)
-            all_file_results = []
-            
-            # Get model knowledge configuration
-            model_knowledge = model.get("info", {}).get("meta", {}).get("knowledge", False)
-            
-            # Combine knowledge base collections and uploaded files
-            files_to_process = []
-            
-            # Add knowledge base collections as "files"
-            if model_knowledge:
-                knowledge_files = []
-                for item in model_knowledge:
-                    if item.get("collection_name"):
-                        knowledge_files.append({
-                            "id": item.get("collection_name"),
-                            "name": item.get("name"),
-                            "legacy": True,
-                        })
-                    elif item.get("collection_names"):
-                        knowledge_files.append({
-                            "name": item.get("name"),
-                            "type": "collection",
-                            "collection_names": item.get("collection_names"),
-                            "legacy": True,
-                        })
-                    else:
-                        knowledge_files.append(item)
-                
-                files_to_process.extend(knowledge_files)
-                logging.info(f"Added {len(knowledge_files)} knowledge base collections for section '{section}'")
-            
-            # Add uploaded files
-            if form_data.files:
-                files_to_process.extend(form_data.files)
-                logging.info(f"Added {len(form_data.files)} uploaded files for section '{section}'")
-            
-            # Process all files (knowledge base + uploaded) together with advanced pipeline
-            if files_to_process:
-                try:
-                    # Create section-specific body for file processing
-                    section_specific_body = {
-                        "model": form_data.model,
-                        "metadata": {
-                            "files": files_to_process  # Knowledge base + uploaded files together
-                        },
-                        "messages": [{"role": "user", "content": user_text}]  # Section-specific query
-                    }
-                    
-                    processed_body, file_flags = await chat_completion_files_handler(request, section_specific_body, user)
-                    all_file_sources = file_flags.get("sources", [])
-                    
-                    # Extract documents with actual distance scores
-                    for source in all_file_sources:
-                        documents = source.get("document", [])
-                        distances = source.get("distances", [])
-                        metadata = source.get("metadata", [])
-                        
-                        # Extract source name from metadata (filename) first, fallback to file object name
-                        source_name = "unknown"
-                        if metadata and isinstance(metadata, list) and len(metadata) > 0:
-                            # Get first metadata entry (should have filename/source info)
-                            first_metadata = metadata[0] if isinstance(metadata[0], dict) else {}
-                            # Try metadata fields that contain actual filenames
-                            for key in ['source', 'name', 'filename', 'file_name']:
-                                if key in first_metadata and first_metadata[key]:
-                                    source_name = first_metadata[key]
-                                    break
-                        
-                        # Fallback to file object name if metadata doesn't have filename
-                        if source_name == "unknown":
-                            file_obj = source.get("source", {})
-                            if isinstance(file_obj, dict):
-                                source_name = file_obj.get("name", file_obj.get("id", "unknown"))
-                        
-                        # Use actual distance scores if available, otherwise use a default
-                        for i, doc in enumerate(documents):
-                            distance = distances[i] if i < len(distances) and distances[i] is not None else 0.15
-                            all_file_results.append((doc, source_name, distance))
-                    
-                    logging.info(f"Processed {len(all_file_sources)} sources (KB + uploaded) for section '{section}'")
-                    logging.info(f"Added {len(all_file_results)} total chunks for {section}")
-                    
-                except Exception as e:
-                    logging.error(f"Error processing files for section '{section}': {e}")
-                    # Continue without files for this section if processing fails
-            
-            # All results are now in all_file_results (knowledge base + uploaded files combined)
-            all_search_results = all_file_results
-            
-             
-            retrieved_chunks = []
-            section_sources = []
-            
-            
-            source_groups = {}
-            for doc, source, score in all_search_results:
-                if source not in source_groups:
-                    source_groups[source] = []
-                source_groups[source].append((doc, score))
-            
-            for source, docs_with_scores in source_groups.items():
-                
-                logging.info(f"Processing source '{source}' with {len(docs_with_scores)} documents, using source name directly")
-                
-                docs = [doc for doc, score in docs_with_scores]
-                real_distances = [score for doc, score in docs_with_scores]
-                
-                for doc in docs:
-                    retrieved_chunks.append(f"<source><source_id>{source}</source_id><source_context>{doc}</source_context></source>")
-                
-                section_sources.append({
-                    "source": {"id": source, "name": source},
-                    "document": docs,  
-                    "metadata": [{"source": source, "name": source}] * len(docs),
-                    "distances": real_distances 
-                })
-                # No need to increment since we're using source names directly
-            
-            retrieved_texts_with_sources = "\n\n".join(retrieved_chunks) if retrieved_chunks else "No relevant PDF documents found in knowledge base."
-            all_sources.extend(section_sources)
-            
-            logging.info(f"Added {len(section_sources)} sources to all_sources for {section}")
-            logging.info(f"Sources added: {[s.get('source', {}).get('name', 'unknown') for s in section_sources]}")
-            
-            logging.info(f"Found {len(all_search_results)} total chunks for {section} (KB + uploaded files processed together with advanced pipeline)")
-            logging.info(f"All sources found: {[source for _, source, _ in all_search_results]}")
-            
-            web_content = ""
-            web_links = []
-            web_scores = []
-            web_source_tags = []
-            
-            if form_data.web_search_enabled:
-                logging.info(f"Web search enabled for section: {section}")
-                # Check if this is Internal Facilities (works for both NSF and NIH)
-                is_internal_facilities = (
-                    section == "5a. Internal Facilities (NYU)" or 
-                    section == "Internal Facilities (NYU)"
-                )
-                
-                if is_internal_facilities:
-                    allowed_sites = request.app.state.config.RAG_WEB_SEARCH_INTERNAL_FACILITIES_SITES.get(user.email)
-                    logging.info(f"Using specific sites search for NYU Internal Facilities")
-                    logging.info(f"Allowed sites: {allowed_sites}")
-                    
-                    if allowed_sites:
-                        web_content, web_links, web_scores = facilities_web_search_specific_sites(
-                            query, allowed_sites, request, user
-                        )
-                    else:
-                        logging.warning("No allowed sites configured for NYU Internal Facilities, falling back to standard search")
-                        web_content, web_links, web_scores = facilities_web_search(query, request, user)
-                else:
-                    # Use improved query (user_text) for standard web search
-                    logging.info(f"Using standard web search for section: {section}")
-                    web_content, web_links, web_scores = facilities_web_search(query, request, user)
-                
-                logging.info(f"Web search results - Content length: {len(web_content) if web_content else 0}, Links: {len(web_links) if web_links else 0}")
-                
-                if web_content and web_links:
-                    
-                    web_content_parts = web_content.split('\n\n')
-                    
-                    for i, (content_part, url, score) in enumerate(zip(web_content_parts, web_links, web_scores)):
-                        if content_part.strip() and url.strip():
-                            # Use current source_index for this web source
-                            logging.info(f"Processing web source '{url}' using URL directly with score: {score}")
-                            web_source_tags.append(f"<source><source_id>{url}</source_id><source_context>{content_part.strip()}</source_context></source>")
-                            
+    def __init__(self):
+        self._tasks: Dict[tuple, asyncio.Task] = {}
 
-                            web_distances = [score]  # Use real score from web search
-                            
-                            # Create separate source for each URL (like existing NAGA system)
-                            all_sources.append({
-                                "source": {"id": url, "name": url, "url": url},  # Use URL as both name and url
-                                "document": [content_part.strip()],
-                                "metadata": [{"source": url, "name": url}],
-                                "distances": web_distances  # Use real distances/scores
-                            })
-                            logging.info(f"Added web source to all_sources: {url}")
-                            # No need to increment since we're using source names directly
-                
-                logging.info(f"Found {len(web_links)} web sources for {section}")
-                logging.info(f"Web URLs found: {web_links}")
-            else:
-                logging.info(f"Web search disabled for {section}")
-            
-            pdf_sources = "\n\n".join(retrieved_chunks) if retrieved_chunks else "No relevant PDF documents found in knowledge base."
-            # Only include web sources if web search is enabled
-            if form_data.web_search_enabled:
-                web_sources = "\n\n".join(web_source_tags) if web_source_tags else "No relevant web sources found."
+    async def get_or_run(self, key: tuple, factory):
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+        return await task
+
+
+def get_facilities_field_mappings(sponsor: str) -> Dict[str, str]:
+    """Mapping from form fields to section labels (1-to-1 for both NSF and NIH)"""
+    if sponsor == "NSF":
+        # NSF: 1-to-1 mapping to individual sections (will be grouped in response)
+        return {
+            "projectTitle": "Project Title",
+            "researchSpaceFacilities": "Research Space and Facilities",
+            "coreInstrumentation": "Core Instrumentation",
+            "computingDataResources": "Computing and Data Resources",
+            "internalFacilitiesNYU": "Internal Facilities (NYU)",
+            "externalFacilitiesOther": "External Facilities (Other Institutions)",
+            "specialInfrastructure": "Special Infrastructure"
+        }
+    # NIH: Individual sections
+    return {
+        "projectTitle": "1. Project Title",
+        "laboratory": "2. Laboratory",
+        "animal": "3. Animal",
+        "computer": "4. Computer",
+        "office": "5. Office",
+        "clinical": "6. Clinical",
+        "other": "7. Other",
+        "equipment": "8. Equipment"
+    }
+
+
+def build_files_to_process(model, files: Optional[List[Dict]]) -> List[Dict]:
+    """Combine the model's knowledge base collections and uploaded files"""
+    files_to_process = []
+
+    model_knowledge = model.get("info", {}).get("meta", {}).get("knowledge", False)
+    if model_knowledge:
+        for item in model_knowledge:
+            if item.get("collection_name"):
+                files_to_process.append({
+                    "id": item.get("collection_name"),
+                    "name": item.get("name"),
+                    "legacy": True,
+                })
+            elif item.get("collection_names"):
+                files_to_process.append({
+                    "name": item.get("name"),
+                    "type": "collection",
+                    "collection_names": item.get("collection_names"),
+                    "legacy": True,
+                })
             else:
-                web_sources = "Web search is disabled for this request."
-            
-            # For NSF: Individual sections are processed separately
-            # The grouping under NSF headers happens in the response formatting
-            section_specific_instructions = section_generation_instructions.get(section, "")
-            integration_instructions = ""
-            
-            # Use the section name as-is for the prompt (will be grouped later in response for NSF)
-            prompt = FACILITIES_PROMPT.format(
-                sponsor=form_data.sponsor,
-                section=section,
-                section_specific_instructions=section_specific_instructions,
-                user_input=user_text,
-                retrieved_chunks=pdf_sources,
-                web_snippets=web_sources,
-                integration_instructions=integration_instructions
+                files_to_process.append(item)
+
+    if files:
+        files_to_process.extend(files)
+
+    return files_to_process
+
+
+async def retrieve_section_file_results(
+    request: Request, user, model_id: str, files_to_process: List[Dict], user_text: str
+) -> List[tuple]:
+    """Run the chat file pipeline (knowledge base + uploaded files) for one query"""
+    from open_webui.utils.middleware import chat_completion_files_handler
+
+    all_file_results = []
+    section_specific_body = {
+        "model": model_id,
+        "metadata": {
+            "files": files_to_process  # Knowledge base + uploaded files together
+        },
+        "messages": [{"role": "user", "content": user_text}]  # Section-specific query
+    }
+
+    processed_body, file_flags = await chat_completion_files_handler(request, section_specific_body, user)
+    all_file_sources = file_flags.get("sources", [])
+
+    # Extract documents with actual distance scores
+    for source in all_file_sources:
+        documents = source.get("document", [])
+        distances = source.get("distances", [])
+        metadata = source.get("metadata", [])
+
+        # Extract source name from metadata (filename) first, fallback to file object name
+        source_name = "unknown"
+        if metadata and isinstance(metadata, list) and len(metadata) > 0:
+            first_metadata = metadata[0] if isinstance(metadata[0], dict) else {}
+            for key in ['source', 'name', 'filename', 'file_name']:
+                if key in first_metadata and first_metadata[key]:
+                    source_name = first_metadata[key]
+                    break
+
+        if source_name == "unknown":
+            file_obj = source.get("source", {})
+            if isinstance(file_obj, dict):
+                source_name = file_obj.get("name", file_obj.get("id", "unknown"))
+
+        # Use actual distance scores if available, otherwise use a default
+        for i, doc in enumerate(documents):
+            distance = distances[i] if i < len(distances) and distances[i] is not None else 0.15
+            all_file_results.append((doc, source_name, distance))
+
+    logging.info(f"Processed {len(all_file_sources)} sources (KB + uploaded), {len(all_file_results)} chunks")
+    return all_file_results
+
+
+async def generate_single_facilities_section(
+    request: Request,
+    user,
+    form_data: FacilitiesRequest,
+    section: str,
+    user_text: str,
+    files_to_process: List[Dict],
+    retrieval_cache: SectionRetrievalCache,
+) -> Dict:
+    """
+    Retrieve context, optionally web search, and generate one section.
+    Returns the section content, the sources it used and its citations.
+    """
+    logging.info(f"Processing section: {section}")
+
+    query = f"{section}: {user_text}"
+
+    # Process all files (knowledge base + uploaded) together with advanced pipeline
+    all_search_results = []
+    if files_to_process:
+        try:
+            all_search_results = await retrieval_cache.get_or_run(
+                ("files", user_text),
+                lambda: retrieve_section_file_results(
+                    request, user, form_data.model, files_to_process, user_text
+                ),
             )
-            
-            try:
-                generated_content = await call_llm_direct(prompt, form_data.model, user, request)
-                
-                import re
-                cleaned_content = generated_content.strip()
-                
-                if cleaned_content.startswith('Error:') or 'Connection aborted' in cleaned_content:
-                    logging.error(f"LLM returned error for {section}: {cleaned_content}")
-                    raise Exception(f"LLM generation failed for {section}: {cleaned_content}")
-                else:
-                    section_outputs[section] = cleaned_content
-                    
-                    # Extract cited sources from the generated text
-                    import re
-                    # Find all citations in the format [source_name] or [url]
-                    citations = re.findall(r'\[([^\]]+)\]', cleaned_content)
-                    for citation in citations:
-                        # Only add if it looks like a source (contains .pdf, .doc, http, or is a filename)
-                        # But exclude web URLs if web search is disabled
-                        if ('.pdf' in citation or '.doc' in citation or 
-                            (citation.startswith('http') and form_data.web_search_enabled) or 
-                            (len(citation) > 10 and not citation.startswith('http'))):  # Likely a filename, not a URL
-                            cited_sources.add(citation)
-                    
-                    logging.info(f"Generated content for {section}: {len(cleaned_content)} chars")
-                    logging.info(f"All citations found in {section}: {citations}")
-                    # Filter citations based on web search status
-                    if form_data.web_search_enabled:
-                        valid_citations = [c for c in citations if '.pdf' in c or '.doc' in c or c.startswith('http') or len(c) > 10]
-                    else:
-                        valid_citations = [c for c in citations if '.pdf' in c or '.doc' in c or (len(c) > 10 and not c.startswith('http'))]
-                    logging.info(f"Valid source citations in {section}: {valid_citations}")
-                    
-                    # Separate PDF and web citations for better debugging
-                    pdf_citations = [c for c in valid_citations if '.pdf' in c or '.doc' in c]
-                    web_citations = [c for c in valid_citations if c.startswith('http')]
-                    logging.info(f"PDF citations in {section}: {pdf_citations}")
-                    logging.info(f"Web citations in {section}: {web_citations}")
-                    logging.info(f"Content preview: {cleaned_content[:200]}...")
-                
-            except Exception as e:
-                logging.error(f"Failed to generate content for {section}: {e}")
-                raise Exception(f"Failed to generate content for {section}: {str(e)}")
-        
-        if not section_outputs:
-            return FacilitiesResponse(
-                success=False,
-                message="No sections generated",
-                content="",
-                sections={},
-                sources=[],
-                error="Failed to generate any sections"
+        except Exception as e:
+            logging.error(f"Error processing files for section '{section}': {e}")
+            # Continue without files for this section if processing fails
+
+    retrieved_chunks = []
+    section_sources = []
+
+    source_groups = {}
+    for doc, source, score in all_search_results:
+        if source not in source_groups:
+            source_groups[source] = []
+        source_groups[source].append((doc, score))
+
+    for source, docs_with_scores in source_groups.items():
+        docs = [doc for doc, score in docs_with_scores]
+        real_distances = [score for doc, score in docs_with_scores]
+
+        for doc in docs:
+            retrieved_chunks.append(f"<source><source_id>{source}</source_id><source_context>{doc}</source_context></source>")
+
+        section_sources.append({
+            "source": {"id": source, "name": source},
+            "document": docs,
+            "metadata": [{"source": source, "name": source}] * len(docs),
+            "distances": real_distances
+        })
+
+    logging.info(f"Found {len(all_search_results)} total chunks for {section} from {len(section_sources)} sources")
+
+    web_source_tags = []
+
+    if form_data.web_search_enabled:
+        # Check if this is Internal Facilities (works for both NSF and NIH)
+        is_internal_facilities = (
+            section == "5a. Internal Facilities (NYU)" or
+            section == "Internal Facilities (NYU)"
+        )
+
+        allowed_sites = None
+        if is_internal_facilities:
+            allowed_sites = request.app.state.config.RAG_WEB_SEARCH_INTERNAL_FACILITIES_SITES.get(user.email)
+            if not allowed_sites:
+                logging.warning("No allowed sites configured for NYU Internal Facilities, falling back to standard search")
+
+        # Tavily calls are blocking; keep them off the event loop
+        if allowed_sites:
+            web_content, web_links, web_scores = await retrieval_cache.get_or_run(
+                ("web-sites", query, tuple(allowed_sites)),
+                lambda: asyncio.to_thread(
+                    facilities_web_search_specific_sites, query, allowed_sites, request, user
+                ),
             )
-        
-        # For NSF: Group individual sections under NSF headers
-        if form_data.sponsor == "NSF":
-            # Group sections by NSF header
-            grouped_sections = {}
-            for individual_section, content in section_outputs.items():
-                nsf_header = nsf_header_mapping.get(individual_section)
-                if nsf_header:
-                    if nsf_header not in grouped_sections:
-                        grouped_sections[nsf_header] = []
-                    grouped_sections[nsf_header].append({
-                        "subsection": individual_section,
-                        "content": content
-                    })
-                else:
-                    logging.warning(f"No NSF header mapping found for section: {individual_section}")
-            
-            # Build formatted response with NSF headers and subsections
-            formatted_sections = {}
-            content = f"# Facilities Response for {form_data.sponsor}\n\n"
-            
-            # Define NSF header order and subsection order within each header
-            nsf_header_order = [
-                "1. Project Title",
-                "2. Facilities",
-                "3. Major Equipment",
-                "4. Other Resources"
-            ]
-            
-            # Define which headers should always use subsection headings (even for single subsections)
-            headers_with_subsections = ["3. Major Equipment", "4. Other Resources"]
-            
-            # Define subsection order for headers with multiple subsections
-            subsection_order = {
-                "3. Major Equipment": ["Core Instrumentation", "Computing and Data Resources"],
-                "4. Other Resources": ["Internal Facilities (NYU)", "External Facilities (Other Institutions)", "Special Infrastructure"]
-            }
-            
-            for nsf_header in nsf_header_order:
-                # Only include headers that have at least one subsection filled
-                # If no subsections are filled for a header, it will be skipped entirely
-                if nsf_header in grouped_sections:
-                    subsections = grouped_sections[nsf_header]
-                    
-                    if nsf_header in headers_with_subsections:
-                        # Sort subsections according to defined order
-                        if nsf_header in subsection_order:
-                            ordered_subsections = []
-                            subsection_dict = {sub['subsection']: sub for sub in subsections}
-                            for ordered_sub_name in subsection_order[nsf_header]:
-                                if ordered_sub_name in subsection_dict:
-                                    ordered_subsections.append(subsection_dict[ordered_sub_name])
-                            # Add any remaining subsections not in the order list
-                            for sub in subsections:
-                                if sub['subsection'] not in subsection_order[nsf_header]:
-                                    ordered_subsections.append(sub)
-                            subsections = ordered_subsections
-                        
-                        formatted_content = ""
-                        for sub in subsections:
-                            formatted_content += f"### {sub['subsection']}\n\n{sub['content']}\n\n"
-                        formatted_sections[nsf_header] = formatted_content.strip()
-                        content += f"## {nsf_header}\n\n{formatted_content}\n\n"
-                    else:
-                        # For single subsection headers (1. Project Title, 2. Facilities), include content directly (no ### heading)
-                        formatted_sections[nsf_header] = subsections[0]['content']
-                        content += f"## {nsf_header}\n\n{subsections[0]['content']}\n\n"
-            
-            # Update section_outputs to use NSF headers for response
-            section_outputs = formatted_sections
         else:
-            # NIH: Keep individual sections as-is
-            content = f"# Facilities Response for {form_data.sponsor}\n\n"
-            for section_name, section_content in section_outputs.items():
-                content += f"## {section_name}\n\n{section_content}\n\n"
-        
-        # Filter sources to only include those that were actually cited in the text
-        filtered_sources = []
-        for source in all_sources:
-            source_name = source.get('source', {}).get('name', '')
-            if source_name in cited_sources:
-                filtered_sources.append(source)
-        
-        formatted_sources = filtered_sources
-        logging.info(f"Total sources found: {len(all_sources)}")
-        logging.info(f"Sources actually cited: {len(cited_sources)}")
-        logging.info(f"Final sources count: {len(formatted_sources)}")
-        logging.info(f"Cited sources: {list(cited_sources)}")
-        logging.info(f"Final sources: {[s.get('source', {}).get('name', 'unknown') for s in formatted_sources]}")
-        
-        # Facilities response is added to current chat by frontend addFacilitiesResponseToChat function
-        
+            web_content, web_links, web_scores = await retrieval_cache.get_or_run(
+                ("web", query),
+                lambda: asyncio.to_thread(facilities_web_search, query, request, user),
+            )
+
+        if web_content and web_links:
+            web_content_parts = web_content.split('\n\n')
+
+            for content_part, url, score in zip(web_content_parts, web_links, web_scores):
+                if content_part.strip() and url.strip():
+                    web_source_tags.append(f"<source><source_id>{url}</source_id><source_context>{content_part.strip()}</source_context></source>")
+
+                    # Create separate source for each URL (like existing NAGA system)
+                    section_sources.append({
+                        "source": {"id": url, "name": url, "url": url},  # Use URL as both name and url
+                        "document": [content_part.strip()],
+                        "metadata": [{"source": url, "name": url}],
+                        "distances": [score]  # Use real score from web search
+                    })
+
+        logging.info(f"Found {len(web_links)} web sources for {section}")
+
+    pdf_sources = "\n\n".join(retrieved_chunks) if retrieved_chunks else "No relevant PDF documents found in knowledge base."
+    # Only include web sources if web search is enabled
+    if form_data.web_search_enabled:
+        web_sources = "\n\n".join(web_source_tags) if web_source_tags else "No relevant web sources found."
+    else:
+        web_sources = "Web search is disabled for this request."
+
+    section_generation_instructions = (
+        NIH_SECTION_GENERATION_INSTRUCTIONS if form_data.sponsor == "NIH" else {}
+    )
+
+    # Use the section name as-is for the prompt (will be grouped later in response for NSF)
+    prompt = FACILITIES_PROMPT.format(
+        sponsor=form_data.sponsor,
+        section=section,
+        section_specific_instructions=section_generation_instructions.get(section, ""),
+        user_input=user_text,
+        retrieved_chunks=pdf_sources,
+        web_snippets=web_sources,
+        integration_instructions=""
+    )
+
+    try:
+        generated_content = await call_llm_direct(prompt, form_data.model, user, request)
+    except Exception as e:
+        logging.error(f"Failed to generate content for {section}: {e}")
+        raise Exception(f"Failed to generate content for {section}: {str(e)}")
+
+    cleaned_content = generated_content.strip()
+    if cleaned_content.startswith('Error:') or 'Connection aborted' in cleaned_content:
+        logging.error(f"LLM returned error for {section}: {cleaned_content}")
+        raise Exception(f"Failed to generate content for {section}: LLM generation failed for {section}: {cleaned_content}")
+
+    # Extract cited sources from the generated text, in the format [source_name] or [url]
+    cited_sources = []
+    for citation in re.findall(r'\[([^\]]+)\]', cleaned_content):
+        # Only add if it looks like a source (contains .pdf, .doc, http, or is a filename)
+        # But exclude web URLs if web search is disabled
+        if ('.pdf' in citation or '.doc' in citation or
+            (citation.startswith('http') and form_data.web_search_enabled) or
+            (len(citation) > 10 and not citation.startswith('http'))):  # Likely a filename, not a URL
+            cited_sources.append(citation)
+
+    logging.info(f"Generated content for {section}: {len(cleaned_content)} chars, {len(cited_sources)} citations")
+
+    return {
+        "section": section,
+        "content": cleaned_content,
+        "sources": section_sources,
+        "cited_sources": cited_sources,
+    }
+
+
+async def schedule_facilities_sections(
+    request: Request,
+    user,
+    form_data: FacilitiesRequest,
+    user_inputs: Dict[str, str],
+    files_to_process: List[Dict],
+):
+    """
+    Run independent sections concurrently under the per-user concurrency cap and
+    yield (index, result) pairs as each section finishes. The index is the
+    section's position in user_inputs, so callers can restore a stable order.
+    """
+    semaphore = get_user_section_semaphore(user.id)
+    retrieval_cache = SectionRetrievalCache()
+
+    async def run(index: int, section: str, user_text: str):
+        async with semaphore:
+            result = await generate_single_facilities_section(
+                request, user, form_data, section, user_text, files_to_process, retrieval_cache
+            )
+        return index, result
+
+    tasks = [
+        asyncio.create_task(run(index, section, user_text))
+        for index, (section, user_text) in enumerate(user_inputs.items())
+    ]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # A failed section (or a disconnected stream) aborts the remaining work
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def get_facilities_user_inputs(form_data: FacilitiesRequest) -> Dict[str, str]:
+    user_inputs = {}
+    for form_key, section_label in get_facilities_field_mappings(form_data.sponsor).items():
+        if form_key in form_data.form_data:
+            text = form_data.form_data[form_key].strip()
+            if text:
+                user_inputs[section_label] = text
+    return user_inputs
+
+
+def build_facilities_response(
+    form_data: FacilitiesRequest, section_results: List[Dict]
+) -> FacilitiesResponse:
+    """Assemble ordered section results into the final facilities response"""
+    section_outputs = {}
+    all_sources = []
+    cited_sources = set()  # Track which sources are actually cited in the text
+    for result in section_results:
+        section_outputs[result["section"]] = result["content"]
+        all_sources.extend(result["sources"])
+        cited_sources.update(result["cited_sources"])
+
+    if not section_outputs:
         return FacilitiesResponse(
-            success=True,
-            message=f"Successfully generated {len(section_outputs)} sections for {form_data.sponsor}",
-            content=content,
-            sections=section_outputs, 
-            sources=formatted_sources,
-            error=None  # No error for successful generation
+            success=False,
+            message="No sections generated",
+            content="",
+            sections={},
+            sources=[],
+            error="Failed to generate any sections"
         )
-        
+
+    # For NSF: Group individual sections under NSF headers
+    if form_data.sponsor == "NSF":
+        # Group sections by NSF header
+        grouped_sections = {}
+        for individual_section, content in section_outputs.items():
+            nsf_header = NSF_HEADER_MAPPING.get(individual_section)
+            if nsf_header:
+                if nsf_header not in grouped_sections:
+                    grouped_sections[nsf_header] = []
+                grouped_sections[nsf_header].append({
+                    "subsection": individual_section,
+                    "content": content
+                })
+            else:
+                logging.warning(f"No NSF header mapping found for section: {individual_section}")
+
+        # Build formatted response with NSF headers and subsections
+        formatted_sections = {}
+        content = f"# Facilities Response for {form_data.sponsor}\n\n"
+
+        # Define NSF header order and subsection order within each header
+        nsf_header_order = [
+            "1. Project Title",
+            "2. Facilities",
+            "3. Major Equipment",
+            "4. Other Resources"
+        ]
+
+        # Define which headers should always use subsection headings (even for single subsections)
+        headers_with_subsections = ["3. Major Equipment", "4. Other Resources"]
+
+        # Define subsection order for headers with multiple subsections
+        subsection_order = {
+            "3. Major Equipment": ["Core Instrumentation", "Computing and Data Resources"],
+            "4. Other Resources": ["Internal Facilities (NYU)", "External Facilities (Other Institutions)", "Special Infrastructure"]
+        }
+
+        for nsf_header in nsf_header_order:
+            # Only include headers that have at least one subsection filled
+            # If no subsections are filled for a header, it will be skipped entirely
+            if nsf_header in grouped_sections:
+                subsections = grouped_sections[nsf_header]
+
+                if nsf_header in headers_with_subsections:
+                    # Sort subsections according to defined order
+                    if nsf_header in subsection_order:
+                        ordered_subsections = []
+                        subsection_dict = {sub['subsection']: sub for sub in subsections}
+                        for ordered_sub_name in subsection_order[nsf_header]:
+                            if ordered_sub_name in subsection_dict:
+                                ordered_subsections.append(subsection_dict[ordered_sub_name])
+                        # Add any remaining subsections not in the order list
+                        for sub in subsections:
+                            if sub['subsection'] not in subsection_order[nsf_header]:
+                                ordered_subsections.append(sub)
+                        subsections = ordered_subsections
+
+                    formatted_content = ""
+                    for sub in subsections:
+                        formatted_content += f"### {sub['subsection']}\n\n{sub['content']}\n\n"
+                    formatted_sections[nsf_header] = formatted_content.strip()
+                    content += f"## {nsf_header}\n\n{formatted_content}\n\n"
+                else:
+                    # For single subsection headers (1. Project Title, 2. Facilities), include content directly (no ### heading)
+                    formatted_sections[nsf_header] = subsections[0]['content']
+                    content += f"## {nsf_header}\n\n{subsections[0]['content']}\n\n"
+
+        # Update section_outputs to use NSF headers for response
+        section_outputs = formatted_sections
+    else:
+        # NIH: Keep individual sections as-is
+        content = f"# Facilities Response for {form_data.sponsor}\n\n"
+        for section_name, section_content in section_outputs.items():
+            content += f"## {section_name}\n\n{section_content}\n\n"
+
+    # Filter sources to only include those that were actually cited in the text
+    formatted_sources = [
+        source for source in all_sources
+        if source.get('source', {}).get('name', '') in cited_sources
+    ]
+    logging.info(f"Total sources found: {len(all_sources)}, cited: {len(cited_sources)}, final: {len(formatted_sources)}")
+
+    # Facilities response is added to current chat by frontend addFacilitiesResponseToChat function
+
+    return FacilitiesResponse(
+        success=True,
+        message=f"Successfully generated {len(section_outputs)} sections for {form_data.sponsor}",
+        content=content,
+        sections=section_outputs,
+        sources=formatted_sources,
+        error=None  # No error for successful generation
+    )
+
+
+async def prepare_facilities_generation(request: Request, form_data: FacilitiesRequest, user):
+    """Validate the request and resolve the model, section inputs and files"""
+    if not request.app.state.config.ENABLE_FACILITIES.get(user.email):
+        raise HTTPException(status_code=403, detail="Facilities feature is not enabled for this user")
+
+    if form_data.sponsor not in ["NSF", "NIH"]:
+        raise HTTPException(status_code=400, detail="Invalid sponsor. Must be 'NSF' or 'NIH'")
+
+    # Get model information for knowledge base access
+    models = await get_models_for_user(request, user)
+    model = models.get(form_data.model)
+    if not model:
+        raise HTTPException(status_code=400, detail="Model not found")
+
+    user_inputs = get_facilities_user_inputs(form_data)
+    files_to_process = build_files_to_process(model, form_data.files)
+    logging.info(f"Facilities request: {len(user_inputs)} sections, {len(files_to_process)} files/collections")
+    return user_inputs, files_to_process
+
+
+NO_INPUT_RESPONSE = dict(
+    success=False,
+    message="No input provided in form fields",
+    content="",
+    sections={},
+    sources=[],
+    error="Please fill in at least one form field"
+)
+
+
+@router.post("/generate", response_model=FacilitiesResponse)
+async def generate_facilities_response(request: Request, form_data: FacilitiesRequest, user=Depends(get_verified_user)):
+    """
+    Generate facilities response
+    Only works when facilities is enabled for the user
+    """
+    user_inputs, files_to_process = await prepare_facilities_generation(request, form_data, user)
+    if not user_inputs:
+        return FacilitiesResponse(**NO_INPUT_RESPONSE)
+
+    try:
+        results = [None] * len(user_inputs)
+        async for index, result in schedule_facilities_sections(
+            request, user, form_data, user_inputs, files_to_process
+        ):
+            results[index] = result
+
+        return build_facilities_response(form_data, results)
+
     except Exception as e:
         logging.error(f"Error in facilities generation: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+
+@router.post("/generate/stream")
+async def generate_facilities_response_stream(request: Request, form_data: FacilitiesRequest, user=Depends(get_verified_user)):
+    """
+    Generate facilities response, streaming each section as NDJSON as soon as it
+    is ready. Section events carry their index; the final "done" event holds the
+    complete response in deterministic section order.
+    """
+    user_inputs, files_to_process = await prepare_facilities_generation(request, form_data, user)
+
+    async def event_stream():
+        if not user_inputs:
+            yield json.dumps({"type": "done", "data": NO_INPUT_RESPONSE}) + "\n"
+            return
+
+        results = [None] * len(user_inputs)
+        try:
+            async for index, result in schedule_facilities_sections(
+                request, user, form_data, user_inputs, files_to_process
+            ):
+                results[index] = result
+                yield json.dumps({
+                    "type": "section",
+                    "index": index,
+                    "total": len(user_inputs),
+                    "section": result["section"],
+                    "content": result["content"],
+                }) + "\n"
+
+            response = build_facilities_response(form_data, results)
+            yield json.dumps({"type": "done", "data": response.model_dump()}) + "\n"
+        except Exception as e:
+            logging.error(f"Error in facilities generation: {e}")
+            yield json.dumps({"type": "error", "error": f"Internal server error: {str(e)}"}) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
 @router.post("/generate-section", response_model=SingleSectionResponse)
 async def generate_facilities_section(request: Request, form_data: SingleSectionRequest, user=Depends(get_verified_user)):
     """
     Generate facilities content for a single section.
     Called once per section so the frontend can display results progressively.
+    Concurrent calls of one user share the per-user section cap of /generate.
     """
     if not request.app.state.config.ENABLE_FACILITIES.get(user.email):
         raise HTTPException(status_code=403, detail="Facilities feature is not enabled for this user")
@@ -1005,232 +1097,37 @@ async def generate_facilities_section(request: Request, form_data: SingleSection
         if not model:
             raise HTTPException(status_code=400, detail="Model not found")
 
-        from open_webui.utils.middleware import chat_completion_files_handler
-        import re
-
-        logging.info(f"Processing section: {section}")
-        logging.info(f"Web search enabled flag: {form_data.web_search_enabled}")
-        query = user_text
-        all_file_results = []
-        all_sources = []
-        cited_sources = set()
-
-        # --- File processing (knowledge base + uploaded files) ---
-        model_knowledge = model.get("info", {}).get("meta", {}).get("knowledge", False)
-        files_to_process = []
-
-        if model_knowledge:
-            knowledge_files = []
-            for item in model_knowledge:
-                if item.get("collection_name"):
-                    knowledge_files.append({
-                        "id": item.get("collection_name"),
-                        "name": item.get("name"),
-                        "legacy": True,
-                    })
-                elif item.get("collection_names"):
-                    knowledge_files.append({
-                        "name": item.get("name"),
-                        "type": "collection",
-                        "collection_names": item.get("collection_names"),
-                        "legacy": True,
-                    })
-                else:
-                    knowledge_files.append(item)
-            files_to_process.extend(knowledge_files)
-            logging.info(f"Added {len(knowledge_files)} knowledge base collections for section '{section}'")
-
-        if form_data.files:
-            files_to_process.extend(form_data.files)
-            logging.info(f"Added {len(form_data.files)} uploaded files for section '{section}'")
-
-        if files_to_process:
-            try:
-                section_specific_body = {
-                    "model": form_data.model,
-                    "metadata": {"files": files_to_process},
-                    "messages": [{"role": "user", "content": user_text}]
-                }
-                processed_body, file_flags = await chat_completion_files_handler(request, section_specific_body, user)
-                all_file_sources = file_flags.get("sources", [])
-
-                for source in all_file_sources:
-                    documents = source.get("document", [])
-                    distances = source.get("distances", [])
-                    metadata = source.get("metadata", [])
-
-                    source_name = "unknown"
-                    if metadata and isinstance(metadata, list) and len(metadata) > 0:
-                        first_metadata = metadata[0] if isinstance(metadata[0], dict) else {}
-                        for key in ['source', 'name', 'filename', 'file_name']:
-                            if key in first_metadata and first_metadata[key]:
-                                source_name = first_metadata[key]
-                                break
-
-                    if source_name == "unknown":
-                        file_obj = source.get("source", {})
-                        if isinstance(file_obj, dict):
-                            source_name = file_obj.get("name", file_obj.get("id", "unknown"))
-
-                    for i, doc in enumerate(documents):
-                        distance = distances[i] if i < len(distances) and distances[i] is not None else 0.15
-                        all_file_results.append((doc, source_name, distance))
-
-                logging.info(f"Processed {len(all_file_sources)} sources (KB + uploaded) for section '{section}'")
-                logging.info(f"Added {len(all_file_results)} total chunks for {section}")
-            except Exception as e:
-                logging.error(f"Error processing files for section '{section}': {e}")
-
-        all_search_results = all_file_results
-
-        # --- Source grouping ---
-        retrieved_chunks = []
-        section_sources = []
-
-        source_groups = {}
-        for doc, source, score in all_search_results:
-            if source not in source_groups:
-                source_groups[source] = []
-            source_groups[source].append((doc, score))
-
-        for source, docs_with_scores in source_groups.items():
-            logging.info(f"Processing source '{source}' with {len(docs_with_scores)} documents, using source name directly")
-            
-            docs = [doc for doc, score in docs_with_scores]
-            real_distances = [score for doc, score in docs_with_scores]
-
-            for doc in docs:
-                retrieved_chunks.append(f"<source><source_id>{source}</source_id><source_context>{doc}</source_context></source>")
-
-            section_sources.append({
-                "source": {"id": source, "name": source},
-                "document": docs,
-                "metadata": [{"source": source, "name": source}] * len(docs),
-                "distances": real_distances
-            })
-
-        all_sources.extend(section_sources)
-        
-        logging.info(f"Added {len(section_sources)} sources to all_sources for {section}")
-        logging.info(f"Sources added: {[s.get('source', {}).get('name', 'unknown') for s in section_sources]}")
-        logging.info(f"Found {len(all_search_results)} total chunks for {section} (KB + uploaded files processed together with advanced pipeline)")
-        logging.info(f"All sources found: {[source for _, source, _ in all_search_results]}")
-
-        # --- Web search ---
-        web_content = ""
-        web_links = []
-        web_scores = []
-        web_source_tags = []
-        
-        if form_data.web_search_enabled:
-            logging.info(f"Web search enabled for section: {section}")
-            is_internal_facilities = (
-                section == "5a. Internal Facilities (NYU)" or
-                section == "Internal Facilities (NYU)"
-            )
-
-            if is_internal_facilities:
-                allowed_sites = request.app.state.config.RAG_WEB_SEARCH_INTERNAL_FACILITIES_SITES.get(user.email)
-                logging.info(f"Using specific sites search for NYU Internal Facilities")
-                logging.info(f"Allowed sites: {allowed_sites}")
-                
-                if allowed_sites:
-                    web_content, web_links, web_scores = facilities_web_search_specific_sites(
-                        query, allowed_sites, request, user
-                    )
-                else:
-                    logging.warning("No allowed sites configured for NYU Internal Facilities, falling back to standard search")
-                    web_content, web_links, web_scores = facilities_web_search(query, request, user)
-            else:
-                logging.info(f"Using standard web search for section: {section}")
-                web_content, web_links, web_scores = facilities_web_search(query, request, user)
-            
-            logging.info(f"Web search results - Content length: {len(web_content) if web_content else 0}, Links: {len(web_links) if web_links else 0}")
-
-            if web_content and web_links:
-                web_content_parts = web_content.split('\n\n')
-                for i, (content_part, url, score) in enumerate(zip(web_content_parts, web_links, web_scores)):
-                    if content_part.strip() and url.strip():
-                        logging.info(f"Processing web source '{url}' using URL directly with score: {score}")
-                        web_source_tags.append(
-                            f"<source><source_id>{url}</source_id><source_context>{content_part.strip()}</source_context></source>"
-                        )
-                        all_sources.append({
-                            "source": {"id": url, "name": url, "url": url},
-                            "document": [content_part.strip()],
-                            "metadata": [{"source": url, "name": url}],
-                            "distances": [score]
-                        })
-                        logging.info(f"Added web source to all_sources: {url}")
-            
-            logging.info(f"Found {len(web_links)} web sources for {section}")
-            logging.info(f"Web URLs found: {web_links}")
-        else:
-            logging.info(f"Web search disabled for {section}")
-
-        # --- Build prompt ---
-        pdf_sources = "\n\n".join(retrieved_chunks) if retrieved_chunks else "No relevant PDF documents found in knowledge base."
-        if form_data.web_search_enabled:
-            web_sources = "\n\n".join(web_source_tags) if web_source_tags else "No relevant web sources found."
-        else:
-            web_sources = "Web search is disabled for this request."
-
-        prompt = FACILITIES_PROMPT.format(
+        section_form_data = FacilitiesRequest(
             sponsor=form_data.sponsor,
-            section=section,
-            section_specific_instructions="",
-            user_input=user_text,
-            retrieved_chunks=pdf_sources,
-            web_snippets=web_sources,
-            integration_instructions=""
+            form_data={form_data.section_key: user_text},
+            model=form_data.model,
+            web_search_enabled=form_data.web_search_enabled,
+            files=form_data.files,
         )
+        async with get_user_section_semaphore(user.id):
+            result = await generate_single_facilities_section(
+                request,
+                user,
+                section_form_data,
+                section,
+                user_text,
+                build_files_to_process(model, form_data.files),
+                SectionRetrievalCache(),
+            )
 
-        # --- LLM call ---
-        generated_content = await call_llm_direct(prompt, form_data.model, user, request)
-        cleaned_content = generated_content.strip()
-
-        if cleaned_content.startswith('Error:') or 'Connection aborted' in cleaned_content:
-            raise Exception(f"LLM generation failed for {section}: {cleaned_content}")
-
-        # --- Citation extraction & source filtering ---
-        citations = re.findall(r'\[([^\]]+)\]', cleaned_content)
-        for citation in citations:
-            if ('.pdf' in citation or '.doc' in citation or 
-                (citation.startswith('http') and form_data.web_search_enabled) or 
-                (len(citation) > 10 and not citation.startswith('http'))):
-                cited_sources.add(citation)
-        
-        logging.info(f"Generated content for {section}: {len(cleaned_content)} chars")
-        logging.info(f"All citations found in {section}: {citations}")
-        # Filter citations based on web search status
-        if form_data.web_search_enabled:
-            valid_citations = [c for c in citations if '.pdf' in c or '.doc' in c or c.startswith('http') or len(c) > 10]
-        else:
-            valid_citations = [c for c in citations if '.pdf' in c or '.doc' in c or (len(c) > 10 and not c.startswith('http'))]
-        logging.info(f"Valid source citations in {section}: {valid_citations}")
-        
-        # Separate PDF and web citations for better debugging
-        pdf_citations = [c for c in valid_citations if '.pdf' in c or '.doc' in c]
-        web_citations = [c for c in valid_citations if c.startswith('http')]
-        logging.info(f"PDF citations in {section}: {pdf_citations}")
-        logging.info(f"Web citations in {section}: {web_citations}")
-        logging.info(f"Content preview: {cleaned_content[:200]}...")
-
-        filtered_sources = []
-        for source in all_sources:
-            source_name = source.get('source', {}).get('name', '')
-            if source_name in cited_sources:
-                filtered_sources.append(source)
-
-        logging.info(f"Total sources found: {len(all_sources)}")
-        logging.info(f"Sources actually cited: {len(cited_sources)}")
-        logging.info(f"Final sources count: {len(filtered_sources)}")
+        # Only the sources the generated text cites
+        cited_sources = set(result["cited_sources"])
+        filtered_sources = [
+            source for source in result["sources"]
+            if source.get("source", {}).get("name", "") in cited_sources
+        ]
+        logging.info(f"Sources for {section}: {len(result['sources'])} found, {len(filtered_sources)} cited")
 
         return SingleSectionResponse(
             success=True,
             section_key=form_data.section_key,
             section_label=section,
-            generated_content=cleaned_content,
+            generated_content=result["content"],
             sources=filtered_sources,
             error=None
         )
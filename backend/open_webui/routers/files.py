@@ -1,4 +1,5 @@
 import logging
+import mimetypes
 import os
 import uuid
 from pathlib import Path
@@ -6,7 +7,9 @@ from typing import Optional
 from urllib.parse import quote
 import time 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, UploadFile, status
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from open_webui.config import STORAGE_PRESIGNED_URL_EXPIRES
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.models.files import (
@@ -15,12 +18,21 @@ from open_webui.models.files import (
     FileModelResponse,
     Files,
 )
-from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.models.knowledge import Knowledges
+from open_webui.socket.progress import update_file_processing_status
+from open_webui.routers.retrieval import (
+    ProcessFileForm,
+    copy_processed_file,
+    get_file_processing_signature,
+    process_file,
+    reindex_file_incrementally,
+)
 from open_webui.utils.job_queue import is_job_queue_available
 from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.file_cleanup import cleanup_file_completely
+from open_webui.utils.misc import HashingFileReader
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
@@ -51,7 +63,10 @@ def upload_file(
         id = str(uuid.uuid4())
         name = filename
         filename = f"{id}_{filename}"
-        contents, file_path = Storage.upload_file(file.file, filename)
+        reader = HashingFileReader(file.file)
+        size, file_path = Storage.upload_file(reader, filename)
+        content_hash = reader.hexdigest()
+        processing_signature = get_file_processing_signature(request, user)
 
         file_item = Files.insert_new_file(
             user.id,
@@ -60,16 +75,33 @@ def upload_file(
                     "id": id,
                     "filename": name,
                     "path": file_path,
+                    "content_hash": content_hash,
                     "meta": {
                         "name": name,
                         "content_type": file.content_type,
-                        "size": len(contents),
+                        "size": size,
                         "data": file_metadata,
+                        "processing_signature": processing_signature,
                     },
                 }
             ),
         )
 
+        # Same bytes already processed with the same settings: copy the
+        # extracted content and chunks instead of running loaders and embeddings
+        duplicate = Files.get_processed_file_by_content_hash(
+            content_hash, processing_signature, exclude_id=id
+        )
+        if duplicate:
+            try:
+                if copy_processed_file(request, duplicate, file_item, user=user):
+                    log.info(f"Deduplicated upload {id} from file {duplicate.id}")
+                    return Files.get_file_by_id(id=id)
+            except Exception as e:
+                log.warning(
+                    f"Could not reuse processed file {duplicate.id} for {id}, processing normally: {e}"
+                )
+
         # Process file in background
         # NOTE: process_file will set processing_status="pending" when it enqueues the job
         # We don't set it here to avoid race condition where process_file sees "pending" and skips processing
@@ -104,7 +136,7 @@ def upload_file(
                 log.error(f"Error starting background processing for file: {id}")
                 # Mark file as error since background task failed to start
                 try:
-                    Files.update_file_metadata_by_id(
+                    update_file_processing_status(
                         id,
                         {
                             "processing_status": "error",
@@ -136,10 +168,114 @@ def upload_file(
 
 
 
+############################
+# Stream File Content
+############################
+
+
+def _parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    (start, end) of a single "bytes=" range, inclusive, or None to send the
+    whole file (no header, several ranges or a syntactically invalid one,
+    which RFC 7233 says to ignore, e.g. "bytes=5-2").
+    Raises 416 if the range lies outside the file.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, dash, last = range_header[len("bytes="):].strip().partition("-")
+    if not dash or not (first or last):
+        return None
+    if not all(part.isascii() and part.isdigit() for part in (first, last) if part):
+        return None
+
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def stream_file_response(
+    request: Request,
+    file: FileModel,
+    headers: dict,
+    media_type: Optional[str] = None,
+) -> Response:
+    """
+    Serve a stored file without materializing it locally first: byte ranges
+    are read from the storage provider as the client consumes them.
+
+    Supports Range/If-Range (single range), ETag/If-None-Match and, with
+    STORAGE_PRESIGNED_URL_EXPIRES set, redirects to a presigned URL.
+    """
+    filename = file.meta.get("name", file.filename)
+    media_type = media_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if STORAGE_PRESIGNED_URL_EXPIRES > 0:
+        url = await run_in_threadpool(
+            Storage.get_download_url,
+            file.path,
+            content_disposition=headers.get("Content-Disposition"),
+            content_type=media_type,
+            expires_in=STORAGE_PRESIGNED_URL_EXPIRES,
+        )
+        if url:
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    try:
+        info = await run_in_threadpool(Storage.get_file_info, file.path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+    size, etag = info["size"], info["etag"]
+    headers = {**headers, "ETag": etag, "Accept-Ranges": "bytes"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range == etag:
+        byte_range = _parse_range(request.headers.get("range"), size)
+
+    if byte_range:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        start, end = 0, size - 1
+        status_code = status.HTTP_200_OK
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        Storage.iter_file(file.path, start, end, etag=etag) if size else iter([]),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
 ## download file with temporary link /start
 
 @router.get("/download/{id}")
-async def download_by_id(id: str, user=Depends(get_verified_user)):
+async def download_by_id(
+    request: Request, id: str, user=Depends(get_verified_user)
+):
 
     file = Files.get_file_by_id(id)
     # if not file:
@@ -159,39 +295,27 @@ async def download_by_id(id: str, user=Depends(get_verified_user)):
     
     if file and (file.user_id == user.id or user.role == "admin"):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                # Handle Unicode filenames
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)  # RFC5987 encoding
-
-                content_type = file.meta.get("content_type")
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)
-                headers = {}
-
-                if content_type == "application/pdf" or filename.lower().endswith(
-                    ".pdf"
-                ):
-                    headers["Content-Disposition"] = (
-                        f"inline; filename*=UTF-8''{encoded_filename}"
-                    )
-                    content_type = "application/pdf"
-                elif content_type != "text/plain":
-                    headers["Content-Disposition"] = (
-                        f"attachment; filename*=UTF-8''{encoded_filename}"
-                    )
-
-                return FileResponse(file_path, headers=headers, media_type=content_type)
-
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ERROR_MESSAGES.NOT_FOUND,
+            # Handle Unicode filenames
+            content_type = file.meta.get("content_type")
+            filename = file.meta.get("name", file.filename)
+            encoded_filename = quote(filename)  # RFC5987 encoding
+            headers = {}
+
+            if content_type == "application/pdf" or filename.lower().endswith(
+                ".pdf"
+            ):
+                headers["Content-Disposition"] = (
+                    f"inline; filename*=UTF-8''{encoded_filename}"
+                )
+                content_type = "application/pdf"
+            elif content_type != "text/plain":
+                headers["Content-Disposition"] = (
+                    f"attachment; filename*=UTF-8''{encoded_filename}"
                 )
+
+            return await stream_file_response(request, file, headers, content_type)
+        except HTTPException:
+            raise
         except Exception as e:
             log.exception(e)
             log.error("Error downloading file content")
@@ -368,13 +492,38 @@ async def update_file_data_content_by_id(
 
     if file and (file.user_id == user.id or user.role == "admin"):
         try:
-            # process_file will use job queue if available, otherwise BackgroundTasks
-            process_file(
-                request,
-                ProcessFileForm(file_id=id, content=form_data.content),
-                user=user,
-                background_tasks=background_tasks,
-            )
+            stats = None
+            if not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
+                try:
+                    # Re-embed only the changed chunks of an already indexed file
+                    file = Files.update_file_data_by_id(
+                        id, {"content": form_data.content}
+                    )
+                    stats = await run_in_threadpool(
+                        reindex_file_incrementally,
+                        request,
+                        file,
+                        [
+                            knowledge.id
+                            for knowledge in Knowledges.get_knowledge_bases_by_file_id(id)
+                        ],
+                        user,
+                        user.email,
+                    )
+                except Exception as e:
+                    log.exception(e)
+                    log.warning(
+                        f"Incremental re-index failed for file {id}, reprocessing it fully"
+                    )
+
+            if stats is None:
+                # process_file will use job queue if available, otherwise BackgroundTasks
+                process_file(
+                    request,
+                    ProcessFileForm(file_id=id, content=form_data.content),
+                    user=user,
+                    background_tasks=background_tasks,
+                )
             file = Files.get_file_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -394,43 +543,33 @@ async def update_file_data_content_by_id(
 
 
 @router.get("/{id}/content")
-async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
+async def get_file_content_by_id(
+    request: Request, id: str, user=Depends(get_verified_user)
+):
     file = Files.get_file_by_id(id)
     if file and (file.user_id == user.id or user.role == "admin"):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                # Handle Unicode filenames
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)  # RFC5987 encoding
-
-                content_type = file.meta.get("content_type")
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)
-                headers = {}
-
-                if content_type == "application/pdf" or filename.lower().endswith(
-                    ".pdf"
-                ):
-                    headers["Content-Disposition"] = (
-                        f"inline; filename*=UTF-8''{encoded_filename}"
-                    )
-                    content_type = "application/pdf"
-                elif content_type != "text/plain":
-                    headers["Content-Disposition"] = (
-                        f"attachment; filename*=UTF-8''{encoded_filename}"
-                    )
-
-                return FileResponse(file_path, headers=headers, media_type=content_type)
-
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ERROR_MESSAGES.NOT_FOUND,
+            # Handle Unicode filenames
+            content_type = file.meta.get("content_type")
+            filename = file.meta.get("name", file.filename)
+            encoded_filename = quote(filename)  # RFC5987 encoding
+            headers = {}
+
+            if content_type == "application/pdf" or filename.lower().endswith(
+                ".pdf"
+            ):
+                headers["Content-Disposition"] = (
+                    f"inline; filename*=UTF-8''{encoded_filename}"
                 )
+                content_type = "application/pdf"
+            elif content_type != "text/plain":
+                headers["Content-Disposition"] = (
+                    f"attachment; filename*=UTF-8''{encoded_filename}"
+                )
+
+            return await stream_file_response(request, file, headers, content_type)
+        except HTTPException:
+            raise
         except Exception as e:
             log.exception(e)
             log.error("Error getting file content")
@@ -477,7 +616,9 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
 
 
 @router.get("/{id}/content/{file_name}")
-async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
+async def get_file_content_by_id(
+    request: Request, id: str, user=Depends(get_verified_user)
+):
     file = Files.get_file_by_id(id)
 
     if file and (file.user_id == user.id or user.role == "admin"):
@@ -491,17 +632,7 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
         }
 
         if file_path:
-            file_path = Storage.get_file(file_path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                return FileResponse(file_path, headers=headers)
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ERROR_MESSAGES.NOT_FOUND,
-                )
+            return await stream_file_response(request, file, headers)
         else:
             # File path doesn’t exist, return the content as .txt if possible
             file_content = file.content.get("content", "")
@@ -10,12 +10,15 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileModelResponse
+from open_webui.models.users import Users
+from open_webui.socket.progress import update_file_processing_status
 from open_webui.retrieval.vector.connector import VECTOR_DB_CLIENT
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
     process_files_batch,
     BatchProcessFilesForm,
+    reindex_file_incrementally,
 )
 from open_webui.utils.job_queue import is_job_queue_available
 from open_webui.storage.provider import Storage
@@ -506,12 +509,12 @@ async def add_file_to_knowledge_by_id(
             safe_add_span_event("file.upload.started", {"file_id": file_id, "filename": name})
             
             filename = f"{file_id}_{filename}"
-            contents, file_path = Storage.upload_file(file.file, filename)
+            size, file_path = Storage.upload_file(file.file, filename)
             
             # Update span with file size after upload
-            safe_set_span_attribute(span, "file.size", len(contents))
+            safe_set_span_attribute(span, "file.size", size)
             
-            safe_add_span_event("file.upload.stored", {"file_path": file_path, "file_size": len(contents)})
+            safe_add_span_event("file.upload.stored", {"file_path": file_path, "file_size": size})
 
             file_item = Files.insert_new_file(
                 user.id,
@@ -523,7 +526,7 @@ async def add_file_to_knowledge_by_id(
                         "meta": {
                             "name": name,
                             "content_type": file.content_type,
-                            "size": len(contents),
+                            "size": size,
                             "data": file_metadata,
                         },
                     }
@@ -572,7 +575,7 @@ async def add_file_to_knowledge_by_id(
                     })
                     # Mark file as error since background task failed to start
                     try:
-                        Files.update_file_metadata_by_id(
+                        update_file_processing_status(
                             file_id,
                             {
                                 "processing_status": "error",
@@ -697,6 +700,25 @@ def update_file_from_knowledge_by_id(
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
+    # Only re-embed the chunks whose text changed, if the file was indexed before
+    if not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
+        try:
+            owner = Users.get_user_by_id(knowledge.user_id)
+            if reindex_file_incrementally(
+                request,
+                file,
+                knowledge_ids=[knowledge.id],
+                user=user,
+                owner_email=owner.email if owner else user.email,
+            ):
+                files = Files.get_files_by_ids((knowledge.data or {}).get("file_ids", []))
+                return KnowledgeFilesResponse(**knowledge.model_dump(), files=files)
+        except Exception as e:
+            log.exception(e)
+            log.warning(
+                f"Incremental re-index failed for file {file.id}, reprocessing it fully"
+            )
+
     # Remove content from the vector database
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
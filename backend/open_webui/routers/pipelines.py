@@ -10,27 +10,144 @@ from fastapi import (
     APIRouter,
 )
 import aiohttp
-import os
+import asyncio
 import logging
-import shutil
-import requests
+import time
 from pydantic import BaseModel
-from starlette.responses import FileResponse
-from typing import Optional
-
-from open_webui.env import SRC_LOG_LEVELS
-from open_webui.config import CACHE_DIR
+from typing import Any, Optional
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_TIMEOUT,
+    AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST,
+    PIPELINES_CACHE_TTL,
+    PIPELINES_CLIENT_POOL_SIZE,
+    SRC_LOG_LEVELS,
+)
 from open_webui.constants import ERROR_MESSAGES
 
-
-from open_webui.routers.openai import get_all_models_responses
-
 from open_webui.utils.auth import get_admin_user
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
+##################################
+#
+# Pipelines Client
+#
+##################################
+
+_session: Optional[aiohttp.ClientSession] = None
+
+# (method, url, key) -> (expires_at, response)
+_cache: dict[tuple, tuple[float, Any]] = {}
+
+
+def get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=PIPELINES_CLIENT_POOL_SIZE, keepalive_timeout=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            trust_env=True,
+        )
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _cache.clear()
+
+
+class PipelinesRequestError(Exception):
+    def __init__(self, status_code: int, detail: Optional[str] = None):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def send_pipelines_request(
+    method: str, url: str, key: str, timeout: Optional[int] = None, **kwargs
+) -> dict:
+    """Call a pipelines server over the shared session; errors raise PipelinesRequestError."""
+    # Without an explicit timeout the session's AIOHTTP_CLIENT_TIMEOUT applies;
+    # passing timeout=None would disable it
+    if timeout:
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+    try:
+        async with get_session().request(
+            method,
+            url,
+            headers={"Authorization": f"Bearer {key}"},
+            **kwargs,
+        ) as r:
+            if r.status >= 400:
+                detail = None
+                try:
+                    res = await r.json(content_type=None)
+                    if isinstance(res, dict) and "detail" in res:
+                        detail = res["detail"]
+                except Exception:
+                    pass
+                raise PipelinesRequestError(r.status, detail)
+            return await r.json(content_type=None)
+    except PipelinesRequestError:
+        raise
+    except Exception as e:
+        raise PipelinesRequestError(status.HTTP_404_NOT_FOUND) from e
+
+
+async def get_cached_pipelines_response(url: str, key: str) -> dict:
+    """GET with a short TTL cache, for listings and valve specs."""
+    cache_key = ("GET", url, key)
+    cached = _cache.get(cache_key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    data = await send_pipelines_request(
+        "GET", url, key, timeout=AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST
+    )
+    if PIPELINES_CACHE_TTL > 0:
+        _cache[cache_key] = (time.monotonic() + PIPELINES_CACHE_TTL, data)
+    return data
+
+
+def invalidate_pipelines_cache(base_url: Optional[str] = None):
+    """Drop cached responses of one pipelines server (or all)."""
+    for cache_key in list(_cache.keys()):
+        if base_url is None or cache_key[1].startswith(f"{base_url}/"):
+            _cache.pop(cache_key, None)
+
+
+def get_pipelines_connection(
+    request: Request, urlIdx: Optional[int]
+) -> tuple[str, str]:
+    url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
+    key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+    return url, key
+
+
+def raise_pipelines_http_exception(e: Exception):
+    # Handle connection error here
+    log.exception(f"Connection error: {e}")
+
+    status_code = status.HTTP_404_NOT_FOUND
+    detail = None
+    if isinstance(e, PipelinesRequestError):
+        status_code = e.status_code
+        detail = e.detail
+
+    raise HTTPException(
+        status_code=status_code,
+        detail=detail if detail else "Pipeline not found",
+    )
+
+
 ##################################
 #
 # Pipeline Middleware
@@ -66,42 +183,42 @@ async def process_pipeline_inlet_filter(request, payload, user, models):
     if "pipeline" in model:
         sorted_filters.append(model)
 
-    async with aiohttp.ClientSession() as session:
-        for filter in sorted_filters:
-            urlIdx = filter.get("urlIdx")
-            if urlIdx is None:
-                continue
-
-            url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-            key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-            if not key:
-                continue
+    session = get_session()
+    for filter in sorted_filters:
+        urlIdx = filter.get("urlIdx")
+        if urlIdx is None:
+            continue
 
-            headers = {"Authorization": f"Bearer {key}"}
-            request_data = {
-                "user": user,
-                "body": payload,
-            }
+        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
+        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
 
-            try:
-                async with session.post(
-                    f"{url}/{filter['id']}/filter/inlet",
-                    headers=headers,
-                    json=request_data,
-                ) as response:
-                    response.raise_for_status()
-                    payload = await response.json()
-            except aiohttp.ClientResponseError as e:
-                res = (
-                    await response.json()
-                    if response.content_type == "application/json"
-                    else {}
-                )
-                if "detail" in res:
-                    raise Exception(response.status, res["detail"])
-            except Exception as e:
-                log.exception(f"Connection error: {e}")
+        if not key:
+            continue
+
+        headers = {"Authorization": f"Bearer {key}"}
+        request_data = {
+            "user": user,
+            "body": payload,
+        }
+
+        try:
+            async with session.post(
+                f"{url}/{filter['id']}/filter/inlet",
+                headers=headers,
+                json=request_data,
+            ) as response:
+                response.raise_for_status()
+                payload = await response.json()
+        except aiohttp.ClientResponseError as e:
+            res = (
+                await response.json()
+                if response.content_type == "application/json"
+                else {}
+            )
+            if "detail" in res:
+                raise Exception(response.status, res["detail"])
+        except Exception as e:
+            log.exception(f"Connection error: {e}")
 
     return payload
 
@@ -115,45 +232,45 @@ async def process_pipeline_outlet_filter(request, payload, user, models):
     if "pipeline" in model:
         sorted_filters = [model] + sorted_filters
 
-    async with aiohttp.ClientSession() as session:
-        for filter in sorted_filters:
-            urlIdx = filter.get("urlIdx")
-            if urlIdx is None:
-                continue
+    session = get_session()
+    for filter in sorted_filters:
+        urlIdx = filter.get("urlIdx")
+        if urlIdx is None:
+            continue
 
-            url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-            key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-            if not key:
-                continue
-
-            headers = {"Authorization": f"Bearer {key}"}
-            request_data = {
-                "user": user,
-                "body": payload,
-            }
+        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
+        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
 
+        if not key:
+            continue
+
+        headers = {"Authorization": f"Bearer {key}"}
+        request_data = {
+            "user": user,
+            "body": payload,
+        }
+
+        try:
+            async with session.post(
+                f"{url}/{filter['id']}/filter/outlet",
+                headers=headers,
+                json=request_data,
+            ) as response:
+                response.raise_for_status()
+                payload = await response.json()
+        except aiohttp.ClientResponseError as e:
             try:
-                async with session.post(
-                    f"{url}/{filter['id']}/filter/outlet",
-                    headers=headers,
-                    json=request_data,
-                ) as response:
-                    response.raise_for_status()
-                    payload = await response.json()
-            except aiohttp.ClientResponseError as e:
-                try:
-                    res = (
-                        await response.json()
-                        if "application/json" in response.content_type
-                        else {}
-                    )
-                    if "detail" in res:
-                        raise Exception(response.status, res)
-                except Exception:
-                    pass
-            except Exception as e:
-                log.exception(f"Connection error: {e}")
+                res = (
+                    await response.json()
+                    if "application/json" in response.content_type
+                    else {}
+                )
+                if "detail" in res:
+                    raise Exception(response.status, res)
+            except Exception:
+                pass
+        except Exception as e:
+            log.exception(f"Connection error: {e}")
 
     return payload
 
@@ -169,19 +286,41 @@ router = APIRouter()
 
 @router.get("/list")
 async def get_pipelines_list(request: Request, user=Depends(get_admin_user)):
-    responses = await get_all_models_responses(request, user)
-    log.debug(f"get_pipelines_list: get_openai_models_responses returned {responses}")
+    config = request.app.state.config
+    if not config.ENABLE_OPENAI_API:
+        return {"data": []}
+
+    async def get_models_response(idx: int, url: str) -> Optional[dict]:
+        api_config = config.OPENAI_API_CONFIGS.get(
+            str(idx), config.OPENAI_API_CONFIGS.get(url, {})  # Legacy support
+        )
+        # Disabled connections and connections with a fixed model list are never
+        # queried for models, so they can't be pipelines servers either
+        if not api_config.get("enable", True) or api_config.get("model_ids"):
+            return None
+        key = config.OPENAI_API_KEYS[idx] if idx < len(config.OPENAI_API_KEYS) else ""
+        return await get_cached_pipelines_response(f"{url}/models", key)
+
+    # Query every connection concurrently: one round trip regardless of how many are configured
+    responses = await asyncio.gather(
+        *(
+            get_models_response(idx, url)
+            for idx, url in enumerate(config.OPENAI_API_BASE_URLS)
+        ),
+        return_exceptions=True,
+    )
+    log.debug(f"get_pipelines_list: models responses {responses}")
 
     urlIdxs = [
         idx
         for idx, response in enumerate(responses)
-        if response is not None and "pipelines" in response
+        if isinstance(response, dict) and "pipelines" in response
     ]
 
     return {
         "data": [
             {
-                "url": request.app.state.config.OPENAI_API_BASE_URLS[urlIdx],
+                "url": config.OPENAI_API_BASE_URLS[urlIdx],
                 "idx": urlIdx,
             }
             for urlIdx in urlIdxs
@@ -204,54 +343,25 @@ async def upload_pipeline(
             detail="Only Python (.py) files are allowed.",
         )
 
-    upload_folder = f"{CACHE_DIR}/pipelines"
-    os.makedirs(upload_folder, exist_ok=True)
-    file_path = os.path.join(upload_folder, file.filename)
-
-    r = None
     try:
-        # Save the uploaded file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        with open(file_path, "rb") as f:
-            files = {"file": f}
-            r = requests.post(
-                f"{url}/pipelines/upload",
-                headers={"Authorization": f"Bearer {key}"},
-                files=files,
-            )
-
-        r.raise_for_status()
-        data = r.json()
+        url, key = get_pipelines_connection(request, urlIdx)
+
+        # Forward the uploaded file as-is, no temporary copy on disk
+        form = aiohttp.FormData()
+        form.add_field(
+            "file",
+            await file.read(),
+            filename=file.filename,
+            content_type=file.content_type or "text/x-python",
+        )
+        data = await send_pipelines_request(
+            "POST", f"{url}/pipelines/upload", key, data=form
+        )
+        invalidate_pipelines_cache(url)
 
         return {**data}
     except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        status_code = status.HTTP_404_NOT_FOUND
-        if r is not None:
-            status_code = r.status_code
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=status_code,
-            detail=detail if detail else "Pipeline not found",
-        )
-    finally:
-        # Ensure the file is deleted after the upload is completed or on failure
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        raise_pipelines_http_exception(e)
 
 
 class AddPipelineForm(BaseModel):
@@ -263,40 +373,17 @@ class AddPipelineForm(BaseModel):
 async def add_pipeline(
     request: Request, form_data: AddPipelineForm, user=Depends(get_admin_user)
 ):
-    r = None
     try:
-        urlIdx = form_data.urlIdx
+        url, key = get_pipelines_connection(request, form_data.urlIdx)
 
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.post(
-            f"{url}/pipelines/add",
-            headers={"Authorization": f"Bearer {key}"},
-            json={"url": form_data.url},
+        data = await send_pipelines_request(
+            "POST", f"{url}/pipelines/add", key, json={"url": form_data.url}
         )
-
-        r.raise_for_status()
-        data = r.json()
+        invalidate_pipelines_cache(url)
 
         return {**data}
     except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+        raise_pipelines_http_exception(e)
 
 
 class DeletePipelineForm(BaseModel):
@@ -308,74 +395,31 @@ class DeletePipelineForm(BaseModel):
 async def delete_pipeline(
     request: Request, form_data: DeletePipelineForm, user=Depends(get_admin_user)
 ):
-    r = None
     try:
-        urlIdx = form_data.urlIdx
-
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+        url, key = get_pipelines_connection(request, form_data.urlIdx)
 
-        r = requests.delete(
-            f"{url}/pipelines/delete",
-            headers={"Authorization": f"Bearer {key}"},
-            json={"id": form_data.id},
+        data = await send_pipelines_request(
+            "DELETE", f"{url}/pipelines/delete", key, json={"id": form_data.id}
         )
-
-        r.raise_for_status()
-        data = r.json()
+        invalidate_pipelines_cache(url)
 
         return {**data}
     except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+        raise_pipelines_http_exception(e)
 
 
 @router.get("/")
 async def get_pipelines(
     request: Request, urlIdx: Optional[int] = None, user=Depends(get_admin_user)
 ):
-    r = None
     try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+        url, key = get_pipelines_connection(request, urlIdx)
 
-        r = requests.get(f"{url}/pipelines", headers={"Authorization": f"Bearer {key}"})
-
-        r.raise_for_status()
-        data = r.json()
+        data = await get_cached_pipelines_response(f"{url}/pipelines", key)
 
         return {**data}
     except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+        raise_pipelines_http_exception(e)
 
 
 @router.get("/{pipeline_id}/valves")
@@ -385,36 +429,15 @@ async def get_pipeline_valves(
     pipeline_id: str,
     user=Depends(get_admin_user),
 ):
-    r = None
     try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.get(
-            f"{url}/{pipeline_id}/valves", headers={"Authorization": f"Bearer {key}"}
-        )
+        url, key = get_pipelines_connection(request, urlIdx)
 
-        r.raise_for_status()
-        data = r.json()
+        # Not cached: the admin expects to see the values they just saved
+        data = await send_pipelines_request("GET", f"{url}/{pipeline_id}/valves", key)
 
         return {**data}
     except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+        raise_pipelines_http_exception(e)
 
 
 @router.get("/{pipeline_id}/valves/spec")
@@ -424,37 +447,16 @@ async def get_pipeline_valves_spec(
     pipeline_id: str,
     user=Depends(get_admin_user),
 ):
-    r = None
     try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+        url, key = get_pipelines_connection(request, urlIdx)
 
-        r = requests.get(
-            f"{url}/{pipeline_id}/valves/spec",
-            headers={"Authorization": f"Bearer {key}"},
+        data = await get_cached_pipelines_response(
+            f"{url}/{pipeline_id}/valves/spec", key
         )
 
-        r.raise_for_status()
-        data = r.json()
-
         return {**data}
     except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+        raise_pipelines_http_exception(e)
 
 
 @router.post("/{pipeline_id}/valves/update")
@@ -465,36 +467,14 @@ async def update_pipeline_valves(
     form_data: dict,
     user=Depends(get_admin_user),
 ):
-    r = None
     try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+        url, key = get_pipelines_connection(request, urlIdx)
 
-        r = requests.post(
-            f"{url}/{pipeline_id}/valves/update",
-            headers={"Authorization": f"Bearer {key}"},
-            json={**form_data},
+        data = await send_pipelines_request(
+            "POST", f"{url}/{pipeline_id}/valves/update", key, json={**form_data}
         )
-
-        r.raise_for_status()
-        data = r.json()
+        invalidate_pipelines_cache(url)
 
         return {**data}
     except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+        raise_pipelines_http_exception(e)
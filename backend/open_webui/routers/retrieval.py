@@ -22,6 +22,7 @@ from fastapi import (
     APIRouter,
 )
 from open_webui.utils.job_queue import (
+    JobQueueAdmissionError,
     enqueue_file_processing_job,
     is_job_queue_available,
 )
@@ -34,11 +35,16 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSpl
 from langchain_core.documents import Document
 
 from open_webui.models.files import FileModel, Files
+from open_webui.models.embeddings import EmbeddingCaches
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.users import Users
 from open_webui.storage.provider import Storage
-from open_webui.env import REDIS_URL
+from open_webui.env import ENABLE_EMBEDDING_CACHE, REDIS_URL
 from open_webui.socket.utils import RedisLock
+from open_webui.socket.progress import (
+    emit_file_progress,
+    update_file_processing_status,
+)
 
 
 from open_webui.retrieval.vector.connector import VECTOR_DB_CLIENT
@@ -241,7 +247,9 @@ async def get_worker_status(request: Request, user=Depends(get_verified_user)):
     """
     from open_webui.utils.job_queue import (
         get_job_queue,
+        get_queue_metrics,
         FILE_PROCESSING_QUEUE_NAME,
+        FILE_PROCESSING_QUEUE_NAMES,
         is_job_queue_available,
     )
     from rq import Worker
@@ -250,7 +258,9 @@ async def get_worker_status(request: Request, user=Depends(get_verified_user)):
         "job_queue_enabled": ENABLE_JOB_QUEUE,
         "job_queue_available": False,
         "queue_name": FILE_PROCESSING_QUEUE_NAME,
+        "queue_names": FILE_PROCESSING_QUEUE_NAMES,
         "queue_length": 0,
+        "queues": {},
         "workers": [],
         "redis_connected": False,
     }
@@ -262,6 +272,12 @@ async def get_worker_status(request: Request, user=Depends(get_verified_user)):
             if queue:
                 status["queue_length"] = len(queue)
                 status["redis_connected"] = True
+
+                # Depth and wait time per job class (interactive / bulk)
+                try:
+                    status["queues"] = get_queue_metrics()
+                except Exception as metrics_error:
+                    log.warning(f"Could not get queue metrics: {metrics_error}")
                 
                 # Get active workers
                 try:
@@ -1128,6 +1144,29 @@ def _get_user_chunk_settings(request: Request, user=None):
     return user_email, chunk_size, chunk_overlap
 
 
+def get_file_processing_signature(request: Request, user=None) -> str:
+    """
+    Fingerprint of the settings that shape a file's extracted content and
+    vectors. Uploads are only deduplicated against files with the same one.
+    """
+    config = request.app.state.config
+    user_email, chunk_size, chunk_overlap = _get_user_chunk_settings(request, user)
+    return calculate_sha256_string(
+        json.dumps(
+            [
+                config.CONTENT_EXTRACTION_ENGINE,
+                bool(config.PDF_EXTRACT_IMAGES),
+                config.TEXT_SPLITTER,
+                str(config.TIKTOKEN_ENCODING_NAME),
+                chunk_size,
+                chunk_overlap,
+                config.RAG_EMBEDDING_ENGINE,
+                config.RAG_EMBEDDING_MODEL_USER.get(user_email) if user_email else None,
+            ]
+        )
+    )
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1197,6 +1236,7 @@ def save_docs_to_vector_db(
                 raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
 
             if split:
+                _emit_docs_progress([doc.metadata for doc in docs], "chunking")
                 user_email, chunk_size, chunk_overlap = _get_user_chunk_settings(request, user)
                 log.info(f"[Splitting] user={user_email or 'background'} | chunk_size={chunk_size} | chunk_overlap={chunk_overlap}")
 
@@ -1350,21 +1390,17 @@ def save_docs_to_vector_db(
                         if hasattr(base_url_config, 'value')
                         else str(base_url_config)
                     )
-                    print(f"  [STEP 3.1] Extracted base_url: {base_url}", flush=True)
                     log.info(f"  [STEP 3.1] Extracted base_url: {base_url}")
                     
                     # Fallback to default if empty (from config.py default)
                     if not base_url or base_url.strip() == "" or base_url == "None":
                         base_url = "https://ai-gateway.apps.cloud.rt.nyu.edu/v1"
-                        print(f"  [STEP 3.2] ⚠️  Base URL was empty/None, using default: {base_url}", flush=True)
                         log.warning(f"  [STEP 3.2] Base URL was empty/None, using default: {base_url}")
                     else:
-                        print(f"  [STEP 3.2] ✅ Using configured base URL: {base_url}", flush=True)
                         log.info(f"  [STEP 3.2] ✅ Using configured base URL: {base_url}")
                     
                     # RBAC: Use owner's API key (per-admin)
                     api_key_to_use = owner_api_key
-                    print(f"  [STEP 3.3] Using OpenAI/Portkey API key (owner_api_key for {effective_owner_email})", flush=True)
                     log.info(f"  [STEP 3.3] Using OpenAI/Portkey API key (owner_api_key for {effective_owner_email})")
                 else:
                     base_url_config = request.app.state.config.RAG_OLLAMA_BASE_URL
@@ -1374,15 +1410,10 @@ def save_docs_to_vector_db(
                         else str(base_url_config)
                     )
                     api_key_to_use = request.app.state.config.RAG_OLLAMA_API_KEY
-                    print(f"  [STEP 3.1] Using Ollama config: base_url={base_url}", flush=True)
                     log.info(f"  [STEP 3.1] Using Ollama config: base_url={base_url}")
                 
                 # CRITICAL BUG FIX: Validate API key before creating embedding function
-                print(f"  [STEP 4] Validating API key before embedding function creation...", flush=True)
                 log.info(f"  [STEP 4] Validating API key before embedding function creation...")
-                print(f"    api_key_to_use is None: {api_key_to_use is None}", flush=True)
-                print(f"    api_key_to_use is empty: {api_key_to_use == '' if api_key_to_use else 'N/A'}", flush=True)
-                print(f"    api_key_to_use length: {len(api_key_to_use) if api_key_to_use else 0}", flush=True)
                 log.info(f"    api_key_to_use is None: {api_key_to_use is None}")
                 log.info(f"    api_key_to_use is empty: {api_key_to_use == '' if api_key_to_use else 'N/A'}")
                 log.info(f"    api_key_to_use length: {len(api_key_to_use) if api_key_to_use else 0}")
@@ -1393,21 +1424,13 @@ def save_docs_to_vector_db(
                         f"Cannot generate embeddings. "
                         f"user_email={user_email}, engine={request.app.state.config.RAG_EMBEDDING_ENGINE}"
                     )
-                    print(f"  [STEP 4] ❌ {error_msg}", flush=True)
                     log.error(f"  [STEP 4] ❌ {error_msg}")
                     raise ValueError(error_msg)
                 
-                print(f"  [STEP 4] ✅ API key validated", flush=True)
                 log.info(f"  [STEP 4] ✅ API key validated")
                 
                 # Embedding function that sends all texts at once
                 # RBAC: Use per-admin model name (not global)
-                print(f"  [STEP 5] Creating embedding function:", flush=True)
-                print(f"    engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}", flush=True)
-                print(f"    model: {owner_model} (per-admin for {effective_owner_email})", flush=True)
-                print(f"    base_url: {base_url}", flush=True)
-                print(f"    batch_size: {request.app.state.config.RAG_EMBEDDING_BATCH_SIZE}", flush=True)
-                print(f"    api_key provided: {api_key_to_use is not None and len(api_key_to_use) > 0}", flush=True)
                 log.info(f"  [STEP 5] Creating embedding function:")
                 log.info(f"    engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}")
                 log.info(f"    model: {owner_model} (per-admin for {effective_owner_email})")
@@ -1424,43 +1447,41 @@ def save_docs_to_vector_db(
                     request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
                 )
                 
-                print(f"  [STEP 5.1] Embedding function created:", flush=True)
-                print(f"    embedding_function is None: {embedding_function is None}", flush=True)
-                print(f"    embedding_function type: {type(embedding_function)}", flush=True)
                 log.info(f"  [STEP 5.1] Embedding function created:")
                 log.info(f"    embedding_function is None: {embedding_function is None}")
                 log.info(f"    embedding_function type: {type(embedding_function)}")
                 
                 if embedding_function is None:
                     error_msg = "Failed to create embedding function - get_single_batch_embedding_function returned None"
-                    print(f"  [STEP 5.1] ❌ {error_msg}", flush=True)
                     log.error(f"  [STEP 5.1] ❌ {error_msg}")
                     raise ValueError(error_msg)
                 
-                print(f"  [STEP 5.1] ✅ Embedding function created successfully", flush=True)
                 log.info(f"  [STEP 5.1] ✅ Embedding function created successfully")
 
                 # Process all text chunks in a single API call
                 embed_api_start = time.time()
-                print(f"  [STEP 6] Generating embeddings for {len(texts)} chunks in a single batch | timestamp={embed_api_start:.3f}", flush=True)
                 log.info(f"  [STEP 6] Generating embeddings for {len(texts)} chunks in a single batch | timestamp={embed_api_start:.3f}")
                 
                 safe_add_span_event("embedding.generation.started", {"text.count": len(texts)})
                 
                 try:
-                    embeddings = embedding_function(
-                        list(map(lambda x: x.replace("\n", " "), texts)), user=user
+                    embeddings = get_embeddings_with_cache(
+                        request.app.state.config.RAG_EMBEDDING_ENGINE,
+                        owner_model,
+                        list(map(lambda x: x.replace("\n", " "), texts)),
+                        lambda batch: embedding_function(batch, user=user),
+                        file_id=_get_single_file_id(metadatas),
+                        on_progress=lambda done, total: _emit_docs_progress(
+                            metadatas, "embedding", done, total
+                        ),
+                        batch_size=request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
                     )
                     embed_api_end = time.time()
                     embed_api_duration = embed_api_end - embed_api_start
                     log.info(f"[EMBED_API] COMPLETE | chunks={len(texts)} | duration={embed_api_duration:.2f}s | timestamp={embed_api_end:.3f}")
                 
-                    print(f"  [STEP 6.1] Embedding generation result:", flush=True)
-                    print(f"    embeddings is None: {embeddings is None}", flush=True)
-                    print(f"    embeddings type: {type(embeddings)}", flush=True)
-                    print(f"    embeddings length: {len(embeddings) if embeddings else 0}", flush=True)
                     if embeddings and len(embeddings) > 0:
-                        print(f"    first embedding length: {len(embeddings[0]) if embeddings[0] else 0}", flush=True)
+                        log.debug("    first embedding length: %d", len(embeddings[0]) if embeddings[0] else 0)
                     log.info(f"  [STEP 6.1] Embedding generation result:")
                     log.info(f"    embeddings is None: {embeddings is None}")
                     log.info(f"    embeddings type: {type(embeddings)}")
@@ -1468,22 +1489,18 @@ def save_docs_to_vector_db(
                     
                     if not embeddings or len(embeddings) == 0:
                         error_msg = "Embedding generation returned empty result"
-                        print(f"  [STEP 6.1] ❌ {error_msg}", flush=True)
                         log.error(f"  [STEP 6.1] ❌ {error_msg}")
                         raise ValueError(error_msg)
                     
                     if len(embeddings) != len(texts):
                         error_msg = f"Embedding count mismatch: expected {len(texts)}, got {len(embeddings)}"
-                        print(f"  [STEP 6.1] ❌ {error_msg}", flush=True)
                         log.error(f"  [STEP 6.1] ❌ {error_msg}")
                         raise ValueError(error_msg)
                     
-                    print(f"  [STEP 6.1] ✅ Embeddings generated successfully", flush=True)
                     log.info(f"  [STEP 6.1] ✅ Embeddings generated successfully")
                     safe_add_span_event("embedding.generation.completed", {"embedding.count": len(embeddings) if embeddings else 0})
                 except Exception as embed_error:
                     error_msg = f"Failed to generate embeddings: {embed_error}"
-                    print(f"  [STEP 6] ❌ {error_msg}", flush=True)
                     log.error(f"  [STEP 6] ❌ {error_msg}", exc_info=True)
                     safe_add_span_event("embedding.generation.failed", {
                         "error.type": type(embed_error).__name__,
@@ -1491,9 +1508,6 @@ def save_docs_to_vector_db(
                     })
                     raise
 
-                print(f"  [STEP 7] Preparing items for vector DB insertion:", flush=True)
-                print(f"    collection_name: {collection_name}", flush=True)
-                print(f"    items count: {len(texts)}", flush=True)
                 log.info(f"  [STEP 7] Preparing items for vector DB insertion:")
                 log.info(f"    collection_name: {collection_name}, items count: {len(texts)}")
                 
@@ -1507,7 +1521,6 @@ def save_docs_to_vector_db(
                     for idx, text in enumerate(texts)
                 ]
                 
-                print(f"  [STEP 7.1] Items prepared, inserting into vector DB...", flush=True)
                 log.info(f"  [STEP 7.1] Items prepared, inserting into vector DB...")
 
                 safe_add_span_event("vector_db.insert.started", {"item.count": len(items)})
@@ -1517,12 +1530,10 @@ def save_docs_to_vector_db(
                         collection_name=collection_name,
                         items=items,
                     )
-                    print(f"  [STEP 7.1] ✅ Successfully inserted {len(items)} items into collection: {collection_name}", flush=True)
                     log.info(f"  [STEP 7.1] ✅ Successfully inserted {len(items)} items into collection: {collection_name}")
                     safe_add_span_event("vector_db.insert.completed", {"item.count": len(items)})
                 except Exception as insert_error:
                     error_msg = f"Failed to insert into vector DB collection {collection_name}: {insert_error}"
-                    print(f"  [STEP 7.1] ❌ {error_msg}", flush=True)
                     log.error(f"  [STEP 7.1] ❌ {error_msg}", exc_info=True)
                     safe_add_span_event("vector_db.insert.failed", {
                         "error.type": type(insert_error).__name__,
@@ -1530,9 +1541,7 @@ def save_docs_to_vector_db(
                     })
                     raise
 
-                print(f"[EMBEDDING] ✅ Embeddings saved successfully", flush=True)
                 log.info(f"[EMBEDDING] ✅ Embeddings saved successfully")
-                print("=" * 80, flush=True)
                 log.info("=" * 80)
 
                 return True
@@ -1552,6 +1561,100 @@ def save_docs_to_vector_db(
             raise e
 
 
+def get_embeddings_with_cache(
+    embedding_engine: str,
+    embedding_model: str,
+    texts: list[str],
+    generate: Callable[[list[str]], list[list[float]]],
+    file_id: Optional[str] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    batch_size: int = 1,
+) -> list[list[float]]:
+    """
+    Look chunks up in the embedding cache and only send new or changed ones to
+    `generate`. The hit ratio is logged and, for single-file jobs, stored in the
+    file's metadata as `embedding_cache`.
+
+    With `on_progress`, texts are handed to `generate` in about ten slices (in
+    multiples of `batch_size`) and `on_progress(done, total)` is called after
+    each one.
+    """
+
+    def _generate(texts: list[str]) -> list[list[float]]:
+        if on_progress is None or not texts:
+            return generate(texts)
+
+        step = max(batch_size, 1)
+        step *= -(-len(texts) // (step * 10))
+        embeddings = []
+        for start in range(0, len(texts), step):
+            embeddings.extend(generate(texts[start : start + step]) or [])
+            on_progress(min(start + step, len(texts)), len(texts))
+        return embeddings
+
+    if not ENABLE_EMBEDDING_CACHE:
+        return _generate(texts)
+
+    cached = EmbeddingCaches.get_embeddings(embedding_engine, embedding_model, texts)
+    # Identical chunks (repeated headers, boilerplate) are embedded once
+    missing = list(dict.fromkeys(text for text in texts if text not in cached))
+
+    if missing:
+        generated = _generate(missing)
+        if not generated or len(generated) != len(missing):
+            raise ValueError(
+                f"Embedding count mismatch: expected {len(missing)}, got {len(generated) if generated else 0}"
+            )
+        new_embeddings = dict(zip(missing, generated))
+        EmbeddingCaches.insert_embeddings(
+            embedding_engine, embedding_model, new_embeddings
+        )
+        cached.update(new_embeddings)
+
+    embedded = set(missing)
+    hits = sum(1 for text in texts if text not in embedded)
+    hit_ratio = hits / len(texts) if texts else 0.0
+    log.info(
+        f"[EMBED_CACHE] file_id={file_id} | chunks={len(texts)} | hits={hits} | "
+        f"embedded={len(missing)} | hit_ratio={hit_ratio:.2f}"
+    )
+    safe_add_span_event(
+        "embedding.cache",
+        {"cache.hits": hits, "cache.misses": len(texts) - hits},
+    )
+    if file_id:
+        Files.update_file_metadata_by_id(
+            file_id,
+            {
+                "embedding_cache": {
+                    "hits": hits,
+                    "misses": len(texts) - hits,
+                    "hit_ratio": round(hit_ratio, 4),
+                }
+            },
+        )
+
+    return [cached[text] for text in texts]
+
+
+def _get_single_file_id(metadatas: list[dict]) -> Optional[str]:
+    file_ids = {metadata.get("file_id") for metadata in metadatas}
+    return file_ids.pop() if len(file_ids) == 1 else None
+
+
+def _emit_docs_progress(
+    metadatas: list[dict],
+    stage: str,
+    current: Optional[int] = None,
+    total: Optional[int] = None,
+) -> None:
+    """Progress event for saves of a single file; batches aren't reported."""
+    targets = {(metadata.get("file_id"), metadata.get("created_by")) for metadata in metadatas}
+    if len(targets) == 1:
+        file_id, user_id = targets.pop()
+        emit_file_progress(file_id, user_id, stage, current=current, total=total)
+
+
 def get_embeddings_with_fallback(
     embedding_engine: str,
     embedding_model: str,
@@ -1646,6 +1749,169 @@ def get_embeddings_with_fallback(
                 raise
 
 
+def share_file_with_collections(file_id: str, collection_names: list[str]) -> bool:
+    """
+    Make the chunks stored in `file-{file_id}` searchable from other collections
+    without copying them. Returns False if the vector DB keeps every collection
+    separately or the file hasn't been embedded yet, in which case the caller
+    has to embed and insert as before.
+    """
+    if not hasattr(VECTOR_DB_CLIENT, "add_to_collection"):
+        return False
+
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=f"file-{file_id}", filter={"file_id": file_id}, limit=1
+    )
+    if result is None or not result.ids[0]:
+        return False
+
+    for collection_name in collection_names:
+        # Drop any older copy of the file so it isn't returned twice
+        VECTOR_DB_CLIENT.delete(
+            collection_name=collection_name, filter={"file_id": file_id}
+        )
+        VECTOR_DB_CLIENT.add_to_collection(
+            collection_name=collection_name,
+            source_collection_name=f"file-{file_id}",
+            filter={"file_id": file_id},
+        )
+    return True
+
+
+def _get_text_splitter(request: Request, user=None):
+    """Text splitter configured the same way as save_docs_to_vector_db."""
+    user_email, chunk_size, chunk_overlap = _get_user_chunk_settings(request, user)
+    if chunk_overlap >= chunk_size:
+        chunk_overlap = chunk_size // 4
+
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        return RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            add_start_index=True,
+        )
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        return TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            add_start_index=True,
+        )
+    raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+
+def reindex_file_incrementally(
+    request: Request,
+    file: FileModel,
+    knowledge_ids: Optional[list[str]] = None,
+    user=None,
+    owner_email: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    Bring the chunks of `file` in line with its current `data.content` without
+    re-embedding the whole document.
+
+    The content is split with the configured splitter and the chunk texts are
+    compared (by sha256, as a multiset) with what is stored for the file: stale
+    chunks are deleted, new ones are embedded and inserted, unchanged ones are
+    left alone. `file-{id}` and the given knowledge collections are updated;
+    with shared chunk storage only `file-{id}` is diffed and the knowledge
+    bases are relinked to it.
+
+    Returns per-collection counts, or None if the file has no stored chunks
+    yet and needs a full process_file instead.
+    """
+    content = (file.data or {}).get("content", "")
+    source_collection = f"file-{file.id}"
+    knowledge_ids = [k for k in (knowledge_ids or []) if k != source_collection]
+
+    existing = VECTOR_DB_CLIENT.query(
+        collection_name=source_collection, filter={"file_id": file.id}
+    )
+    if existing is None or not existing.ids or not existing.ids[0]:
+        return None
+
+    hash = calculate_sha256_string(content)
+    docs = _get_text_splitter(request, user).split_documents(
+        [
+            Document(
+                page_content=content.replace("<br/>", "\n"),
+                metadata={
+                    **file.meta,
+                    "name": file.filename,
+                    "created_by": file.user_id,
+                    "file_id": file.id,
+                    "source": file.filename,
+                    "hash": hash,
+                },
+            )
+        ]
+    )
+    if not docs:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+    shared = hasattr(VECTOR_DB_CLIENT, "add_to_collection")
+    collections = [source_collection] if shared else [source_collection, *knowledge_ids]
+
+    stats = {}
+    for collection_name in collections:
+        if collection_name == source_collection:
+            result = existing
+        else:
+            result = VECTOR_DB_CLIENT.query(
+                collection_name=collection_name, filter={"file_id": file.id}
+            )
+
+        # chunk hash -> ids of stored chunks with that text
+        stored: dict[str, list[str]] = {}
+        if result is not None and result.ids:
+            for chunk_id, text in zip(result.ids[0], result.documents[0]):
+                stored.setdefault(calculate_sha256_string(text or ""), []).append(
+                    chunk_id
+                )
+
+        new_docs = []
+        for doc in docs:
+            ids = stored.get(calculate_sha256_string(doc.page_content))
+            if ids:
+                ids.pop()
+            else:
+                new_docs.append(doc)
+        stale_ids = [chunk_id for ids in stored.values() for chunk_id in ids]
+
+        if stale_ids:
+            VECTOR_DB_CLIENT.delete(collection_name=collection_name, ids=stale_ids)
+        if new_docs:
+            # "hash" stays on the chunks only; passing it in metadata would trip
+            # the duplicate check against the chunks that were kept
+            save_docs_to_vector_db(
+                request,
+                docs=new_docs,
+                collection_name=collection_name,
+                metadata={"file_id": file.id, "name": file.filename},
+                split=False,
+                add=True,
+                user=user,
+                owner_email=owner_email,
+            )
+
+        stats[collection_name] = {
+            "kept": len(docs) - len(new_docs),
+            "inserted": len(new_docs),
+            "deleted": len(stale_ids),
+        }
+        log.info(
+            f"[REINDEX] file_id={file.id} | collection={collection_name} | {stats[collection_name]}"
+        )
+
+    if shared and knowledge_ids:
+        share_file_with_collections(file.id, knowledge_ids)
+
+    Files.update_file_hash_by_id(file.id, hash)
+    return stats
+
+
 def save_docs_to_multiple_collections(
     request: Request,
     docs,
@@ -1657,7 +1923,11 @@ def save_docs_to_multiple_collections(
     owner_email: Optional[str] = None,
 ) -> bool:
     """
-    Save documents to multiple collections using a single embedding operation
+    Save documents to multiple collections using a single embedding operation.
+
+    If the vector DB supports collection membership, chunks are stored once in
+    the first collection and shared with the rest, so a document that is
+    already embedded there only needs membership rows for the others.
     """
 
     def _get_docs_info(docs: list[Document]) -> str:
@@ -1680,6 +1950,36 @@ def save_docs_to_multiple_collections(
         f"save_docs_to_multiple_collections: document {_get_docs_info(docs)} to collections {collections}"
     )
 
+    shared_storage = hasattr(VECTOR_DB_CLIENT, "add_to_collection")
+    source_collection = collections[0]
+    link_filter = {"hash": metadata["hash"]} if metadata and "hash" in metadata else None
+
+    if shared_storage and link_filter and not overwrite:
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=source_collection, filter=link_filter, limit=1
+        )
+        if result is not None and result.ids[0]:
+            for collection_name in collections[1:]:
+                existing = VECTOR_DB_CLIENT.query(
+                    collection_name=collection_name, filter=link_filter, limit=1
+                )
+                if existing is not None and existing.ids[0]:
+                    log.info(
+                        f"Document with hash {metadata['hash']} already exists in collection {collection_name}"
+                    )
+                    raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+            for collection_name in collections[1:]:
+                VECTOR_DB_CLIENT.add_to_collection(
+                    collection_name=collection_name,
+                    source_collection_name=source_collection,
+                    filter=link_filter,
+                )
+            log.info(
+                f"[EMBEDDING] Reused chunks from {source_collection} for {collections[1:]} (no re-embedding)"
+            )
+            return True
+
     # Check if entries with the same hash (metadata.hash) already exist in any collection (BUG #14 fix)
     if metadata and "hash" in metadata:
         # Check all collections, not just collections[1]
@@ -1693,7 +1993,6 @@ def save_docs_to_multiple_collections(
                 existing_doc_ids = result.ids[0]
                 if existing_doc_ids:
                     error_msg = f"Document with hash {metadata['hash']} already exists in collection {collection_name}"
-                    print(f"[DUPLICATE CHECK] ❌ {error_msg}", flush=True)
                     log.info(error_msg)
                     raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
@@ -1709,6 +2008,7 @@ def save_docs_to_multiple_collections(
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
 
     if split:
+        _emit_docs_progress([doc.metadata for doc in docs], "chunking")
         user_email, chunk_size, chunk_overlap = _get_user_chunk_settings(request, user)
         log.info(f"[Splitting] user={user_email or 'background'} | chunk_size={chunk_size} | chunk_overlap={chunk_overlap}")
         if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
@@ -1805,31 +2105,20 @@ def save_docs_to_multiple_collections(
                     log.info(f"Deleting existing collection {collection_name}")
 
         # RBAC: Get per-admin model and API key for the owner
-        print("=" * 80, flush=True)
-        print("[EMBEDDING] Starting embedding generation in save_docs_to_multiple_collections", flush=True)
         log.info("=" * 80)
         log.info("[EMBEDDING] Starting embedding generation in save_docs_to_multiple_collections")
         
         # RBAC: Use owner_email if provided, otherwise fall back to user.email
         effective_owner_email_for_key = effective_owner_email  # Already determined above
         
-        print(f"  [STEP 1] RBAC context:", flush=True)
-        print(f"    owner_email: {effective_owner_email_for_key}", flush=True)
-        print(f"    owner_model: {owner_model}", flush=True)
-        print(f"    collections: {collections}", flush=True)
         log.info(f"  [STEP 1] RBAC context: owner_email={effective_owner_email_for_key}, owner_model={owner_model}, collections={collections}")
         
-        print(f"  [STEP 2] Retrieving API key from config for owner {effective_owner_email_for_key}...", flush=True)
         log.info(f"  [STEP 2] Retrieving API key from config for owner {effective_owner_email_for_key}...")
         owner_api_key = request.app.state.config.RAG_OPENAI_API_KEY.get(effective_owner_email_for_key)
         
-        print(f"  [STEP 2.1] API key retrieval result:", flush=True)
-        print(f"    owner_api_key is None: {owner_api_key is None}", flush=True)
-        print(f"    owner_api_key is empty: {owner_api_key == '' if owner_api_key else 'N/A'}", flush=True)
-        print(f"    owner_api_key length: {len(owner_api_key) if owner_api_key else 0}", flush=True)
         if owner_api_key:
             api_key_preview = owner_api_key[-4:] if len(owner_api_key) >= 4 else '***'
-            print(f"    owner_api_key ends with: ...{api_key_preview}", flush=True)
+            log.debug("    owner_api_key ends with: ...%s", api_key_preview)
         log.info(f"  [STEP 2.1] API key retrieval result:")
         log.info(f"    owner_api_key is None: {owner_api_key is None}")
         log.info(f"    owner_api_key is empty: {owner_api_key == '' if owner_api_key else 'N/A'}")
@@ -1842,15 +2131,12 @@ def save_docs_to_multiple_collections(
                 f"Cannot generate embeddings. "
                 f"Please ensure the admin configures the embedding API key in Settings > Documents."
             )
-            print(f"  [STEP 2.2] ❌ {error_msg}", flush=True)
             log.error(f"  [STEP 2.2] ❌ {error_msg}")
             raise ValueError(error_msg)
         
-        print(f"  [STEP 2.2] ✅ API key validated", flush=True)
         log.info(f"  [STEP 2.2] ✅ API key validated")
         
         # Get base URL value - handle PersistentConfig objects properly
-        print(f"  [STEP 3] Getting base URL for embedding engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}", flush=True)
         log.info(f"  [STEP 3] Getting base URL for embedding engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}")
         
         if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai" or request.app.state.config.RAG_EMBEDDING_ENGINE == "portkey":
@@ -1860,21 +2146,17 @@ def save_docs_to_multiple_collections(
                 if hasattr(base_url_config, 'value')
                 else str(base_url_config)
             )
-            print(f"  [STEP 3.1] Extracted base_url: {base_url}", flush=True)
             log.info(f"  [STEP 3.1] Extracted base_url: {base_url}")
             
             # Fallback to default if empty (from config.py default)
             if not base_url or base_url.strip() == "" or base_url == "None":
                 base_url = "https://ai-gateway.apps.cloud.rt.nyu.edu/v1"
-                print(f"  [STEP 3.2] ⚠️  Base URL was empty/None, using default: {base_url}", flush=True)
                 log.warning(f"  [STEP 3.2] Base URL was empty/None, using default: {base_url}")
             else:
-                print(f"  [STEP 3.2] ✅ Using configured base URL: {base_url}", flush=True)
                 log.info(f"  [STEP 3.2] ✅ Using configured base URL: {base_url}")
             
             # RBAC: Use owner's API key (per-admin)
             api_key_to_use = owner_api_key
-            print(f"  [STEP 3.3] Using OpenAI/Portkey API key (owner_api_key for {effective_owner_email_for_key})", flush=True)
             log.info(f"  [STEP 3.3] Using OpenAI/Portkey API key (owner_api_key for {effective_owner_email_for_key})")
         else:
             base_url_config = request.app.state.config.RAG_OLLAMA_BASE_URL
@@ -1884,15 +2166,10 @@ def save_docs_to_multiple_collections(
                 else str(base_url_config)
             )
             api_key_to_use = request.app.state.config.RAG_OLLAMA_API_KEY
-            print(f"  [STEP 3.1] Using Ollama config: base_url={base_url}", flush=True)
             log.info(f"  [STEP 3.1] Using Ollama config: base_url={base_url}")
         
         # CRITICAL BUG FIX: Validate API key before calling embedding function
-        print(f"  [STEP 4] Validating API key before embedding generation...", flush=True)
         log.info(f"  [STEP 4] Validating API key before embedding generation...")
-        print(f"    api_key_to_use is None: {api_key_to_use is None}", flush=True)
-        print(f"    api_key_to_use is empty: {api_key_to_use == '' if api_key_to_use else 'N/A'}", flush=True)
-        print(f"    api_key_to_use length: {len(api_key_to_use) if api_key_to_use else 0}", flush=True)
         log.info(f"    api_key_to_use is None: {api_key_to_use is None}")
         log.info(f"    api_key_to_use is empty: {api_key_to_use == '' if api_key_to_use else 'N/A'}")
         log.info(f"    api_key_to_use length: {len(api_key_to_use) if api_key_to_use else 0}")
@@ -1903,22 +2180,13 @@ def save_docs_to_multiple_collections(
                 f"Cannot generate embeddings. "
                 f"owner_email={effective_owner_email_for_key}, engine={request.app.state.config.RAG_EMBEDDING_ENGINE}"
             )
-            print(f"  [STEP 4] ❌ {error_msg}", flush=True)
             log.error(f"  [STEP 4] ❌ {error_msg}")
             raise ValueError(error_msg)
         
-        print(f"  [STEP 4] ✅ API key validated", flush=True)
         log.info(f"  [STEP 4] ✅ API key validated")
         
         # Usage of get_embeddings_with_fallback
         # RBAC: Use per-admin model (not global)
-        print(f"  [STEP 5] Calling get_embeddings_with_fallback:", flush=True)
-        print(f"    engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}", flush=True)
-        print(f"    model: {owner_model} (per-admin for {effective_owner_email_for_key})", flush=True)
-        print(f"    base_url: {base_url}", flush=True)
-        print(f"    batch_size: {request.app.state.config.RAG_EMBEDDING_BATCH_SIZE}", flush=True)
-        print(f"    texts count: {len(texts)}", flush=True)
-        print(f"    api_key provided: {api_key_to_use is not None and len(api_key_to_use) > 0}", flush=True)
         log.info(f"  [STEP 5] Calling get_embeddings_with_fallback:")
         log.info(f"    engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}")
         log.info(f"    model: {owner_model} (per-admin for {effective_owner_email_for_key})")
@@ -1928,25 +2196,31 @@ def save_docs_to_multiple_collections(
         log.info(f"    api_key provided: {api_key_to_use is not None and len(api_key_to_use) > 0}")
         
         try:
-            embeddings = get_embeddings_with_fallback(
+            embeddings = get_embeddings_with_cache(
                 request.app.state.config.RAG_EMBEDDING_ENGINE,
-                owner_model,  # RBAC: Use per-admin model (not global)
-                request.app.state.ef,
-                base_url,
-                api_key_to_use,
-                request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+                owner_model,
                 list(map(lambda x: x.replace("\n", " "), texts)),
-                get_single_batch_embedding_function,  # Pass this function
-                get_embedding_function,  # Pass this function
-                user=user,
+                lambda batch: get_embeddings_with_fallback(
+                    request.app.state.config.RAG_EMBEDDING_ENGINE,
+                    owner_model,  # RBAC: Use per-admin model (not global)
+                    request.app.state.ef,
+                    base_url,
+                    api_key_to_use,
+                    request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+                    batch,
+                    get_single_batch_embedding_function,  # Pass this function
+                    get_embedding_function,  # Pass this function
+                    user=user,
+                ),
+                file_id=_get_single_file_id(metadatas),
+                on_progress=lambda done, total: _emit_docs_progress(
+                    metadatas, "embedding", done, total
+                ),
+                batch_size=request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
             )
             
-            print(f"  [STEP 5.1] Embedding generation result:", flush=True)
-            print(f"    embeddings is None: {embeddings is None}", flush=True)
-            print(f"    embeddings type: {type(embeddings)}", flush=True)
-            print(f"    embeddings length: {len(embeddings) if embeddings else 0}", flush=True)
             if embeddings and len(embeddings) > 0:
-                print(f"    first embedding length: {len(embeddings[0]) if embeddings[0] else 0}", flush=True)
+                log.debug("    first embedding length: %d", len(embeddings[0]) if embeddings[0] else 0)
             log.info(f"  [STEP 5.1] Embedding generation result:")
             log.info(f"    embeddings is None: {embeddings is None}")
             log.info(f"    embeddings type: {type(embeddings)}")
@@ -1954,30 +2228,26 @@ def save_docs_to_multiple_collections(
             
             if not embeddings or len(embeddings) == 0:
                 error_msg = "Embedding generation returned empty result"
-                print(f"  [STEP 5.1] ❌ {error_msg}", flush=True)
                 log.error(f"  [STEP 5.1] ❌ {error_msg}")
                 raise ValueError(error_msg)
             
             if len(embeddings) != len(texts):
                 error_msg = f"Embedding count mismatch: expected {len(texts)}, got {len(embeddings)}"
-                print(f"  [STEP 5.1] ❌ {error_msg}", flush=True)
                 log.error(f"  [STEP 5.1] ❌ {error_msg}")
                 raise ValueError(error_msg)
             
-            print(f"  [STEP 5.1] ✅ Embeddings generated successfully", flush=True)
             log.info(f"  [STEP 5.1] ✅ Embeddings generated successfully")
         except Exception as embed_error:
             error_msg = f"Failed to generate embeddings: {embed_error}"
-            print(f"  [STEP 5] ❌ {error_msg}", flush=True)
             log.error(f"  [STEP 5] ❌ {error_msg}", exc_info=True)
             raise
 
-        # Insert embeddings into all collections
-        print(f"  [STEP 7] Inserting embeddings into {len(collections)} collection(s): {collections}", flush=True)
-        log.info(f"  [STEP 7] Inserting embeddings into {len(collections)} collection(s): {collections}")
+        # Insert embeddings into all collections, or only the first one when
+        # the others can share its chunks
+        insert_collections = collections[:1] if shared_storage else collections
+        log.info(f"  [STEP 7] Inserting embeddings into {len(insert_collections)} collection(s): {insert_collections}")
         
-        for col_idx, collection_name in enumerate(collections):
-            print(f"  [STEP 7.{col_idx+1}] Processing collection: {collection_name}", flush=True)
+        for col_idx, collection_name in enumerate(insert_collections):
             log.info(f"  [STEP 7.{col_idx+1}] Processing collection: {collection_name}")
             
             items = [
@@ -1990,7 +2260,6 @@ def save_docs_to_multiple_collections(
                 for text_idx, text in enumerate(texts)
             ]
             
-            print(f"    Preparing {len(items)} items for insertion", flush=True)
             log.info(f"    Preparing {len(items)} items for insertion")
 
             try:
@@ -1998,18 +2267,23 @@ def save_docs_to_multiple_collections(
                     collection_name=collection_name,
                     items=items,
                 )
-                print(f"  [STEP 7.{col_idx+1}] ✅ Successfully inserted into collection: {collection_name}", flush=True)
                 log.info(f"  [STEP 7.{col_idx+1}] ✅ Successfully inserted into collection: {collection_name}")
             except Exception as insert_error:
                 error_msg = f"Failed to insert into collection {collection_name}: {insert_error}"
-                print(f"  [STEP 7.{col_idx+1}] ❌ {error_msg}", flush=True)
                 log.error(f"  [STEP 7.{col_idx+1}] ❌ {error_msg}", exc_info=True)
                 # BUG FIX: Don't continue if one collection fails - raise exception
                 raise ValueError(error_msg)
 
-        print(f"[EMBEDDING] ✅ All embeddings saved successfully", flush=True)
+        if shared_storage:
+            for collection_name in collections[1:]:
+                linked = VECTOR_DB_CLIENT.add_to_collection(
+                    collection_name=collection_name,
+                    source_collection_name=source_collection,
+                    filter=link_filter,
+                )
+                log.info(f"  [STEP 8] ✅ Shared {linked} chunk(s) from {source_collection} with {collection_name}")
+
         log.info(f"[EMBEDDING] ✅ All embeddings saved successfully")
-        print("=" * 80, flush=True)
         log.info("=" * 80)
         
         return True
@@ -2018,6 +2292,61 @@ def save_docs_to_multiple_collections(
         raise e
 
 
+def copy_processed_file(request: Request, source: FileModel, file: FileModel, user=None) -> bool:
+    """
+    Give `file` the extracted content and chunks of `source`, an already
+    processed upload with the same bytes, without running loaders or the
+    splitter. Vectors come from the embedding cache. Returns False if the
+    source has nothing to copy, so the caller can process the file normally.
+    """
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=f"file-{source.id}", filter={"file_id": source.id}
+    )
+    if result is None or not result.ids or not result.ids[0]:
+        return False
+
+    content = (source.data or {}).get("content", "")
+    Files.update_file_data_by_id(file.id, {"content": content})
+    Files.update_file_hash_by_id(file.id, source.hash)
+
+    docs = [
+        Document(
+            page_content=text,
+            metadata={
+                **{
+                    key: value
+                    for key, value in (result.metadatas[0][idx] or {}).items()
+                    if key != "embedding_config"
+                },
+                "name": file.filename,
+                "created_by": file.user_id,
+                "file_id": file.id,
+                "source": file.filename,
+            },
+        )
+        for idx, text in enumerate(result.documents[0])
+    ]
+    collection_name = f"file-{file.id}"
+    save_docs_to_vector_db(
+        request,
+        docs=docs,
+        collection_name=collection_name,
+        metadata={"file_id": file.id, "name": file.filename, "hash": source.hash},
+        split=False,
+        user=user,
+    )
+    update_file_processing_status(
+        file.id,
+        {
+            "collection_name": collection_name,
+            "processing_status": "completed",
+            "processing_completed_at": int(time.time()),
+            "deduplicated_from": source.id,
+        },
+    )
+    return True
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: Optional[str] = None
@@ -2044,20 +2373,13 @@ def _process_file_sync(
         knowledge_id: Optional knowledge base ID
         user_id: User ID for logging
     """
-    print("=" * 80, flush=True)
-    print("[BACKGROUND TASK] Starting _process_file_sync", flush=True)
-    print(f"  file_id: {file_id}", flush=True)
-    print(f"  user_id: {user_id}", flush=True)
-    print(f"  collection_name: {collection_name}", flush=True)
-    print(f"  knowledge_id: {knowledge_id}", flush=True)
-    print(f"  content provided: {'Yes (' + str(len(content)) + ' chars)' if content else 'No'}", flush=True)
     log.info("=" * 80)
     log.info("[BACKGROUND TASK] Starting _process_file_sync")
     log.info(f"  file_id: {file_id}, user_id: {user_id}, collection_name: {collection_name}, knowledge_id: {knowledge_id}")
+    log.debug("  content provided: %d chars", len(content) if content else 0)
     
     try:
         # Get user object if user_id is provided
-        print(f"  [STEP 1] Retrieving user object...", flush=True)
         log.info(f"  [STEP 1] Retrieving user object...")
         user = None
         if user_id:
@@ -2068,20 +2390,16 @@ def _process_file_sync(
                         f"User {user_id} not found for file processing (file_id={file_id}), "
                         "processing without user context"
                     )
-                    print(f"  [STEP 1] ⚠️  {warning_msg}", flush=True)
                     log.warning(warning_msg)
                 else:
-                    print(f"  [STEP 1] ✅ User retrieved: {user.email} (role: {user.role})", flush=True)
                     log.info(f"  [STEP 1] ✅ User retrieved: {user.email} (role: {user.role})")
             except Exception as user_error:
                 warning_msg = (
                     f"Error retrieving user {user_id} for file processing (file_id={file_id}): {user_error}, "
                     "processing without user context"
                 )
-                print(f"  [STEP 1] ⚠️  {warning_msg}", flush=True)
                 log.warning(warning_msg)
         else:
-            print(f"  [STEP 1] ⚠️  No user_id provided, processing without user context", flush=True)
             log.warning(f"  [STEP 1] No user_id provided, processing without user context")
         
         # RBAC: Determine owner_email for per-admin model/key lookup
@@ -2105,27 +2423,23 @@ def _process_file_sync(
                 owner_email = user.email if user else None
         
         # Update status to processing
-        print(f"  [STEP 2] Updating file status to 'processing'...", flush=True)
         log.info(f"  [STEP 2] Updating file status to 'processing'...")
-        Files.update_file_metadata_by_id(
+        update_file_processing_status(
             file_id,
             {
                 "processing_status": "processing",
                 "processing_started_at": int(time.time()),
             },
         )
-        print(f"  [STEP 2] ✅ File status updated", flush=True)
         log.info(f"  [STEP 2] ✅ File status updated")
         
-        print(f"  [STEP 3] Retrieving file object...", flush=True)
         log.info(f"  [STEP 3] Retrieving file object...")
         file = Files.get_file_by_id(file_id)
         if not file:
             error_msg = f"File {file_id} not found for processing (user_id={user_id})"
-            print(f"  [STEP 3] ❌ {error_msg}", flush=True)
             log.error(error_msg)
             try:
-                Files.update_file_metadata_by_id(
+                update_file_processing_status(
                     file_id,
                     {
                         "processing_status": "error",
@@ -2167,11 +2481,9 @@ def _process_file_sync(
             
             # First, check if file has already been processed and exists in vector DB
             if collection_name:
-                print(f"  [CACHE CHECK] collection_name provided: {collection_name}", flush=True)
                 log.info(f"  [CACHE CHECK] collection_name provided: {collection_name}")
                 # BUG FIX: Use collection_name instead of f"file-{file.id}" when provided
                 cache_collection = collection_name
-                print(f"  [CACHE CHECK] Querying collection: {cache_collection} (not file-{file.id})", flush=True)
                 log.info(f"  [CACHE CHECK] Querying collection: {cache_collection} (not file-{file.id})")
                 try:
                     result = VECTOR_DB_CLIENT.query(
@@ -2236,6 +2548,7 @@ def _process_file_sync(
                         USER=user,
                         PDF_IMAGE_RBAC_OWNER_EMAIL=owner_email,
                     )
+                    emit_file_progress(file.id, file.user_id, "extracting")
                     docs = loader.load(
                         file.filename, file.meta.get("content_type"), file_path
                     )
@@ -2305,22 +2618,35 @@ def _process_file_sync(
         hash = calculate_sha256_string(text_content)
         Files.update_file_hash_by_id(file.id, hash)
         
-        print(f"  [STEP 4] Checking BYPASS_EMBEDDING_AND_RETRIEVAL flag...", flush=True)
         log.info(f"  [STEP 4] Checking BYPASS_EMBEDDING_AND_RETRIEVAL flag...")
-        print(f"    BYPASS_EMBEDDING_AND_RETRIEVAL: {request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL}", flush=True)
         log.info(f"    BYPASS_EMBEDDING_AND_RETRIEVAL: {request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL}")
 
         if not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
-            print(f"  [STEP 4] ✅ Embedding and retrieval enabled, proceeding with embedding generation", flush=True)
             log.info(f"  [STEP 4] ✅ Embedding and retrieval enabled, proceeding with embedding generation")
             try:
+                target_collection = knowledge_id or collection_name
+                if (
+                    not content
+                    and target_collection != f"file-{file.id}"
+                    and share_file_with_collections(file.id, [target_collection])
+                ):
+                    # Already embedded: joining another collection is metadata-only
+                    log.info(f"  [STEP 5] ✅ Reused existing chunks of file-{file.id} for {target_collection}")
+                    update_file_processing_status(
+                        file.id,
+                        {
+                            "collection_name": (
+                                f"file-{file.id}" if knowledge_id else collection_name
+                            ),
+                            "processing_status": "completed",
+                            "processing_completed_at": int(time.time()),
+                        },
+                    )
                 # If knowledge_id is provided, we're adding to both collections at once
-                if knowledge_id:
+                elif knowledge_id:
                     file_collection = f"file-{file.id}"
                     collections = [file_collection, knowledge_id]
                     
-                    print(f"  [STEP 5] Knowledge ID provided, saving to multiple collections:", flush=True)
-                    print(f"    collections: {collections}", flush=True)
                     log.info(
                         f"Processing file file_id={file.id}, filename={file.filename} "
                         f"for both file collection and knowledge base: collections={collections}, "
@@ -2342,13 +2668,11 @@ def _process_file_sync(
                     )
 
                     # Use file collection name for file metadata
-                    print(f"  [STEP 6] Embedding save result: {result}", flush=True)
                     log.info(f"  [STEP 6] Embedding save result: {result}")
                     
                     if result:
-                        print(f"  [STEP 6] ✅ Embeddings saved successfully, updating file status to 'completed'", flush=True)
                         log.info(f"  [STEP 6] ✅ Embeddings saved successfully, updating file status to 'completed'")
-                        Files.update_file_metadata_by_id(
+                        update_file_processing_status(
                             file.id,
                             {
                                 "collection_name": file_collection,
@@ -2356,24 +2680,19 @@ def _process_file_sync(
                                 "processing_completed_at": int(time.time()),
                             },
                         )
-                        print(f"  [STEP 6.1] ✅ File status updated to 'completed'", flush=True)
                         log.info(f"  [STEP 6.1] ✅ File status updated to 'completed'")
                     else:
                         error_msg = "Failed to save to vector DB"
-                        print(f"  [STEP 6] ❌ {error_msg}, updating file status to 'error'", flush=True)
                         log.error(f"  [STEP 6] ❌ {error_msg}, updating file status to 'error'")
-                        Files.update_file_metadata_by_id(
+                        update_file_processing_status(
                             file.id,
                             {
                                 "processing_status": "error",
                                 "processing_error": error_msg,
                             },
                         )
-                        print(f"  [STEP 6.1] ⚠️  File status updated to 'error'", flush=True)
                         log.warning(f"  [STEP 6.1] File status updated to 'error'")
                 else:
-                    print(f"  [STEP 5] No knowledge ID, saving to single collection:", flush=True)
-                    print(f"    collection_name: {collection_name}", flush=True)
                     log.info(f"  [STEP 5] No knowledge ID, saving to single collection: {collection_name}")
                     
                     # RBAC: Pass owner_email so save_docs_to_vector_db uses per-admin model/key
@@ -2391,13 +2710,20 @@ def _process_file_sync(
                         owner_email=owner_email,  # RBAC: Per-admin model/key lookup
                     )
                     
-                    print(f"  [STEP 6] Embedding save result: {result}", flush=True)
                     log.info(f"  [STEP 6] Embedding save result: {result}")
 
                     if result:
-                        print(f"  [STEP 6] ✅ Embeddings saved successfully, updating file status to 'completed'", flush=True)
                         log.info(f"  [STEP 6] ✅ Embeddings saved successfully, updating file status to 'completed'")
-                        Files.update_file_metadata_by_id(
+                        if collection_name == f"file-{file.id}":
+                            # Re-embedding replaced the chunks that knowledge bases shared
+                            share_file_with_collections(
+                                file.id,
+                                [
+                                    knowledge.id
+                                    for knowledge in Knowledges.get_knowledge_bases_by_file_id(file.id)
+                                ],
+                            )
+                        update_file_processing_status(
                             file.id,
                             {
                                 "collection_name": collection_name,
@@ -2406,7 +2732,7 @@ def _process_file_sync(
                             },
                         )
                     else:
-                        Files.update_file_metadata_by_id(
+                        update_file_processing_status(
                             file.id,
                             {
                                 "processing_status": "error",
@@ -2421,7 +2747,7 @@ def _process_file_sync(
                 )
                 log.exception(e)
                 try:
-                    Files.update_file_metadata_by_id(
+                    update_file_processing_status(
                         file.id,
                         {
                             "processing_status": "error",
@@ -2432,21 +2758,17 @@ def _process_file_sync(
                     log.error(f"Failed to update file status after vector DB error: {update_error}")
         else:
             # Bypass embedding, just mark as completed
-            print(f"  [STEP 4] ⚠️  Embedding and retrieval bypassed (BYPASS_EMBEDDING_AND_RETRIEVAL=True)", flush=True)
             log.info(f"  [STEP 4] Embedding and retrieval bypassed (BYPASS_EMBEDDING_AND_RETRIEVAL=True)")
-            Files.update_file_metadata_by_id(
+            update_file_processing_status(
                 file.id,
                 {
                     "processing_status": "completed",
                     "processing_completed_at": int(time.time()),
                 },
             )
-            print(f"  [STEP 4.1] ✅ File status updated to 'completed' (bypassed)", flush=True)
             log.info(f"  [STEP 4.1] File status updated to 'completed' (bypassed)")
         
-        print(f"[BACKGROUND TASK] ✅ File processing completed successfully", flush=True)
         log.info(f"[BACKGROUND TASK] ✅ File processing completed successfully")
-        print("=" * 80, flush=True)
         log.info("=" * 80)
 
     except Exception as e:
@@ -2460,7 +2782,7 @@ def _process_file_sync(
         
         # Update file status to error
         try:
-            Files.update_file_metadata_by_id(
+            update_file_processing_status(
                 file_id,
                 {
                     "processing_status": "error",
@@ -2718,6 +3040,9 @@ def process_file(
                 else:
                     update_succeeded = result.rowcount > 0
                 db.commit()
+
+                if update_succeeded:
+                    emit_file_progress(form_data.file_id, cached_file.user_id, "queued")
                 
                 if not update_succeeded:
                     # Another request already set status to pending/processing
@@ -2746,7 +3071,7 @@ def process_file(
                 exc_info=True
             )
             # BUG #4 fix: Check return value in fallback path too
-            result = Files.update_file_metadata_by_id(
+            result = update_file_processing_status(
                 form_data.file_id,
                 {
                     "processing_status": "pending",
@@ -2814,7 +3139,7 @@ def process_file(
             # Status update must succeed before we can proceed
             try:
                 # Check return value to detect silent failures
-                result = Files.update_file_metadata_by_id(
+                result = update_file_processing_status(
                     form_data.file_id,
                     {
                         "processing_status": "pending",
@@ -2861,13 +3186,6 @@ def process_file(
     background_task_added = False
     
     # Get the user's embedding API key for the worker (per-admin scoped)
-    print("=" * 80, flush=True)
-    print("[PROCESS FILE] Starting file processing request", flush=True)
-    print(f"  file_id: {form_data.file_id}", flush=True)
-    print(f"  user.email: {user.email}", flush=True)
-    print(f"  user.id: {user.id}", flush=True)
-    print(f"  user.role: {user.role}", flush=True)
-    print(f"  knowledge_id: {knowledge_id}", flush=True)
     log.info("=" * 80)
     log.info("[PROCESS FILE] Starting file processing request")
     log.info(f"  file_id: {form_data.file_id}, user.email: {user.email}, user.id: {user.id}, user.role: {user.role}, knowledge_id: {knowledge_id}")
@@ -2891,11 +3209,6 @@ def process_file(
                             f"  [API KEY RBAC] Using knowledge base owner's API key: "
                             f"owner={api_key_owner_email} (not uploader={user.email})"
                         )
-                        print(
-                            f"  [API KEY RBAC] Using knowledge base owner's API key: "
-                            f"owner={api_key_owner_email} (not uploader={user.email})",
-                            flush=True
-                        )
         except Exception as e:
             log.warning(f"Failed to retrieve knowledge base owner, using uploader's email: {e}")
             # Fall back to requesting user's email if anything fails
@@ -2903,27 +3216,18 @@ def process_file(
     
     embedding_api_key = None
     embedding_model = None
-    print(f"  [STEP 1] Checking embedding engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}", flush=True)
     log.info(f"  [STEP 1] Checking embedding engine: {request.app.state.config.RAG_EMBEDDING_ENGINE}")
     
     if request.app.state.config.RAG_EMBEDDING_ENGINE in ["openai", "portkey"]:
-        print(f"  [STEP 1.1] Engine is OpenAI/Portkey, retrieving model and API key for {api_key_owner_email}...", flush=True)
         log.info(f"  [STEP 1.1] Engine is OpenAI/Portkey, retrieving model and API key for {api_key_owner_email}...")
         
         # RBAC: Get per-admin model name and API key for the owner
         embedding_model = request.app.state.config.RAG_EMBEDDING_MODEL_USER.get(api_key_owner_email)
         embedding_api_key = request.app.state.config.RAG_OPENAI_API_KEY.get(api_key_owner_email)
         
-        print(f"  [STEP 1.2] Model and API key retrieval result:", flush=True)
-        print(f"    embedding_model is None: {embedding_model is None}", flush=True)
-        print(f"    embedding_model is empty: {embedding_model == '' if embedding_model else 'N/A'}", flush=True)
-        print(f"    embedding_model value: {embedding_model if embedding_model else '(empty)'}", flush=True)
-        print(f"    embedding_api_key is None: {embedding_api_key is None}", flush=True)
-        print(f"    embedding_api_key is empty: {embedding_api_key == '' if embedding_api_key else 'N/A'}", flush=True)
-        print(f"    embedding_api_key length: {len(embedding_api_key) if embedding_api_key else 0}", flush=True)
         if embedding_api_key:
             api_key_preview = embedding_api_key[-4:] if len(embedding_api_key) >= 4 else '***'
-            print(f"    embedding_api_key ends with: ...{api_key_preview}", flush=True)
+            log.debug("    embedding_api_key ends with: ...%s", api_key_preview)
         log.info(f"  [STEP 1.2] Model and API key retrieval result:")
         log.info(f"    embedding_model is None: {embedding_model is None}")
         log.info(f"    embedding_model is empty: {embedding_model == '' if embedding_model else 'N/A'}")
@@ -2942,7 +3246,6 @@ def process_file(
                 f"Please ensure the admin ({api_key_owner_email}) configures the embedding model in Settings > Documents. "
                 f"If {api_key_owner_email} is not admin, ensure they are in a group created by an admin who has configured the model."
             )
-            print(f"  [STEP 1.3] ❌ {error_msg}", flush=True)
             log.error(f"  [STEP 1.3] ❌ {error_msg}")
             if processing_lock and lock_acquired and not lock_released:
                 try:
@@ -2964,7 +3267,6 @@ def process_file(
                 f"Please ensure the admin ({api_key_owner_email}) configures the embedding API key in Settings > Documents. "
                 f"If {api_key_owner_email} is not admin, ensure they are in a group created by an admin who has configured the API key."
             )
-            print(f"  [STEP 1.3] ❌ {error_msg}", flush=True)
             log.error(f"  [STEP 1.3] ❌ {error_msg}")
             if processing_lock and lock_acquired and not lock_released:
                 try:
@@ -2979,10 +3281,8 @@ def process_file(
                 "error": "No embedding API key configured. Please configure in Settings > Documents.",
             }
         
-        print(f"  [STEP 1.3] ✅ Model and API key retrieved and validated", flush=True)
         log.info(f"  [STEP 1.3] ✅ Model ({embedding_model}) and API key retrieved and validated for owner {api_key_owner_email}")
     else:
-        print(f"  [STEP 1.1] Engine is {request.app.state.config.RAG_EMBEDDING_ENGINE}, skipping OpenAI API key check", flush=True)
         log.info(f"  [STEP 1.1] Engine is {request.app.state.config.RAG_EMBEDDING_ENGINE}, skipping OpenAI API key check")
     
     try:
@@ -3013,6 +3313,25 @@ def process_file(
                         f"Job queue unavailable for file_id={form_data.file_id}, "
                         "falling back to BackgroundTasks"
                     )
+            except JobQueueAdmissionError as admission_error:
+                # Too much of this user's work is already waiting; don't run it in-process either
+                update_file_processing_status(
+                    form_data.file_id,
+                    {
+                        "processing_status": "error",
+                        "processing_error": "Too many files are waiting to be processed. Please try again later.",
+                    },
+                )
+                if processing_lock and lock_acquired and not lock_released:
+                    try:
+                        processing_lock.release_lock()
+                        lock_released = True
+                    except Exception as release_error:
+                        log.error(f"Failed to release lock after admission refusal: {release_error}")
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=str(admission_error),
+                )
             except Exception as job_enqueue_error:
                 # If job enqueue fails, fall back to BackgroundTasks
                 log.warning(
@@ -3685,6 +4004,13 @@ def process_files_batch(
     all_docs: List[Document] = []
     for file in form_data.files:
         try:
+            if share_file_with_collections(file.id, [collection_name]):
+                # Chunks are shared from the file's own collection, nothing to embed
+                results.append(
+                    BatchProcessFilesResult(file_id=file.id, status="completed")
+                )
+                continue
+
             text_content = file.data.get("content", "")
 
             docs: List[Document] = [
@@ -3726,6 +4052,8 @@ def process_files_batch(
 
             # Update all files with collection name
             for result in results:
+                if result.status == "completed":
+                    continue
                 Files.update_file_metadata_by_id(
                     result.file_id, {"collection_name": collection_name}
                 )
@@ -3736,6 +4064,8 @@ def process_files_batch(
                 f"process_files_batch: Error saving documents to vector DB: {str(e)}"
             )
             for result in results:
+                if result.status == "completed":
+                    continue
                 result.status = "failed"
                 errors.append(
                     BatchProcessFilesResult(file_id=result.file_id, error=str(e))
@@ -21,6 +21,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from open_webui.utils.auth import get_admin_user, get_current_user, get_password_hash, get_verified_user
 from open_webui.utils.super_admin import is_email_super_admin, get_super_admin_emails
+from open_webui.utils.cache import get_cache_manager
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -241,6 +242,8 @@ async def update_user_permissions(
     request: Request, form_data: UserPermissions, user=Depends(get_admin_user)
 ):
     request.app.state.config.USER_PERMISSIONS = form_data.model_dump()
+    # Effective permissions of every user are merged with the defaults
+    get_cache_manager().bump_permissions_version()
     return request.app.state.config.USER_PERMISSIONS
 
 
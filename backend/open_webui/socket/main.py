@@ -1,4 +1,5 @@
 import asyncio
+import json
 import os
 import socketio
 import logging
@@ -13,9 +14,11 @@ from open_webui.env import (
     ENABLE_WEBSOCKET_SUPPORT,
     WEBSOCKET_MANAGER,
     WEBSOCKET_REDIS_URL,
+    WEBSOCKET_PRESENCE_BROADCAST_INTERVAL_MS,
 )
 from open_webui.utils.auth import decode_token
 from open_webui.socket.utils import RedisDict, RedisLock
+from open_webui.socket.progress import get_user_room
 
 from open_webui.env import (
     GLOBAL_LOG_LEVEL,
@@ -51,6 +54,14 @@ else:
 # Timeout duration in seconds
 TIMEOUT_DURATION = 3
 
+# Room for sockets that receive presence/usage updates (admins join automatically,
+# other clients join by requesting the "user-list")
+PRESENCE_ROOM = "presence"
+
+# Sorted set of usage heartbeats (member: [model_id, sid], score: last update),
+# so expiry only reads stale entries instead of the whole usage hash
+USAGE_HEARTBEATS_KEY = "open-webui:usage_pool:heartbeats"
+
 # Dictionary to maintain the user pool
 
 if WEBSOCKET_MANAGER == "redis":
@@ -77,6 +88,78 @@ else:
     aquire_func = release_func = renew_func = lambda: True
 
 
+def remove_expired_usage_entries():
+    """
+    Remove timed-out sessions by scanning the full usage pool.
+    Returns True if any entry was removed.
+    """
+    now = int(time.time())
+    removed = False
+    for model_id, connections in list(USAGE_POOL.items()):
+        # Ensure connections is a dict
+        if not isinstance(connections, dict):
+            log.warning(f"USAGE_POOL[{model_id}] is not a dict, resetting. Value: {connections}")
+            try:
+                del USAGE_POOL[model_id]
+            except KeyError:
+                pass  # Already deleted by another replica
+            continue
+
+        # Creating a list of sids to remove if they have timed out
+        expired_sids = [
+            sid
+            for sid, details in connections.items()
+            if isinstance(details, dict) and now - details.get("updated_at", 0) > TIMEOUT_DURATION
+        ]
+
+        if expired_sids:
+            # Use truly atomic Lua script for batch field removal (single round trip)
+            if isinstance(USAGE_POOL, RedisDict):
+                result = USAGE_POOL.atomic_remove_dict_fields(model_id, expired_sids)
+                if result is None:
+                    log.debug(f"Cleaning up model {model_id} from usage pool (now empty)")
+            else:
+                # Fallback for regular dict (single-pod mode, no Redis)
+                for expired_sid in expired_sids:
+                    if expired_sid in connections:
+                        del connections[expired_sid]
+                if not connections:
+                    log.debug(f"Cleaning up model {model_id} from usage pool")
+                    del USAGE_POOL[model_id]
+                else:
+                    USAGE_POOL[model_id] = connections
+            removed = True
+    return removed
+
+
+def remove_expired_usage_heartbeats():
+    """
+    Remove timed-out sessions using the heartbeat sorted set (Redis mode).
+    Only expired heartbeats are read, so the cost does not grow with the
+    number of active sessions. Returns True if any entry was removed.
+    """
+    cutoff = int(time.time()) - TIMEOUT_DURATION - 1
+    expired = USAGE_POOL.redis.zrangebyscore(USAGE_HEARTBEATS_KEY, "-inf", cutoff)
+    if not expired:
+        return False
+
+    expired_by_model = {}
+    for member in expired:
+        try:
+            model_id, sid = json.loads(member)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue
+        expired_by_model.setdefault(model_id, []).append(sid)
+
+    for model_id, sids in expired_by_model.items():
+        if USAGE_POOL.atomic_remove_dict_fields(model_id, sids) is None:
+            log.debug(f"Cleaning up model {model_id} from usage pool (now empty)")
+
+    # Only drops heartbeats that were not refreshed in the meantime
+    USAGE_POOL.redis.zremrangebyscore(USAGE_HEARTBEATS_KEY, "-inf", cutoff)
+    return True
+
+
 async def periodic_usage_pool_cleanup():
     if not aquire_func():
         log.debug("Usage pool cleanup lock already exists. Not running it.")
@@ -85,6 +168,7 @@ async def periodic_usage_pool_cleanup():
     
     consecutive_renewal_failures = 0
     max_renewal_failures = 3  # Allow some transient failures before giving up
+    legacy_sweep_pending = True
     
     try:
         while True:
@@ -110,47 +194,17 @@ async def periodic_usage_pool_cleanup():
             # Reset failure counter on successful renewal
             consecutive_renewal_failures = 0
 
-            now = int(time.time())
-            send_usage = False
             try:
-                for model_id, connections in list(USAGE_POOL.items()):
-                    # Ensure connections is a dict
-                    if not isinstance(connections, dict):
-                        log.warning(f"USAGE_POOL[{model_id}] is not a dict, resetting. Value: {connections}")
-                        try:
-                            del USAGE_POOL[model_id]
-                        except KeyError:
-                            pass  # Already deleted by another replica
-                        continue
-                    
-                    # Creating a list of sids to remove if they have timed out
-                    expired_sids = [
-                        sid
-                        for sid, details in connections.items()
-                        if isinstance(details, dict) and now - details.get("updated_at", 0) > TIMEOUT_DURATION
-                    ]
-
-                    if expired_sids:
-                        # Use truly atomic Lua script for batch field removal (single round trip)
-                        if isinstance(USAGE_POOL, RedisDict):
-                            result = USAGE_POOL.atomic_remove_dict_fields(model_id, expired_sids)
-                            if result is None:
-                                log.debug(f"Cleaning up model {model_id} from usage pool (now empty)")
-                        else:
-                            # Fallback for regular dict (single-pod mode, no Redis)
-                            for expired_sid in expired_sids:
-                                if expired_sid in connections:
-                                    del connections[expired_sid]
-                            if not connections:
-                                log.debug(f"Cleaning up model {model_id} from usage pool")
-                                del USAGE_POOL[model_id]
-                            else:
-                                USAGE_POOL[model_id] = connections
-                        send_usage = True
-
-                if send_usage:
-                    # Emit updated usage information after cleaning
-                    await sio.emit("usage", {"models": get_models_in_use()})
+                if isinstance(USAGE_POOL, RedisDict) and not legacy_sweep_pending:
+                    removed = remove_expired_usage_heartbeats()
+                else:
+                    # Single-pod mode, or the first pass after startup to pick up
+                    # entries written before the heartbeat index existed
+                    removed = remove_expired_usage_entries()
+                    legacy_sweep_pending = False
+
+                if removed:
+                    presence_aggregator.mark_usage_changed()
             except Exception as e:
                 log.error(f"Error in usage pool cleanup iteration: {e}", exc_info=True)
 
@@ -174,6 +228,96 @@ def get_models_in_use():
     return models_in_use
 
 
+class PresenceAggregator:
+    """
+    Coalesces presence and usage changes into periodic diffs.
+
+    Socket handlers only record which users came online/went offline and
+    whether model usage changed. Once per interval, each pod re-checks the
+    changed users with one pipelined HEXISTS batch and emits a diff to
+    PRESENCE_ROOM, instead of sending every list to every client on every event.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._changed_user_ids = set()
+        self._usage_changed = False
+        self._last_models = None
+
+    def mark_user_changed(self, user_id):
+        self._changed_user_ids.add(user_id)
+
+    def mark_usage_changed(self):
+        self._usage_changed = True
+
+    async def flush(self):
+        if self._changed_user_ids:
+            user_ids, self._changed_user_ids = self._changed_user_ids, set()
+
+            # Resolve the current state so out-of-order events across pods settle
+            if isinstance(USER_POOL, RedisDict):
+                states = USER_POOL.exists_many(user_ids)
+            else:
+                states = {user_id: user_id in USER_POOL for user_id in user_ids}
+
+            await sio.emit(
+                "presence",
+                {
+                    "online": [user_id for user_id, online in states.items() if online],
+                    "offline": [user_id for user_id, online in states.items() if not online],
+                    "count": len(USER_POOL),
+                },
+                room=PRESENCE_ROOM,
+            )
+
+        if self._usage_changed:
+            self._usage_changed = False
+            models = sorted(get_models_in_use())
+            if models != self._last_models:
+                self._last_models = models
+                await sio.emit("usage", {"models": models}, room=PRESENCE_ROOM)
+
+    async def run(self):
+        while True:
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Error broadcasting presence updates: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+
+presence_aggregator = PresenceAggregator(WEBSOCKET_PRESENCE_BROADCAST_INTERVAL_MS / 1000)
+
+
+async def periodic_presence_broadcast():
+    await presence_aggregator.run()
+
+
+def add_user_session(user_id, sid):
+    """Register a session for a user; marks the user changed if they just came online."""
+    # Atomic append to prevent race conditions (fast single round trip)
+    # Fallback to regular dict operations if RedisDict not available
+    if isinstance(USER_POOL, RedisDict):
+        sessions = USER_POOL.atomic_append_to_list(user_id, sid)
+    else:
+        # Fallback for regular dict (single-pod mode, no Redis)
+        existing_sessions = USER_POOL.get(user_id, [])
+        if not isinstance(existing_sessions, list):
+            existing_sessions = []
+        sessions = existing_sessions + [sid]
+        USER_POOL[user_id] = sessions
+
+    if len(sessions) == 1:
+        presence_aggregator.mark_user_changed(user_id)
+
+
+async def send_presence_snapshot(sid):
+    """Subscribe a session to presence updates and send it the full current state."""
+    await sio.enter_room(sid, PRESENCE_ROOM)
+    await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())}, to=sid)
+    await sio.emit("usage", {"models": get_models_in_use()}, to=sid)
+
+
 @sio.on("usage")
 async def usage(sid, data):
     try:
@@ -183,17 +327,23 @@ async def usage(sid, data):
 
         # Use truly atomic Lua script for single-round-trip update (prevents race conditions)
         if isinstance(USAGE_POOL, RedisDict):
-            USAGE_POOL.atomic_set_dict_field(model_id, sid, {"updated_at": current_time})
+            usage = USAGE_POOL.atomic_set_dict_field(model_id, sid, {"updated_at": current_time})
+            pipe = USAGE_POOL.redis.pipeline(transaction=False)
+            pipe.zadd(USAGE_HEARTBEATS_KEY, {json.dumps([model_id, sid]): current_time})
+            pipe.expire(USAGE_HEARTBEATS_KEY, USAGE_POOL.default_ttl)
+            pipe.execute()
         else:
             # Fallback for regular dict (single-pod mode, no Redis)
-            existing_usage = USAGE_POOL.get(model_id, {})
-            if not isinstance(existing_usage, dict):
-                existing_usage = {}
-            existing_usage[sid] = {"updated_at": current_time}
-            USAGE_POOL[model_id] = existing_usage
-
-        # Broadcast the usage data to all clients
-        await sio.emit("usage", {"models": get_models_in_use()})
+            usage = USAGE_POOL.get(model_id, {})
+            if not isinstance(usage, dict):
+                usage = {}
+            usage[sid] = {"updated_at": current_time}
+            USAGE_POOL[model_id] = usage
+
+        # A model's first session may have just put it in use; the aggregator
+        # only broadcasts if the set of models actually changed
+        if len(usage) == 1:
+            presence_aggregator.mark_usage_changed()
     except Exception as e:
         log.error(f"Error in usage handler for session {sid}: {e}", exc_info=True)
 
@@ -210,23 +360,15 @@ async def connect(sid, environ, auth):
         if user:
             try:
                 SESSION_POOL[sid] = user.model_dump()
-                # Atomic append to prevent race conditions (fast single round trip)
-                # Fallback to regular dict operations if RedisDict not available
-                if isinstance(USER_POOL, RedisDict):
-                    USER_POOL.atomic_append_to_list(user.id, sid)
-                else:
-                    # Fallback for regular dict (single-pod mode, no Redis)
-                    existing_sessions = USER_POOL.get(user.id, [])
-                    if not isinstance(existing_sessions, list):
-                        existing_sessions = []
-                    USER_POOL[user.id] = existing_sessions + [sid]
+                add_user_session(user.id, sid)
+                await sio.enter_room(sid, get_user_room(user.id))
 
                 pod_id = os.environ.get("HOSTNAME", "unknown")
                 log.debug(
                     f"[DEBUG] [WS-CHAT 0] [socket connect from socket/main.py] websocket connected on this pod. pod={pod_id} session_id={sid} user_id={user.id}."
                 )
-                await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
-                await sio.emit("usage", {"models": get_models_in_use()})
+                if user.role == "admin":
+                    await send_presence_snapshot(sid)
             except Exception as e:
                 log.error(f"Error in connect handler for user {user.id}: {e}", exc_info=True)
 
@@ -248,16 +390,8 @@ async def user_join(sid, data):
 
     try:
         SESSION_POOL[sid] = user.model_dump()
-        # Atomic append to prevent race conditions (fast single round trip)
-        # Fallback to regular dict operations if RedisDict not available
-        if isinstance(USER_POOL, RedisDict):
-            USER_POOL.atomic_append_to_list(user.id, sid)
-        else:
-            # Fallback for regular dict (single-pod mode, no Redis)
-            existing_sessions = USER_POOL.get(user.id, [])
-            if not isinstance(existing_sessions, list):
-                existing_sessions = []
-            USER_POOL[user.id] = existing_sessions + [sid]
+        add_user_session(user.id, sid)
+        await sio.enter_room(sid, get_user_room(user.id))
 
         pod_id = os.environ.get("HOSTNAME", "unknown")
         log.debug(
@@ -271,7 +405,8 @@ async def user_join(sid, data):
 
         # print(f"user {user.name}({user.id}) connected with session ID {sid}")
 
-        await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+        if user.role == "admin":
+            await send_presence_snapshot(sid)
         return {"id": user.id, "name": user.name}
     except Exception as e:
         log.error(f"Error in user_join handler for user {user.id}: {e}", exc_info=True)
@@ -335,7 +470,8 @@ async def channel_events(sid, data):
 
 @sio.on("user-list")
 async def user_list(sid):
-    await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+    # Reply to the requesting session only and subscribe it to presence diffs
+    await send_presence_snapshot(sid)
 
 
 @sio.event
@@ -348,8 +484,9 @@ async def disconnect(sid):
             user_id = user["id"]
             # Use truly atomic Lua script for list item removal (single round trip)
             if isinstance(USER_POOL, RedisDict):
-                USER_POOL.atomic_remove_from_list(user_id, sid)
                 # Note: atomic_remove_from_list handles key deletion if list becomes empty
+                if USER_POOL.atomic_remove_from_list(user_id, sid) is None:
+                    presence_aggregator.mark_user_changed(user_id)
             else:
                 # Fallback for regular dict (single-pod mode, no Redis)
                 existing_sessions = USER_POOL.get(user_id, [])
@@ -359,10 +496,9 @@ async def disconnect(sid):
                 if len(filtered_sessions) == 0:
                     if user_id in USER_POOL:
                         del USER_POOL[user_id]
+                    presence_aggregator.mark_user_changed(user_id)
                 else:
                     USER_POOL[user_id] = filtered_sessions
-
-            await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
         else:
             pass
             # print(f"Unknown session ID {sid} disconnected")
@@ -0,0 +1,136 @@
+"""
+File processing progress pushed to the uploader's sockets.
+
+Events are sent as "file-progress" to the user's room. With the Redis
+websocket manager they are published through Redis (a write-only socket.io
+manager), so RQ workers and every pod can emit them; otherwise they go
+through the socket.io server of the current process, if there is one.
+"""
+
+import asyncio
+import functools
+import logging
+import sys
+import threading
+import time
+from typing import Optional
+
+import anyio.from_thread
+import socketio
+
+from open_webui.env import SRC_LOG_LEVELS, WEBSOCKET_MANAGER, WEBSOCKET_REDIS_URL
+from open_webui.models.files import FileModel, Files
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["SOCKET"])
+
+FILE_PROGRESS_EVENT = "file-progress"
+
+# Overall percentage at the start of each stage; embedding fills the gap up to 95
+STAGE_PROGRESS = {
+    "queued": 0,
+    "processing": 5,
+    "extracting": 10,
+    "chunking": 30,
+    "embedding": 35,
+    "completed": 100,
+}
+
+# processing_status values stored in file.meta -> stage names
+STATUS_STAGES = {"pending": "queued"}
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_user_room(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def _get_redis_manager() -> Optional[socketio.RedisManager]:
+    global _manager
+    if WEBSOCKET_MANAGER != "redis":
+        return None
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = socketio.RedisManager(WEBSOCKET_REDIS_URL, write_only=True)
+    return _manager
+
+
+def _emit_in_process(data: dict, room: str) -> None:
+    # Only the web app imports the socket server; workers have nothing to emit to
+    socket_main = sys.modules.get("open_webui.socket.main")
+    if socket_main is None:
+        return
+
+    emit = functools.partial(socket_main.sio.emit, FILE_PROGRESS_EVENT, data, room=room)
+    try:
+        asyncio.get_running_loop().create_task(emit())
+        return
+    except RuntimeError:
+        pass
+
+    try:
+        # Threadpool / background task thread started by the app's event loop
+        anyio.from_thread.run(emit)
+    except RuntimeError:
+        log.debug(f"No event loop to emit {FILE_PROGRESS_EVENT} to {room}")
+
+
+def emit_file_progress(
+    file_id: str,
+    user_id: Optional[str],
+    stage: str,
+    current: Optional[int] = None,
+    total: Optional[int] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Push a progress event for a file. Never raises: progress is best-effort
+    and clients can still fall back to GET /files/{id}/status.
+    """
+    if not file_id or not user_id:
+        return
+
+    stage = STATUS_STAGES.get(stage, stage)
+    progress = STAGE_PROGRESS.get(stage)
+    if stage == "embedding" and total:
+        progress = STAGE_PROGRESS["embedding"] + int(
+            60 * min(current or 0, total) / total
+        )
+
+    data = {
+        "file_id": file_id,
+        "stage": stage,
+        "progress": progress,
+        "current": current,
+        "total": total,
+        "error": error,
+        "timestamp": int(time.time()),
+    }
+
+    try:
+        manager = _get_redis_manager()
+        if manager is not None:
+            manager.emit(FILE_PROGRESS_EVENT, data, room=get_user_room(user_id))
+        else:
+            _emit_in_process(data, get_user_room(user_id))
+    except Exception as e:
+        log.debug(f"Failed to emit {FILE_PROGRESS_EVENT} for file {file_id}: {e}")
+
+
+def update_file_processing_status(file_id: str, meta: dict) -> Optional[FileModel]:
+    """
+    Merge `meta` (with a processing_status) into the file's metadata and push
+    the new status to the uploader's sockets.
+    """
+    file = Files.update_file_metadata_by_id(file_id, meta)
+    if file is not None:
+        emit_file_progress(
+            file.id,
+            file.user_id,
+            meta["processing_status"],
+            error=meta.get("processing_error"),
+        )
+    return file
@@ -907,6 +907,25 @@ class RedisDict:
             log.error(f"Redis error getting keys of {self.name}: {e}")
             return []  # Return empty list on error
 
+    def exists_many(self, keys):
+        """
+        Check which keys exist using one pipelined batch of HEXISTS calls.
+        
+        Returns:
+            Dict mapping each key to True/False (all False if Redis is unavailable)
+        """
+        keys = list(keys)
+        if self.redis is None or not keys:
+            return {key: False for key in keys}
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.hexists(self.name, key)
+            return {key: bool(exists) for key, exists in zip(keys, pipe.execute())}
+        except (ConnectionError, TimeoutError, RedisError) as e:
+            log.error(f"Redis error checking keys of {self.name}: {e}")
+            return {key: False for key in keys}
+
     def values(self):
         # BUG #3 fix: Check if redis is available
         if self.redis is None:
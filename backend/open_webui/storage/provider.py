@@ -1,11 +1,18 @@
+import hashlib
 import os
 import shutil
+import threading
 import json
 import logging
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Iterator, Optional, Tuple
 
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from open_webui.config import (
@@ -23,20 +30,329 @@ from open_webui.config import (
     AZURE_STORAGE_CONTAINER_NAME,
     AZURE_STORAGE_KEY,
     STORAGE_PROVIDER,
+    STORAGE_CACHE_MAX_SIZE_MB,
     UPLOAD_DIR,
+    CACHE_DIR,
 )
 from google.cloud import storage
 from google.cloud.exceptions import GoogleCloudError, NotFound
 from open_webui.constants import ERROR_MESSAGES
 from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import BlobSasPermissions, BlobServiceClient, generate_blob_sas
+from azure.core import MatchConditions
 from azure.core.exceptions import ResourceNotFoundError
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.misc import HashingFileReader
 
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Size of the blocks uploads are read and sent in (S3 part / GCS resumable chunk
+# size; GCS needs a multiple of 256 KiB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Size of the blocks files are streamed to clients in
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _iter_local_file(
+    file_path: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yields bytes start..end (inclusive, None = to the end) of a local file."""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = f.read(
+                STREAM_CHUNK_SIZE
+                if remaining is None
+                else min(STREAM_CHUNK_SIZE, remaining)
+            )
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+class _LocalCopyWriter:
+    """
+    Writes a local copy of a file to a temporary path while hashing it; the
+    copy replaces `local_path` only once it is complete (see commit).
+    """
+
+    def __init__(self, local_path: str, sha256=None):
+        self.local_path = local_path
+        self.size = 0
+        # A hash object fed elsewhere with the same bytes, shared rather
+        # than computed twice
+        self._hash_writes = sha256 is None
+        self._sha256 = hashlib.sha256() if sha256 is None else sha256
+        self._tmp_path = f"{local_path}.{uuid.uuid4().hex}.part"
+        self._file = open(self._tmp_path, "wb")
+
+    def write(self, data: bytes) -> int:
+        if self._hash_writes:
+            self._sha256.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+    def commit(self) -> None:
+        self._file.close()
+        os.replace(self._tmp_path, self.local_path)
+
+    def discard(self) -> None:
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class _DownloadStream(_LocalCopyWriter):
+    """Write target for object store downloads (never seekable, so chunks arrive in order)."""
+
+    def seekable(self) -> bool:
+        return False
+
+
+class _UploadStream(_LocalCopyWriter):
+    """
+    Read side of an upload: hands the request body to the object store client
+    in chunks and keeps the local copy as it goes, so the upload is never
+    buffered whole or read back from disk.
+
+    If the body is a HashingFileReader, its digest is reused for the local
+    copy instead of hashing the bytes again.
+
+    Raises ValueError straight away if the body is empty.
+    """
+
+    def __init__(self, file: BinaryIO, local_path: str):
+        self._source = file
+        self._head = file.read(UPLOAD_CHUNK_SIZE)
+        if not self._head:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        super().__init__(
+            local_path,
+            sha256=file.sha256 if isinstance(file, HashingFileReader) else None,
+        )
+
+    def read(self, size: int = -1) -> bytes:
+        if self._head:
+            if size is None or size < 0:
+                chunk = self._head + self._source.read()
+                self._head = b""
+            else:
+                chunk, self._head = self._head[:size], self._head[size:]
+                if len(chunk) < size:
+                    chunk += self._source.read(size - len(chunk))
+        else:
+            chunk = self._source.read(size)
+        self.write(chunk)
+        return chunk
+
+    def tell(self) -> int:
+        return self.size
+
+    def seekable(self) -> bool:
+        return False
+
+
+class LocalFileCache:
+    """
+    Size-bounded read-through cache for the local copies of object store files.
+
+    Copies stay in UPLOAD_DIR, where callers expect them; a small JSON record
+    per copy (under CACHE_DIR/storage) holds its size, sha256 and the object's
+    ETag, and the record's mtime is the copy's last use. A copy is reused only
+    while the object's ETag is unchanged and the file still matches its
+    record (re-hashed if it was modified since). Least recently used copies
+    are removed once the total exceeds STORAGE_CACHE_MAX_SIZE_MB.
+    """
+
+    # Copies used this recently are never evicted: callers open the returned
+    # path after get() or put(), possibly from another process
+    EVICTION_GRACE_SECONDS = 300
+    # Records are shared with other processes; rescan them at most this often
+    INDEX_REFRESH_SECONDS = 60
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # filename -> [last_used, size] of every record
+        self._index: dict[str, list] = {}
+        self._index_loaded_at: Optional[float] = None
+
+    @staticmethod
+    def _record_path(local_path: str) -> str:
+        return f"{CACHE_DIR}/storage/{os.path.basename(local_path)}.json"
+
+    @staticmethod
+    def _read_record(record_path: str) -> Optional[dict]:
+        try:
+            with open(record_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_record(record_path: str, record: dict) -> None:
+        os.makedirs(os.path.dirname(record_path), exist_ok=True)
+        tmp_path = f"{record_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, record_path)
+
+    @staticmethod
+    def _sha256_file(path: str) -> str:
+        with open(path, "rb") as f:
+            reader = HashingFileReader(f)
+            while reader.read(UPLOAD_CHUNK_SIZE):
+                pass
+        return reader.hexdigest()
+
+    def _note_use(self, local_path: str, size: int) -> None:
+        with self._lock:
+            self._index[os.path.basename(local_path)] = [time.time(), size]
+
+    def get(self, local_path: str, etag: str) -> Optional[str]:
+        """Returns local_path if it holds a valid copy of the object with this ETag."""
+        record_path = self._record_path(local_path)
+        record = self._read_record(record_path)
+        if not record or record.get("etag") != etag:
+            return None
+
+        try:
+            stat = os.stat(local_path)
+        except FileNotFoundError:
+            return None
+        if stat.st_size != record.get("size"):
+            return None
+        if stat.st_mtime_ns != record.get("mtime_ns"):
+            if self._sha256_file(local_path) != record.get("sha256"):
+                log.warning(f"Cached copy {local_path} failed checksum validation")
+                return None
+            record["mtime_ns"] = stat.st_mtime_ns
+            self._write_record(record_path, record)
+        else:
+            try:
+                os.utime(record_path)
+            except FileNotFoundError:
+                # Evicted meanwhile by another process
+                return None
+
+        self._note_use(local_path, stat.st_size)
+        return local_path
+
+    def put(self, copy: _LocalCopyWriter, etag: str) -> None:
+        """Records a committed local copy and evicts old copies if over the limit."""
+        self._write_record(
+            self._record_path(copy.local_path),
+            {
+                "size": copy.size,
+                "sha256": copy.hexdigest(),
+                "etag": etag,
+                "mtime_ns": os.stat(copy.local_path).st_mtime_ns,
+            },
+        )
+        self._note_use(copy.local_path, copy.size)
+        self._evict(keep=copy.local_path)
+
+    def forget(self, local_path: str) -> None:
+        with self._lock:
+            self._index.pop(os.path.basename(local_path), None)
+        try:
+            os.remove(self._record_path(local_path))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index.clear()
+        shutil.rmtree(f"{CACHE_DIR}/storage", ignore_errors=True)
+
+    def _load_index(self) -> None:
+        record_dir = f"{CACHE_DIR}/storage"
+        index = {}
+        try:
+            names = os.listdir(record_dir)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            record_path = os.path.join(record_dir, name)
+            record = self._read_record(record_path)
+            try:
+                last_used = os.stat(record_path).st_mtime
+            except FileNotFoundError:
+                continue
+            if record:
+                index[name[: -len(".json")]] = [last_used, record.get("size", 0)]
+        self._index = index
+        self._index_loaded_at = time.monotonic()
+
+    def _evict(self, keep: str) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            if (
+                self._index_loaded_at is None
+                or time.monotonic() - self._index_loaded_at > self.INDEX_REFRESH_SECONDS
+            ):
+                self._load_index()
+
+            total = sum(size for _, size in self._index.values())
+            if total <= self.max_size:
+                return
+
+            grace_cutoff = time.time() - self.EVICTION_GRACE_SECONDS
+            for filename, (last_used, size) in sorted(
+                self._index.items(), key=lambda item: item[1][0]
+            ):
+                if total <= self.max_size or last_used > grace_cutoff:
+                    break
+                local_path = f"{UPLOAD_DIR}/{filename}"
+                if local_path == keep:
+                    continue
+                # Another process may have used it since the last scan
+                record_path = self._record_path(local_path)
+                try:
+                    last_used = os.stat(record_path).st_mtime
+                except FileNotFoundError:
+                    last_used = 0
+                if last_used > grace_cutoff:
+                    self._index[filename][0] = last_used
+                    continue
+
+                try:
+                    os.remove(local_path)
+                except FileNotFoundError:
+                    pass
+                try:
+                    os.remove(record_path)
+                except FileNotFoundError:
+                    pass
+                del self._index[filename]
+                total -= size
+                log.debug(f"Evicted cached copy {local_path} ({size} bytes)")
+
+
+file_cache = LocalFileCache(STORAGE_CACHE_MAX_SIZE_MB * 1024 * 1024)
+
 
 class StorageProvider(ABC):
     @abstractmethod
@@ -44,7 +360,7 @@ class StorageProvider(ABC):
         pass
 
     @abstractmethod
-    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[bytes, str]:
+    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[int, str]:
         pass
 
     @abstractmethod
@@ -55,23 +371,69 @@ class StorageProvider(ABC):
     def delete_file(self, file_path: str) -> None:
         pass
 
+    def get_file_info(self, file_path: str) -> dict:
+        """
+        Size and ETag of a stored file, without downloading it.
+        Raises FileNotFoundError if there is no such file.
+        """
+        return LocalStorageProvider.get_file_info(self.get_file(file_path))
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """
+        Streams bytes start..end (inclusive, None = to the end) of a stored
+        file. With `etag`, the read fails if the file has changed since.
+        """
+        return _iter_local_file(self.get_file(file_path), start, end)
+
+    def get_download_url(
+        self,
+        file_path: str,
+        content_disposition: Optional[str] = None,
+        content_type: Optional[str] = None,
+        expires_in: int = 300,
+    ) -> Optional[str]:
+        """Presigned URL clients can fetch the file from directly, or None if unsupported."""
+        return None
+
 
 class LocalStorageProvider(StorageProvider):
     @staticmethod
-    def upload_file(file: BinaryIO, filename: str) -> Tuple[bytes, str]:
-        contents = file.read()
-        if not contents:
-            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    def upload_file(file: BinaryIO, filename: str) -> Tuple[int, str]:
+        """Streams the file to local storage. Returns its size and path."""
         file_path = f"{UPLOAD_DIR}/{filename}"
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        return contents, file_path
+        with _UploadStream(file, file_path) as stream:
+            while stream.read(UPLOAD_CHUNK_SIZE):
+                pass
+        return stream.size, file_path
 
     @staticmethod
     def get_file(file_path: str) -> str:
         """Handles downloading of the file from local storage."""
         return file_path
 
+    @staticmethod
+    def get_file_info(file_path: str) -> dict:
+        stat = os.stat(file_path)
+        return {
+            "size": stat.st_size,
+            "etag": f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+        }
+
+    @staticmethod
+    def iter_file(
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        return _iter_local_file(file_path, start, end)
+
     @staticmethod
     def delete_file(file_path: str) -> None:
         """Handles deletion of the file from local storage."""
@@ -117,29 +479,114 @@ class S3StorageProvider(StorageProvider):
         self.bucket_name = S3_BUCKET_NAME
         self.key_prefix = S3_KEY_PREFIX if S3_KEY_PREFIX else ""
 
-    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[bytes, str]:
-        """Handles uploading of the file to S3 storage."""
-        _, file_path = LocalStorageProvider.upload_file(file, filename)
+    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[int, str]:
+        """Handles uploading of the file to S3 storage (multipart, streamed from `file`)."""
+        s3_key = os.path.join(self.key_prefix, filename)
+        stream = _UploadStream(file, self._get_local_file_path(s3_key))
         try:
-            s3_key = os.path.join(self.key_prefix, filename)
-            self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
-            return (
-                open(file_path, "rb").read(),
-                "s3://" + self.bucket_name + "/" + s3_key,
-            )
-        except ClientError as e:
+            with stream:
+                self.s3_client.upload_fileobj(
+                    stream,
+                    self.bucket_name,
+                    s3_key,
+                    Config=TransferConfig(
+                        multipart_threshold=UPLOAD_CHUNK_SIZE,
+                        multipart_chunksize=UPLOAD_CHUNK_SIZE,
+                    ),
+                )
+                etag = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)[
+                    "ETag"
+                ]
+        except (ClientError, S3UploadFailedError) as e:
             raise RuntimeError(f"Error uploading file to S3: {e}")
 
+        file_cache.put(stream, etag)
+        return stream.size, "s3://" + self.bucket_name + "/" + s3_key
+
     def get_file(self, file_path: str) -> str:
-        """Handles downloading of the file from S3 storage."""
+        """Handles downloading of the file from S3 storage, reusing a valid local copy."""
         try:
             s3_key = self._extract_s3_key(file_path)
             local_file_path = self._get_local_file_path(s3_key)
-            self.s3_client.download_file(self.bucket_name, s3_key, local_file_path)
+            etag = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)[
+                "ETag"
+            ]
+            if file_cache.get(local_file_path, etag):
+                return local_file_path
+
+            with _DownloadStream(local_file_path) as stream:
+                self.s3_client.download_fileobj(
+                    self.bucket_name,
+                    s3_key,
+                    stream,
+                    ExtraArgs={"ChecksumMode": "ENABLED"},
+                )
+            file_cache.put(stream, etag)
             return local_file_path
         except ClientError as e:
             raise RuntimeError(f"Error downloading file from S3: {e}")
 
+    def get_file_info(self, file_path: str) -> dict:
+        try:
+            head = self.s3_client.head_object(
+                Bucket=self.bucket_name, Key=self._extract_s3_key(file_path)
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                raise FileNotFoundError(f"{file_path} not found in S3")
+            raise RuntimeError(f"Error reading file from S3: {e}")
+        return {"size": head["ContentLength"], "etag": head["ETag"]}
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """Streams a byte range from S3, or from the local copy if it is current."""
+        s3_key = self._extract_s3_key(file_path)
+        local_file_path = self._get_local_file_path(s3_key)
+        if etag and file_cache.get(local_file_path, etag):
+            yield from _iter_local_file(local_file_path, start, end)
+            return
+
+        params = {
+            "Bucket": self.bucket_name,
+            "Key": s3_key,
+            "Range": f"bytes={start}-{'' if end is None else end}",
+        }
+        if etag:
+            params["IfMatch"] = etag
+        try:
+            body = self.s3_client.get_object(**params)["Body"]
+        except ClientError as e:
+            raise RuntimeError(f"Error reading file from S3: {e}")
+        try:
+            yield from body.iter_chunks(STREAM_CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def get_download_url(
+        self,
+        file_path: str,
+        content_disposition: Optional[str] = None,
+        content_type: Optional[str] = None,
+        expires_in: int = 300,
+    ) -> Optional[str]:
+        params = {"Bucket": self.bucket_name, "Key": self._extract_s3_key(file_path)}
+        if content_disposition:
+            params["ResponseContentDisposition"] = content_disposition
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.s3_client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_in
+        )
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from S3 storage."""
         try:
@@ -150,6 +597,7 @@ class S3StorageProvider(StorageProvider):
 
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
+        file_cache.forget(file_path)
 
     def delete_all_files(self) -> None:
         """Handles deletion of all files from S3 storage."""
@@ -169,6 +617,7 @@ class S3StorageProvider(StorageProvider):
 
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
+        file_cache.clear()
 
     # The s3 key is the name assigned to an object. It excludes the bucket name, but includes the internal path and the file name.
     def _extract_s3_key(self, full_file_path: str) -> str:
@@ -193,28 +642,102 @@ class GCSStorageProvider(StorageProvider):
             self.gcs_client = storage.Client()
         self.bucket = self.gcs_client.bucket(GCS_BUCKET_NAME)
 
-    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[bytes, str]:
-        """Handles uploading of the file to GCS storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename)
+    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[int, str]:
+        """Handles uploading of the file to GCS storage (resumable, streamed from `file`)."""
+        stream = _UploadStream(file, f"{UPLOAD_DIR}/{filename}")
         try:
-            blob = self.bucket.blob(filename)
-            blob.upload_from_filename(file_path)
-            return contents, "gs://" + self.bucket_name + "/" + filename
+            with stream:
+                blob = self.bucket.blob(filename, chunk_size=UPLOAD_CHUNK_SIZE)
+                # Recovering a failed chunk seeks back in the source, which
+                # the request body can't do; fail the upload instead
+                blob.upload_from_file(stream, retry=None)
         except GoogleCloudError as e:
             raise RuntimeError(f"Error uploading file to GCS: {e}")
 
+        file_cache.put(stream, blob.etag)
+        return stream.size, "gs://" + self.bucket_name + "/" + filename
+
     def get_file(self, file_path: str) -> str:
-        """Handles downloading of the file from GCS storage."""
+        """Handles downloading of the file from GCS storage, reusing a valid local copy."""
         try:
             filename = file_path.removeprefix("gs://").split("/")[1]
             local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob = self.bucket.get_blob(filename)
-            blob.download_to_filename(local_file_path)
-
+            if blob is None:
+                raise NotFound(f"{filename} not found in bucket {self.bucket_name}")
+            if file_cache.get(local_file_path, blob.etag):
+                return local_file_path
+
+            with _DownloadStream(local_file_path) as stream:
+                blob.download_to_file(stream)
+            file_cache.put(stream, blob.etag)
             return local_file_path
         except NotFound as e:
             raise RuntimeError(f"Error downloading file from GCS: {e}")
 
+    def get_file_info(self, file_path: str) -> dict:
+        filename = file_path.removeprefix("gs://").split("/")[1]
+        blob = self.bucket.get_blob(filename)
+        if blob is None:
+            raise FileNotFoundError(
+                f"{filename} not found in bucket {self.bucket_name}"
+            )
+        return {"size": blob.size, "etag": blob.etag}
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """Streams a byte range from GCS, or from the local copy if it is current."""
+        filename = file_path.removeprefix("gs://").split("/")[1]
+        local_file_path = f"{UPLOAD_DIR}/{filename}"
+        if etag and file_cache.get(local_file_path, etag):
+            yield from _iter_local_file(local_file_path, start, end)
+            return
+
+        blob = self.bucket.blob(filename)
+        position = start
+        while end is None or position <= end:
+            chunk_end = position + STREAM_CHUNK_SIZE - 1
+            if end is not None:
+                chunk_end = min(chunk_end, end)
+            try:
+                chunk = blob.download_as_bytes(
+                    start=position, end=chunk_end, if_etag_match=etag
+                )
+            except GoogleCloudError as e:
+                raise RuntimeError(f"Error reading file from GCS: {e}")
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_end - position + 1:
+                # Reached the end of the object
+                break
+            position += len(chunk)
+
+    def get_download_url(
+        self,
+        file_path: str,
+        content_disposition: Optional[str] = None,
+        content_type: Optional[str] = None,
+        expires_in: int = 300,
+    ) -> Optional[str]:
+        filename = file_path.removeprefix("gs://").split("/")[1]
+        try:
+            return self.bucket.blob(filename).generate_signed_url(
+                version="v4",
+                expiration=timedelta(seconds=expires_in),
+                method="GET",
+                response_disposition=content_disposition,
+                response_type=content_type,
+            )
+        except Exception as e:
+            # Credentials without a private key (e.g. metadata server) cannot sign
+            log.debug(f"Could not sign GCS URL for {filename}: {e}")
+            return None
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from GCS storage."""
         try:
@@ -226,6 +749,7 @@ class GCSStorageProvider(StorageProvider):
 
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
+        file_cache.forget(file_path)
 
     def delete_all_files(self) -> None:
         """Handles deletion of all files from GCS storage."""
@@ -240,6 +764,7 @@ class GCSStorageProvider(StorageProvider):
 
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
+        file_cache.clear()
 
 
 class AzureStorageProvider(StorageProvider):
@@ -263,28 +788,98 @@ class AzureStorageProvider(StorageProvider):
             self.container_name
         )
 
-    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[bytes, str]:
-        """Handles uploading of the file to Azure Blob Storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename)
+    def upload_file(self, file: BinaryIO, filename: str) -> Tuple[int, str]:
+        """Handles uploading of the file to Azure Blob Storage (block upload, streamed from `file`)."""
+        stream = _UploadStream(file, f"{UPLOAD_DIR}/{filename}")
         try:
-            blob_client = self.container_client.get_blob_client(filename)
-            blob_client.upload_blob(contents, overwrite=True)
-            return contents, f"{self.endpoint}/{self.container_name}/{filename}"
+            with stream:
+                blob_client = self.container_client.get_blob_client(filename)
+                result = blob_client.upload_blob(
+                    stream, overwrite=True, max_block_size=UPLOAD_CHUNK_SIZE
+                )
         except Exception as e:
             raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
 
+        file_cache.put(stream, result["etag"])
+        return stream.size, f"{self.endpoint}/{self.container_name}/{filename}"
+
     def get_file(self, file_path: str) -> str:
-        """Handles downloading of the file from Azure Blob Storage."""
+        """Handles downloading of the file from Azure Blob Storage, reusing a valid local copy."""
         try:
             filename = file_path.split("/")[-1]
             local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob_client = self.container_client.get_blob_client(filename)
-            with open(local_file_path, "wb") as download_file:
-                download_file.write(blob_client.download_blob().readall())
+            etag = blob_client.get_blob_properties().etag
+            if file_cache.get(local_file_path, etag):
+                return local_file_path
+
+            with _DownloadStream(local_file_path) as stream:
+                blob_client.download_blob(
+                    etag=etag, match_condition=MatchConditions.IfNotModified
+                ).readinto(stream)
+            file_cache.put(stream, etag)
             return local_file_path
         except ResourceNotFoundError as e:
             raise RuntimeError(f"Error downloading file from Azure Blob Storage: {e}")
 
+    def get_file_info(self, file_path: str) -> dict:
+        filename = file_path.split("/")[-1]
+        try:
+            properties = self.container_client.get_blob_client(
+                filename
+            ).get_blob_properties()
+        except ResourceNotFoundError as e:
+            raise FileNotFoundError(f"{filename} not found in Azure Blob Storage: {e}")
+        return {"size": properties.size, "etag": properties.etag}
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """Streams a byte range from Azure, or from the local copy if it is current."""
+        filename = file_path.split("/")[-1]
+        local_file_path = f"{UPLOAD_DIR}/{filename}"
+        if etag and file_cache.get(local_file_path, etag):
+            yield from _iter_local_file(local_file_path, start, end)
+            return
+
+        kwargs = {"offset": start, "length": None if end is None else end - start + 1}
+        if etag:
+            kwargs.update(etag=etag, match_condition=MatchConditions.IfNotModified)
+        try:
+            downloader = self.container_client.get_blob_client(filename).download_blob(
+                **kwargs
+            )
+        except ResourceNotFoundError as e:
+            raise RuntimeError(f"Error reading file from Azure Blob Storage: {e}")
+        yield from downloader.chunks()
+
+    def get_download_url(
+        self,
+        file_path: str,
+        content_disposition: Optional[str] = None,
+        content_type: Optional[str] = None,
+        expires_in: int = 300,
+    ) -> Optional[str]:
+        # A SAS token has to be signed with the account key
+        if not AZURE_STORAGE_KEY:
+            return None
+        filename = file_path.split("/")[-1]
+        sas = generate_blob_sas(
+            account_name=self.blob_service_client.account_name,
+            container_name=self.container_name,
+            blob_name=filename,
+            account_key=AZURE_STORAGE_KEY,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+            content_disposition=content_disposition,
+            content_type=content_type,
+        )
+        return f"{self.endpoint}/{self.container_name}/{filename}?{sas}"
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from Azure Blob Storage."""
         try:
@@ -296,6 +891,7 @@ class AzureStorageProvider(StorageProvider):
 
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
+        file_cache.forget(file_path)
 
     def delete_all_files(self) -> None:
         """Handles deletion of all files from Azure Blob Storage."""
@@ -308,6 +904,7 @@ class AzureStorageProvider(StorageProvider):
 
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
+        file_cache.clear()
 
 
 def get_storage_provider(storage_provider: str):
@@ -4,6 +4,7 @@ import json
 import logging
 import os
 import socket
+import threading
 import time
 from typing import Dict, Optional
 from uuid import uuid4, UUID
@@ -27,6 +28,15 @@ tasks: Dict[str, asyncio.Task] = {}
 # Redis hash key for storing task metadata
 REDIS_TASKS_KEY = "open-webui:tasks"
 
+# Redis set per chat holding the IDs of that chat's tasks (chat-scoped lookups)
+REDIS_CHAT_TASKS_KEY_PREFIX = "open-webui:tasks:chat:"
+REDIS_CHAT_TASKS_TTL = 86400
+
+# Pub/sub channel used to ask the owning replica to cancel a task, and the
+# per-request list the owner pushes its acknowledgement to
+REDIS_TASK_CANCEL_CHANNEL = "open-webui:tasks:cancel"
+REDIS_TASK_CANCEL_ACK_KEY_PREFIX = "open-webui:tasks:cancel-ack:"
+
 # Task status constants
 TASK_STATUS_RUNNING = "running"
 TASK_STATUS_COMPLETED = "completed"
@@ -97,6 +107,8 @@ class RedisTaskStore:
         self._redis_available = False
         self._max_retries = 3
         self._retry_delay = 0.1  # 100ms initial delay
+        self._reconnect_interval = 5.0  # Seconds between reconnection attempts
+        self._last_reconnect_attempt = 0.0
         self._initialize_redis()
         self._load_lua_scripts()
 
@@ -121,6 +133,7 @@ class RedisTaskStore:
         """Load Lua scripts for atomic operations. Handles errors gracefully."""
         if not self._redis_available or not self.redis:
             self._update_status_script = None
+            self._chat_tasks_script = None
             return
         
         try:
@@ -169,6 +182,23 @@ class RedisTaskStore:
                 redis.call('HSET', key, task_id, encoded)
                 return {1, 'SUCCESS'}
             """)
+            # Lua script returning the metadata of every task of a chat in one round trip
+            self._chat_tasks_script = self.redis.register_script("""
+                local task_ids = redis.call('SMEMBERS', KEYS[2])
+                if #task_ids == 0 then
+                    return {}
+                end
+                local values = redis.call('HMGET', KEYS[1], unpack(task_ids))
+                local result = {}
+                for i, task_id in ipairs(task_ids) do
+                    if values[i] then
+                        table.insert(result, values[i])
+                    else
+                        redis.call('SREM', KEYS[2], task_id)
+                    end
+                end
+                return result
+            """)
             log.debug("Lua script registered successfully")
         except Exception as e:
             log.warning(
@@ -176,19 +206,23 @@ class RedisTaskStore:
                 "Falling back to read-modify-write pattern (non-atomic)."
             )
             self._update_status_script = None
+            self._chat_tasks_script = None
 
     def _check_redis_connection(self) -> bool:
-        """Check if Redis is available, attempt reconnection if needed."""
+        """
+        Check if Redis is available, attempt reconnection if needed.
+        
+        No round trip is made while Redis is considered available: operations
+        flag the store as unavailable when they fail, and only then do we ping
+        again (at most once per _reconnect_interval).
+        """
         if self._redis_available and self.redis:
-            try:
-                self.redis.ping()
-                return True
-            except Exception:
-                self._redis_available = False
-                log.warning("Redis connection lost. Falling back to local-only mode.")
+            return True
 
         # Try to reconnect if we have a pool
-        if self.pool and not self._redis_available:
+        now = time.time()
+        if self.pool and now - self._last_reconnect_attempt >= self._reconnect_interval:
+            self._last_reconnect_attempt = now
             try:
                 if not self.redis:
                     self.redis = redis.Redis(connection_pool=self.pool)
@@ -232,7 +266,11 @@ class RedisTaskStore:
         return None
 
     def create_task_metadata(
-        self, task_id: str, pod_id: str, status: str = TASK_STATUS_RUNNING
+        self,
+        task_id: str,
+        pod_id: str,
+        status: str = TASK_STATUS_RUNNING,
+        chat_id: Optional[str] = None,
     ) -> bool:
         """
         Store task metadata in Redis atomically.
@@ -248,14 +286,18 @@ class RedisTaskStore:
                 "status": status,
                 "created_at": time.time(),
             }
+            if chat_id:
+                metadata["chat_id"] = chat_id
             
             def _create():
-                self.redis.hset(
-                    REDIS_TASKS_KEY, task_id, json.dumps(metadata)
-                )
-                # Set TTL on the hash key (optional, but helps with cleanup)
-                # Note: This sets TTL on the entire hash, not individual fields
-                # For per-task TTL, we'd need a different structure
+                # Single round trip: metadata + chat index
+                pipe = self.redis.pipeline()
+                pipe.hset(REDIS_TASKS_KEY, task_id, json.dumps(metadata))
+                if chat_id:
+                    chat_key = f"{REDIS_CHAT_TASKS_KEY_PREFIX}{chat_id}"
+                    pipe.sadd(chat_key, task_id)
+                    pipe.expire(chat_key, REDIS_CHAT_TASKS_TTL)
+                pipe.execute()
             
             self._retry_operation(_create)
             return True
@@ -416,9 +458,9 @@ class RedisTaskStore:
             )
             return False
 
-    def delete_task_metadata(self, task_id: str) -> bool:
+    def delete_task_metadata(self, task_id: str, chat_id: Optional[str] = None) -> bool:
         """
-        Delete task metadata from Redis.
+        Delete task metadata (and its chat index entry) from Redis.
         Returns True if successful or if task didn't exist, False on Redis error.
         """
         if not self._check_redis_connection():
@@ -426,7 +468,11 @@ class RedisTaskStore:
 
         try:
             def _delete():
-                self.redis.hdel(REDIS_TASKS_KEY, task_id)
+                pipe = self.redis.pipeline()
+                pipe.hdel(REDIS_TASKS_KEY, task_id)
+                if chat_id:
+                    pipe.srem(f"{REDIS_CHAT_TASKS_KEY_PREFIX}{chat_id}", task_id)
+                pipe.execute()
             
             self._retry_operation(_delete)
             return True
@@ -511,6 +557,85 @@ class RedisTaskStore:
             log.error(f"Unexpected error getting all task metadata: {e}", exc_info=True)
             return {}
 
+    def get_chat_task_metadata(self, chat_id: str) -> list:
+        """
+        Get the metadata of all tasks belonging to a chat in a single round trip.
+        Returns empty list if Redis is unavailable.
+        """
+        if not self._check_redis_connection() or not self._chat_tasks_script:
+            return []
+
+        try:
+            def _get_chat():
+                return self._chat_tasks_script(
+                    keys=[REDIS_TASKS_KEY, f"{REDIS_CHAT_TASKS_KEY_PREFIX}{chat_id}"]
+                )
+
+            result = []
+            for value in self._retry_operation(_get_chat) or []:
+                try:
+                    result.append(json.loads(value))
+                except json.JSONDecodeError:
+                    continue
+            return result
+        except (ConnectionError, TimeoutError, RedisError) as e:
+            log.error(f"Redis error getting tasks for chat {chat_id}: {e}")
+            self._redis_available = False
+            return []
+        except Exception as e:
+            log.error(f"Unexpected error getting tasks for chat {chat_id}: {e}", exc_info=True)
+            return []
+
+    def publish_cancel_request(self, task_id: str, pod_id: str, request_id: str) -> int:
+        """
+        Ask the replica owning a task to cancel it.
+        Returns the number of replicas that received the request (0 if none).
+        """
+        if not self._check_redis_connection():
+            return 0
+
+        try:
+            payload = json.dumps(
+                {"task_id": task_id, "pod_id": pod_id, "request_id": request_id}
+            )
+            return self.redis.publish(REDIS_TASK_CANCEL_CHANNEL, payload) or 0
+        except (ConnectionError, TimeoutError, RedisError) as e:
+            log.error(f"Redis error publishing cancel request for {task_id}: {e}")
+            self._redis_available = False
+            return 0
+
+    def push_cancel_ack(self, request_id: str, ack: dict, ttl: int = 60) -> bool:
+        """Acknowledge a cancel request back to the replica that sent it."""
+        if not self._check_redis_connection():
+            return False
+
+        try:
+            key = f"{REDIS_TASK_CANCEL_ACK_KEY_PREFIX}{request_id}"
+            pipe = self.redis.pipeline()
+            pipe.rpush(key, json.dumps(ack))
+            pipe.expire(key, ttl)
+            pipe.execute()
+            return True
+        except (ConnectionError, TimeoutError, RedisError) as e:
+            log.error(f"Redis error acknowledging cancel request {request_id}: {e}")
+            self._redis_available = False
+            return False
+
+    def pop_cancel_ack(self, request_id: str) -> Optional[dict]:
+        """Non-blocking read of a cancel acknowledgement (None if not there yet)."""
+        if not self._check_redis_connection():
+            return None
+
+        try:
+            value = self.redis.lpop(f"{REDIS_TASK_CANCEL_ACK_KEY_PREFIX}{request_id}")
+            return json.loads(value) if value else None
+        except (ConnectionError, TimeoutError, RedisError) as e:
+            log.error(f"Redis error reading cancel ack {request_id}: {e}")
+            self._redis_available = False
+            return None
+        except json.JSONDecodeError:
+            return None
+
     def cleanup_orphaned_tasks(self, current_pod_id: str) -> int:
         """
         Clean up tasks from this pod that no longer exist locally (orphaned after restart).
@@ -591,6 +716,7 @@ def _safe_int_env(key: str, default: int, min_value: int = 1) -> int:
 TASK_CLEANUP_INTERVAL = _safe_int_env("TASK_CLEANUP_INTERVAL", 300, min_value=60)  # Run cleanup every 5 minutes (default, min 1 minute)
 TASK_STALE_THRESHOLD = _safe_int_env("TASK_STALE_THRESHOLD", 3600, min_value=60)  # Consider tasks stale after 1 hour (default, min 1 minute)
 TASK_COMPLETED_RETENTION = _safe_int_env("TASK_COMPLETED_RETENTION", 86400, min_value=3600)  # Keep completed/cancelled tasks for 24 hours (default, min 1 hour)
+TASK_CANCEL_ACK_TIMEOUT = _safe_int_env("TASK_CANCEL_ACK_TIMEOUT", 5, min_value=1)  # Seconds to wait for the owning pod to acknowledge a cancel
 
 
 async def startup_cleanup():
@@ -713,7 +839,7 @@ async def periodic_task_cleanup():
         log.debug("Task cleanup stopped")
 
 
-def cleanup_task(task_id: str):
+def cleanup_task(task_id: str, chat_id: Optional[str] = None):
     """
     Remove a completed or canceled task from both local dictionary and Redis.
     This ensures data invalidation across all pods.
@@ -724,17 +850,16 @@ def cleanup_task(task_id: str):
 
     # Remove from Redis (ensures invalidation across all pods)
     # This is idempotent - safe to call multiple times
-    _redis_task_store.delete_task_metadata(task_id)
+    _redis_task_store.delete_task_metadata(task_id, chat_id=chat_id)
 
 
-def create_task(coroutine):
+def create_task(coroutine, chat_id: Optional[str] = None):
     """
     Create a new asyncio task and add it to both local dictionary and Redis.
     
-    This function maintains backward compatibility - signature unchanged.
-    
     Args:
         coroutine: The coroutine to run as a task
+        chat_id: Optional chat the task belongs to (enables chat-scoped lookups)
         
     Returns:
         tuple: (task_id, task) where task_id is a string and task is the asyncio.Task
@@ -746,7 +871,9 @@ def create_task(coroutine):
 
     # Store metadata in Redis first (ensures visibility across pods)
     # If Redis fails, we still create the task locally (graceful degradation)
-    redis_success = _redis_task_store.create_task_metadata(task_id, pod_id, TASK_STATUS_RUNNING)
+    redis_success = _redis_task_store.create_task_metadata(
+        task_id, pod_id, TASK_STATUS_RUNNING, chat_id=chat_id
+    )
     if not redis_success:
         log.warning(
             f"Failed to store task {task_id} metadata in Redis. "
@@ -766,6 +893,7 @@ def create_task(coroutine):
     # Track if task was manually cancelled to avoid double update (BUG #4 fix)
     # Use setattr to ensure attribute exists even if task object is modified
     setattr(task, '_manually_cancelled', False)
+    setattr(task, '_chat_id', chat_id)
 
     # Add a done callback for cleanup
     def cleanup_callback(t: asyncio.Task):
@@ -809,7 +937,7 @@ def create_task(coroutine):
             # Note: cleanup_task() is a sync function, so we can call it directly
             # from the done callback (which runs in the event loop context)
             tasks.pop(task_id, None)
-            _redis_task_store.delete_task_metadata(task_id)
+            _redis_task_store.delete_task_metadata(task_id, chat_id=chat_id)
         except Exception as e:
             log.error(f"Error in task cleanup callback for {task_id}: {e}", exc_info=True)
             # Still try to clean up locally to prevent memory leaks
@@ -920,34 +1048,28 @@ def list_tasks():
         list: List of task ID strings (only running tasks)
         Same return type as before for backward compatibility
     """
-    # Try to get running tasks from Redis
-    redis_tasks = _redis_task_store.list_all_tasks(status_filter=TASK_STATUS_RUNNING)
+    # Single round trip: fetch all metadata, then filter locally
+    all_metadata = _redis_task_store.get_all_task_metadata()
     
     # If Redis is available, return Redis list (includes all pods, only running tasks)
     if _redis_task_store._redis_available:
-        # Also include local running tasks, but filter by status in Redis
-        # FIXED BUG #3: Only include local tasks that are actually running in Redis
-        # BUG #3 fix: Create snapshot of task IDs to avoid race condition during iteration
-        local_running_tasks = []
-        task_ids_snapshot = list(tasks.keys())  # Create snapshot to avoid race condition
-        for task_id in task_ids_snapshot:
-            # Check if task is running in Redis (might not be in Redis yet if just created)
-            metadata = _redis_task_store.get_task_metadata(task_id)
-            if metadata is None:
-                # Task not in Redis yet, assume it's running (just created)
-                # Double-check task still exists locally (could have been deleted)
-                if task_id in tasks:
-                    local_running_tasks.append(task_id)
-            elif metadata.get("status") == TASK_STATUS_RUNNING:
-                # Task is running in Redis
-                # Double-check task still exists locally (could have been deleted)
-                if task_id in tasks:
-                    local_running_tasks.append(task_id)
-            # If task is completed/cancelled/error in Redis, don't include it
+        redis_tasks = [
+            task_id
+            for task_id, metadata in all_metadata.items()
+            if metadata.get("status") == TASK_STATUS_RUNNING
+        ]
+        # Also include local tasks that are running in Redis or not there yet
+        # (just created); completed/cancelled/error tasks are excluded.
+        # FIXED BUG #3: Snapshot task IDs to avoid race condition during iteration
+        local_running_tasks = [
+            task_id
+            for task_id in list(tasks.keys())
+            if all_metadata.get(task_id, {}).get("status", TASK_STATUS_RUNNING)
+            == TASK_STATUS_RUNNING
+        ]
         
         # Combine and deduplicate
-        all_tasks = list(set(redis_tasks + local_running_tasks))
-        return all_tasks
+        return list(set(redis_tasks + local_running_tasks))
     
     # Fallback to local-only if Redis is unavailable
     # This ensures backward compatibility when Redis is down
@@ -955,12 +1077,171 @@ def list_tasks():
     return list(tasks.keys())
 
 
+def list_task_ids_by_chat_id(chat_id: str) -> list:
+    """
+    List the IDs of running tasks for a chat, across all pods.
+    Uses a single Redis round trip; falls back to local tasks if Redis is down.
+    """
+    if _redis_task_store._redis_available:
+        chat_tasks = _redis_task_store.get_chat_task_metadata(chat_id)
+        if _redis_task_store._redis_available:
+            return [
+                metadata["task_id"]
+                for metadata in chat_tasks
+                if metadata.get("status") == TASK_STATUS_RUNNING
+            ]
+
+    return [
+        task_id
+        for task_id, task in list(tasks.items())
+        if getattr(task, "_chat_id", None) == chat_id
+    ]
+
+
+async def _stop_local_task(task_id: str, task: asyncio.Task) -> dict:
+    """Cancel a task running on this pod and wait for it to finish."""
+    # Mark as manually cancelled to prevent done callback from updating (BUG #4 fix)
+    setattr(task, '_manually_cancelled', True)
+    
+    # Update Redis status to "cancelled" immediately for consistency
+    _redis_task_store.update_task_status(
+        task_id,
+        TASK_STATUS_CANCELLED,
+        completed_at=time.time(),
+    )
+    
+    # Log task cancellation for metrics/observability (BUG #15 fix)
+    try:
+        pod_id = get_pod_identifier()
+    except Exception as pod_error:
+        log.warning(f"Failed to get pod identifier for task {task_id}: {pod_error}")
+        pod_id = "unknown"
+    log.info(f"Task stopped: task_id={task_id}, pod_id={pod_id}")
+    
+    task.cancel()
+    try:
+        await task  # Wait for the task to handle the cancellation
+    except asyncio.CancelledError:
+        # Task successfully canceled
+        # Cleanup will be handled by the done callback
+        pass
+    except Exception as e:
+        log.error(f"Error while stopping task {task_id}: {e}", exc_info=True)
+        # Update Redis to reflect error state
+        _redis_task_store.update_task_status(
+            task_id,
+            TASK_STATUS_ERROR,
+            error=str(e),
+            completed_at=time.time(),
+            skip_transition_check=True,
+        )
+        return {"status": False, "message": f"Failed to stop task {task_id}: {e}"}
+    return {"status": True, "message": f"Task {task_id} successfully stopped."}
+
+
+async def _stop_remote_task(task_id: str, pod_id: str) -> dict:
+    """
+    Ask the pod owning a task to cancel it over pub/sub and wait for its ack.
+    
+    Raises:
+        ValueError: If no pod is listening or the owner does not acknowledge in time.
+    """
+    request_id = str(uuid4())
+    receivers = _redis_task_store.publish_cancel_request(task_id, pod_id, request_id)
+    if not receivers:
+        raise ValueError(
+            f"Cannot stop task: task_id={task_id}, task_pod_id={pod_id}. "
+            "No replica is listening for cancellation requests."
+        )
+
+    deadline = time.monotonic() + TASK_CANCEL_ACK_TIMEOUT
+    delay = 0.02
+    while time.monotonic() < deadline:
+        ack = _redis_task_store.pop_cancel_ack(request_id)
+        if ack is not None:
+            return {
+                "status": bool(ack.get("status")),
+                "message": ack.get("message", ""),
+            }
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.25)
+
+    raise ValueError(
+        f"Cannot stop task: task_id={task_id}, task_pod_id={pod_id}. "
+        f"The owning pod did not acknowledge the cancellation within {TASK_CANCEL_ACK_TIMEOUT}s."
+    )
+
+
+async def _handle_cancel_request(task_id: str, request_id: str):
+    """Cancel a local task on behalf of another pod and acknowledge the result."""
+    task = tasks.get(task_id)
+    if task is None:
+        result = {"status": False, "message": f"Task {task_id} is no longer running."}
+    else:
+        result = await _stop_local_task(task_id, task)
+    result["pod_id"] = get_pod_identifier()
+    _redis_task_store.push_cancel_ack(request_id, result)
+
+
+def start_task_cancellation_listener():
+    """
+    Start a background thread that subscribes to cancellation requests from
+    other pods and cancels matching tasks on this pod's event loop.
+    Must be called from the running event loop (e.g. app lifespan).
+    """
+    if not _redis_task_store.pool:
+        log.debug("Redis unavailable, skipping task cancellation listener")
+        return
+
+    loop = asyncio.get_running_loop()
+    pod_id = get_pod_identifier()
+
+    def _listener():
+        while True:
+            pubsub = None
+            try:
+                pubsub = redis.Redis(connection_pool=_redis_task_store.pool).pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(REDIS_TASK_CANCEL_CHANNEL)
+                while True:
+                    # Short timeout stays below the pool's socket timeout
+                    message = pubsub.get_message(timeout=1.0)
+                    if not message or message.get("type") != "message":
+                        continue
+                    try:
+                        data = json.loads(message.get("data"))
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+
+                    task_id = data.get("task_id")
+                    # Only the owning pod acts (and acks); everyone else ignores it
+                    if data.get("pod_id") != pod_id and task_id not in tasks:
+                        continue
+                    asyncio.run_coroutine_threadsafe(
+                        _handle_cancel_request(task_id, data.get("request_id")), loop
+                    )
+            except Exception as e:
+                log.warning(f"Task cancellation listener error: {e}. Reconnecting in 5s.")
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+                time.sleep(5)
+
+    thread = threading.Thread(target=_listener, name="task-cancel-listener", daemon=True)
+    thread.start()
+    log.info(f"Task cancellation listener started for pod {pod_id}")
+
+
 async def stop_task(task_id: str):
     """
     Cancel a running task and remove it from both local dictionary and Redis.
     
-    Important: Can only cancel tasks that are running on the current pod.
-    Tasks on other pods cannot be cancelled from here (asyncio.Task objects are not shared).
+    Tasks on this pod are cancelled directly. Tasks on other pods are cancelled
+    by publishing a request on REDIS_TASK_CANCEL_CHANNEL; the owning pod cancels
+    the task and acknowledges the result back.
     
     FIXED BUG #4: Removed redundant status update - done callback handles it.
     
@@ -968,7 +1249,8 @@ async def stop_task(task_id: str):
         task_id: The task ID to stop (must be a valid UUID)
     
     Raises:
-        ValueError: If task ID is invalid, task is not found, or is on another pod.
+        ValueError: If task ID is invalid, task is not found, or the owning pod
+            does not acknowledge the cancellation.
     """
     # Validate task ID format
     if not _is_valid_task_id(task_id):
@@ -981,44 +1263,7 @@ async def stop_task(task_id: str):
     task = tasks.get(task_id)
     
     if task:
-        # Task is on this pod, we can cancel it
-        # Mark as manually cancelled to prevent done callback from updating (BUG #4 fix)
-        # Use setattr to ensure attribute exists
-        setattr(task, '_manually_cancelled', True)
-        
-        # Update Redis status to "cancelled" immediately for consistency
-        _redis_task_store.update_task_status(
-            task_id,
-            TASK_STATUS_CANCELLED,
-            completed_at=time.time(),
-        )
-        
-        # Log task cancellation for metrics/observability (BUG #15 fix)
-        try:
-            pod_id = get_pod_identifier()
-        except Exception as pod_error:
-            log.warning(f"Failed to get pod identifier for task {task_id}: {pod_error}")
-            pod_id = "unknown"
-        log.info(f"Task stopped: task_id={task_id}, pod_id={pod_id}")
-        
-        task.cancel()
-        try:
-            await task  # Wait for the task to handle the cancellation
-        except asyncio.CancelledError:
-            # Task successfully canceled
-            # Cleanup will be handled by the done callback
-            return {"status": True, "message": f"Task {task_id} successfully stopped."}
-        except Exception as e:
-            log.error(f"Error while stopping task {task_id}: {e}", exc_info=True)
-            # Update Redis to reflect error state
-            _redis_task_store.update_task_status(
-                task_id,
-                TASK_STATUS_ERROR,
-                error=str(e),
-                completed_at=time.time(),
-                skip_transition_check=True,
-            )
-            return {"status": False, "message": f"Failed to stop task {task_id}: {e}"}
+        return await _stop_local_task(task_id, task)
     
     # Task not found locally, check Redis
     metadata = _redis_task_store.get_task_metadata(task_id)
@@ -1026,12 +1271,6 @@ async def stop_task(task_id: str):
         pod_id = metadata.get("pod_id")
         current_pod = get_pod_identifier()
         
-        if pod_id != current_pod:
-            raise ValueError(
-                f"Cannot stop task: task_id={task_id}, task_pod_id={pod_id}, current_pod_id={current_pod}. "
-                "Tasks can only be stopped on the pod where they were created."
-            )
-        
         # Task metadata exists but Task object is gone (might have completed)
         status = metadata.get("status")
         if status in [TASK_STATUS_COMPLETED, TASK_STATUS_CANCELLED, TASK_STATUS_ERROR]:
@@ -1040,6 +1279,10 @@ async def stop_task(task_id: str):
                 "Task is already in a terminal state and cannot be stopped."
             )
         
+        if pod_id != current_pod:
+            # Task runs on another replica: ask it to cancel over pub/sub
+            return await _stop_remote_task(task_id, pod_id)
+        
         # Task was on this pod but Task object is missing (shouldn't happen, but handle gracefully)
         # Mark it as cancelled in Redis since we can't actually cancel the Task object
         _redis_task_store.update_task_status(
@@ -0,0 +1,136 @@
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from open_webui.models.files import FileModel
+from open_webui.routers import files
+from open_webui.routers.files import _parse_range, stream_file_response
+from open_webui.storage import provider
+
+CONTENT = bytes(range(256)) * 4  # 1024 bytes
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=1000-", (1000, 1023)),
+        ("bytes=1000-5000", (1000, 1023)),
+        ("bytes=-100", (924, 1023)),
+        ("bytes=-5000", (0, 1023)),
+        # Syntactically invalid: ignored, the whole file is sent
+        ("bytes=5-2", None),
+        ("bytes=-", None),
+        ("bytes=a-b", None),
+        ("bytes=--5", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-10", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert _parse_range(header, len(CONTENT)) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1024-", "bytes=2000-3000", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_range(header, len(CONTENT))
+    assert exc_info.value.status_code == 416
+    assert exc_info.value.headers["Content-Range"] == "bytes */1024"
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(CONTENT)
+    file = FileModel(
+        id="file-id",
+        user_id="user-id",
+        filename="file.bin",
+        path=str(path),
+        meta={"name": "file.bin"},
+        created_at=0,
+        updated_at=0,
+    )
+    monkeypatch.setattr(files, "Storage", provider.LocalStorageProvider())
+    monkeypatch.setattr(files, "STORAGE_PRESIGNED_URL_EXPIRES", 0)
+
+    app = FastAPI()
+
+    @app.get("/file")
+    async def get_file(request: Request):
+        return await stream_file_response(request, file, {})
+
+    @app.get("/missing")
+    async def get_missing(request: Request):
+        missing = file.model_copy(update={"path": str(tmp_path / "missing.bin")})
+        return await stream_file_response(request, missing, {})
+
+    return TestClient(app)
+
+
+def test_full_response(client):
+    response = client.get("/file")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-length"] == "1024"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"]
+
+
+def test_range_response(client):
+    response = client.get("/file", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/1024"
+    assert response.headers["content-length"] == "10"
+
+
+def test_suffix_range_response(client):
+    response = client.get("/file", headers={"Range": "bytes=-4"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[-4:]
+    assert response.headers["content-range"] == "bytes 1020-1023/1024"
+
+
+def test_invalid_range_sends_whole_file(client):
+    response = client.get("/file", headers={"Range": "bytes=5-2"})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_unsatisfiable_range(client):
+    response = client.get("/file", headers={"Range": "bytes=4096-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */1024"
+
+
+def test_if_none_match(client):
+    etag = client.get("/file").headers["etag"]
+    response = client.get("/file", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    response = client.get("/file", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert response.status_code == 304
+
+    response = client.get("/file", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_if_range(client):
+    etag = client.get("/file").headers["etag"]
+    response = client.get("/file", headers={"Range": "bytes=0-3", "If-Range": etag})
+    assert response.status_code == 206
+    assert response.content == CONTENT[:4]
+
+    # Changed since the client's copy: the whole file instead of a range
+    response = client.get("/file", headers={"Range": "bytes=0-3", "If-Range": '"old"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_missing_file(client):
+    response = client.get("/missing")
+    assert response.status_code == 404
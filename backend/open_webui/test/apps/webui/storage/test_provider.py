@@ -1,3 +1,4 @@
+import hashlib
 import io
 import os
 import boto3
@@ -66,14 +67,25 @@ class TestLocalStorageProvider:
 
     def test_upload_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, file_path = self.Storage.upload_file(self.file_bytesio, self.filename)
+        size, file_path = self.Storage.upload_file(self.file_bytesio, self.filename)
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert size == len(self.file_content)
         assert file_path == str(upload_dir / self.filename)
         with pytest.raises(ValueError):
             self.Storage.upload_file(self.file_bytesio_empty, self.filename)
 
+    def test_upload_stream_reuses_reader_hash(self, monkeypatch, tmp_path):
+        upload_dir = mock_upload_dir(monkeypatch, tmp_path)
+        monkeypatch.setattr(provider, "UPLOAD_CHUNK_SIZE", 5)
+        reader = provider.HashingFileReader(io.BytesIO(self.file_content))
+        with provider._UploadStream(reader, str(upload_dir / self.filename)) as stream:
+            while stream.read(3):
+                pass
+        assert stream._sha256 is reader.sha256
+        assert stream.hexdigest() == hashlib.sha256(self.file_content).hexdigest()
+        assert (upload_dir / self.filename).read_bytes() == self.file_content
+
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         file_path = str(upload_dir / self.filename)
@@ -116,7 +128,7 @@ class TestS3StorageProvider:
         with pytest.raises(Exception):
             self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
+        size, s3_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename)
@@ -124,7 +136,7 @@ class TestS3StorageProvider:
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert size == len(self.file_content)
         assert s3_file_path == "s3://" + self.Storage.bucket_name + "/" + self.filename
         with pytest.raises(ValueError):
             self.Storage.upload_file(self.file_bytesio_empty, self.filename)
@@ -132,7 +144,7 @@ class TestS3StorageProvider:
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
+        size, s3_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         file_path = self.Storage.get_file(s3_file_path)
@@ -142,7 +154,7 @@ class TestS3StorageProvider:
     def test_delete_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
+        size, s3_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         assert (upload_dir / self.filename).exists()
@@ -218,7 +230,7 @@ class TestGCSStorageProvider:
         with pytest.raises(Exception):
             self.Storage.bucket = monkeypatch(self.Storage, "bucket", None)
             self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
-        contents, gcs_file_path = self.Storage.upload_file(
+        size, gcs_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         object = self.Storage.bucket.get_blob(self.filename)
@@ -226,7 +238,7 @@ class TestGCSStorageProvider:
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert size == len(self.file_content)
         assert gcs_file_path == "gs://" + self.Storage.bucket_name + "/" + self.filename
         # test error if file is empty
         with pytest.raises(ValueError):
@@ -234,7 +246,7 @@ class TestGCSStorageProvider:
 
     def test_get_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
+        size, gcs_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         file_path = self.Storage.get_file(gcs_file_path)
@@ -243,7 +255,7 @@ class TestGCSStorageProvider:
 
     def test_delete_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
+        size, gcs_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         # ensure that local directory has the uploaded file as well
@@ -337,16 +349,16 @@ class TestAzureStorageProvider:
         # Reset side effect and create container
         self.Storage.container_client.get_blob_client.side_effect = None
         self.Storage.create_container()
-        contents, azure_file_path = self.Storage.upload_file(
+        size, azure_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
 
         # Assertions
         self.Storage.container_client.get_blob_client.assert_called_with(self.filename)
-        self.Storage.container_client.get_blob_client().upload_blob.assert_called_once_with(
-            self.file_content, overwrite=True
-        )
-        assert contents == self.file_content
+        upload_blob = self.Storage.container_client.get_blob_client().upload_blob
+        upload_blob.assert_called_once()
+        assert upload_blob.call_args.kwargs["overwrite"] is True
+        assert size == len(self.file_content)
         assert (
             azure_file_path
             == f"https://myaccount.blob.core.windows.net/{self.Storage.container_name}/{self.filename}"
@@ -364,7 +376,7 @@ class TestAzureStorageProvider:
         # Mock upload behavior
         self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
         # Mock blob download behavior
-        self.Storage.container_client.get_blob_client().download_blob().readall.return_value = (
+        self.Storage.container_client.get_blob_client().download_blob().readinto.side_effect = lambda stream: stream.write(
             self.file_content
         )
 
@@ -0,0 +1,171 @@
+from types import SimpleNamespace
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from open_webui.utils import access_control, cache
+from open_webui.utils.access_control import (
+    _lookup_permission,
+    flatten_permissions,
+    get_effective_permissions,
+    get_permissions,
+    has_permission,
+    unflatten_permissions,
+)
+
+PERMISSIONS = {
+    "chat": {"file_upload": True, "delete": False, "controls": {}},
+    "workspace": {"models": False, "tools": False},
+    "features": {"web_search": True},
+}
+
+
+def walk_nested(permissions, permission_key):
+    """has_permission's lookup before the tree was flattened."""
+    for key in permission_key.split("."):
+        if key not in permissions:
+            return False
+        permissions = permissions[key]
+    return bool(permissions)
+
+
+class FakeGroups:
+    def __init__(self):
+        self.permissions = {}
+
+    def get_groups_by_member_id(self, user_id):
+        return [
+            SimpleNamespace(permissions=p) for p in self.permissions.get(user_id, [])
+        ]
+
+
+@pytest.fixture
+def groups(monkeypatch):
+    groups = FakeGroups()
+    monkeypatch.setattr(access_control, "Groups", groups)
+    return groups
+
+
+def make_cache_manager(server) -> cache.CacheManager:
+    manager = cache.CacheManager("redis://localhost:6379/0")
+    manager.redis = fakeredis.FakeRedis(server=server)
+    return manager
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def cache_manager(monkeypatch, redis_server):
+    manager = make_cache_manager(redis_server)
+    monkeypatch.setattr(cache, "get_cache_manager", lambda: manager)
+    return manager
+
+
+def test_flatten_round_trip():
+    flat = flatten_permissions(PERMISSIONS)
+    assert flat["chat.file_upload"] is True
+    assert flat["workspace.models"] is False
+    assert "chat.controls" not in flat
+    # Empty subtrees are dropped; they deny either way
+    assert unflatten_permissions(flat) == {
+        "chat": {"file_upload": True, "delete": False},
+        "workspace": {"models": False, "tools": False},
+        "features": {"web_search": True},
+    }
+
+
+@pytest.mark.parametrize(
+    "permission_key",
+    [
+        "chat.file_upload",
+        "chat.delete",
+        "chat.controls",
+        "chat",
+        "workspace",
+        "workspace.models",
+        "features.web_search",
+        "chat.file",
+        "missing",
+        "missing.nested",
+    ],
+)
+def test_lookup_matches_nested_tree(permission_key):
+    assert _lookup_permission(
+        flatten_permissions(PERMISSIONS), permission_key
+    ) == walk_nested(PERMISSIONS, permission_key)
+
+
+def test_lookup_semantics():
+    flat = flatten_permissions(PERMISSIONS)
+    # A missing key denies
+    assert not _lookup_permission(flat, "chat.unknown")
+    # A prefix of a key name is not a subtree
+    assert not _lookup_permission(flat, "chat.file")
+    # A non-empty subtree allows, even if every leaf in it is False
+    assert _lookup_permission(flat, "workspace")
+    assert not _lookup_permission(flat, "chat.controls")
+
+
+def test_has_permission_uses_most_permissive_group(groups, cache_manager):
+    defaults = {"chat": {"file_upload": False}, "workspace": {"models": False}}
+    groups.permissions["u1"] = [
+        {"chat": {"file_upload": False}},
+        {"chat": {"file_upload": True}},
+    ]
+
+    assert has_permission("u1", "chat.file_upload", defaults)
+    assert not has_permission("u1", "workspace.models", defaults)
+    assert not has_permission("u1", "chat.not_a_permission", defaults)
+    assert not has_permission("u2", "chat.file_upload", defaults)
+
+
+def test_defaults_are_not_mutated(groups, cache_manager):
+    defaults = {"chat": {"file_upload": False}}
+    groups.permissions["u1"] = [{"chat": {"file_upload": True, "delete": True}}]
+
+    assert get_permissions("u1", defaults)["chat"] == {
+        "file_upload": True,
+        "delete": True,
+    }
+    assert defaults == {"chat": {"file_upload": False}}
+
+
+def test_entry_is_cached_until_version_bump(groups, cache_manager):
+    defaults = {"chat": {"file_upload": False}}
+    groups.permissions["u1"] = [{"chat": {"file_upload": True}}]
+    assert get_effective_permissions("u1", defaults)["chat.file_upload"] is True
+
+    # Served from the cache: the group change is not seen yet
+    groups.permissions["u1"] = [{"chat": {"file_upload": False}}]
+    assert get_effective_permissions("u1", defaults)["chat.file_upload"] is True
+
+    cache_manager.bump_permissions_version()
+    assert get_effective_permissions("u1", defaults)["chat.file_upload"] is False
+
+
+def test_entry_is_rebuilt_when_defaults_change(groups, cache_manager):
+    groups.permissions["u1"] = []
+    assert not get_effective_permissions("u1", {"chat": {"delete": False}})[
+        "chat.delete"
+    ]
+    assert get_effective_permissions("u1", {"chat": {"delete": True}})["chat.delete"]
+
+
+def test_version_bump_reaches_other_pods(monkeypatch, groups, redis_server):
+    # No process-local caching, so every read goes to Redis
+    monkeypatch.setattr(cache, "LOCAL_PERMISSIONS_CACHE_TTL", 0)
+    pod_a = make_cache_manager(redis_server)
+    pod_b = make_cache_manager(redis_server)
+    defaults = {"chat": {"file_upload": False}}
+    groups.permissions["u1"] = [{"chat": {"file_upload": True}}]
+
+    monkeypatch.setattr(cache, "get_cache_manager", lambda: pod_b)
+    assert get_effective_permissions("u1", defaults)["chat.file_upload"] is True
+
+    groups.permissions["u1"] = []
+    pod_a.bump_permissions_version()
+    assert get_effective_permissions("u1", defaults)["chat.file_upload"] is False
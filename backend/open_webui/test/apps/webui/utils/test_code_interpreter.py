@@ -0,0 +1,195 @@
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+pytest.importorskip("jupyter_server")
+pytest.importorskip("ipykernel")
+
+from open_webui.utils.code_interpreter import JupyterClient, JupyterKernelPool
+
+TOKEN = "test-token"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def jupyter_url(tmp_path_factory):
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "jupyter_server",
+            "--no-browser",
+            "--allow-root",
+            f"--port={port}",
+            "--ServerApp.port_retries=0",
+            f"--IdentityProvider.token={TOKEN}",
+            f"--ServerApp.root_dir={tmp_path_factory.mktemp('jupyter')}",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                urllib.request.urlopen(f"{url}/api/status?token={TOKEN}", timeout=1)
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    pytest.skip("Jupyter server did not start")
+                time.sleep(0.2)
+        yield url
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def make_pool(url, **kwargs) -> JupyterKernelPool:
+    kwargs.setdefault("size", 1)
+    kwargs.setdefault("max_kernels", 2)
+    kwargs.setdefault("idle_timeout", 600)
+    kwargs.setdefault("policy", "reset")
+    return JupyterKernelPool(JupyterClient(url, token=TOKEN), **kwargs)
+
+
+async def settle(pool: JupyterKernelPool):
+    """Wait for background recycling, discarding and pre-starting to finish."""
+    while pool._tasks:
+        await asyncio.gather(*list(pool._tasks), return_exceptions=True)
+
+
+async def server_kernel_ids(pool: JupyterKernelPool) -> set:
+    return {kernel["id"] for kernel in await pool.client.request("GET", "/api/kernels")}
+
+
+def run(url, scenario, **kwargs):
+    async def main():
+        pool = make_pool(url, **kwargs)
+        try:
+            return await scenario(pool)
+        finally:
+            await pool.shutdown()
+
+    return asyncio.run(main())
+
+
+def test_lease_and_release_reuses_kernel(jupyter_url):
+    async def scenario(pool):
+        pool.prewarm()
+        await settle(pool)
+        kernel = pool._idle[0]
+
+        result = await pool.execute("print(6 * 7)", timeout=30)
+        assert result["stdout"] == "42"
+        assert not kernel.lock.locked()
+        await settle(pool)
+
+        assert list(pool._idle) == [kernel]
+        assert pool._kernel_count == 1
+        assert await server_kernel_ids(pool) == {kernel.id}
+
+    # One kernel at most, so nothing is pre-started while it is leased
+    run(jupyter_url, scenario, max_kernels=1)
+
+
+@pytest.mark.parametrize("policy", ["reset", "restart"])
+def test_clean_policies_clear_state_between_leases(jupyter_url, policy):
+    async def scenario(pool):
+        await pool.execute("secret = 41", timeout=30)
+        await settle(pool)
+        kernel = pool._idle[0]
+
+        result = await pool.execute("print(secret)", timeout=30)
+        assert "NameError" in result["stderr"]
+        await settle(pool)
+        # Cleaned in place, not replaced
+        assert list(pool._idle) == [kernel]
+
+    run(jupyter_url, scenario, policy=policy, max_kernels=1)
+
+
+def test_session_policy_keeps_state_per_session(jupyter_url):
+    async def scenario(pool):
+        await pool.execute("secret = 41", timeout=30, session_key="chat-a")
+        result = await pool.execute(
+            "print(secret + 1)", timeout=30, session_key="chat-a"
+        )
+        assert result["stdout"] == "42"
+
+        result = await pool.execute("print(secret)", timeout=30, session_key="chat-b")
+        assert "NameError" in result["stderr"]
+        assert pool._sessions["chat-a"] is not pool._sessions["chat-b"]
+
+    run(jupyter_url, scenario, policy="session", size=0)
+
+
+def test_timeout_discards_kernel(jupyter_url):
+    async def scenario(pool):
+        result = await pool.execute("import time; time.sleep(30)", timeout=1)
+        assert "Execution timed out." in result["stderr"]
+        await settle(pool)
+
+        # The busy kernel is deleted and a fresh one pre-started in its place
+        assert pool._kernel_count == 1
+        assert await server_kernel_ids(pool) == {pool._idle[0].id}
+
+        result = await pool.execute("print('ok')", timeout=30)
+        assert result["stdout"] == "ok"
+
+    run(jupyter_url, scenario)
+
+
+def test_max_kernels_cap(jupyter_url):
+    peak = 0
+
+    class CountingPool(JupyterKernelPool):
+        async def _start_kernel(self):
+            nonlocal peak
+            peak = max(peak, self._kernel_count + 1)
+            return await super()._start_kernel()
+
+    async def main():
+        pool = CountingPool(
+            JupyterClient(jupyter_url, token=TOKEN),
+            size=1,
+            max_kernels=2,
+            idle_timeout=600,
+            policy="reset",
+        )
+        try:
+            results = await asyncio.gather(
+                *(pool.execute(f"print({i})", timeout=30) for i in range(6))
+            )
+            assert [r["stdout"] for r in results] == [str(i) for i in range(6)]
+            # Back to back: the next lease waits for the kernel being recycled
+            for i in range(3):
+                await pool.execute(f"print({i})", timeout=30)
+            await settle(pool)
+            assert len(await server_kernel_ids(pool)) <= 2
+        finally:
+            await pool.shutdown()
+
+    asyncio.run(main())
+    assert peak <= 2
+
+
+def test_session_kernels_are_evicted_at_cap(jupyter_url):
+    async def scenario(pool):
+        await pool.execute("x = 1", timeout=30, session_key="chat-a")
+        await pool.execute("x = 2", timeout=30, session_key="chat-b")
+        assert list(pool._sessions) == ["chat-b"]
+        assert pool._kernel_count == 1
+
+    run(jupyter_url, scenario, policy="session", size=0, max_kernels=1)
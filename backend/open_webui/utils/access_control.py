@@ -4,6 +4,7 @@ from open_webui.models.groups import Groups
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
+import hashlib
 import json
 
 
@@ -25,24 +26,49 @@ def fill_missing_permissions(
     return permissions
 
 
-def get_permissions(
-    user_id: str,
-    default_permissions: Dict[str, Any],
+def flatten_permissions(
+    permissions: Dict[str, Any], prefix: str = ""
 ) -> Dict[str, Any]:
-    """
-    Get all permissions for a user by combining the permissions of all groups the user is a member of.
-    If a permission is defined in multiple groups, the most permissive value is used (True > False).
-    Permissions are nested in a dict with the permission key as the key and a boolean as the value.
-    """
-    from open_webui.utils.cache import get_cache_manager
-    
-    cache = get_cache_manager()
-    
-    # Check cache first
-    cached_permissions = cache.get_user_permissions(user_id)
-    if cached_permissions is not None:
-        return cached_permissions
+    """Flatten a nested permission tree into dotted keys, e.g. {"chat.file_upload": True}."""
+    flat = {}
+    for key, value in permissions.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_permissions(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def unflatten_permissions(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of flatten_permissions."""
+    permissions: Dict[str, Any] = {}
+    for path, value in flat.items():
+        *parents, leaf = path.split(".")
+        node = permissions
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+    return permissions
+
+
+def _lookup_permission(flat: Dict[str, Any], permission_key: str) -> bool:
+    """Same result as walking the nested tree: a missing key denies, a non-empty subtree allows."""
+    if permission_key in flat:
+        return bool(flat[permission_key])
+    prefix = f"{permission_key}."
+    return any(key.startswith(prefix) for key in flat)
 
+
+def _permissions_fingerprint(permissions: Dict[str, Any]) -> str:
+    return hashlib.sha1(
+        json.dumps(permissions, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _merge_group_permissions(
+    user_id: str, default_permissions: Dict[str, Any]
+) -> Dict[str, Any]:
     def combine_permissions(
         permissions: Dict[str, Any], group_permissions: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -74,14 +100,73 @@ def get_permissions(
         permissions = combine_permissions(permissions, group_permissions)
 
     # Ensure all fields from default_permissions are present and filled in
-    permissions = fill_missing_permissions(permissions, default_permissions)
-    
-    # Cache the result
-    cache.set_user_permissions(user_id, permissions)
+    return fill_missing_permissions(
+        permissions, json.loads(json.dumps(default_permissions))
+    )
+
 
+def get_effective_permissions(
+    user_id: str,
+    default_permissions: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    The user's merged permission tree, flattened to dotted keys.
+
+    Cached per user in Redis (and briefly in process memory) together with the
+    global permissions version and a fingerprint of the default permissions, so
+    a change to either is picked up without deleting every user's entry.
+    """
+    from open_webui.utils.cache import get_cache_manager
+
+    cache = get_cache_manager()
+    fingerprint = _permissions_fingerprint(default_permissions)
+
+    version, entry = cache.get_effective_permissions(user_id)
+    if entry is not None and entry.get("defaults") == fingerprint:
+        return entry["permissions"]
+
+    permissions = flatten_permissions(
+        _merge_group_permissions(user_id, default_permissions)
+    )
+    cache.set_effective_permissions(
+        user_id,
+        {"version": version, "defaults": fingerprint, "permissions": permissions},
+    )
     return permissions
 
 
+def get_permissions(
+    user_id: str,
+    default_permissions: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Get all permissions for a user by combining the permissions of all groups the user is a member of.
+    If a permission is defined in multiple groups, the most permissive value is used (True > False).
+    Permissions are nested in a dict with the permission key as the key and a boolean as the value.
+    """
+    return unflatten_permissions(get_effective_permissions(user_id, default_permissions))
+
+
+# fingerprint -> flattened default permissions filled from DEFAULT_USER_PERMISSIONS
+_fallback_permissions: Dict[str, Dict[str, Any]] = {}
+
+
+def _get_fallback_permissions(default_permissions: Dict[str, Any]) -> Dict[str, Any]:
+    fingerprint = _permissions_fingerprint(default_permissions)
+    fallback = _fallback_permissions.get(fingerprint)
+    if fallback is None:
+        if len(_fallback_permissions) > 64:
+            _fallback_permissions.clear()
+        fallback = flatten_permissions(
+            fill_missing_permissions(
+                json.loads(json.dumps(default_permissions)),
+                DEFAULT_USER_PERMISSIONS,
+            )
+        )
+        _fallback_permissions[fingerprint] = fallback
+    return fallback
+
+
 def has_permission(
     user_id: str,
     permission_key: str,
@@ -93,28 +178,15 @@ def has_permission(
 
     Permission keys can be hierarchical and separated by dots ('.').
     """
-
-    def get_permission(permissions: Dict[str, Any], keys: List[str]) -> bool:
-        """Traverse permissions dict using a list of keys (from dot-split permission_key)."""
-        for key in keys:
-            if key not in permissions:
-                return False  # If any part of the hierarchy is missing, deny access
-            permissions = permissions[key]  # Traverse one level deeper
-
-        return bool(permissions)  # Return the boolean at the final level
-
-    permission_hierarchy = permission_key.split(".")
-
-    # Use get_permissions which is now cached
-    user_permissions = get_permissions(user_id, default_permissions)
-    if get_permission(user_permissions, permission_hierarchy):
+    if _lookup_permission(
+        get_effective_permissions(user_id, default_permissions), permission_key
+    ):
         return True
 
     # Check default permissions afterward if the group permissions don't allow it
-    default_permissions = fill_missing_permissions(
-        default_permissions, DEFAULT_USER_PERMISSIONS
+    return _lookup_permission(
+        _get_fallback_permissions(default_permissions), permission_key
     )
-    return get_permission(default_permissions, permission_hierarchy)
 
 
 def has_access(
@@ -29,11 +29,18 @@ log = logging.getLogger(__name__)
 # Shorter TTL reduces stale data window if invalidation fails
 DEFAULT_CACHE_TTL = 900  # 15 minutes (reduced from 1 hour)
 
+# Effective permissions are also kept in process memory for a few seconds so that
+# the repeated has_permission() checks of a single request don't each hit Redis.
+# Other pods see changes after at most this many seconds.
+LOCAL_PERMISSIONS_CACHE_TTL = 5
+LOCAL_PERMISSIONS_CACHE_MAX_ENTRIES = 10000
+
 # Cache key prefixes
 CACHE_PREFIX_USER_ROLE = "cache:user:role"
 CACHE_PREFIX_USER_SETTINGS = "cache:user:settings"
 CACHE_PREFIX_USER_SETTINGS_KEYS = "cache:user:settings:keys"  # Set tracking all config_paths for a user
 CACHE_PREFIX_USER_PERMISSIONS = "cache:user:permissions"
+CACHE_KEY_PERMISSIONS_VERSION = "cache:permissions:version"  # Bumped when group or default permissions change
 CACHE_PREFIX_USER_GROUPS = "cache:user:groups"
 CACHE_PREFIX_GROUP_ADMIN_CONFIG = "cache:group:admin_config"
 CACHE_PREFIX_GROUP_ADMIN_CONFIG_KEYS = "cache:group:admin_config:keys"  # Set tracking all config_paths for a group
@@ -79,6 +86,10 @@ class CacheManager:
         self._last_connection_error = None  # Track last connection error to reduce log spam
         self._last_availability_check = 0  # Track when we last checked Redis availability
         self._availability_check_interval = 30  # Refresh availability check every 30 seconds
+
+        # user_id -> (expires_at, effective permissions entry)
+        self._local_permissions: dict = {}
+        self._local_permissions_version = 0  # Used as the version while Redis is unavailable
     
     def _check_redis_available(self) -> bool:
         """Check if Redis is available. Caches result but refreshes periodically.
@@ -323,20 +334,81 @@ class CacheManager:
             return 0
     
     # User permissions caching
-    def get_user_permissions(self, user_id: str) -> Optional[dict]:
-        """Get cached user permissions."""
-        key = f"{CACHE_PREFIX_USER_PERMISSIONS}:{user_id}"
-        return self._get(key)
-    
-    def set_user_permissions(self, user_id: str, permissions: dict) -> bool:
-        """Cache user permissions."""
-        key = f"{CACHE_PREFIX_USER_PERMISSIONS}:{user_id}"
-        return self._set(key, permissions)
-    
     def invalidate_user_permissions(self, user_id: str) -> bool:
         """Invalidate cached user permissions."""
+        self._local_permissions.pop(user_id, None)
         key = f"{CACHE_PREFIX_USER_PERMISSIONS}:{user_id}"
         return self._delete(key)
+
+    # Effective permissions caching (flattened, versioned)
+    def get_effective_permissions(self, user_id: str) -> tuple[int, Optional[dict]]:
+        """Get the current permissions version and the user's cached entry.
+
+        The entry is only meaningful if its "version" equals the returned version.
+        Version and entry are read with a single MGET.
+        """
+        local = self._local_permissions.get(user_id)
+        if local is not None and local[0] > time.monotonic():
+            return local[1]["version"], local[1]
+
+        if not self._check_redis_available():
+            return self._local_permissions_version, None
+
+        try:
+            version, value = self.redis.mget(
+                CACHE_KEY_PERMISSIONS_VERSION,
+                f"{CACHE_PREFIX_USER_PERMISSIONS}:{user_id}",
+            )
+            version = int(version or 0)
+            entry = json.loads(value) if value else None
+            if not isinstance(entry, dict) or entry.get("version") != version:
+                return version, None
+
+            self._set_local_permissions(user_id, entry)
+            return version, entry
+        except (ConnectionError, TimeoutError, RedisError) as e:
+            error_msg = str(e)
+            if self._last_connection_error != error_msg:
+                log.debug(f"Redis unavailable, falling back to database. Error: {e}")
+                self._last_connection_error = error_msg
+                self._redis_available = False
+            return self._local_permissions_version, None
+        except Exception as e:
+            log.error(f"Unexpected error getting effective permissions for {user_id}: {e}", exc_info=True)
+            return self._local_permissions_version, None
+
+    def set_effective_permissions(self, user_id: str, entry: dict) -> bool:
+        """Cache a user's effective permissions entry (must contain "version")."""
+        self._set_local_permissions(user_id, entry)
+        key = f"{CACHE_PREFIX_USER_PERMISSIONS}:{user_id}"
+        return self._set(key, entry)
+
+    def _set_local_permissions(self, user_id: str, entry: dict):
+        if len(self._local_permissions) >= LOCAL_PERMISSIONS_CACHE_MAX_ENTRIES:
+            self._local_permissions.clear()
+        self._local_permissions[user_id] = (
+            time.monotonic() + LOCAL_PERMISSIONS_CACHE_TTL,
+            entry,
+        )
+
+    def bump_permissions_version(self) -> int:
+        """Invalidate the effective permissions of every user at once.
+
+        Used when group permissions or the default user permissions change.
+        """
+        self._local_permissions.clear()
+        self._local_permissions_version += 1
+        if not self._check_redis_available():
+            return self._local_permissions_version
+        try:
+            return int(self.redis.incr(CACHE_KEY_PERMISSIONS_VERSION))
+        except (ConnectionError, TimeoutError, RedisError) as e:
+            log.warning(f"Redis unavailable, permissions version not bumped: {e}")
+            self._redis_available = False
+            return self._local_permissions_version
+        except Exception as e:
+            log.error(f"Unexpected error bumping permissions version: {e}", exc_info=True)
+            return self._local_permissions_version
     
     # User groups caching
     def get_user_groups(self, user_id: str) -> Optional[List[dict]]:
@@ -468,6 +540,7 @@ class CacheManager:
         
         Uses Redis pipeline for batch operations to minimize round trips.
         """
+        self._local_permissions.pop(user_id, None)
         if not self._check_redis_available():
             return 0
         
@@ -573,6 +646,8 @@ class CacheManager:
             count = 0
             
             for user_id in members:
+                self._local_permissions.pop(user_id, None)
+
                 # Build all keys to delete for this user
                 user_role_key = f"{CACHE_PREFIX_USER_ROLE}:{user_id}"
                 user_permissions_key = f"{CACHE_PREFIX_USER_PERMISSIONS}:{user_id}"
@@ -1,148 +1,510 @@
 import asyncio
 import json
+import logging
+import time
 import uuid
-import websockets
-import requests
+from collections import deque
+from typing import Optional
 from urllib.parse import urljoin
 
+import aiohttp
 
-async def execute_code_jupyter(
-    jupyter_url, code, token=None, password=None, timeout=10
-):
+from open_webui.env import (
+    JUPYTER_KERNEL_IDLE_TIMEOUT,
+    JUPYTER_KERNEL_POOL_MAX_KERNELS,
+    JUPYTER_KERNEL_POOL_POLICY,
+    JUPYTER_KERNEL_POOL_SIZE,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+# Clears the user namespace between leases for the "reset"/"session" policies
+KERNEL_RESET_CODE = "%reset -f"
+
+
+class JupyterAuthError(Exception):
+    pass
+
+
+class JupyterClient:
     """
-    Executes Python code in a Jupyter kernel.
-    Supports authentication with a token or password.
-    :param jupyter_url: Jupyter server URL (e.g., "http://localhost:8888")
-    :param code: Code to execute
-    :param token: Jupyter authentication token (optional)
-    :param password: Jupyter password (optional)
-    :param timeout: WebSocket timeout in seconds (default: 10s)
-    :return: Dictionary with stdout, stderr, and result
-             - Images are prefixed with "base64:image/png," and separated by newlines if multiple.
+    Authenticated async HTTP and websocket access to one Jupyter server.
+    The aiohttp session (and its login cookies) is reused for every call.
     """
-    session = requests.Session()  # Maintain cookies
-    headers = {}  # Headers for requests
 
-    # Authenticate using password
-    if password and not token:
+    def __init__(
+        self, url: str, token: Optional[str] = None, password: Optional[str] = None
+    ):
+        self.url = url
+        self.token = token
+        self.password = password
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._headers: dict = {}
+        self._authenticated = False
+        self._login_lock = asyncio.Lock()
+
+    def _url(self, path: str) -> str:
+        params = f"?token={self.token}" if self.token else ""
+        return urljoin(self.url, f"{path}{params}")
+
+    def _get_cookie(self, name: str) -> Optional[str]:
+        for cookie in self._session.cookie_jar:
+            if cookie.key == name:
+                return cookie.value
+        return None
+
+    async def _login(self):
+        login_url = urljoin(self.url, "/login")
         try:
-            login_url = urljoin(jupyter_url, "/login")
-            response = session.get(login_url)
-            response.raise_for_status()
-            xsrf_token = session.cookies.get("_xsrf")
+            async with self._session.get(login_url) as response:
+                response.raise_for_status()
+            xsrf_token = self._get_cookie("_xsrf")
             if not xsrf_token:
                 raise ValueError("Failed to fetch _xsrf token")
 
-            login_data = {"_xsrf": xsrf_token, "password": password}
-            login_response = session.post(
-                login_url, data=login_data, cookies=session.cookies
+            async with self._session.post(
+                login_url, data={"_xsrf": xsrf_token, "password": self.password}
+            ) as response:
+                response.raise_for_status()
+            self._headers = {"X-XSRFToken": xsrf_token}
+        except Exception as e:
+            raise JupyterAuthError(str(e)) from e
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # unsafe=True keeps cookies for IP hosts such as 127.0.0.1
+            self._session = aiohttp.ClientSession(
+                cookie_jar=aiohttp.CookieJar(unsafe=True)
             )
-            login_response.raise_for_status()
-            headers["X-XSRFToken"] = xsrf_token
+            self._authenticated = False
+
+        if not self._authenticated:
+            async with self._login_lock:
+                if not self._authenticated:
+                    if self.password and not self.token:
+                        await self._login()
+                    self._authenticated = True
+        return self._session
+
+    async def request(self, method: str, path: str) -> Optional[dict]:
+        session = await self.get_session()
+        async with session.request(
+            method, self._url(path), headers=self._headers
+        ) as response:
+            if response.status in (401, 403) and self.password and not self.token:
+                # Login cookie expired, log in again on the next call
+                self._authenticated = False
+            response.raise_for_status()
+            if response.content_type == "application/json":
+                return await response.json()
+            return None
+
+    async def create_kernel(self) -> str:
+        data = await self.request("POST", "/api/kernels")
+        return data["id"]
+
+    async def restart_kernel(self, kernel_id: str):
+        await self.request("POST", f"/api/kernels/{kernel_id}/restart")
+
+    async def interrupt_kernel(self, kernel_id: str):
+        await self.request("POST", f"/api/kernels/{kernel_id}/interrupt")
+
+    async def delete_kernel(self, kernel_id: str):
+        await self.request("DELETE", f"/api/kernels/{kernel_id}")
+
+    async def connect(self, kernel_id: str) -> aiohttp.ClientWebSocketResponse:
+        session = await self.get_session()
+        return await session.ws_connect(
+            self._url(f"/api/kernels/{kernel_id}/channels"),
+            headers=self._headers,
+            max_msg_size=0,
+        )
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class PooledKernel:
+    """A started kernel with an open channels websocket."""
+
+    def __init__(self, kernel_id: str, ws: aiohttp.ClientWebSocketResponse):
+        self.id = kernel_id
+        self.ws = ws
+        self.session = str(uuid.uuid4())
+        self.lock = asyncio.Lock()
+        self.healthy = True
+        self.last_used = time.monotonic()
+
+    async def execute(self, code: str, timeout: int, silent: bool = False) -> dict:
+        """
+        Run `code` and collect its output. On timeout the kernel is marked
+        unhealthy since it may still be busy.
+        """
+        msg_id = str(uuid.uuid4())
+        execute_request = {
+            "header": {
+                "msg_id": msg_id,
+                "msg_type": "execute_request",
+                "username": "user",
+                "session": self.session,
+                "date": "",
+                "version": "5.3",
+            },
+            "parent_header": {},
+            "metadata": {},
+            "content": {
+                "code": code,
+                "silent": silent,
+                "store_history": not silent,
+                "user_expressions": {},
+                "allow_stdin": False,
+                "stop_on_error": True,
+            },
+            "channel": "shell",
+        }
+        await self.ws.send_str(json.dumps(execute_request))
+
+        stdout, stderr, result = "", "", []
+
+        while True:
+            try:
+                message = await asyncio.wait_for(self.ws.receive(), timeout)
+            except asyncio.TimeoutError:
+                stderr += "\nExecution timed out."
+                self.healthy = False
+                break
+
+            if message.type != aiohttp.WSMsgType.TEXT:
+                self.healthy = False
+                raise ConnectionError(f"Kernel {self.id} websocket closed")
+
+            message_data = json.loads(message.data)
+            if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+                continue
+
+            msg_type = message_data.get("msg_type")
+
+            if msg_type == "stream":
+                if message_data["content"]["name"] == "stdout":
+                    stdout += message_data["content"]["text"]
+                elif message_data["content"]["name"] == "stderr":
+                    stderr += message_data["content"]["text"]
+
+            elif msg_type in ("execute_result", "display_data"):
+                data = message_data["content"]["data"]
+                if "image/png" in data:
+                    result.append(f"data:image/png;base64,{data['image/png']}")
+                elif "text/plain" in data:
+                    result.append(data["text/plain"])
+
+            elif msg_type == "error":
+                stderr += "\n".join(message_data["content"]["traceback"])
+
+            elif (
+                msg_type == "status"
+                and message_data["content"]["execution_state"] == "idle"
+            ):
+                break
+
+        return {
+            "stdout": stdout.strip(),
+            "stderr": stderr.strip(),
+            "result": "\n".join(result).strip() if result else "",
+        }
+
+
+class JupyterKernelPool:
+    """
+    Pre-started kernels on one Jupyter server, leased per execution instead of
+    creating and deleting a kernel for every code block.
+
+    Idle kernels are kept at `size`; a leased kernel is cleaned in the
+    background according to `policy` before it is handed out again. With the
+    "session" policy a kernel stays bound to its session key (the chat id)
+    until it has been idle for `idle_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        client: JupyterClient,
+        size: int = JUPYTER_KERNEL_POOL_SIZE,
+        max_kernels: int = JUPYTER_KERNEL_POOL_MAX_KERNELS,
+        idle_timeout: int = JUPYTER_KERNEL_IDLE_TIMEOUT,
+        policy: str = JUPYTER_KERNEL_POOL_POLICY,
+    ):
+        self.client = client
+        self.size = size
+        self.max_kernels = max_kernels
+        self.idle_timeout = idle_timeout
+        self.policy = policy
+
+        self._idle: deque[PooledKernel] = deque()
+        self._sessions: dict[str, PooledKernel] = {}
+        self._kernel_count = 0
+        self._starting = 0
+        self._slots = asyncio.Semaphore(max_kernels)
+        # Set (and replaced) whenever a kernel goes back to idle or is discarded
+        self._kernel_returned = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._culler: Optional[asyncio.Task] = None
+        self._last_used = time.monotonic()
+
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _start_kernel(self) -> PooledKernel:
+        self._kernel_count += 1
+        try:
+            kernel_id = await self.client.create_kernel()
+        except Exception:
+            self._kernel_count -= 1
+            self._notify_kernel_returned()
+            raise
+        try:
+            ws = await self.client.connect(kernel_id)
+        except Exception:
+            self._discard(PooledKernel(kernel_id, None))
+            raise
+        log.debug(f"Started Jupyter kernel {kernel_id}")
+        return PooledKernel(kernel_id, ws)
+
+    async def _delete_kernel(self, kernel: PooledKernel):
+        try:
+            if kernel.ws is not None:
+                await kernel.ws.close()
+            await self.client.delete_kernel(kernel.id)
         except Exception as e:
-            return {
-                "stdout": "",
-                "stderr": f"Authentication Error: {str(e)}",
-                "result": "",
-            }
+            log.debug(f"Failed to delete Jupyter kernel {kernel.id}: {e}")
 
-    # Construct API URLs with authentication token if provided
-    params = f"?token={token}" if token else ""
-    kernel_url = urljoin(jupyter_url, f"/api/kernels{params}")
+    def _discard(self, kernel: PooledKernel):
+        self._kernel_count -= 1
+        self._spawn(self._delete_kernel(kernel))
+        self._notify_kernel_returned()
 
-    try:
-        response = session.post(kernel_url, headers=headers, cookies=session.cookies)
-        response.raise_for_status()
-        kernel_id = response.json()["id"]
+    def _notify_kernel_returned(self):
+        self._kernel_returned.set()
+        self._kernel_returned = asyncio.Event()
+
+    async def _fill(self):
+        try:
+            kernel = await self._start_kernel()
+        except Exception as e:
+            log.warning(f"Failed to pre-start Jupyter kernel: {e}")
+            return
+        finally:
+            self._starting -= 1
+        self._return_idle(kernel)
+
+    def _return_idle(self, kernel: PooledKernel):
+        # A pre-start and a recycle can race to fill the last idle place
+        if len(self._idle) < self.size:
+            self._idle.append(kernel)
+            self._notify_kernel_returned()
+        else:
+            self._discard(kernel)
+
+    def prewarm(self):
+        """Start kernels in the background until `size` are idle or starting."""
+        self._ensure_culler()
+        while (
+            len(self._idle) + self._starting < self.size
+            and self._kernel_count + self._starting < self.max_kernels
+        ):
+            self._starting += 1
+            self._spawn(self._fill())
+
+    def _evict_session_kernel(self) -> bool:
+        candidates = [
+            (key, kernel)
+            for key, kernel in self._sessions.items()
+            if not kernel.lock.locked()
+        ]
+        if not candidates:
+            return False
+        key, kernel = min(candidates, key=lambda item: item[1].last_used)
+        del self._sessions[key]
+        self._discard(kernel)
+        return True
+
+    async def _take_kernel(self) -> PooledKernel:
+        while True:
+            while self._idle:
+                kernel = self._idle.popleft()
+                if kernel.healthy and not kernel.ws.closed:
+                    return kernel
+                self._discard(kernel)
+
+            if self._kernel_count < self.max_kernels or self._evict_session_kernel():
+                return await self._start_kernel()
+
+            # Every kernel is leased, being recycled or starting; wait for one
+            await self._kernel_returned.wait()
+
+    async def _lease(self, session_key: Optional[str]) -> PooledKernel:
+        """Return a kernel with its lock held."""
+        if self.policy == "session" and session_key:
+            while (kernel := self._sessions.get(session_key)) is not None:
+                await kernel.lock.acquire()
+                if kernel.healthy and self._sessions.get(session_key) is kernel:
+                    return kernel
+                kernel.lock.release()
+                if self._sessions.get(session_key) is kernel:
+                    del self._sessions[session_key]
+
+        kernel = await self._take_kernel()
+        await kernel.lock.acquire()
+        if self.policy == "session" and session_key:
+            self._sessions[session_key] = kernel
+        self.prewarm()
+        return kernel
+
+    async def _recycle(self, kernel: PooledKernel):
+        try:
+            async with kernel.lock:
+                if self.policy == "restart":
+                    await kernel.ws.close()
+                    await self.client.restart_kernel(kernel.id)
+                    kernel.ws = await self.client.connect(kernel.id)
+                    kernel.session = str(uuid.uuid4())
+                else:
+                    await kernel.execute(KERNEL_RESET_CODE, timeout=30, silent=True)
+        except Exception as e:
+            log.debug(f"Failed to recycle Jupyter kernel {kernel.id}: {e}")
+            kernel.healthy = False
+
+        if kernel.healthy:
+            self._return_idle(kernel)
+        else:
+            self._discard(kernel)
+
+    def _release(self, kernel: PooledKernel, session_key: Optional[str]):
+        kernel.last_used = self._last_used = time.monotonic()
+        kernel.lock.release()
+
+        bound = session_key is not None and self._sessions.get(session_key) is kernel
+        if not kernel.healthy:
+            if bound:
+                del self._sessions[session_key]
+            self._spawn(self._interrupt_and_discard(kernel))
+        elif not bound:
+            self._spawn(self._recycle(kernel))
+        else:
+            # Unlocked now, so a lease waiting for capacity may evict it
+            self._notify_kernel_returned()
+
+    async def _interrupt_and_discard(self, kernel: PooledKernel):
+        try:
+            await self.client.interrupt_kernel(kernel.id)
+        except Exception:
+            pass
+        self._discard(kernel)
+
+    async def execute(
+        self, code: str, timeout: int, session_key: Optional[str] = None
+    ) -> dict:
+        self._ensure_culler()
+        async with self._slots:
+            kernel = await self._lease(session_key)
+            try:
+                return await kernel.execute(code, timeout)
+            except Exception:
+                kernel.healthy = False
+                raise
+            finally:
+                self._release(kernel, session_key)
+
+    def _ensure_culler(self):
+        if self._culler is None or self._culler.done():
+            self._culler = asyncio.create_task(self._cull_idle())
 
-        websocket_url = urljoin(
-            jupyter_url.replace("http", "ws"),
-            f"/api/kernels/{kernel_id}/channels{params}",
+    async def _cull_idle(self):
+        while True:
+            await asyncio.sleep(min(60, self.idle_timeout))
+            now = time.monotonic()
+
+            for key, kernel in list(self._sessions.items()):
+                if (
+                    not kernel.lock.locked()
+                    and now - kernel.last_used > self.idle_timeout
+                ):
+                    del self._sessions[key]
+                    self._discard(kernel)
+
+            # Give the pre-started kernels back when the pool is not used at all
+            if now - self._last_used > self.idle_timeout:
+                while self._idle:
+                    self._discard(self._idle.popleft())
+
+    async def shutdown(self):
+        if self._culler is not None:
+            self._culler.cancel()
+        # Kernels still starting or being recycled land in the pool afterwards
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        kernels = list(self._idle) + list(self._sessions.values())
+        self._idle.clear()
+        self._sessions.clear()
+        await asyncio.gather(
+            *(self._delete_kernel(kernel) for kernel in kernels),
+            return_exceptions=True,
         )
+        await self.client.close()
 
-        ws_headers = {}
-        if password and not token:
-            ws_headers["X-XSRFToken"] = session.cookies.get("_xsrf")
-            cookies = {name: value for name, value in session.cookies.items()}
-            ws_headers["Cookie"] = "; ".join(
-                [f"{name}={value}" for name, value in cookies.items()]
-            )
 
-        async with websockets.connect(
-            websocket_url, additional_headers=ws_headers
-        ) as ws:
-            msg_id = str(uuid.uuid4())
-            execute_request = {
-                "header": {
-                    "msg_id": msg_id,
-                    "msg_type": "execute_request",
-                    "username": "user",
-                    "session": str(uuid.uuid4()),
-                    "date": "",
-                    "version": "5.3",
-                },
-                "parent_header": {},
-                "metadata": {},
-                "content": {
-                    "code": code,
-                    "silent": False,
-                    "store_history": True,
-                    "user_expressions": {},
-                    "allow_stdin": False,
-                    "stop_on_error": True,
-                },
-                "channel": "shell",
-            }
-            await ws.send(json.dumps(execute_request))
-
-            stdout, stderr, result = "", "", []
-
-            while True:
-                try:
-                    message = await asyncio.wait_for(ws.recv(), timeout)
-                    message_data = json.loads(message)
-                    if message_data.get("parent_header", {}).get("msg_id") == msg_id:
-                        msg_type = message_data.get("msg_type")
-
-                        if msg_type == "stream":
-                            if message_data["content"]["name"] == "stdout":
-                                stdout += message_data["content"]["text"]
-                            elif message_data["content"]["name"] == "stderr":
-                                stderr += message_data["content"]["text"]
-
-                        elif msg_type in ("execute_result", "display_data"):
-                            data = message_data["content"]["data"]
-                            if "image/png" in data:
-                                result.append(
-                                    f"data:image/png;base64,{data['image/png']}"
-                                )
-                            elif "text/plain" in data:
-                                result.append(data["text/plain"])
-
-                        elif msg_type == "error":
-                            stderr += "\n".join(message_data["content"]["traceback"])
-
-                        elif (
-                            msg_type == "status"
-                            and message_data["content"]["execution_state"] == "idle"
-                        ):
-                            break
-
-                except asyncio.TimeoutError:
-                    stderr += "\nExecution timed out."
-                    break
+_kernel_pools: dict[tuple, JupyterKernelPool] = {}
 
-    except Exception as e:
-        return {"stdout": "", "stderr": f"Error: {str(e)}", "result": ""}
 
-    finally:
-        if kernel_id:
-            requests.delete(
-                f"{kernel_url}/{kernel_id}", headers=headers, cookies=session.cookies
-            )
+def get_jupyter_kernel_pool(
+    jupyter_url: str, token: Optional[str] = None, password: Optional[str] = None
+) -> JupyterKernelPool:
+    key = (jupyter_url, token, password)
+    pool = _kernel_pools.get(key)
+    if pool is None:
+        pool = JupyterKernelPool(JupyterClient(jupyter_url, token, password))
+        _kernel_pools[key] = pool
+    return pool
 
-    return {
-        "stdout": stdout.strip(),
-        "stderr": stderr.strip(),
-        "result": "\n".join(result).strip() if result else "",
-    }
+
+async def shutdown_jupyter_kernel_pools():
+    pools = list(_kernel_pools.values())
+    _kernel_pools.clear()
+    for pool in pools:
+        try:
+            await pool.shutdown()
+        except Exception as e:
+            log.warning(f"Error shutting down Jupyter kernel pool: {e}")
+
+
+async def execute_code_jupyter(
+    jupyter_url, code, token=None, password=None, timeout=10, session_id=None
+):
+    """
+    Executes Python code in a pooled Jupyter kernel.
+    Supports authentication with a token or password.
+    :param jupyter_url: Jupyter server URL (e.g., "http://localhost:8888")
+    :param code: Code to execute
+    :param token: Jupyter authentication token (optional)
+    :param password: Jupyter password (optional)
+    :param timeout: WebSocket timeout in seconds (default: 10s)
+    :param session_id: Key binding a kernel to a chat for the "session" pool policy (optional)
+    :return: Dictionary with stdout, stderr, and result
+             - Images are prefixed with "base64:image/png," and separated by newlines if multiple.
+    """
+    pool = get_jupyter_kernel_pool(jupyter_url, token, password)
+    try:
+        return await pool.execute(code, timeout, session_key=session_id)
+    except JupyterAuthError as e:
+        return {
+            "stdout": "",
+            "stderr": f"Authentication Error: {str(e)}",
+            "result": "",
+        }
+    except Exception as e:
+        return {"stdout": "", "stderr": f"Error: {str(e)}", "result": ""}
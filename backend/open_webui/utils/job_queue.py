@@ -15,10 +15,13 @@ Jobs are stored in Redis and can be processed by any worker pod, enabling:
 import json
 import logging
 import threading
+import time
+from datetime import timezone
 from typing import Optional, Dict, Any
 
 from rq import Queue, Retry
 from rq.job import Job, JobStatus
+from rq.registry import StartedJobRegistry
 from redis import Redis
 from redis.exceptions import ConnectionError, TimeoutError
 
@@ -30,8 +33,11 @@ from open_webui.env import (
     JOB_RETRY_DELAY,
     JOB_RESULT_TTL,
     JOB_FAILURE_TTL,
+    JOB_QUEUE_USER_SLOTS,
+    JOB_QUEUE_MAX_BACKLOG,
 )
 from open_webui.socket.utils import get_redis_pool
+from open_webui.utils.logger import get_correlation_id
 
 # OpenTelemetry instrumentation (conditional import)
 try:
@@ -75,9 +81,81 @@ def safe_trace_span(*args, **kwargs):
 
 log = logging.getLogger(__name__)
 
-# Queue name for file processing jobs
+# Queue name for file processing jobs (bulk knowledge-base ingestion; keeps the
+# original name so jobs enqueued before the split into classes still get picked up)
 FILE_PROCESSING_QUEUE_NAME = "file_processing"
 
+# Chat attachments someone is waiting on
+INTERACTIVE_QUEUE_NAME = "file_processing_interactive"
+
+# Queue per job class, in priority order: workers listen to the queues in this
+# order, so interactive jobs are always taken before bulk ones
+JOB_CLASS_QUEUES = {
+    "interactive": INTERACTIVE_QUEUE_NAME,
+    "bulk": FILE_PROCESSING_QUEUE_NAME,
+}
+FILE_PROCESSING_QUEUE_NAMES = list(JOB_CLASS_QUEUES.values())
+
+# Redis keys for fair-share scheduling and metrics
+ACTIVE_JOBS_KEY = "file_processing:active:{job_class}:{owner}"
+BACKLOG_KEY = "file_processing:backlog:{job_class}:{owner}"
+METRICS_KEY = "file_processing:metrics:{job_class}"
+FILE_PARTS_KEY = "file_processing:parts:{file_id}"
+
+# RQ statuses of jobs that still hold one of their owner's slots
+_SLOT_HOLDING_STATUSES = {
+    JobStatus.QUEUED,
+    JobStatus.STARTED,
+    JobStatus.SCHEDULED,  # waiting for a retry
+    JobStatus.DEFERRED,
+}
+
+# Take a slot if one is free and nothing is backlogged (keeps the backlog FIFO),
+# else append to the backlog. Returns 1 = admitted, 0 = backlogged, -1 = refused.
+_ADMIT_SCRIPT = """
+local slots = tonumber(ARGV[1])
+local max_backlog = tonumber(ARGV[2])
+local backlog = redis.call('LLEN', KEYS[2])
+if backlog == 0 and redis.call('SCARD', KEYS[1]) < slots then
+    redis.call('SADD', KEYS[1], ARGV[3])
+    return 1
+end
+if max_backlog > 0 and backlog >= max_backlog then
+    return -1
+end
+redis.call('RPUSH', KEYS[2], ARGV[4])
+return 0
+"""
+
+# Move the oldest backlogged job into a free slot. Returns its payload or nil.
+_PROMOTE_SCRIPT = """
+if redis.call('SCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return nil
+end
+local payload = redis.call('LPOP', KEYS[2])
+if not payload then
+    return nil
+end
+redis.call('SADD', KEYS[1], cjson.decode(payload)['job_id'])
+return payload
+"""
+
+# Count a part of a fanned-out file in. Returns {total, remaining, failed,
+# job_class, owner}, or nil if the parts record is missing (expired, or the
+# file was fanned out again), so a stray part can't complete the file.
+_FINISH_PART_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], 'total') == 0 then
+    return nil
+end
+local failed = redis.call('HINCRBY', KEYS[1], 'failed', tonumber(ARGV[1]))
+local remaining = redis.call('HINCRBY', KEYS[1], 'remaining', -1)
+local record = redis.call('HMGET', KEYS[1], 'total', 'job_class', 'owner')
+if remaining <= 0 then
+    redis.call('DEL', KEYS[1])
+end
+return {record[1], remaining, failed, record[2] or '', record[3] or ''}
+"""
+
 # Default job timeout (1 hour for large files)
 DEFAULT_JOB_TIMEOUT = JOB_TIMEOUT
 
@@ -97,6 +175,11 @@ class JobQueueError(Exception):
     pass
 
 
+class JobQueueAdmissionError(JobQueueError):
+    """Raised when a user already has JOB_QUEUE_MAX_BACKLOG jobs waiting in a class"""
+    pass
+
+
 def get_job_queue(queue_name: str = FILE_PROCESSING_QUEUE_NAME) -> Optional[Queue]:
     """
     Get or create an RQ queue for job processing.
@@ -132,7 +215,7 @@ def get_job_queue(queue_name: str = FILE_PROCESSING_QUEUE_NAME) -> Optional[Queu
                     cached_queue.connection.ping()
                     ping_end = time.time()
                     cache_check_end = time.time()
-                    log.debug(f"[JOB_QUEUE] Using cached queue | queue={queue_name} | ping_duration={ping_end - ping_start:.3f}s | total_duration={cache_check_end - cache_check_start:.3f}s | timestamp={cache_check_end:.3f}")
+                    log.debug("[JOB_QUEUE] Using cached queue | queue=%s | ping_duration=%.3fs | total_duration=%.3fs | timestamp=%.3f", queue_name, ping_end - ping_start, cache_check_end - cache_check_start, cache_check_end)
                     return cached_queue
                 except Exception:
                     ping_end = time.time()
@@ -145,7 +228,7 @@ def get_job_queue(queue_name: str = FILE_PROCESSING_QUEUE_NAME) -> Optional[Queu
         pool_get_start = time.time()
         pool = get_redis_pool(REDIS_URL, use_master=True)
         pool_get_end = time.time()
-        log.debug(f"[JOB_QUEUE] Redis pool retrieved | duration={pool_get_end - pool_get_start:.3f}s | timestamp={pool_get_end:.3f}")
+        log.debug("[JOB_QUEUE] Redis pool retrieved | duration=%.3fs | timestamp=%.3f", pool_get_end - pool_get_start, pool_get_end)
         
         # Handle Sentinel connection wrapper
         conn_get_start = time.time()
@@ -162,28 +245,28 @@ def get_job_queue(queue_name: str = FILE_PROCESSING_QUEUE_NAME) -> Optional[Queu
             # Standard connection pool
             redis_conn = Redis(connection_pool=pool)
         conn_get_end = time.time()
-        log.debug(f"[JOB_QUEUE] Redis connection obtained | duration={conn_get_end - conn_get_start:.3f}s | timestamp={conn_get_end:.3f}")
+        log.debug("[JOB_QUEUE] Redis connection obtained | duration=%.3fs | timestamp=%.3f", conn_get_end - conn_get_start, conn_get_end)
         
         # Test connection
         ping_start = time.time()
         redis_conn.ping()
         ping_end = time.time()
-        log.debug(f"[JOB_QUEUE] Connection ping test | duration={ping_end - ping_start:.3f}s | timestamp={ping_end:.3f}")
+        log.debug("[JOB_QUEUE] Connection ping test | duration=%.3fs | timestamp=%.3f", ping_end - ping_start, ping_end)
         
         # Create queue with the connection
         queue_create_start = time.time()
         queue = Queue(queue_name, connection=redis_conn)
         queue_create_end = time.time()
-        log.debug(f"[JOB_QUEUE] Queue object created | queue={queue_name} | duration={queue_create_end - queue_create_start:.3f}s | timestamp={queue_create_end:.3f}")
+        log.debug("[JOB_QUEUE] Queue object created | queue=%s | duration=%.3fs | timestamp=%.3f", queue_name, queue_create_end - queue_create_start, queue_create_end)
         
         # Cache the queue instance for reuse
         cache_store_start = time.time()
         with _queue_cache_lock:
             _queue_cache[queue_name] = queue
         cache_store_end = time.time()
-        log.debug(f"[JOB_QUEUE] Queue cached | queue={queue_name} | duration={cache_store_end - cache_store_start:.3f}s | timestamp={cache_store_end:.3f}")
+        log.debug("[JOB_QUEUE] Queue cached | queue=%s | duration=%.3fs | timestamp=%.3f", queue_name, cache_store_end - cache_store_start, cache_store_end)
         
-        log.debug(f"Created and cached job queue: {queue_name}")
+        log.debug("Created and cached job queue: %s", queue_name)
         return queue
     except (ConnectionError, TimeoutError, ValueError) as e:
         log.warning(f"Failed to connect to Redis for job queue: {e}")
@@ -193,6 +276,254 @@ def get_job_queue(queue_name: str = FILE_PROCESSING_QUEUE_NAME) -> Optional[Queu
         return None
 
 
+def get_job_class(knowledge_id: Optional[str] = None) -> str:
+    """Knowledge-base ingestion is bulk work; everything else is someone waiting in a chat."""
+    return "bulk" if knowledge_id else "interactive"
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _incr_metrics(connection, job_class: str, **fields) -> None:
+    try:
+        pipe = connection.pipeline(transaction=False)
+        for field, amount in fields.items():
+            if isinstance(amount, float):
+                pipe.hincrbyfloat(METRICS_KEY.format(job_class=job_class), field, amount)
+            else:
+                pipe.hincrby(METRICS_KEY.format(job_class=job_class), field, amount)
+        pipe.execute()
+    except Exception as e:
+        log.debug(f"Failed to update job queue metrics for {job_class}: {e}")
+
+
+def _prune_active_jobs(connection, active_key: str) -> None:
+    """Free slots of jobs that ended without running a callback (killed work horse, TTL)."""
+    members = [_decode(member) for member in connection.smembers(active_key)]
+    if not members:
+        return
+    # Slots handed over to fanned-out parts last as long as their parts record
+    parts_prefix = FILE_PARTS_KEY.format(file_id="")
+    stale = [
+        member
+        for member in members
+        if member.startswith(parts_prefix) and not connection.exists(member)
+    ]
+    job_ids = [member for member in members if not member.startswith(parts_prefix)]
+    jobs = Job.fetch_many(job_ids, connection=connection) if job_ids else []
+    stale += [
+        job_id
+        for job_id, job in zip(job_ids, jobs)
+        if job is None or job.get_status() not in _SLOT_HOLDING_STATUSES
+    ]
+    if stale:
+        connection.srem(active_key, *stale)
+        log.info(f"[JOB_QUEUE] Released {len(stale)} stale slot(s) | key={active_key}")
+
+
+def _enqueue_admitted_job(connection, payload: dict) -> Job:
+    """Put a job that already holds a slot of its owner into its class queue."""
+    job_class = payload["job_class"]
+    # Import here to avoid circular imports
+    from open_webui.workers.file_processor import process_file_job
+
+    queue = Queue(JOB_CLASS_QUEUES[job_class], connection=connection)
+    try:
+        return queue.enqueue(
+            process_file_job,
+            **payload["kwargs"],
+            job_timeout=payload["job_timeout"],
+            retry=Retry(max=MAX_RETRIES, interval=RETRY_DELAY),
+            job_id=payload["job_id"],
+            result_ttl=JOB_RESULT_TTL,  # Configurable TTL for job results
+            failure_ttl=JOB_FAILURE_TTL,  # Configurable TTL for failed job info
+            on_success=on_file_processing_job_success,
+            on_failure=on_file_processing_job_failure,
+            meta={
+                "job_class": job_class,
+                "owner": payload["owner"],
+                "queued_at": payload["queued_at"],
+                "correlation_id": payload.get("correlation_id"),
+            },
+        )
+    except Exception:
+        connection.srem(
+            ACTIVE_JOBS_KEY.format(job_class=job_class, owner=payload["owner"]),
+            payload["job_id"],
+        )
+        raise
+
+
+def _admit_job(connection, payload: dict) -> Optional[Job]:
+    """
+    Fair share: each owner gets JOB_QUEUE_USER_SLOTS jobs per class in the RQ
+    queue; further jobs wait in the owner's backlog, so one user's bulk upload
+    can't push everyone else's jobs to the back of the queue.
+
+    Returns the RQ job if it was admitted, None if it was backlogged.
+    Raises JobQueueAdmissionError if the owner's backlog is full.
+    """
+    job_class, owner = payload["job_class"], payload["owner"]
+    active_key = ACTIVE_JOBS_KEY.format(job_class=job_class, owner=owner)
+    backlog_key = BACKLOG_KEY.format(job_class=job_class, owner=owner)
+
+    _prune_active_jobs(connection, active_key)
+    admitted = connection.register_script(_ADMIT_SCRIPT)(
+        keys=[active_key, backlog_key],
+        args=[
+            JOB_QUEUE_USER_SLOTS,
+            JOB_QUEUE_MAX_BACKLOG,
+            payload["job_id"],
+            json.dumps(payload),
+        ],
+    )
+
+    if admitted == -1:
+        _incr_metrics(connection, job_class, refused=1)
+        raise JobQueueAdmissionError(
+            f"{JOB_QUEUE_MAX_BACKLOG} {job_class} jobs are already waiting for {owner}"
+        )
+    if admitted == 0:
+        _incr_metrics(connection, job_class, backlogged_total=1)
+        # The slots may have been freed between the prune and the push
+        promote_backlog(connection, job_class, owner)
+        return None
+
+    _incr_metrics(connection, job_class, admitted=1)
+    return _enqueue_admitted_job(connection, payload)
+
+
+def promote_backlog(connection, job_class: str, owner: str) -> int:
+    """Admit the owner's oldest backlogged jobs into free slots. Returns how many."""
+    active_key = ACTIVE_JOBS_KEY.format(job_class=job_class, owner=owner)
+    backlog_key = BACKLOG_KEY.format(job_class=job_class, owner=owner)
+    promote = connection.register_script(_PROMOTE_SCRIPT)
+
+    promoted = 0
+    while True:
+        payload = promote(keys=[active_key, backlog_key], args=[JOB_QUEUE_USER_SLOTS])
+        if payload is None:
+            return promoted
+        payload = json.loads(_decode(payload))
+        try:
+            _enqueue_admitted_job(connection, payload)
+            _incr_metrics(connection, job_class, admitted=1)
+            promoted += 1
+        except Exception as e:
+            log.error(
+                f"[JOB_QUEUE] Failed to admit backlogged job {payload.get('job_id')}: {e}",
+                exc_info=True,
+            )
+
+
+def promote_backlogs(connection) -> int:
+    """Promote every owner's backlog, e.g. at worker startup after a crash."""
+    promoted = 0
+    for job_class in JOB_CLASS_QUEUES:
+        pattern = BACKLOG_KEY.format(job_class=job_class, owner="*")
+        prefix = pattern[:-1]
+        for key in connection.scan_iter(match=pattern, count=100):
+            promoted += promote_backlog(connection, job_class, _decode(key)[len(prefix):])
+    if promoted:
+        log.info(f"[JOB_QUEUE] Promoted {promoted} backlogged job(s)")
+    return promoted
+
+
+def _release_job_slot(job: Job, connection, outcome: str) -> None:
+    job_class = job.meta.get("job_class")
+    owner = job.meta.get("owner")
+    if job_class not in JOB_CLASS_QUEUES or not owner:
+        return
+
+    connection.srem(ACTIVE_JOBS_KEY.format(job_class=job_class, owner=owner), job.id)
+
+    metrics = {outcome: 1}
+    if job.started_at and job.meta.get("queued_at"):
+        started_at = job.started_at.replace(tzinfo=timezone.utc).timestamp()
+        metrics["wait_count"] = 1
+        metrics["wait_seconds_total"] = float(max(started_at - job.meta["queued_at"], 0.0))
+        metrics["run_seconds_total"] = float(max(time.time() - started_at, 0.0))
+    _incr_metrics(connection, job_class, **metrics)
+
+    promote_backlog(connection, job_class, owner)
+
+
+def on_file_processing_job_success(job: Job, connection, result, *args, **kwargs):
+    """RQ success callback: free the owner's slot and admit their next job."""
+    try:
+        _release_job_slot(job, connection, "completed")
+    except Exception as e:
+        log.error(f"[JOB_QUEUE] Failed to release slot of job {job.id}: {e}", exc_info=True)
+
+
+def on_file_processing_job_failure(job: Job, connection, type, value, traceback):
+    """RQ failure callback: like success, unless RQ is going to retry the job."""
+    if job.retries_left:
+        return
+    try:
+        _release_job_slot(job, connection, "failed")
+    except Exception as e:
+        log.error(f"[JOB_QUEUE] Failed to release slot of job {job.id}: {e}", exc_info=True)
+
+
+def get_queue_metrics() -> Dict[str, Any]:
+    """
+    Depth and wait-time metrics per job class, for tuning worker scaling.
+
+    queued/started are jobs in RQ; backlogged are jobs waiting for a fair-share
+    slot. Counters and totals are cumulative since Redis was last flushed.
+    """
+    queue = get_job_queue()
+    if queue is None:
+        return {}
+    connection = queue.connection
+
+    metrics = {}
+    for job_class, queue_name in JOB_CLASS_QUEUES.items():
+        class_queue = Queue(queue_name, connection=connection)
+
+        backlogged = 0
+        backlog_owners = 0
+        for key in connection.scan_iter(
+            match=BACKLOG_KEY.format(job_class=job_class, owner="*"), count=100
+        ):
+            backlog_owners += 1
+            backlogged += connection.llen(key)
+
+        counters = {
+            _decode(field): float(_decode(value))
+            for field, value in connection.hgetall(
+                METRICS_KEY.format(job_class=job_class)
+            ).items()
+        }
+        wait_count = counters.get("wait_count", 0)
+
+        metrics[job_class] = {
+            "queue_name": queue_name,
+            "queued": len(class_queue),
+            "started": StartedJobRegistry(queue=class_queue).count,
+            "backlogged": backlogged,
+            "backlog_owners": backlog_owners,
+            "admitted": int(counters.get("admitted", 0)),
+            "completed": int(counters.get("completed", 0)),
+            "failed": int(counters.get("failed", 0)),
+            "backlogged_total": int(counters.get("backlogged_total", 0)),
+            "refused": int(counters.get("refused", 0)),
+            "avg_wait_seconds": (
+                round(counters.get("wait_seconds_total", 0) / wait_count, 3)
+                if wait_count
+                else None
+            ),
+            "avg_run_seconds": (
+                round(counters.get("run_seconds_total", 0) / wait_count, 3)
+                if wait_count
+                else None
+            ),
+        }
+    return metrics
+
+
 def enqueue_file_processing_job(
     file_id: str,
     content: Optional[str] = None,
@@ -203,9 +534,14 @@ def enqueue_file_processing_job(
     embedding_model: Optional[str] = None,
     embedding_api_key: Optional[str] = None,
     job_timeout: int = DEFAULT_JOB_TIMEOUT,
+    job_class: Optional[str] = None,
 ) -> Optional[str]:
     """
     Enqueue a file processing job to the distributed job queue.
+
+    Jobs go to the queue of their class ("interactive" or "bulk", by default
+    bulk if a knowledge base is involved) and are subject to per-user fair
+    share: beyond JOB_QUEUE_USER_SLOTS they wait in the user's backlog.
     
     Args:
         file_id: ID of the file to process (must be non-empty string, typically UUID)
@@ -217,12 +553,13 @@ def enqueue_file_processing_job(
         embedding_model: Per-admin embedding model name (resolved at enqueue time for RBAC)
         embedding_api_key: API key for embedding service (per-user, from admin config)
         job_timeout: Job timeout in seconds (default: 1 hour)
+        job_class: "interactive" or "bulk" (default: derived from knowledge_id)
         
     Returns:
-        Job ID if successfully enqueued, None if queue unavailable or validation fails
+        Job ID if successfully enqueued or backlogged, None if queue unavailable or validation fails
         
     Raises:
-        ValueError: If input validation fails
+        JobQueueAdmissionError: If the user's backlog for the job class is full
     """
     # Input validation
     if not file_id or not isinstance(file_id, str) or not file_id.strip():
@@ -245,14 +582,20 @@ def enqueue_file_processing_job(
         log.error(f"Job arguments are not JSON-serializable for file_id={file_id}: {e}")
         return None
     
-    import time
+    if job_class is None:
+        job_class = get_job_class(knowledge_id)
+    if job_class not in JOB_CLASS_QUEUES:
+        log.error(f"Invalid job_class: {job_class}")
+        return None
+    queue_name = JOB_CLASS_QUEUES[job_class]
+
     enqueue_start = time.time()
-    log.info(f"[JOB_QUEUE] Starting enqueue operation | file_id={file_id} | timestamp={enqueue_start:.3f}")
+    log.debug("[JOB_QUEUE] Starting enqueue operation | file_id=%s | class=%s | timestamp=%.3f", file_id, job_class, enqueue_start)
     try:
         queue_get_start = time.time()
-        queue = get_job_queue()
+        queue = get_job_queue(queue_name)
         queue_get_end = time.time()
-        log.info(f"[JOB_QUEUE] Queue retrieved | duration={queue_get_end - queue_get_start:.3f}s | timestamp={queue_get_end:.3f}")
+        log.debug("[JOB_QUEUE] Queue retrieved | duration=%.3fs | timestamp=%.3f", queue_get_end - queue_get_start, queue_get_end)
         if queue is None:
             log.warning(f"[JOB_QUEUE] Job queue unavailable, cannot enqueue file processing for file_id={file_id}")
             return None
@@ -265,7 +608,7 @@ def enqueue_file_processing_job(
         try:
             existing_job = Job.fetch(job_id_str, connection=queue.connection)
             job_fetch_end = time.time()
-            log.info(f"[JOB_QUEUE] Job fetch check | duration={job_fetch_end - job_fetch_start:.3f}s | timestamp={job_fetch_end:.3f}")
+            log.debug("[JOB_QUEUE] Job fetch check | duration=%.3fs | timestamp=%.3f", job_fetch_end - job_fetch_start, job_fetch_end)
             if existing_job:
                 existing_status = existing_job.get_status()
                 
@@ -301,7 +644,7 @@ def enqueue_file_processing_job(
                     # Extract trace context into a dictionary
                     propagator = TraceContextTextMapPropagator()
                     propagator.inject(trace_context)
-                    log.debug(f"Extracted trace context for job enqueueing: {trace_context}")
+                    log.debug("Extracted trace context for job enqueueing: %s", trace_context)
             except Exception as trace_error:
                 log.debug(f"Failed to extract trace context: {trace_error}")
                 trace_context = {}
@@ -330,37 +673,47 @@ def enqueue_file_processing_job(
             attributes={
                 "job.id": job_id_str,
                 "job.file_id": file_id,
-                "job.queue_name": FILE_PROCESSING_QUEUE_NAME,
+                "job.queue_name": queue_name,
+                "job.class": job_class,
                 "job.timeout": job_timeout,
                 "job.has_trace_context": bool(trace_context),
             },
         ) as span:
-            # Enqueue job with retry logic
-            # Import here to avoid circular imports
-            from open_webui.workers.file_processor import process_file_job
-        
             # Try to enqueue the job
             # RQ may raise an exception if job_id already exists (race condition)
             enqueue_redis_start = time.time()
             try:
-                job = queue.enqueue(
-                    process_file_job,
-                    **job_kwargs,
-                    job_timeout=job_timeout,
-                    retry=Retry(max=MAX_RETRIES, interval=RETRY_DELAY),
-                    job_id=job_id_str,
-                    result_ttl=JOB_RESULT_TTL,  # Configurable TTL for job results
-                    failure_ttl=JOB_FAILURE_TTL,  # Configurable TTL for failed job info
+                job = _admit_job(
+                    queue.connection,
+                    {
+                        "job_id": job_id_str,
+                        "job_class": job_class,
+                        "owner": user_id or "anonymous",
+                        "kwargs": job_kwargs,
+                        "job_timeout": job_timeout,
+                        "queued_at": enqueue_start,
+                        "correlation_id": get_correlation_id(),
+                    },
                 )
                 enqueue_redis_end = time.time()
                 enqueue_end = time.time()
+                if job is None:
+                    safe_add_span_event("job.backlogged", {"job_id": job_id_str, "file_id": file_id})
+                    log.info(
+                        f"[JOB_QUEUE] Backlogged file processing job (user has no free slot) | job_id={job_id_str} | "
+                        f"file_id={file_id} | class={job_class} | user_id={user_id} | "
+                        f"total_duration={enqueue_end - enqueue_start:.3f}s | timestamp={enqueue_end:.3f}"
+                    )
+                    return job_id_str
                 safe_add_span_event("job.enqueued", {"job_id": job.id, "file_id": file_id})
                 log.info(
                     f"[JOB_QUEUE] Enqueued file processing job | job_id={job.id} | file_id={file_id} | "
-                    f"queue={FILE_PROCESSING_QUEUE_NAME} | redis_duration={enqueue_redis_end - enqueue_redis_start:.3f}s | "
+                    f"queue={queue_name} | redis_duration={enqueue_redis_end - enqueue_redis_start:.3f}s | "
                     f"total_duration={enqueue_end - enqueue_start:.3f}s | timestamp={enqueue_end:.3f}"
                 )
                 return job.id
+            except JobQueueAdmissionError:
+                raise
             except Exception as enqueue_error:
                 # Handle case where job was created between our check and enqueue (race condition)
                 error_str = str(enqueue_error).lower()
@@ -384,11 +737,110 @@ def enqueue_file_processing_job(
                 })
                 # Re-raise if it's not a duplicate job error
                 raise
+    except JobQueueAdmissionError as e:
+        log.warning(f"[JOB_QUEUE] Refused file processing job for file_id={file_id}: {e}")
+        raise
     except Exception as e:
         log.error(f"Failed to enqueue file processing job for file_id={file_id}: {e}", exc_info=True)
         return None
 
 
+def enqueue_file_processing_parts(
+    file_id: str,
+    parts: list,
+    job_class: str,
+    job_timeout: int = DEFAULT_JOB_TIMEOUT,
+    parent_job: Optional[Job] = None,
+) -> list:
+    """
+    Fan a file out into independent part jobs (kwargs for process_file_part_job).
+
+    Parts run on any worker of the file's queue class. The parent job's
+    fair-share slot is handed over to the parts record, so the owner keeps
+    it until finish_file_processing_part counts the last part back in.
+
+    Returns the part job IDs. Raises JobQueueError if the queue is unavailable.
+    """
+    queue = get_job_queue(JOB_CLASS_QUEUES.get(job_class, FILE_PROCESSING_QUEUE_NAME))
+    if queue is None:
+        raise JobQueueError("Job queue unavailable, cannot fan out file processing")
+
+    # Import here to avoid circular imports
+    from open_webui.workers.file_processor import process_file_part_job
+
+    parts_key = FILE_PARTS_KEY.format(file_id=file_id)
+    owner = parent_job.meta.get("owner") if parent_job is not None else None
+    pipe = queue.connection.pipeline()
+    pipe.delete(parts_key)
+    pipe.hset(
+        parts_key,
+        mapping={
+            "total": len(parts),
+            "remaining": len(parts),
+            "failed": 0,
+            "job_class": job_class,
+            "owner": owner or "",
+        },
+    )
+    # Outlive the slowest possible part, including its retries
+    pipe.expire(parts_key, job_timeout * (MAX_RETRIES + 2) + RETRY_DELAY * MAX_RETRIES)
+    if owner:
+        active_key = ACTIVE_JOBS_KEY.format(job_class=job_class, owner=owner)
+        pipe.sadd(active_key, parts_key)
+        pipe.srem(active_key, parent_job.id)
+    pipe.execute()
+
+    job_ids = []
+    for part, kwargs in enumerate(parts):
+        job = queue.enqueue(
+            process_file_part_job,
+            **kwargs,
+            job_timeout=job_timeout,
+            retry=Retry(max=MAX_RETRIES, interval=RETRY_DELAY),
+            job_id=f"file_processing_{file_id}_part_{part}",
+            result_ttl=JOB_RESULT_TTL,
+            failure_ttl=JOB_FAILURE_TTL,
+            meta={"correlation_id": get_correlation_id()},
+        )
+        job_ids.append(job.id)
+
+    log.info(f"[JOB_QUEUE] Fanned out file processing | file_id={file_id} | parts={len(parts)} | queue={queue.name}")
+    return job_ids
+
+
+def finish_file_processing_part(file_id: str, failed: bool = False) -> Dict[str, int]:
+    """
+    Count a part of a fanned-out file as done (or permanently failed).
+
+    Returns {"total", "remaining", "failed"} after this part. The caller that
+    sees remaining == 0 is the last one and finalizes the file; by then the
+    owner's slot has been freed. Raises JobQueueError if the queue is
+    unavailable or the file has no parts record.
+    """
+    queue = get_job_queue()
+    if queue is None:
+        raise JobQueueError("Job queue unavailable, cannot record file part")
+
+    connection = queue.connection
+    parts_key = FILE_PARTS_KEY.format(file_id=file_id)
+    record = connection.register_script(_FINISH_PART_SCRIPT)(
+        keys=[parts_key], args=[1 if failed else 0]
+    )
+    if record is None:
+        raise JobQueueError(f"No parts record for file_id={file_id}, it expired or was replaced")
+
+    total, remaining, failed_count, job_class, owner = record
+    job_class, owner = _decode(job_class), _decode(owner)
+    if remaining <= 0 and owner and job_class in JOB_CLASS_QUEUES:
+        connection.srem(ACTIVE_JOBS_KEY.format(job_class=job_class, owner=owner), parts_key)
+        promote_backlog(connection, job_class, owner)
+    return {
+        "total": int(_decode(total)),
+        "remaining": max(int(remaining), 0),
+        "failed": int(failed_count),
+    }
+
+
 def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
     """
     Get the status of a job by ID.
@@ -1,17 +1,248 @@
 import subprocess
 import os
 import json
-from typing import List
+from typing import List, Optional
 from pathlib import Path
 import re
 from html import escape
 import time
 import logging
+import atexit
+import queue
+import select
+import threading
+from collections import OrderedDict
+
+from open_webui.env import (
+    KATEX_RENDER_CACHE_SIZE,
+    KATEX_RENDER_TIMEOUT,
+    KATEX_WORKER_POOL_SIZE,
+)
 
 """
 This code requires Pango system dependency to run
 """
 
+log = logging.getLogger(__name__)
+
+# Long-lived Node worker: reads one JSON request per line on stdin
+# ({"id": n, "items": [{"latex": ..., "display": ...}]}) and writes one JSON
+# response per line on stdout ({"id": n, "results": [{"success": ..., "html": ...}]}).
+# The script is passed with `node -e`, so nothing is written to disk.
+KATEX_WORKER_SCRIPT = """
+const katex = require(process.argv[1]);
+const readline = require('readline');
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on('line', (line) => {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (e) {
+    process.stdout.write(JSON.stringify({ id: null, fatal: true, error: e.message }) + '\\n');
+    return;
+  }
+  const results = (request.items || []).map((it) => {
+    try {
+      const html = katex.renderToString(it.latex, {
+        displayMode: !!it.display, throwOnError: false, trust: true, strict: false, output: 'html'
+      });
+      return { success: true, html };
+    } catch (e) {
+      return { success: false, error: e.message };
+    }
+  });
+  process.stdout.write(JSON.stringify({ id: request.id, results }) + '\\n');
+});
+"""
+
+
+class FragmentCache:
+    """Process-wide, size-bounded LRU of rendered KaTeX fragments keyed by (latex, display)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def put(self, key, html: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+fragment_cache = FragmentCache(KATEX_RENDER_CACHE_SIZE)
+
+
+class KaTeXWorker:
+    """A single persistent Node process rendering KaTeX over stdin/stdout."""
+
+    def __init__(self, katex_path: str, cwd: str):
+        try:
+            self.proc = subprocess.Popen(
+                ["node", "-e", KATEX_WORKER_SCRIPT, katex_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=cwd,
+            )
+        except FileNotFoundError as e:
+            raise RuntimeError("Node.js is required to render KaTeX HTML") from e
+        self._request_id = 0
+
+    def is_alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def render(self, items: list[dict], timeout: float) -> list[dict]:
+        self._request_id += 1
+        request = {"id": self._request_id, "items": items}
+        self.proc.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+        self.proc.stdin.flush()
+
+        ready, _, _ = select.select([self.proc.stdout], [], [], timeout)
+        if not ready:
+            raise TimeoutError(f"KaTeX worker did not respond within {timeout}s")
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError("KaTeX worker exited unexpectedly")
+
+        data = json.loads(line)
+        if data.get("fatal"):
+            raise RuntimeError(data.get("error", "KaTeX worker fatal error"))
+        if data.get("id") != self._request_id or len(data.get("results", [])) != len(items):
+            raise RuntimeError("KaTeX worker returned unexpected result")
+        return data["results"]
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+
+
+class KaTeXRenderService:
+    """
+    Bounded pool of persistent KaTeX workers shared by all exports in this process.
+    Workers are started lazily and replaced after a timeout or crash.
+    """
+
+    def __init__(self, node_modules_path: Path, pool_size: int, timeout: float):
+        self.node_modules_path = node_modules_path
+        self._katex_path = str(node_modules_path / "katex")
+        self._cwd = str(node_modules_path.parent)
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> KaTeXWorker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self._pool_size:
+                self._created += 1
+                try:
+                    return KaTeXWorker(self._katex_path, self._cwd)
+                except Exception:
+                    self._created -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise TimeoutError("No KaTeX worker became available")
+
+    def _release(self, worker: KaTeXWorker, healthy: bool):
+        if healthy and worker.is_alive():
+            self._idle.put(worker)
+            return
+        worker.close()
+        with self._lock:
+            self._created -= 1
+
+    def render_many(self, items: list[dict]) -> list[dict]:
+        worker = self._acquire()
+        healthy = False
+        try:
+            results = worker.render(items, self._timeout)
+            healthy = True
+            return results
+        finally:
+            self._release(worker, healthy)
+
+    def close(self):
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+            with self._lock:
+                self._created -= 1
+
+
+_render_service: Optional[KaTeXRenderService] = None
+_render_service_pid: Optional[int] = None
+_render_service_lock = threading.Lock()
+
+
+def get_katex_render_service(node_modules_path: Path) -> KaTeXRenderService:
+    """Return the process-wide render service, recreating it after a fork."""
+    global _render_service, _render_service_pid
+    with _render_service_lock:
+        if (
+            _render_service is None
+            or _render_service_pid != os.getpid()
+            or _render_service.node_modules_path != node_modules_path
+        ):
+            # Pipes inherited from a parent process must not be shared
+            if _render_service is not None and _render_service_pid == os.getpid():
+                _render_service.close()
+            _render_service = KaTeXRenderService(
+                node_modules_path, KATEX_WORKER_POOL_SIZE, KATEX_RENDER_TIMEOUT
+            )
+            _render_service_pid = os.getpid()
+        return _render_service
+
+
+def shutdown_katex_render_service():
+    with _render_service_lock:
+        if _render_service is not None and _render_service_pid == os.getpid():
+            _render_service.close()
+
+
+atexit.register(shutdown_katex_render_service)
+
 class KaTeXCompiler:
     """
     Compile LaTeX expressions using KaTeX for better matrix and complex expression support.
@@ -21,7 +252,6 @@ class KaTeXCompiler:
     def __init__(self, debug: bool = False):
         self.temp_images = []
         self.node_modules_path = self._find_node_modules()
-        self._cache = {}
         self._logger = logging.getLogger(__name__)
         self._debug = debug
 
@@ -358,178 +588,43 @@ class KaTeXCompiler:
     
     def render_to_html(self, latex_expr: str, display: bool = False) -> str:
         """Render a LaTeX expression to a KaTeX HTML fragment (no images)."""
-        try:
-            # Cache check
-            cache_key = (latex_expr, bool(display))
-            if cache_key in self._cache:
-                return self._cache[cache_key]
-            # Ensure Node.js is available
-            result = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=5)
-            if result.returncode != 0:
-                raise RuntimeError('Node.js is required to render KaTeX HTML')
-
-            katex_path = str(self.node_modules_path / 'katex')
-            display_mode = str(display).lower()
+        return self.render_many_to_html([(latex_expr, display)])[0]
 
-            script_lines = [
-                "const katex = require('" + katex_path + "');",
-                "",
-                "const latex = " + json.dumps(latex_expr) + ";",
-                "const displayMode = " + display_mode + ";",
-                "",
-                "try {",
-                "  const html = katex.renderToString(latex, {",
-                "    displayMode: displayMode,",
-                "    throwOnError: false,",
-                "    trust: true,",
-                "    strict: false,",
-                "    output: 'html'",
-                "  });",
-                "  console.log(JSON.stringify({ success: true, html }));",
-                "} catch (error) {",
-                "  console.log(JSON.stringify({ success: false, error: error.message }));",
-                "}",
-            ]
-
-            script_content = "\n".join(script_lines)
-
-            # Use /tmp directory (works in OpenShift)
-            project_temp_dir = Path('/tmp')
-            
-            script_path = project_temp_dir / 'katex_render_fragment.cjs'
-            with open(script_path, 'w') as f:
-                f.write(script_content)
+    def render_many_to_html(self, items: list[tuple[str, bool]]) -> list[str]:
+        """
+        Render multiple LaTeX expressions to KaTeX HTML using the persistent worker pool.
+        Fragments are looked up in (and added to) the process-wide LRU cache first.
+        """
+        results: list[str | None] = [None] * len(items)
+        # Deduplicate within the batch: key -> indexes that need it
+        missing: dict[tuple[str, bool], list[int]] = {}
+        for idx, (expr, display) in enumerate(items):
+            key = (expr, bool(display))
+            html = fragment_cache.get(key)
+            if html is None:
+                missing.setdefault(key, []).append(idx)
+            else:
+                results[idx] = html
 
+        if missing:
+            keys = list(missing)
             t0 = time.perf_counter()
-            proc = subprocess.run(
-                ['node', str(script_path)],
-                capture_output=True,
-                text=True,
-                timeout=15,
-                cwd=str(self.node_modules_path.parent)
+            rendered = get_katex_render_service(self.node_modules_path).render_many(
+                [{"latex": expr, "display": display} for expr, display in keys]
             )
             t1 = time.perf_counter()
 
-            try:
-                os.unlink(script_path)
-            except Exception:
-                pass
-
-            if proc.returncode != 0:
-                raise RuntimeError(proc.stderr)
+            for key, res in zip(keys, rendered):
+                if not res.get('success'):
+                    raise RuntimeError(res.get('error', 'KaTeX render failed'))
+                fragment_cache.put(key, res['html'])
+                for idx in missing[key]:
+                    results[idx] = res['html']
 
-            data = json.loads(proc.stdout or '{}')
-            if not data.get('success'):
-                raise RuntimeError(data.get('error', 'KaTeX render failed'))
-
-            html = data['html']
-            self._cache[cache_key] = html
             if self._debug:
                 self._logger.info(
-                    f"KaTeX: single render display={display} len={len(latex_expr)} took {t1 - t0:.3f}s"
+                    f"KaTeX: batch render count={len(keys)} cached={len(items) - sum(len(v) for v in missing.values())} took {t1 - t0:.3f}s"
                 )
-            return html
-        except Exception as e:
-            raise e
-
-    def render_many_to_html(self, items: list[tuple[str, bool]]) -> list[str]:
-        """Batch render multiple LaTeX expressions to KaTeX HTML in a single Node process."""
-        # Prepare results with cache hits filled
-        results: list[str | None] = []
-        to_render = []
-        index_map = []
-        for idx, (expr, display) in enumerate(items):
-            key = (expr, bool(display))
-            if key in self._cache:
-                results.append(self._cache[key])
-            else:
-                results.append(None)
-                index_map.append(idx)
-                to_render.append({"latex": expr, "display": bool(display)})
-
-        if not to_render:
-            # All cached
-            return [r for r in results if r is not None]
-
-        # Ensure Node.js is available
-        chk = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=5)
-        if chk.returncode != 0:
-            # Fallback: render individually
-            for j, item in zip(index_map, to_render):
-                html = self.render_to_html(item["latex"], item["display"])
-                self._cache[(item["latex"], item["display"])] = html
-                results[j] = html
-            return [r if r is not None else '' for r in results]
-
-        katex_path = str(self.node_modules_path / 'katex')
-        payload = json.dumps(to_render)
-
-        script_lines = [
-            "const katex = require('" + katex_path + "');",
-            "let input = '';",
-            "process.stdin.on('data', c => input += c);",
-            "process.stdin.on('end', () => {",
-            "  try {",
-            "    const items = JSON.parse(input);",
-            "    const out = items.map(it => {",
-            "      try {",
-            "        const html = katex.renderToString(it.latex, {",
-            "          displayMode: !!it.display, throwOnError: false, trust: true, strict: false, output: 'html'",
-            "        });",
-            "        return { success: true, html };",
-            "      } catch (e) {",
-            "        return { success: false, error: e.message };",
-            "      }",
-            "    });",
-            "    process.stdout.write(JSON.stringify(out));",
-            "  } catch (e) {",
-            "    process.stdout.write(JSON.stringify({ fatal: true, error: e.message }));",
-            "  }",
-            "});",
-        ]
-        script_content = "\n".join(script_lines)
-
-        tmp_dir = Path('/tmp')
-        script_path = tmp_dir / 'katex_render_many.cjs'
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-
-        t0 = time.perf_counter()
-        proc = subprocess.run(
-            ['node', str(script_path)],
-            input=payload,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=str(self.node_modules_path.parent)
-        )
-        t1 = time.perf_counter()
-
-        try:
-            os.unlink(script_path)
-        except Exception:
-            pass
-
-        if proc.returncode != 0:
-            raise RuntimeError(proc.stderr or 'KaTeX batch render failed')
-
-        data = json.loads(proc.stdout or '[]')
-        if isinstance(data, dict) and data.get('fatal'):
-            raise RuntimeError(data.get('error', 'KaTeX batch fatal error'))
-        if not isinstance(data, list) or len(data) != len(to_render):
-            raise RuntimeError('KaTeX batch returned unexpected result')
-
-        for idx, item, res in zip(index_map, to_render, data):
-            if not res.get('success'):
-                raise RuntimeError(res.get('error', 'KaTeX render failed'))
-            html = res['html']
-            self._cache[(item["latex"], item["display"])] = html
-            results[idx] = html
-
-        if self._debug:
-            self._logger.info(
-                f"KaTeX: batch render count={len(to_render)} cached={len(items)-len(to_render)} took {t1 - t0:.3f}s payload_len={len(payload)}"
-            )
 
         return [r if r is not None else '' for r in results]
 
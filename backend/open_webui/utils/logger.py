@@ -1,8 +1,14 @@
+import contextvars
 import json
 import logging
+import random
 import sys
 import os
-from typing import TYPE_CHECKING
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional
 from datetime import timezone
 try:
     from zoneinfo import ZoneInfo
@@ -24,6 +30,8 @@ from open_webui.env import (
     AUDIT_LOG_LEVEL,
     AUDIT_LOGS_FILE_PATH,
     GLOBAL_LOG_LEVEL,
+    LOG_ENQUEUE,
+    LOG_RATE_LIMIT,
 )
 
 
@@ -31,6 +39,76 @@ if TYPE_CHECKING:
     from loguru import Record
 
 
+# ID shared by all log records of one HTTP request or background job
+correlation_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "correlation_id", default=None
+)
+
+
+def get_correlation_id() -> Optional[str]:
+    return correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(value: Optional[str] = None):
+    """
+    Tags every log record emitted in this context (and tasks/threads started
+    from it) with a correlation ID: `value`, or a new random one.
+    """
+    token = correlation_id.set(value or uuid.uuid4().hex[:16])
+    try:
+        yield correlation_id.get()
+    finally:
+        correlation_id.reset(token)
+
+
+class LogRateLimiter:
+    """
+    Keeps chatty log statements cheap on hot paths.
+
+    Each call site (file and line) may emit `per_second` DEBUG records per
+    second; the rest are dropped before their message is formatted and the
+    next record let through carries the number dropped as "suppressed".
+    INFO records pass untouched unless they ask to be sampled with
+    extra={"sample": 0.1}, in which case only that fraction of their
+    occurrences is kept and the same per-site limit applies. WARNING and
+    above always pass.
+    """
+
+    def __init__(self, per_second: int):
+        self.per_second = per_second
+        # call site -> [window start, records in window, records dropped]
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def allow(self, site, levelno: int, sample: Optional[float] = None) -> tuple[bool, int]:
+        """Returns (emit?, records suppressed at this site since the last emitted one)."""
+        if levelno >= logging.WARNING:
+            return True, 0
+        if sample is None:
+            if levelno >= logging.INFO:
+                return True, 0
+        elif random.random() >= sample:
+            return False, 0
+        if self.per_second <= 0:
+            return True, 0
+
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(site)
+            if window is None or now - window[0] >= 1.0:
+                self._windows[site] = [now, 1, 0]
+                return True, window[2] if window else 0
+            if window[1] < self.per_second:
+                window[1] += 1
+                return True, 0
+            window[2] += 1
+            return False, 0
+
+
+rate_limiter = LogRateLimiter(LOG_RATE_LIMIT)
+
+
 def stdout_format(record: "Record") -> str:
     """
     Generates a formatted string for log records that are output to the console. This format includes a timestamp, log level, source location (module, function, and line), the log message, and any extra data (serialized as JSON).
@@ -61,6 +139,11 @@ def stdout_format(record: "Record") -> str:
         record["extra"]["trace_id"] = trace_id
     if span_id:
         record["extra"]["span_id"] = span_id
+    # Formatting runs in the logging thread even with enqueue=True, so the
+    # caller's context is still current here
+    request_id = correlation_id.get()
+    if request_id:
+        record["extra"]["correlation_id"] = request_id
     
     # Convert time to NYC timezone and format it
     nyc_time = record["time"].astimezone(NYC_TIMEZONE)
@@ -76,6 +159,8 @@ def stdout_format(record: "Record") -> str:
         trace_correlation = f"<yellow>trace_id={trace_id}</yellow> | "
     if span_id:
         trace_correlation += f"<yellow>span_id={span_id}</yellow> | "
+    if request_id:
+        trace_correlation += f"<magenta>cid={request_id}</magenta> | "
     
     return (
         f"<green>{time_str} {tz_abbr}</green> | "
@@ -99,7 +184,14 @@ class InterceptHandler(logging.Handler):
         Called by the standard logging module for each log event.
         It transforms the standard `LogRecord` into a format compatible with Loguru
         and passes it to Loguru's logger. The timestamp is converted to NYC timezone.
+        Records over the rate limit are dropped before their message is built.
         """
+        allowed, suppressed = rate_limiter.allow(
+            (record.pathname, record.lineno), record.levelno, getattr(record, "sample", None)
+        )
+        if not allowed:
+            return
+
         try:
             level = logger.level(record.levelname).name
         except ValueError:
@@ -112,9 +204,10 @@ class InterceptHandler(logging.Handler):
 
         # Convert record time to NYC timezone if available
         # Loguru will handle the timezone conversion in stdout_format
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level, record.getMessage()
-        )
+        target = logger.opt(depth=depth, exception=record.exc_info)
+        if suppressed:
+            target = target.bind(suppressed=suppressed)
+        target.log(level, record.getMessage())
 
 
 def file_format(record: "Record"):
@@ -150,7 +243,8 @@ def start_logger():
     """
     Initializes and configures Loguru's logger with distinct handlers:
 
-    A console (stdout) handler for general log messages (excluding those marked as auditable).
+    A console (stdout) handler for general log messages (excluding those marked as auditable),
+    written from a background thread when LOG_ENQUEUE is on so callers never wait on stdout.
     An optional file handler for audit logs if audit logging is enabled.
     Additionally, this function reconfigures Python's standard logging to route through Loguru and adjusts logging levels for Uvicorn.
     
@@ -166,6 +260,7 @@ def start_logger():
         level=GLOBAL_LOG_LEVEL,
         format=stdout_format,
         filter=lambda record: "auditable" not in record["extra"],
+        enqueue=LOG_ENQUEUE,
     )
 
     if AUDIT_LOG_LEVEL != "NONE":
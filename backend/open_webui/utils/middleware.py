@@ -2002,6 +2002,7 @@ async def process_chat_response(
                                             else None
                                         ),
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
+                                        session_id=metadata.get("chat_id", None),
                                     )
                                 else:
                                     output = {
@@ -2186,7 +2187,10 @@ async def process_chat_response(
                 await response.background()
 
         # background_tasks.add_task(post_response_handler, response, events)
-        task_id, _ = create_task(post_response_handler(response, events))
+        task_id, _ = create_task(
+            post_response_handler(response, events),
+            chat_id=metadata.get("chat_id"),
+        )
         return {"status": True, "task_id": task_id}
 
     else:
@@ -266,6 +266,22 @@ def calculate_sha256(file_path, chunk_size):
     return sha256.hexdigest()
 
 
+class HashingFileReader:
+    """Wraps a binary file object and hashes the bytes as they are read."""
+
+    def __init__(self, file):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size=-1):
+        chunk = self.file.read(size)
+        self.sha256.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
+
+
 def calculate_sha256_string(string):
     # Create a new SHA-256 hash object
     sha256_hash = hashlib.sha256()
@@ -600,3 +600,9 @@ class PDFGenerator:
             raise e
         finally:
             self.cleanup_temp_images()
+
+
+def render_chat_pdf(title: str, messages: list) -> bytes:
+    """Build and render a single chat PDF. Module-level so it can run in a process pool."""
+    form_data = ChatTitleMessagesForm(title=title, messages=messages)
+    return PDFGenerator(form_data).generate_chat_pdf()
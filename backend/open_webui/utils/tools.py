@@ -1,7 +1,9 @@
+import copy
 import inspect
 import logging
 import re
-from typing import Any, Awaitable, Callable, get_type_hints
+import threading
+from typing import Any, Awaitable, Callable, Optional, get_type_hints
 from functools import update_wrapper, partial
 
 
@@ -10,7 +12,7 @@ from pydantic import BaseModel, Field, create_model
 from langchain_core.utils.function_calling import convert_to_openai_function
 
 
-from open_webui.models.tools import Tools
+from open_webui.models.tools import Tools, ToolVersionModel
 from open_webui.models.users import UserModel
 from open_webui.utils.plugin import load_tools_module_by_id
 
@@ -34,33 +36,100 @@ def apply_extra_params_to_tool_function(
     return new_function
 
 
-# Mutation on extra_params
-def get_tools(
-    request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
-) -> dict[str, dict]:
-    tools_dict = {}
+class CompiledTool:
+    """
+    Everything about one version of a tool that does not depend on the request:
+    the loaded module, its cleaned specs, descriptions and argument models.
+    """
 
-    for tool_id in tool_ids:
-        tools = Tools.get_tool_by_id(tool_id)
-        if tools is None:
-            continue
+    def __init__(
+        self, tool_id: str, version: int, module, valves, functions: list[dict]
+    ):
+        self.tool_id = tool_id
+        self.version = version
+        self.module = module
+        self.valves = valves
+        self.functions = functions
+
+    def bind_instance(self):
+        """
+        Per-call view of the tool instance with the current valves attached.
+        The shared module is never mutated, so concurrent requests can't see
+        each other's valves.
+        """
+        if self.valves is None:
+            return self.module
+        try:
+            instance = copy.copy(self.module)
+        except Exception:
+            log.warning(
+                f"Tool {self.tool_id} can not be copied, binding valves in place"
+            )
+            instance = self.module
+        instance.valves = self.valves
+        return instance
+
+
+class ToolRegistry:
+    """
+    Compiles each tool once per version (Tool.updated_at, which also changes
+    when valves are saved) and reuses the result for every chat request.
+    """
 
+    def __init__(self):
+        self._compiled: dict[str, CompiledTool] = {}
+        self._lock = threading.Lock()
+
+    def _is_current(
+        self, compiled: Optional[CompiledTool], module, version: int
+    ) -> bool:
+        return (
+            compiled is not None
+            and compiled.version == version
+            and (module is None or module is compiled.module)
+        )
+
+    def get(
+        self, request: Request, version: ToolVersionModel
+    ) -> Optional[CompiledTool]:
+        tool_id = version.id
         module = request.app.state.TOOLS.get(tool_id, None)
+        compiled = self._compiled.get(tool_id)
+        if not self._is_current(compiled, module, version.updated_at):
+            with self._lock:
+                compiled = self._compiled.get(tool_id)
+                if not self._is_current(compiled, module, version.updated_at):
+                    compiled = self._compile(request, version, module)
+                    if compiled is None:
+                        self._compiled.pop(tool_id, None)
+                        return None
+                    self._compiled[tool_id] = compiled
+
+        if module is None:
+            request.app.state.TOOLS[tool_id] = compiled.module
+        return compiled
+
+    def invalidate(self, tool_id: str):
+        with self._lock:
+            self._compiled.pop(tool_id, None)
+
+    def _compile(
+        self, request: Request, version: ToolVersionModel, module
+    ) -> Optional[CompiledTool]:
+        tool_id = version.id
+        tool = Tools.get_tool_by_id(tool_id)
+        if tool is None:
+            return None
+
         if module is None:
             module, _ = load_tools_module_by_id(tool_id)
-            request.app.state.TOOLS[tool_id] = module
 
-        extra_params["__id__"] = tool_id
+        valves = None
         if hasattr(module, "valves") and hasattr(module, "Valves"):
-            valves = Tools.get_tool_valves_by_id(tool_id) or {}
-            module.valves = module.Valves(**valves)
-
-        if hasattr(module, "UserValves"):
-            extra_params["__user__"]["valves"] = module.UserValves(  # type: ignore
-                **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
-            )
+            valves = module.Valves(**version.valves)
 
-        for spec in tools.specs:
+        functions = []
+        for spec in copy.deepcopy(tool.specs):
             # TODO: Fix hack for OpenAI API
             # Some times breaks OpenAI but others don't. Leaving the comment
             for val in spec.get("parameters", {}).get("properties", {}).values():
@@ -75,23 +144,79 @@ def get_tools(
             }
 
             function_name = spec["name"]
-
-            # convert to function that takes only model params and inserts custom params
             original_func = getattr(module, function_name)
-            callable = apply_extra_params_to_tool_function(original_func, extra_params)
 
-            if callable.__doc__ and callable.__doc__.strip() != "":
-                s = re.split(":(param|return)", callable.__doc__, 1)
+            if original_func.__doc__ and original_func.__doc__.strip() != "":
+                s = re.split(":(param|return)", original_func.__doc__, 1)
                 spec["description"] = s[0]
             else:
                 spec["description"] = function_name
 
+            functions.append(
+                {
+                    "name": function_name,
+                    "spec": spec,
+                    "pydantic_model": function_to_pydantic_model(original_func),
+                }
+            )
+
+        log.debug(f"Compiled tool {tool_id} at version {version.updated_at}")
+        return CompiledTool(tool_id, version.updated_at, module, valves, functions)
+
+
+tool_registry = ToolRegistry()
+
+
+def get_user_tool_valves(user: UserModel) -> dict:
+    """All tool user valves from the user's settings, keyed by tool id."""
+    settings = user.settings.model_dump() if user.settings else {}
+    return (settings.get("tools") or {}).get("valves") or {}
+
+
+def get_tools(
+    request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
+) -> dict[str, dict]:
+    tools_dict = {}
+
+    versions = Tools.get_tool_versions_by_ids(tool_ids)
+    user_valves = get_user_tool_valves(user)
+
+    for tool_id in tool_ids:
+        version = versions.get(tool_id)
+        if version is None:
+            continue
+
+        compiled = tool_registry.get(request, version)
+        if compiled is None:
+            continue
+
+        module = compiled.module
+        instance = compiled.bind_instance()
+
+        # Per-tool copy so that __id__ and user valves don't leak between tools
+        tool_params = {**extra_params, "__id__": tool_id}
+        if hasattr(module, "UserValves"):
+            tool_params["__user__"] = {
+                **extra_params.get("__user__", {}),
+                "valves": module.UserValves(  # type: ignore
+                    **(user_valves.get(tool_id) or {})
+                ),
+            }
+
+        for function in compiled.functions:
+            function_name = function["name"]
+
+            # convert to function that takes only model params and inserts custom params
+            callable = apply_extra_params_to_tool_function(
+                getattr(instance, function_name), tool_params
+            )
+
             # TODO: This needs to be a pydantic model
             tool_dict = {
                 "toolkit_id": tool_id,
                 "callable": callable,
-                "spec": spec,
-                "pydantic_model": function_to_pydantic_model(callable),
+                "spec": function["spec"],
+                "pydantic_model": function["pydantic_model"],
                 "file_handler": hasattr(module, "file_handler") and module.file_handler,
                 "citation": hasattr(module, "citation") and module.citation,
             }
@@ -99,8 +224,10 @@ def get_tools(
             # TODO: if collision, prepend toolkit name
             if function_name in tools_dict:
                 log.warning(f"Tool {function_name} already exists in another tools!")
-                log.warning(f"Collision between {tools} and {tool_id}.")
-                log.warning(f"Discarding {tools}.{function_name}")
+                log.warning(
+                    f"Collision between {tools_dict[function_name]['toolkit_id']} and {tool_id}."
+                )
+                log.warning(f"Discarding {tool_id}.{function_name}")
             else:
                 tools_dict[function_name] = tool_dict
 
@@ -5,9 +5,12 @@ This module contains the worker function that processes file jobs enqueued in Re
 Workers run in separate processes and can be distributed across multiple pods.
 """
 
+import functools
+import hashlib
 import logging
 import os
 import sys
+import threading
 import time
 from typing import Optional
 
@@ -34,14 +37,21 @@ if not logging.root.handlers or not has_loguru_handler:
 from langchain_core.documents import Document
 
 from open_webui.models.files import Files
+from open_webui.models.knowledge import Knowledges
 from open_webui.models.users import Users
 from open_webui.storage.provider import Storage
 from open_webui.retrieval.vector.connector import VECTOR_DB_CLIENT
 from open_webui.retrieval.loaders.main import Loader
+from open_webui.socket.progress import (
+    emit_file_progress,
+    update_file_processing_status,
+)
 from open_webui.internal.db import Session
 from open_webui.routers.retrieval import (
     save_docs_to_vector_db,
     save_docs_to_multiple_collections,
+    share_file_with_collections,
+    _get_text_splitter,
     calculate_sha256_string,
     get_ef,
     get_rf,
@@ -81,8 +91,18 @@ from open_webui.config import (
     ENABLE_OLLAMA_API,
     ENABLE_EVALUATION_ARENA_MODELS,
     EVALUATION_ARENA_MODELS,
+    TIKTOKEN_ENCODING_NAME,
 )
 from open_webui.retrieval.utils import get_embedding_function
+from open_webui.env import FILE_PROCESSING_PART_CHUNKS
+from open_webui.utils.job_queue import (
+    DEFAULT_JOB_TIMEOUT,
+    JobQueueError,
+    enqueue_file_processing_parts,
+    finish_file_processing_part,
+)
+from open_webui.utils.logger import correlation_id
+from rq import get_current_job
 
 # OpenTelemetry instrumentation (conditional import)
 try:
@@ -159,9 +179,18 @@ def safe_trace_span(*args, **kwargs):
         return nullcontext(enter_result=None)
 
 # Global cached AppConfig instance (initialized once at worker startup, reused for all jobs)
-# Note: RQ workers process jobs sequentially by default, so no threading.Lock needed
-# If concurrent job processing is enabled, initialization happens once anyway during module import
+# Warm workers may run several jobs concurrently in threads, so initialization is locked
 _worker_config = None
+_worker_config_lock = threading.Lock()
+
+# Process-wide embedding/reranking models (ef, rf) - loaded once, shared by all jobs
+_base_models = None
+_base_models_lock = threading.Lock()
+
+# Per-process cache of embedding clients keyed by engine/model/url/key hash
+_embedding_functions = {}
+_embedding_functions_lock = threading.Lock()
+_EMBEDDING_FUNCTIONS_MAX = 32
 
 
 def get_worker_config():
@@ -171,57 +200,63 @@ def get_worker_config():
     This config is initialized once at worker startup and reused for all jobs,
     preventing unnecessary AppConfig creation and database connection overhead.
     
-    Note: RQ workers process jobs sequentially by default, so no lock is needed.
     The initialization happens lazily on first job or can be called at worker startup.
     
     Returns:
         AppConfig: Cached AppConfig instance with all RAG config values assigned
     """
     global _worker_config
-    if _worker_config is None:
+    if _worker_config is not None:
+        return _worker_config
+
+    with _worker_config_lock:
+        if _worker_config is not None:
+            return _worker_config
         try:
-            _worker_config = AppConfig()
+            config = AppConfig()
             # CRITICAL: Assign all config values to AppConfig, just like main.py does
             # Without this, AppConfig._state is empty and accessing config values fails
             # Assign all RAG config values to AppConfig (same as main.py)
-            _worker_config.RAG_EMBEDDING_ENGINE = RAG_EMBEDDING_ENGINE
-            _worker_config.RAG_EMBEDDING_MODEL = RAG_EMBEDDING_MODEL
-            _worker_config.RAG_EMBEDDING_MODEL_USER = RAG_EMBEDDING_MODEL_USER  # RBAC: Per-admin model name
-            _worker_config.RAG_EMBEDDING_BATCH_SIZE = RAG_EMBEDDING_BATCH_SIZE
-            _worker_config.RAG_RERANKING_MODEL = RAG_RERANKING_MODEL
-            _worker_config.RAG_OPENAI_API_BASE_URL = RAG_OPENAI_API_BASE_URL
-            _worker_config.RAG_OPENAI_API_KEY = RAG_OPENAI_API_KEY
-            _worker_config.RAG_OLLAMA_BASE_URL = RAG_OLLAMA_BASE_URL
-            _worker_config.RAG_OLLAMA_API_KEY = RAG_OLLAMA_API_KEY
-            _worker_config.CONTENT_EXTRACTION_ENGINE = CONTENT_EXTRACTION_ENGINE
-            _worker_config.TEXT_SPLITTER = RAG_TEXT_SPLITTER
-            _worker_config.CHUNK_SIZE = CHUNK_SIZE  # UserScopedConfig
-            _worker_config.CHUNK_OVERLAP = CHUNK_OVERLAP  # UserScopedConfig
+            config.RAG_EMBEDDING_ENGINE = RAG_EMBEDDING_ENGINE
+            config.RAG_EMBEDDING_MODEL = RAG_EMBEDDING_MODEL
+            config.RAG_EMBEDDING_MODEL_USER = RAG_EMBEDDING_MODEL_USER  # RBAC: Per-admin model name
+            config.RAG_EMBEDDING_BATCH_SIZE = RAG_EMBEDDING_BATCH_SIZE
+            config.RAG_RERANKING_MODEL = RAG_RERANKING_MODEL
+            config.RAG_OPENAI_API_BASE_URL = RAG_OPENAI_API_BASE_URL
+            config.RAG_OPENAI_API_KEY = RAG_OPENAI_API_KEY
+            config.RAG_OLLAMA_BASE_URL = RAG_OLLAMA_BASE_URL
+            config.RAG_OLLAMA_API_KEY = RAG_OLLAMA_API_KEY
+            config.CONTENT_EXTRACTION_ENGINE = CONTENT_EXTRACTION_ENGINE
+            config.TEXT_SPLITTER = RAG_TEXT_SPLITTER
+            config.TIKTOKEN_ENCODING_NAME = TIKTOKEN_ENCODING_NAME
+            config.CHUNK_SIZE = CHUNK_SIZE  # UserScopedConfig
+            config.CHUNK_OVERLAP = CHUNK_OVERLAP  # UserScopedConfig
             # Additional UserScopedConfig objects used in worker code paths
-            _worker_config.RAG_TEMPLATE = RAG_TEMPLATE  # Used in _get_user_chunk_settings
-            _worker_config.TOP_K = RAG_TOP_K  # Used in retrieval queries (aliased as TOP_K in main.py)
-            _worker_config.RAG_TOP_K = RAG_TOP_K  # Also set alias for compatibility
-            _worker_config.ENABLE_RAG_HYBRID_SEARCH = ENABLE_RAG_HYBRID_SEARCH  # Used in retrieval queries
-            _worker_config.RAG_FULL_CONTEXT = RAG_FULL_CONTEXT  # Used in config endpoints
-            _worker_config.RELEVANCE_THRESHOLD = RAG_RELEVANCE_THRESHOLD  # PersistentConfig, used in retrieval
+            config.RAG_TEMPLATE = RAG_TEMPLATE  # Used in _get_user_chunk_settings
+            config.TOP_K = RAG_TOP_K  # Used in retrieval queries (aliased as TOP_K in main.py)
+            config.RAG_TOP_K = RAG_TOP_K  # Also set alias for compatibility
+            config.ENABLE_RAG_HYBRID_SEARCH = ENABLE_RAG_HYBRID_SEARCH  # Used in retrieval queries
+            config.RAG_FULL_CONTEXT = RAG_FULL_CONTEXT  # Used in config endpoints
+            config.RELEVANCE_THRESHOLD = RAG_RELEVANCE_THRESHOLD  # PersistentConfig, used in retrieval
             # Respect configured PDF image extraction setting (defaults to False).
-            _worker_config.PDF_EXTRACT_IMAGES = PDF_EXTRACT_IMAGES
-            _worker_config.PDF_IMAGE_DESCRIPTION_MODEL = PDF_IMAGE_DESCRIPTION_MODEL
-            _worker_config.PDF_IMAGE_DESCRIPTION_MODEL_USER = PDF_IMAGE_DESCRIPTION_MODEL_USER
-            _worker_config.DOCUMENT_INTELLIGENCE_ENDPOINT = DOCUMENT_INTELLIGENCE_ENDPOINT
-            _worker_config.DOCUMENT_INTELLIGENCE_KEY = DOCUMENT_INTELLIGENCE_KEY
-            _worker_config.BYPASS_EMBEDDING_AND_RETRIEVAL = BYPASS_EMBEDDING_AND_RETRIEVAL
+            config.PDF_EXTRACT_IMAGES = PDF_EXTRACT_IMAGES
+            config.PDF_IMAGE_DESCRIPTION_MODEL = PDF_IMAGE_DESCRIPTION_MODEL
+            config.PDF_IMAGE_DESCRIPTION_MODEL_USER = PDF_IMAGE_DESCRIPTION_MODEL_USER
+            config.DOCUMENT_INTELLIGENCE_ENDPOINT = DOCUMENT_INTELLIGENCE_ENDPOINT
+            config.DOCUMENT_INTELLIGENCE_KEY = DOCUMENT_INTELLIGENCE_KEY
+            config.BYPASS_EMBEDDING_AND_RETRIEVAL = BYPASS_EMBEDDING_AND_RETRIEVAL
             
             # Required by get_all_base_models / get_models_for_user (PDF image description path)
-            _worker_config.ENABLE_OPENAI_API = ENABLE_OPENAI_API
-            _worker_config.ENABLE_OLLAMA_API = ENABLE_OLLAMA_API
-            _worker_config.ENABLE_EVALUATION_ARENA_MODELS = ENABLE_EVALUATION_ARENA_MODELS
-            _worker_config.EVALUATION_ARENA_MODELS = EVALUATION_ARENA_MODELS
+            config.ENABLE_OPENAI_API = ENABLE_OPENAI_API
+            config.ENABLE_OLLAMA_API = ENABLE_OLLAMA_API
+            config.ENABLE_EVALUATION_ARENA_MODELS = ENABLE_EVALUATION_ARENA_MODELS
+            config.EVALUATION_ARENA_MODELS = EVALUATION_ARENA_MODELS
             
             # Verify config is populated
-            if not hasattr(_worker_config, '_state') or 'RAG_EMBEDDING_ENGINE' not in _worker_config._state:
+            if not hasattr(config, '_state') or 'RAG_EMBEDDING_ENGINE' not in config._state:
                 raise ValueError("AppConfig._state not properly populated with RAG_EMBEDDING_ENGINE")
             
+            _worker_config = config
             log.info("Worker AppConfig initialized successfully with all RAG config values (cached for reuse)")
         except Exception as config_error:
             log.error(
@@ -234,6 +269,97 @@ def get_worker_config():
     return _worker_config
 
 
+def get_worker_base_models(config):
+    """
+    Get the process-wide embedding (ef) and reranking (rf) models.
+    
+    These are expensive to load (local sentence-transformers models) and do not
+    depend on the job, so they are created once and shared by every job in the
+    process. Returns (None, None) if loading fails.
+    """
+    global _base_models
+    if _base_models is not None:
+        return _base_models
+
+    with _base_models_lock:
+        if _base_models is not None:
+            return _base_models
+        try:
+            ef = get_ef(
+                config.RAG_EMBEDDING_ENGINE,
+                config.RAG_EMBEDDING_MODEL,
+                RAG_EMBEDDING_MODEL_AUTO_UPDATE,
+            )
+            rf = get_rf(
+                config.RAG_RERANKING_MODEL,
+                RAG_RERANKING_MODEL_AUTO_UPDATE,
+            )
+            _base_models = (ef, rf)
+            log.info(
+                f"Initialized base embedding functions in worker: "
+                f"engine={config.RAG_EMBEDDING_ENGINE}, model={config.RAG_EMBEDDING_MODEL}"
+            )
+        except Exception as embedding_error:
+            log.error(
+                f"Failed to initialize base embedding functions in worker process: {embedding_error}. "
+                "File processing may fail if embeddings are required.",
+                exc_info=True
+            )
+            # Not cached, so the next job retries the load
+            return None, None
+    return _base_models
+
+
+def get_cached_embedding_function(engine, model, ef, api_url, api_key, batch_size):
+    """
+    Reuse embedding clients across jobs that share the same engine, model, URL and key.
+    
+    The returned function is stateless, so concurrent jobs can share it safely.
+    """
+    key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()
+    cache_key = (engine, model, id(ef), api_url, key_hash, batch_size)
+
+    with _embedding_functions_lock:
+        embedding_function = _embedding_functions.get(cache_key)
+        if embedding_function is None:
+            embedding_function = get_embedding_function(
+                engine, model, ef, api_url, api_key, batch_size
+            )
+            if embedding_function is None:
+                return None
+            if len(_embedding_functions) >= _EMBEDDING_FUNCTIONS_MAX:
+                # Drop the oldest entry (dicts preserve insertion order)
+                _embedding_functions.pop(next(iter(_embedding_functions)))
+            _embedding_functions[cache_key] = embedding_function
+        return embedding_function
+
+
+def warm_up_worker_process():
+    """
+    Initialize everything a file job needs once per process: config, embedding
+    and reranking models, the tokenizer used by the token splitter, and the
+    vector DB client. Used by warm workers before they start dequeuing jobs.
+    """
+    start = time.time()
+    config = get_worker_config()
+    get_worker_base_models(config)
+
+    try:
+        import tiktoken
+
+        tiktoken.get_encoding(str(config.TIKTOKEN_ENCODING_NAME))
+    except Exception as tokenizer_error:
+        log.warning(f"Could not preload tokenizer: {tokenizer_error}")
+
+    try:
+        # Opens the vector DB connection (pool) before the first job needs it
+        VECTOR_DB_CLIENT.has_collection(collection_name="__worker_warmup__")
+    except Exception as vector_db_error:
+        log.warning(f"Could not warm up vector DB client: {vector_db_error}")
+
+    log.info(f"[WORKER] Process warm-up completed | duration={time.time() - start:.3f}s")
+
+
 class MockRequest:
     """
     Mock Request object for workers that need app.state.config.
@@ -276,36 +402,9 @@ class MockState:
         # Store embedding_api_key for per-job initialization
         self._embedding_api_key = embedding_api_key
         
-        # Initialize base embedding functions (ef, rf) - these don't need API key
-        # EMBEDDING_FUNCTION will be initialized per-job with the correct API key
-        try:
-            # Initialize embedding function model (ef) - no API key needed
-            self.ef = get_ef(
-                self.config.RAG_EMBEDDING_ENGINE,
-                self.config.RAG_EMBEDDING_MODEL,
-                RAG_EMBEDDING_MODEL_AUTO_UPDATE,
-            )
-            
-            # Initialize reranking function (rf) - no API key needed
-            self.rf = get_rf(
-                self.config.RAG_RERANKING_MODEL,
-                RAG_RERANKING_MODEL_AUTO_UPDATE,
-            )
-            
-            log.debug(
-                f"Initialized base embedding functions in worker: "
-                f"engine={self.config.RAG_EMBEDDING_ENGINE}, "
-                f"model={self.config.RAG_EMBEDDING_MODEL}"
-            )
-        except Exception as embedding_error:
-            log.error(
-                f"Failed to initialize base embedding functions in worker process: {embedding_error}. "
-                "File processing may fail if embeddings are required.",
-                exc_info=True
-            )
-            # Set to None - functions that use these should handle None gracefully
-            self.ef = None
-            self.rf = None
+        # Base embedding functions (ef, rf) don't need an API key and are loaded
+        # once per process; EMBEDDING_FUNCTION is bound per-job with the correct API key
+        self.ef, self.rf = get_worker_base_models(self.config)
         
         # EMBEDDING_FUNCTION will be initialized per-job with the correct per-user API key
         self.EMBEDDING_FUNCTION = None
@@ -378,7 +477,7 @@ class MockState:
             
             log.info(f"[RBAC] Using embedding model from job: {model_to_use} (RBAC-protected)")
             
-            self.EMBEDDING_FUNCTION = get_embedding_function(
+            self.EMBEDDING_FUNCTION = get_cached_embedding_function(
                 self.config.RAG_EMBEDDING_ENGINE,
                 model_to_use,  # Use job parameter, not config (RBAC-protected)
                 self.ef,  # Can be None for API-based engines
@@ -515,6 +614,128 @@ def _create_fallback_config():
 log.debug("file_processor.py module loaded successfully")
 
 
+def _with_job_correlation_id(func):
+    """
+    Run a job under the correlation ID of the request that enqueued it (or
+    the RQ job ID), so its log lines can be joined with the request's.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        job = get_current_job()
+        value = None
+        if job is not None:
+            value = job.meta.get("correlation_id") or job.id
+        token = correlation_id.set(value)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            correlation_id.reset(token)
+
+    return wrapper
+
+
+def _fan_out_file_chunks(
+    request,
+    file,
+    docs,
+    hash: str,
+    collection_name: Optional[str],
+    knowledge_id: Optional[str],
+    user,
+    owner_email: Optional[str],
+    embedding_model: Optional[str],
+    embedding_api_key: Optional[str],
+    _otel_trace_context: Optional[dict] = None,
+) -> int:
+    """
+    Split a large document once and hand contiguous chunk ranges to
+    process_file_part_job, so its embedding runs on every idle worker.
+
+    Every chunk keeps its loader metadata (page, start_index) and gets its
+    position in the whole document as "chunk_index", so ordering survives
+    parts finishing out of order.
+
+    Returns the number of part jobs, or 0 if the file should be embedded
+    in this job as usual (small file, fan-out disabled, not running under
+    RQ, or content already stored, which the normal path reports).
+    """
+    job = get_current_job()
+    if FILE_PROCESSING_PART_CHUNKS <= 0 or job is None:
+        return 0
+
+    file_collection = f"file-{file.id}"
+    shared_storage = hasattr(VECTOR_DB_CLIENT, "add_to_collection")
+    if knowledge_id:
+        collections = [file_collection] if shared_storage else [file_collection, knowledge_id]
+        share_with = [knowledge_id]
+        final_collection_name = file_collection
+    else:
+        collections = [collection_name or file_collection]
+        share_with = (
+            [knowledge.id for knowledge in Knowledges.get_knowledge_bases_by_file_id(file.id)]
+            if collections[0] == file_collection
+            else []
+        )
+        final_collection_name = collection_name
+
+    existing = VECTOR_DB_CLIENT.query(
+        collection_name=collections[0], filter={"hash": hash}, limit=1
+    )
+    if existing is not None and existing.ids and existing.ids[0]:
+        return 0
+
+    emit_file_progress(file.id, file.user_id, "chunking")
+    split_start = time.time()
+    chunks = _get_text_splitter(request, user).split_documents(docs)
+    log.info(f"[FAN_OUT] SPLIT | file_id={file.id} | chunks={len(chunks)} | part_chunks={FILE_PROCESSING_PART_CHUNKS} | duration={time.time() - split_start:.2f}s")
+    if len(chunks) <= FILE_PROCESSING_PART_CHUNKS:
+        return 0
+
+    parts = []
+    for part, start in enumerate(range(0, len(chunks), FILE_PROCESSING_PART_CHUNKS)):
+        parts.append(
+            {
+                "file_id": file.id,
+                "part": part,
+                "chunks": [
+                    {
+                        "text": chunk.page_content,
+                        "metadata": {
+                            **chunk.metadata,
+                            "hash": hash,
+                            "chunk_index": start + offset,
+                            "file_part": f"{file.id}:{part}",
+                        },
+                    }
+                    for offset, chunk in enumerate(
+                        chunks[start : start + FILE_PROCESSING_PART_CHUNKS]
+                    )
+                ],
+                "collections": collections,
+                "share_with": share_with,
+                "final_collection_name": final_collection_name,
+                "user_id": user.id if user else None,
+                "owner_email": owner_email,
+                "embedding_model": embedding_model,
+                "embedding_api_key": embedding_api_key,
+                "_otel_trace_context": _otel_trace_context,
+            }
+        )
+    for kwargs in parts:
+        kwargs["parts"] = len(parts)
+
+    enqueue_file_processing_parts(
+        file.id,
+        parts,
+        job_class=job.meta.get("job_class", "bulk"),
+        job_timeout=job.timeout or DEFAULT_JOB_TIMEOUT,
+        parent_job=job,
+    )
+    return len(parts)
+
+
+@_with_job_correlation_id
 def process_file_job(
     file_id: str,
     content: Optional[str] = None,
@@ -708,7 +929,7 @@ def process_file_job(
                     
                     # Update status to processing
                     processing_start_time = int(time.time())
-                    Files.update_file_metadata_by_id(
+                    update_file_processing_status(
                         file_id,
                         {
                             "processing_status": "processing",
@@ -722,7 +943,7 @@ def process_file_job(
                         log.error(f"File {file_id} not found for processing (user_id={user_id})")
                         safe_add_span_event("job.file.not_found", {"file_id": file_id})
                         try:
-                            Files.update_file_metadata_by_id(
+                            update_file_processing_status(
                                 file_id,
                                 {
                                     "processing_status": "error",
@@ -824,10 +1045,9 @@ def process_file_job(
                                                     PDF_IMAGE_RBAC_OWNER_EMAIL=owner_email,
                                                 )
                                                 try:
-                                                    print(f"[DEBUG] About to call loader.load() for file_id={file.id} | extract_images={pdf_extract_images_val}", flush=True)
                                                     log.info(f"[DEBUG] About to call loader.load() for file_id={file.id} | extract_images={pdf_extract_images_val}")
+                                                    emit_file_progress(file.id, file.user_id, "extracting")
                                                     docs = loader.load(file.filename, file.meta.get("content_type"), file_path)
-                                                    print(f"[DEBUG] loader.load() completed for file_id={file.id} | docs_count={len(docs) if docs else 0}", flush=True)
                                                     log.info(f"[DEBUG] loader.load() completed for file_id={file.id} | docs_count={len(docs) if docs else 0}")
                                                     total_chars = sum(len(doc.page_content) for doc in docs) if docs else 0
                                                     non_empty = sum(1 for doc in docs if doc.page_content and doc.page_content.strip()) if docs else 0
@@ -877,7 +1097,6 @@ def process_file_job(
                                                 ]
                                                 text_content = ""
                                         except Exception as storage_error:
-                                            print(f"    ❌ Failed to get file from storage: {storage_error}", flush=True)
                                             log.error(f"    ❌ Failed to get file from storage: {storage_error}", exc_info=True)
                                             docs = [
                                                 Document(
@@ -895,7 +1114,7 @@ def process_file_job(
                                     else:
                                         log.error(f"[JOB] FILE_PATH_MISSING | file_id={file.id} | filename={file.filename} | file.path is None - cannot extract content")
                                         error_msg = "File path is missing. Cannot extract content from file system."
-                                        Files.update_file_metadata_by_id(file.id, {"processing_status": "error", "processing_error": error_msg})
+                                        update_file_processing_status(file.id, {"processing_status": "error", "processing_error": error_msg})
                                         raise ValueError(error_msg)
                                 else:
                                     # Use content from file.data
@@ -940,10 +1159,9 @@ def process_file_job(
                                                 PDF_IMAGE_RBAC_OWNER_EMAIL=owner_email,
                                             )
                                             try:
-                                                print(f"[DEBUG] About to call loader.load() for file_id={file.id} | extract_images={pdf_extract_images_val}", flush=True)
                                                 log.info(f"[DEBUG] About to call loader.load() for file_id={file.id} | extract_images={pdf_extract_images_val}")
+                                                emit_file_progress(file.id, file.user_id, "extracting")
                                                 docs = loader.load(file.filename, file.meta.get("content_type"), file_path)
-                                                print(f"[DEBUG] loader.load() completed for file_id={file.id} | docs_count={len(docs) if docs else 0}", flush=True)
                                                 log.info(f"[DEBUG] loader.load() completed for file_id={file.id} | docs_count={len(docs) if docs else 0}")
                                                 total_chars = sum(len(doc.page_content) for doc in docs) if docs else 0
                                                 non_empty = sum(1 for doc in docs if doc.page_content and doc.page_content.strip()) if docs else 0
@@ -970,7 +1188,6 @@ def process_file_job(
                                             ]
                                             text_content = ""
                                     except Exception as storage_error:
-                                        print(f"    ❌ Failed to get file from storage: {storage_error}", flush=True)
                                         log.error(f"    ❌ Failed to get file from storage: {storage_error}", exc_info=True)
                                         docs = [
                                             Document(
@@ -988,7 +1205,7 @@ def process_file_job(
                                 else:
                                     log.error(f"[JOB] FILE_PATH_MISSING | file_id={file.id} | filename={file.filename} | file.path is None - cannot extract content")
                                     error_msg = "File path is missing. Cannot extract content from file system."
-                                    Files.update_file_metadata_by_id(file.id, {"processing_status": "error", "processing_error": error_msg})
+                                    update_file_processing_status(file.id, {"processing_status": "error", "processing_error": error_msg})
                                     raise ValueError(error_msg)
                             else:
                                 # Use content from file.data
@@ -1036,12 +1253,11 @@ def process_file_job(
                                             PDF_IMAGE_RBAC_OWNER_EMAIL=owner_email,
                                         )
                                         try:
-                                            print(f"[DEBUG] About to call loader.load() for file_id={file.id} | extract_images={pdf_extract_images_val} | timestamp={extract_start:.3f}", flush=True)
                                             log.info(f"[DEBUG] About to call loader.load() for file_id={file.id} | extract_images={pdf_extract_images_val}")
+                                            emit_file_progress(file.id, file.user_id, "extracting")
                                             docs = loader.load(file.filename, file.meta.get("content_type"), file_path)
                                             extract_end = time.time()
                                             extract_duration = extract_end - extract_start
-                                            print(f"[DEBUG] loader.load() completed for file_id={file.id} | docs_count={len(docs) if docs else 0} | duration={extract_duration:.2f}s", flush=True)
                                             log.info(f"[DEBUG] loader.load() completed for file_id={file.id} | docs_count={len(docs) if docs else 0} | duration={extract_duration:.2f}s")
                                             total_chars = sum(len(doc.page_content) for doc in docs) if docs else 0
                                             non_empty = sum(1 for doc in docs if doc.page_content and doc.page_content.strip()) if docs else 0
@@ -1058,17 +1274,17 @@ def process_file_job(
                                     else:
                                         log.error(f"[JOB] FILE_NOT_FOUND | file_id={file.id} | resolved_path={file_path} | file does not exist")
                                         error_msg = f"File not found at path: {file_path}"
-                                        Files.update_file_metadata_by_id(file.id, {"processing_status": "error", "processing_error": error_msg})
+                                        update_file_processing_status(file.id, {"processing_status": "error", "processing_error": error_msg})
                                         raise ValueError(error_msg)
                                 except Exception as storage_error:
                                     log.error(f"[JOB] STORAGE_ERROR | file_id={file.id} | error={type(storage_error).__name__}: {storage_error}", exc_info=True)
                                     error_msg = f"Failed to retrieve file from storage: {storage_error}"
-                                    Files.update_file_metadata_by_id(file.id, {"processing_status": "error", "processing_error": error_msg})
+                                    update_file_processing_status(file.id, {"processing_status": "error", "processing_error": error_msg})
                                     raise ValueError(error_msg)
                             else:
                                 log.error(f"[JOB] FILE_PATH_MISSING | file_id={file.id} | filename={file.filename} | file.path is None - cannot extract content")
                                 error_msg = "File path is missing. Cannot extract content from file system."
-                                Files.update_file_metadata_by_id(file.id, {"processing_status": "error", "processing_error": error_msg})
+                                update_file_processing_status(file.id, {"processing_status": "error", "processing_error": error_msg})
                                 raise ValueError(error_msg)
                         else:
                             # Use content from file.data
@@ -1118,7 +1334,7 @@ def process_file_job(
                     
                     # Update file status to error
                     try:
-                        Files.update_file_metadata_by_id(
+                        update_file_processing_status(
                             file_id,
                             {
                                 "processing_status": "error",
@@ -1157,14 +1373,14 @@ def process_file_job(
                 if not docs or len(docs) == 0:
                     error_msg = ERROR_MESSAGES.EMPTY_CONTENT
                     log.error(f"[VALIDATE] FAILED | file_id={file.id} | reason=NO_DOCS | loader returned empty list")
-                    Files.update_file_metadata_by_id(file.id, {"processing_status": "error", "processing_error": error_msg})
+                    update_file_processing_status(file.id, {"processing_status": "error", "processing_error": error_msg})
                     raise ValueError(error_msg)
                 
                 if total_chars == 0:
                     error_msg = ERROR_MESSAGES.EMPTY_CONTENT
                     log.error(f"[VALIDATE] FAILED | file_id={file.id} | reason=EMPTY_CONTENT | docs={len(docs)} but all page_content empty")
                     log.error(f"[VALIDATE] DIAGNOSIS | Possible: image-only PDF, corrupted file, extraction failed silently")
-                    Files.update_file_metadata_by_id(file.id, {"processing_status": "error", "processing_error": error_msg})
+                    update_file_processing_status(file.id, {"processing_status": "error", "processing_error": error_msg})
                     raise ValueError(error_msg)
                 
                 validate_end = time.time()
@@ -1188,8 +1404,53 @@ def process_file_job(
                     log.info(f"[RAG File] file_id={file.id} | filename={filename} | docs_pre_split={len(docs)} (chunking and embedding next)")
                     log.info(f"[EMBED] START | file_id={file.id} | filename={filename} | docs_pre_split={len(docs)} | timestamp={embed_start:.3f}")
                     try:
+                        target_collection = knowledge_id or vector_collection_name
+                        reused = (
+                            not content
+                            and target_collection != f"file-{file.id}"
+                            and share_file_with_collections(file.id, [target_collection])
+                        )
+                        parts = 0
+                        if not reused:
+                            parts = _fan_out_file_chunks(
+                                request,
+                                file,
+                                docs,
+                                hash,
+                                collection_name=collection_name,
+                                knowledge_id=knowledge_id,
+                                user=user,
+                                owner_email=owner_email,
+                                embedding_model=embedding_model,
+                                embedding_api_key=embedding_api_key,
+                                _otel_trace_context=_otel_trace_context,
+                            )
+
+                        if reused:
+                            # Already embedded: joining another collection is metadata-only
+                            log.info(f"[EMBED] REUSED | file_id={file.id} | filename={filename} | collection={target_collection}")
+                            update_file_processing_status(
+                                file.id,
+                                {
+                                    "collection_name": (
+                                        f"file-{file.id}" if knowledge_id else collection_name
+                                    ),
+                                    "processing_status": "completed",
+                                    "processing_completed_at": int(time.time()),
+                                },
+                            )
+                        elif parts:
+                            # The part jobs embed the chunks; the last one to finish completes the file
+                            log.info(f"[EMBED] FANNED_OUT | file_id={file.id} | filename={filename} | parts={parts} | duration={time.time() - embed_start:.2f}s")
+                            safe_add_span_event("job.embedding.fanned_out", {"parts": parts})
+                            return {
+                                "status": "fanned_out",
+                                "file_id": file_id,
+                                "parts": parts,
+                                "elapsed_time": time.time() - start_time,
+                            }
                         # If knowledge_id is provided, we're adding to both collections at once
-                        if knowledge_id:
+                        elif knowledge_id:
                             file_collection = f"file-{file.id}"
                             collections = [file_collection, knowledge_id]
 
@@ -1213,7 +1474,7 @@ def process_file_job(
                                 embed_duration = embed_end - embed_start
                                 log.info(f"[EMBED] SUCCESS | file_id={file.id} | filename={filename} | collections={collections} | docs_pre_split={len(docs)} | duration={embed_duration:.2f}s | timestamp={embed_end:.3f}")
                                 safe_add_span_event("job.embedding.completed", {"status": "success", "collection_name": file_collection})
-                                Files.update_file_metadata_by_id(
+                                update_file_processing_status(
                                     file.id,
                                     {
                                         "collection_name": file_collection,
@@ -1223,7 +1484,7 @@ def process_file_job(
                                 )
                             else:
                                 log.error(f"[EMBED] FAILED | file_id={file.id} | filename={filename} | reason=SAVE_TO_VDB_FAILED")
-                                Files.update_file_metadata_by_id(
+                                update_file_processing_status(
                                     file.id,
                                     {
                                         "processing_status": "error",
@@ -1252,7 +1513,16 @@ def process_file_job(
                                 embed_end = time.time()
                                 embed_duration = embed_end - embed_start
                                 log.info(f"[EMBED] SUCCESS | file_id={file.id} | filename={filename} | collection={collection_name} | docs_pre_split={len(docs)} | duration={embed_duration:.2f}s | timestamp={embed_end:.3f}")
-                                Files.update_file_metadata_by_id(
+                                if collection_name == file_collection:
+                                    # Re-embedding replaced the chunks that knowledge bases shared
+                                    share_file_with_collections(
+                                        file.id,
+                                        [
+                                            knowledge.id
+                                            for knowledge in Knowledges.get_knowledge_bases_by_file_id(file.id)
+                                        ],
+                                    )
+                                update_file_processing_status(
                                     file.id,
                                     {
                                         "collection_name": collection_name,
@@ -1262,7 +1532,7 @@ def process_file_job(
                                 )
                             else:
                                 log.error(f"[EMBED] FAILED | file_id={file.id} | filename={filename} | reason=SAVE_TO_VDB_FAILED")
-                                Files.update_file_metadata_by_id(
+                                update_file_processing_status(
                                     file.id,
                                     {
                                         "processing_status": "error",
@@ -1273,7 +1543,7 @@ def process_file_job(
                         error_msg = str(e)
                         log.error(f"[EMBED] FAILED | file_id={file.id} | filename={filename} | error={type(e).__name__}: {error_msg}", exc_info=True)
                         try:
-                            Files.update_file_metadata_by_id(
+                            update_file_processing_status(
                                 file.id,
                                 {
                                     "processing_status": "error",
@@ -1284,7 +1554,7 @@ def process_file_job(
                             log.error(f"Failed to update file status after vector DB error: {update_error}")
                         return {"status": "error", "error": error_msg}
                 else:
-                    Files.update_file_metadata_by_id(
+                    update_file_processing_status(
                         file.id,
                         {
                             "processing_status": "completed",
@@ -1323,7 +1593,7 @@ def process_file_job(
         
         # Update file status to error
         try:
-            Files.update_file_metadata_by_id(
+            update_file_processing_status(
                 file_id,
                 {
                     "processing_status": "error",
@@ -1368,3 +1638,158 @@ def process_file_job(
                     log.debug(f"Detached trace context for job: file_id={file_id}")
                 except Exception as detach_error:
                     log.debug(f"Failed to detach trace context: {detach_error}")
+
+
+@_with_job_correlation_id
+def process_file_part_job(
+    file_id: str,
+    part: int,
+    parts: int,
+    chunks: list,
+    collections: list,
+    share_with: list,
+    final_collection_name: Optional[str],
+    user_id: Optional[str] = None,
+    owner_email: Optional[str] = None,
+    embedding_model: Optional[str] = None,
+    embedding_api_key: Optional[str] = None,
+    _otel_trace_context: Optional[dict] = None,
+) -> dict:
+    """
+    Embed one chunk range of a file fanned out by process_file_job.
+
+    Chunks are already split and carry their "chunk_index", so they are
+    inserted as they are. A retried part first removes whatever an earlier
+    attempt inserted. The last part to finish completes the file record;
+    a part that fails for good marks the file as errored.
+    """
+    start_time = time.time()
+    log.info(f"[PART] START | file_id={file_id} | part={part + 1}/{parts} | chunks={len(chunks)}")
+
+    request = None
+    try:
+        with safe_trace_span(
+            name="job.process_part",
+            attributes={
+                "job.file_id": file_id,
+                "job.part": part,
+                "job.parts": parts,
+                "job.has_trace_context": bool(_otel_trace_context),
+            },
+        ):
+            request = MockRequest(embedding_api_key=embedding_api_key)
+            request.app.state.initialize_embedding_function(
+                embedding_api_key=embedding_api_key,
+                embedding_model=embedding_model,
+            )
+            if request.app.state.config.RAG_EMBEDDING_ENGINE in ["openai", "portkey"]:
+                request.app.state.config.RAG_EMBEDDING_MODEL_USER.set(owner_email, embedding_model)
+                request.app.state.config.RAG_OPENAI_API_KEY.set(owner_email, embedding_api_key)
+
+            user = Users.get_user_by_id(user_id) if user_id else None
+
+            file = Files.get_file_by_id(file_id)
+            if not file:
+                raise ValueError("File not found")
+
+            for collection_name in collections:
+                try:
+                    VECTOR_DB_CLIENT.delete(
+                        collection_name=collection_name,
+                        filter={"file_part": f"{file_id}:{part}"},
+                    )
+                except Exception:
+                    # Nothing stored yet for this part
+                    pass
+
+            # No "hash" in metadata: the other parts of the same file would
+            # trip the duplicate check
+            save_docs_to_multiple_collections(
+                request,
+                docs=[
+                    Document(page_content=chunk["text"], metadata=chunk["metadata"])
+                    for chunk in chunks
+                ],
+                collections=collections,
+                metadata={"file_id": file.id, "name": file.filename},
+                split=False,
+                user=user,
+                owner_email=owner_email,
+            )
+    except Exception as e:
+        job = get_current_job()
+        if job is not None and job.retries_left:
+            log.warning(f"[PART] RETRY | file_id={file_id} | part={part + 1}/{parts} | error={type(e).__name__}: {e}")
+            raise
+
+        log.error(f"[PART] FAILED | file_id={file_id} | part={part + 1}/{parts} | error={type(e).__name__}: {e}", exc_info=True)
+        try:
+            finish_file_processing_part(file_id, failed=True)
+        except Exception as finish_error:
+            log.error(f"Failed to record failed part for file_id={file_id}: {finish_error}")
+        try:
+            update_file_processing_status(
+                file_id,
+                {
+                    "processing_status": "error",
+                    "processing_error": f"Part {part + 1}/{parts} failed: {e}",
+                },
+            )
+        except Exception as update_error:
+            log.error(f"Failed to update file status after part error for file_id={file_id}: {update_error}")
+        raise
+    finally:
+        try:
+            Session.remove()
+        except Exception as session_cleanup_error:
+            log.warning(f"Error cleaning up database session registry: {session_cleanup_error}")
+        if request is not None:
+            request.app.state.EMBEDDING_FUNCTION = None
+
+    try:
+        progress = finish_file_processing_part(file_id)
+    except JobQueueError as e:
+        # Without the parts record nobody can tell when the file is complete
+        log.error(f"[PART] UNTRACKED | file_id={file_id} | part={part + 1}/{parts} | error={e}")
+        update_file_processing_status(
+            file_id,
+            {
+                "processing_status": "error",
+                "processing_error": f"Lost track of the file's parts: {e}",
+            },
+        )
+        # Retrying would re-embed the part and hit the same missing record
+        return {
+            "status": "error",
+            "file_id": file_id,
+            "part": part,
+            "parts": parts,
+            "error": str(e),
+        }
+    done = progress["total"] - progress["remaining"]
+    emit_file_progress(file_id, file.user_id, "embedding", done, progress["total"])
+    log.info(f"[PART] SUCCESS | file_id={file_id} | part={part + 1}/{parts} | done={done}/{progress['total']} | duration={time.time() - start_time:.2f}s")
+
+    if progress["remaining"] == 0 and progress["failed"] == 0:
+        try:
+            if share_with:
+                share_file_with_collections(file_id, share_with)
+            update_file_processing_status(
+                file_id,
+                {
+                    "collection_name": final_collection_name,
+                    "processing_status": "completed",
+                    "processing_completed_at": int(time.time()),
+                },
+            )
+            log.info(f"[PART] FILE COMPLETED | file_id={file_id} | parts={parts}")
+        finally:
+            Session.remove()
+
+    return {
+        "status": "success",
+        "file_id": file_id,
+        "part": part,
+        "parts": parts,
+        "elapsed_time": time.time() - start_time,
+    }
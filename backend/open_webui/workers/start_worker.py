@@ -5,11 +5,16 @@ This module can be run as a script to start an RQ worker for file processing.
 
 Usage:
     python -m open_webui.workers.start_worker
+
+Set WORKER_MODE=warm for a long-lived, pre-initialized worker that runs jobs
+in-process (see WORKER_CONCURRENCY and WORKER_MAX_JOBS).
 """
 
 import os
 import sys
+import signal
 import socket
+import threading
 
 # Add backend directory to Python path
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -26,7 +31,8 @@ logger.start_logger()
 import logging
 log = logging.getLogger(__name__)
 
-from rq import Worker, Queue, Connection
+from rq import Worker, SimpleWorker, Queue, Connection
+from rq.timeouts import TimerDeathPenalty
 from redis import Redis
 from redis.connection import ConnectionPool
 from redis.sentinel import Sentinel
@@ -37,8 +43,11 @@ from open_webui.env import (
     REDIS_USE_SENTINEL,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_SERVICE_NAME,
+    WORKER_MODE,
+    WORKER_CONCURRENCY,
+    WORKER_MAX_JOBS,
 )
-from open_webui.utils.job_queue import FILE_PROCESSING_QUEUE_NAME
+from open_webui.utils.job_queue import FILE_PROCESSING_QUEUE_NAMES, promote_backlogs
 
 # Set log level from environment
 log.setLevel(SRC_LOG_LEVELS.get("WORKER", SRC_LOG_LEVELS.get("MODELS", logging.INFO)))
@@ -75,6 +84,98 @@ def initialize_database():
         return False
 
 
+class WarmWorker(SimpleWorker):
+    """
+    RQ worker that executes jobs in-process instead of forking a work horse.
+    
+    Job timeouts use a timer thread (SIGALRM only works in the main thread), and
+    signal handlers are only installed when running in the main thread, so
+    several WarmWorkers can share one pre-initialized process.
+    """
+
+    death_penalty_class = TimerDeathPenalty
+
+    def _install_signal_handlers(self):
+        if threading.current_thread() is threading.main_thread():
+            super()._install_signal_handlers()
+
+
+def run_warm_workers(redis_conn, worker_name: str):
+    """
+    Warm the process once, then run WORKER_CONCURRENCY in-process workers.
+    
+    Each worker stops after WORKER_MAX_JOBS jobs (0 = never). Once all of them
+    have stopped without a shutdown request, the process re-executes itself so
+    that a fresh interpreter picks up the queue (recycling guards against leaks).
+    """
+    from open_webui.workers.file_processor import warm_up_worker_process
+
+    log.info(f"[WORKER] Warm mode | concurrency={WORKER_CONCURRENCY} | max_jobs={WORKER_MAX_JOBS or 'unlimited'}")
+    warm_up_worker_process()
+
+    # Listed in priority order: interactive jobs are always taken before bulk ones
+    queues = [Queue(name, connection=redis_conn) for name in FILE_PROCESSING_QUEUE_NAMES]
+    max_jobs = WORKER_MAX_JOBS or None
+
+    if WORKER_CONCURRENCY == 1:
+        worker = WarmWorker(queues, name=worker_name, connection=redis_conn)
+        log.info(f"✅ Warm RQ Worker '{worker_name}' ready for queues {FILE_PROCESSING_QUEUE_NAMES}")
+        worker.work(max_jobs=max_jobs)
+        stop_requested = worker._stop_requested
+    else:
+        workers = [
+            WarmWorker(queues, name=f"{worker_name}_{i}", connection=redis_conn)
+            for i in range(WORKER_CONCURRENCY)
+        ]
+        shutdown = threading.Event()
+
+        def request_stop(signum, frame):
+            # Warm shutdown: each worker finishes its current job, then exits its loop
+            log.info(f"[WORKER] Received signal {signum}, stopping {len(workers)} warm workers")
+            shutdown.set()
+            for worker in workers:
+                worker._stop_requested = True
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        threads = [
+            threading.Thread(
+                target=worker.work,
+                kwargs={"max_jobs": max_jobs},
+                name=worker.name,
+                daemon=True,
+            )
+            for worker in workers
+        ]
+        for thread in threads:
+            thread.start()
+        log.info(f"✅ {len(workers)} warm RQ Workers '{worker_name}_*' ready for queues {FILE_PROCESSING_QUEUE_NAMES}")
+
+        # Join with a timeout so the main thread stays responsive to signals
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+            if shutdown.is_set():
+                # Idle workers block in BRPOP; don't wait for the dequeue timeout
+                if not any(worker.get_state() == "busy" for worker in workers):
+                    break
+        stop_requested = shutdown.is_set()
+
+        for worker, thread in zip(workers, threads):
+            if thread.is_alive():
+                try:
+                    worker.register_death()
+                except Exception as e:
+                    log.warning(f"Could not unregister worker {worker.name}: {e}")
+
+    if max_jobs and not stop_requested:
+        log.info(f"[WORKER] Recycling warm worker process after {max_jobs} jobs per worker")
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(sys.executable, [sys.executable, "-m", "open_webui.workers.start_worker"])
+
+
 def start_worker():
     """Start RQ worker for file processing queue"""
     try:
@@ -219,10 +320,10 @@ def start_worker():
             
             # Test queue access (RQ handles binary data correctly)
             queue_test_start = time.time()
-            test_queue = Queue(FILE_PROCESSING_QUEUE_NAME, connection=redis_conn)
-            queue_length = len(test_queue)
-            queue_test_end = time.time()
-            log.info(f"[REDIS] Queue access test | queue='{FILE_PROCESSING_QUEUE_NAME}' | length={queue_length} | duration={queue_test_end - queue_test_start:.3f}s | timestamp={queue_test_end:.3f}")
+            for queue_name in FILE_PROCESSING_QUEUE_NAMES:
+                queue_length = len(Queue(queue_name, connection=redis_conn))
+                queue_test_end = time.time()
+                log.info(f"[REDIS] Queue access test | queue='{queue_name}' | length={queue_length} | duration={queue_test_end - queue_test_start:.3f}s | timestamp={queue_test_end:.3f}")
         except Exception as redis_error:
             log.error(f"Failed to connect to Redis: {redis_error}", exc_info=True)
             log.error("Worker cannot start without Redis connection. Please check:")
@@ -236,7 +337,7 @@ def start_worker():
         worker_name = f"file_processor_{hostname}_{os.getpid()}"
         
         log.info(f"Worker name: {worker_name}")
-        log.info(f"Queue name: {FILE_PROCESSING_QUEUE_NAME}")
+        log.info(f"Queue names (priority order): {FILE_PROCESSING_QUEUE_NAMES}")
         
         # Clean up stale worker registrations before starting
         # This prevents "There exists an active worker named '...' already" errors
@@ -255,7 +356,8 @@ def start_worker():
                 log.info(f"[REDIS] Worker list retrieved | count={len(existing_workers)} | duration={worker_list_end - worker_list_start:.3f}s | timestamp={worker_list_end:.3f}")
                 
                 for existing_worker in existing_workers:
-                    if existing_worker.name == worker_name:
+                    # Warm workers register as worker_name_<n>
+                    if existing_worker.name == worker_name or existing_worker.name.startswith(f"{worker_name}_"):
                         unregister_start = time.time()
                         log.warning(f"[REDIS] Found stale worker registration: {existing_worker.name}. Cleaning up... | timestamp={unregister_start:.3f}")
                         try:
@@ -277,26 +379,37 @@ def start_worker():
             cleanup_end = time.time()
             log.info(f"[REDIS] Worker cleanup completed | total_duration={cleanup_end - cleanup_start:.3f}s | timestamp={cleanup_end:.3f}")
         
+        # Backlogged jobs are normally admitted when an earlier job of the same
+        # user finishes; pick up any that were left behind by a crashed worker
+        try:
+            promote_backlogs(redis_conn)
+        except Exception as promote_error:
+            log.warning(f"[WORKER] Could not promote backlogged jobs (non-fatal): {promote_error}")
+        
+        if WORKER_MODE == "warm":
+            run_warm_workers(redis_conn, worker_name)
+            return
+        
         # Create queue connection
         worker_init_start = time.time()
         log.info(f"[WORKER] Initializing worker | timestamp={worker_init_start:.3f}")
         with Connection(redis_conn):
             # Create queue
             queue_create_start = time.time()
-            queue = Queue(FILE_PROCESSING_QUEUE_NAME)
+            queues = [Queue(name) for name in FILE_PROCESSING_QUEUE_NAMES]
             queue_create_end = time.time()
             log.info(f"[WORKER] Queue object created | duration={queue_create_end - queue_create_start:.3f}s | timestamp={queue_create_end:.3f}")
             
             # Create and start worker
             worker_create_start = time.time()
-            worker = Worker([queue], name=worker_name)
+            worker = Worker(queues, name=worker_name)
             worker_create_end = time.time()
             log.info(f"[WORKER] Worker object created | duration={worker_create_end - worker_create_start:.3f}s | timestamp={worker_create_end:.3f}")
             
             worker_init_end = time.time()
             log.info("=" * 80)
             log.info(
-                f"✅ RQ Worker '{worker_name}' starting for queue '{FILE_PROCESSING_QUEUE_NAME}' | init_duration={worker_init_end - worker_init_start:.3f}s"
+                f"✅ RQ Worker '{worker_name}' starting for queues {FILE_PROCESSING_QUEUE_NAMES} | init_duration={worker_init_end - worker_init_start:.3f}s"
             )
             log.info(f"   Redis: {REDIS_URL.split('@')[0]}@...")
             log.info(f"   Hostname: {hostname}")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Benchmark KaTeX fragment rendering for math-heavy chat exports.
+
+Compares three strategies over the same synthetic chat:
+  - spawn:  one fresh Node process per message batch (previous behaviour)
+  - cold:   persistent worker pool, empty fragment cache
+  - warm:   persistent worker pool, fragments already cached (repeat export)
+
+Run from a directory whose node_modules (or ../node_modules) contains katex:
+    python backend/scripts/benchmark_katex.py --messages 200 --exprs 15
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from open_webui.utils.katex_compiler import (  # noqa: E402
+    KATEX_WORKER_SCRIPT,
+    KaTeXCompiler,
+    fragment_cache,
+)
+
+EXPRESSIONS = [
+    r"\int_0^{\infty} e^{-x^2} \, dx = \frac{\sqrt{\pi}}{2}",
+    r"\sum_{n=1}^{\infty} \frac{1}{n^2} = \frac{\pi^2}{6}",
+    r"\begin{pmatrix} a & b \\ c & d \end{pmatrix}^{-1} = \frac{1}{ad-bc} \begin{pmatrix} d & -b \\ -c & a \end{pmatrix}",
+    r"\nabla \cdot \mathbf{E} = \frac{\rho}{\varepsilon_0}",
+    r"f(x) = \lim_{h \to 0} \frac{f(x+h) - f(x)}{h}",
+    r"\hat{\beta} = (X^\top X)^{-1} X^\top y",
+    r"P(A \mid B) = \frac{P(B \mid A) P(A)}{P(B)}",
+    r"x_{{i}} = \frac{-b \pm \sqrt{b^2 - 4ac}}{2a}",
+]
+
+
+def build_chat(messages: int, exprs: int, seed: int) -> list[list[tuple[str, bool]]]:
+    """Each message is a batch of (latex, display) pairs, like PDFGenerator sends them."""
+    rng = random.Random(seed)
+    chat = []
+    for m in range(messages):
+        batch = []
+        for _ in range(exprs):
+            # Mix repeated formulas with message-specific ones
+            expr = rng.choice(EXPRESSIONS).replace("{i}", str(rng.randint(0, m + 1)))
+            batch.append((expr, rng.random() < 0.3))
+        chat.append(batch)
+    return chat
+
+
+def render_spawn(compiler: KaTeXCompiler, chat) -> None:
+    katex_path = str(compiler.node_modules_path / "katex")
+    for batch in chat:
+        request = {"id": 1, "items": [{"latex": e, "display": d} for e, d in batch]}
+        proc = subprocess.run(
+            ["node", "-e", KATEX_WORKER_SCRIPT, katex_path],
+            input=json.dumps(request) + "\n",
+            capture_output=True,
+            text=True,
+            timeout=60,
+            cwd=str(compiler.node_modules_path.parent),
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr)
+
+
+def render_pool(compiler: KaTeXCompiler, chat) -> None:
+    for batch in chat:
+        compiler.render_many_to_html(batch)
+
+
+def timed(label: str, fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:>6}: {elapsed:8.3f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--exprs", type=int, default=10, help="expressions per message")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-spawn", action="store_true")
+    args = parser.parse_args()
+
+    compiler = KaTeXCompiler()
+    if not compiler.is_available():
+        sys.exit(
+            f"KaTeX not found under {compiler.node_modules_path} (cwd={os.getcwd()})"
+        )
+
+    chat = build_chat(args.messages, args.exprs, args.seed)
+    print(f"{args.messages} messages x {args.exprs} expressions")
+
+    if not args.skip_spawn:
+        timed("spawn", lambda: render_spawn(compiler, chat))
+
+    fragment_cache.clear()
+    timed("cold", lambda: render_pool(compiler, chat))
+    timed("warm", lambda: render_pool(compiler, chat))
+    print(
+        f"cache: entries={len(fragment_cache)} hits={fragment_cache.hits} misses={fragment_cache.misses}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -93,6 +93,150 @@ export const getAllFeedbacks = async (token: string = '') => {
 	return res;
 };
 
+export const getLeaderboard = async (token: string = '', skip: number = 0, limit: number = 0) => {
+	let error = null;
+
+	const searchParams = new URLSearchParams();
+	searchParams.append('skip', `${skip}`);
+	searchParams.append('limit', `${limit}`);
+
+	const res = await fetch(
+		`${WEBUI_API_BASE_URL}/evaluations/leaderboard?${searchParams.toString()}`,
+		{
+			method: 'GET',
+			headers: {
+				Accept: 'application/json',
+				'Content-Type': 'application/json',
+				authorization: `Bearer ${token}`
+			}
+		}
+	)
+		.then(async (res) => {
+			if (!res.ok) throw await res.json();
+			return res.json();
+		})
+		.then((json) => {
+			return json;
+		})
+		.catch((err) => {
+			error = err.detail;
+			console.log(err);
+			return null;
+		});
+
+	if (error) {
+		throw error;
+	}
+
+	return res;
+};
+
+export const getFeedbacks = async (
+	token: string = '',
+	skip: number = 0,
+	limit: number = 50,
+	modelId: string | null = null,
+	rating: string | null = null
+) => {
+	let error = null;
+
+	const searchParams = new URLSearchParams();
+	searchParams.append('skip', `${skip}`);
+	searchParams.append('limit', `${limit}`);
+	if (modelId) searchParams.append('model_id', modelId);
+	if (rating) searchParams.append('rating', rating);
+
+	const res = await fetch(`${WEBUI_API_BASE_URL}/evaluations/feedbacks?${searchParams.toString()}`, {
+		method: 'GET',
+		headers: {
+			Accept: 'application/json',
+			'Content-Type': 'application/json',
+			authorization: `Bearer ${token}`
+		}
+	})
+		.then(async (res) => {
+			if (!res.ok) throw await res.json();
+			return res.json();
+		})
+		.then((json) => {
+			return json;
+		})
+		.catch((err) => {
+			error = err.detail;
+			console.log(err);
+			return null;
+		});
+
+	if (error) {
+		throw error;
+	}
+
+	return res;
+};
+
+export const getFeedbackTags = async (token: string = '') => {
+	let error = null;
+
+	const res = await fetch(`${WEBUI_API_BASE_URL}/evaluations/feedbacks/tags`, {
+		method: 'GET',
+		headers: {
+			Accept: 'application/json',
+			'Content-Type': 'application/json',
+			authorization: `Bearer ${token}`
+		}
+	})
+		.then(async (res) => {
+			if (!res.ok) throw await res.json();
+			return res.json();
+		})
+		.then((json) => {
+			return json;
+		})
+		.catch((err) => {
+			error = err.detail;
+			console.log(err);
+			return null;
+		});
+
+	if (error) {
+		throw error;
+	}
+
+	return res;
+};
+
+export const getTopicLeaderboard = async (token: string, tags: Record<string, number>) => {
+	let error = null;
+
+	const res = await fetch(`${WEBUI_API_BASE_URL}/evaluations/leaderboard/topic`, {
+		method: 'POST',
+		headers: {
+			Accept: 'application/json',
+			'Content-Type': 'application/json',
+			authorization: `Bearer ${token}`
+		},
+		body: JSON.stringify({ tags })
+	})
+		.then(async (res) => {
+			if (!res.ok) throw await res.json();
+			return res.json();
+		})
+		.then((json) => {
+			return json;
+		})
+		.catch((err) => {
+			error = err.detail;
+			console.log(err);
+			return null;
+		});
+
+	if (error) {
+		throw error;
+	}
+
+	return res;
+};
+
 export const exportAllFeedbacks = async (token: string = '') => {
 	let error = null;
 